@@ -1,9 +1,15 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any, Optional
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional, Tuple
 from psycopg2 import sql
 from ..core.config import settings
 from ..core.redis_cache import response_cache
 from ..services.db_client import get_db_client
+from ..services.table_catalog import get_table_catalog
+from ..services.table_export import csv_chunks, parquet_chunks
+import base64
+import binascii
+import json
 import logging
 
 router = APIRouter()
@@ -29,27 +35,7 @@ async def get_tables():
     Get a list of all tables in the public schema.
     """
     try:
-        cache_key = response_cache.make_key("db-explorer-tables")
-        hit, cached = response_cache.get(cache_key, settings.DB_EXPLORER_CACHE_TTL_SECONDS)
-        if hit:
-            return cached
-
-        client = get_db_client()
-        query = """
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_type = 'BASE TABLE';
-        """
-        results = client.execute_query(query)
-        tables = [row["table_name"] for row in results]
-        response_cache.set(
-            cache_key,
-            tables,
-            settings.DB_EXPLORER_CACHE_TTL_SECONDS,
-            cache_empty=True,
-        )
-        return tables
+        return get_table_catalog(get_db_client()).tables()
     except Exception as e:
         logger.error(f"Error fetching tables: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -61,33 +47,16 @@ async def get_table_schema(table_name: str):
     Get the schema (columns and types) for a specific table.
     """
     try:
-        cache_key = response_cache.make_key("db-explorer-schema", table_name)
-        hit, cached = response_cache.get(cache_key, settings.DB_EXPLORER_CACHE_TTL_SECONDS)
-        if hit:
-            return cached
-
-        client = get_db_client()
-        # Validate table name to prevent SQL injection (basic check)
-        # In a real app, we should verify against the list of known tables
-
-        query = """
-            SELECT column_name, data_type, is_nullable
-            FROM information_schema.columns
-            WHERE table_name = %s
-            ORDER BY ordinal_position;
-        """
-        results = client.execute_query(query, (table_name,))
-
-        if not results:
-            raise HTTPException(status_code=404, detail=f"Table {table_name} not found")
-
-        response_cache.set(
-            cache_key,
-            results,
-            settings.DB_EXPLORER_CACHE_TTL_SECONDS,
-            cache_empty=True,
-        )
-        return results
+        catalog = get_table_catalog(get_db_client())
+        _validate_identifier(table_name, catalog.table_names(), "table")
+        return [
+            {
+                "column_name": column["column_name"],
+                "data_type": column["data_type"],
+                "is_nullable": column["is_nullable"],
+            }
+            for column in catalog.columns(table_name)
+        ]
     except HTTPException:
         raise
     except Exception as e:
@@ -95,6 +64,116 @@ async def get_table_schema(table_name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(state, dict) or not isinstance(state.get("after"), list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return state
+
+
+def _cursor_value(value: Any) -> Any:
+    """Key value as it goes into a cursor; non-JSON types travel as text."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _serializable_rows(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace values FastAPI cannot serialize (bytea/memoryview) with a marker."""
+    processed_results = []
+    for row in results:
+        processed_row = dict(row)
+        for key, value in processed_row.items():
+            # Handle bytes/memoryview (Postgres bytea)
+            if isinstance(value, (bytes, memoryview)):
+                processed_row[key] = "<binary data>"
+        processed_results.append(processed_row)
+    return processed_results
+
+
+def _filter_clause(
+    catalog, table_name: str, filter_col: Optional[str], filter_val: Optional[str]
+) -> Tuple[Optional[sql.Composable], List[Any]]:
+    """``column = %s`` for a validated filter column, or (None, [])."""
+    if not (filter_col and filter_val):
+        return None, []
+    # Basic SQL injection prevention for column name: check if it exists in the table
+    safe_filter_col = _validate_identifier(filter_col, catalog.column_names(table_name), "column")
+    return sql.SQL("{column} = %s").format(column=sql.Identifier(safe_filter_col)), [filter_val]
+
+
+def _keyset_page(
+    client,
+    catalog,
+    table_name: str,
+    limit: int,
+    cursor: Optional[str],
+    filter_col: Optional[str],
+    filter_val: Optional[str],
+) -> Dict[str, Any]:
+    """
+    One page ordered by the table's ordering key, starting after the key
+    values in ``cursor``: ``WHERE (key) > (last key)`` walks the key's index
+    instead of scanning and discarding OFFSET rows.
+    """
+    keys = catalog.ordering_key(table_name)
+    filter_sql, params = _filter_clause(catalog, table_name, filter_col, filter_val)
+    conditions = [filter_sql] if filter_sql is not None else []
+
+    if cursor:
+        state = _decode_cursor(cursor)
+        if (
+            state.get("table") != table_name
+            or state.get("keys") != keys
+            or state.get("filter") != [filter_col, filter_val]
+            or len(state["after"]) != len(keys)
+        ):
+            raise HTTPException(
+                status_code=400, detail="Cursor does not belong to this table and filter"
+            )
+        conditions.append(
+            sql.SQL("({keys}) > ({values})").format(
+                keys=sql.SQL(", ").join(map(sql.Identifier, keys)),
+                values=sql.SQL(", ").join(sql.Placeholder() * len(keys)),
+            )
+        )
+        params.extend(state["after"])
+
+    query = sql.SQL("SELECT *{ctid} FROM {table}{where} ORDER BY {keys} LIMIT %s").format(
+        ctid=sql.SQL(", ctid") if "ctid" in keys else sql.SQL(""),
+        table=sql.Identifier(table_name),
+        where=sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions) if conditions else sql.SQL(""),
+        keys=sql.SQL(", ").join(map(sql.Identifier, keys)),
+    )
+    results = client.execute_query(query, tuple(params + [limit]))
+
+    next_cursor = None
+    if len(results) == limit:
+        last = results[-1]
+        next_cursor = _encode_cursor(
+            {
+                "table": table_name,
+                "keys": keys,
+                "filter": [filter_col, filter_val],
+                "after": [_cursor_value(last[key]) for key in keys],
+            }
+        )
+    if "ctid" in keys:
+        for row in results:
+            row.pop("ctid", None)
+
+    return {"rows": _serializable_rows(results), "next_cursor": next_cursor, "order_by": keys}
+
+
 @router.get("/data/{table_name}")
 async def get_table_data(
     table_name: str,
@@ -102,10 +181,25 @@ async def get_table_data(
     offset: int = Query(0, ge=0),
     filter_col: Optional[str] = None,
     filter_val: Optional[str] = None,
+    paginate: str = "offset",
+    cursor: Optional[str] = None,
 ):
     """
     Get data from a specific table with pagination and optional simple filtering.
+
+    ``offset`` pagination returns a list of rows and is meant for the first
+    few pages; deep pages should use ``keyset`` pagination, whose cost does
+    not grow with the page number. ``paginate=keyset`` returns
+    ``{rows, next_cursor, order_by}``; pass ``next_cursor`` back as
+    ``cursor`` for the following page (a cursor implies keyset).
+
+    Keyset order is the primary key, else a timestamp column
+    (publish_timestamp) with the physical row id as the tie breaker; rows
+    whose timestamp is NULL are not reached.
     """
+    if paginate not in ("offset", "keyset"):
+        raise HTTPException(status_code=400, detail=f"Invalid paginate: {paginate}")
+    keyset = paginate == "keyset" or cursor is not None
     try:
         cache_key = response_cache.make_key(
             "db-explorer-data",
@@ -114,66 +208,35 @@ async def get_table_data(
             offset,
             filter_col,
             filter_val,
+            *(("keyset", cursor) if keyset else ()),
         )
         hit, cached = response_cache.get(cache_key, settings.DB_EXPLORER_CACHE_TTL_SECONDS)
         if hit:
             return cached
 
         client = get_db_client()
+        catalog = get_table_catalog(client)
 
-        # Sanitize table name (basic check)
-        # Ideally, check against a whitelist of existing tables
-        tables_query = """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = %s
-              AND table_type = %s
-        """
-        valid_tables = [
-            t["table_name"]
-            for t in client.execute_query(tables_query, ("public", "BASE TABLE"))
-        ]
-        safe_table_name = _validate_identifier(table_name, set(valid_tables), "table")
-
-        if filter_col and filter_val:
-            # Basic SQL injection prevention for column name: check if it exists in the table
-            cols_query = "SELECT column_name FROM information_schema.columns WHERE table_name = %s"
-            valid_cols = [
-                c["column_name"]
-                for c in client.execute_query(cols_query, (table_name,))
-            ]
-
-            safe_filter_col = _validate_identifier(filter_col, set(valid_cols), "column")
+        # Identifiers are checked against the cached catalog
+        safe_table_name = _validate_identifier(table_name, catalog.table_names(), "table")
 
-            query = sql.SQL("SELECT * FROM {table} WHERE {column} = %s LIMIT %s OFFSET %s").format(
-                table=sql.Identifier(safe_table_name),
-                column=sql.Identifier(safe_filter_col),
+        if keyset:
+            results = _keyset_page(
+                client, catalog, safe_table_name, limit, cursor, filter_col, filter_val
             )
-            results = client.execute_query(query, (filter_val, limit, offset))
         else:
-            query = sql.SQL("SELECT * FROM {table} LIMIT %s OFFSET %s").format(
-                table=sql.Identifier(safe_table_name),
-            )
-            results = client.execute_query(query, (limit, offset))
-
-        # Debug logging
-        if results:
-            logger.info(f"First row type: {type(results[0])}")
-            # logger.info(f"First row content: {results[0]}") # Commented out to avoid log spam
-
-            # Process results to handle non-serializable types (like bytea/memoryview)
-            processed_results = []
-            for row in results:
-                processed_row = dict(row)
-                for key, value in processed_row.items():
-                    # Handle bytes/memoryview (Postgres bytea)
-                    if isinstance(value, (bytes, memoryview)):
-                        processed_row[key] = "<binary data>"
-                processed_results.append(processed_row)
-
-            results = processed_results
-
-        # Handle datetime serialization if necessary (FastAPI usually handles this, but just in case)
+            filter_sql, params = _filter_clause(catalog, safe_table_name, filter_col, filter_val)
+            if filter_sql is not None:
+                query = sql.SQL("SELECT * FROM {table} WHERE {condition} LIMIT %s OFFSET %s").format(
+                    table=sql.Identifier(safe_table_name),
+                    condition=filter_sql,
+                )
+            else:
+                query = sql.SQL("SELECT * FROM {table} LIMIT %s OFFSET %s").format(
+                    table=sql.Identifier(safe_table_name),
+                )
+            results = _serializable_rows(client.execute_query(query, tuple(params + [limit, offset])))
+
         response_cache.set(
             cache_key,
             results,
@@ -186,3 +249,49 @@ async def get_table_data(
     except Exception as e:
         logger.error(f"Error fetching data for {table_name}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/export/{table_name}")
+def export_table(
+    table_name: str,
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    filter_col: Optional[str] = None,
+    filter_val: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum rows (default: all)"),
+):
+    """
+    Stream a whole table (or its filtered rows) as CSV or Parquet.
+
+    Rows are read through a server-side cursor in batches of
+    DB_EXPLORER_EXPORT_BATCH_ROWS and encoded as they arrive, so memory use
+    does not depend on the table size.
+    """
+    client = get_db_client()
+    catalog = get_table_catalog(client)
+    safe_table_name = _validate_identifier(table_name, catalog.table_names(), "table")
+    filter_sql, params = _filter_clause(catalog, safe_table_name, filter_col, filter_val)
+
+    query = sql.SQL("SELECT * FROM {table}").format(table=sql.Identifier(safe_table_name))
+    if filter_sql is not None:
+        query = query + sql.SQL(" WHERE ") + filter_sql
+    if limit is not None:
+        query = query + sql.SQL(" LIMIT %s")
+        params.append(limit)
+
+    columns = catalog.columns(safe_table_name)
+    names = [column["column_name"] for column in columns]
+    batches = client.iter_query_batches(
+        query, tuple(params), batch_size=settings.DB_EXPLORER_EXPORT_BATCH_ROWS
+    )
+    if format == "parquet":
+        body = parquet_chunks(names, {c["column_name"]: c["data_type"] for c in columns}, batches)
+        media_type = "application/vnd.apache.parquet"
+    else:
+        body = csv_chunks(names, batches)
+        media_type = "text/csv"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{safe_table_name}.{format}"'},
+    )
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
 import logging
 
 from ..schemas.intersection import IntersectionRead
@@ -12,10 +15,15 @@ from ..schemas.safety_score import (
 )
 from ..services.intersection_service import get_all, get_by_id
 from ..services.db_client import get_db_client
+from ..services.async_db_client import get_async_db_client
 from ..services.mcdm_service import MCDMSafetyIndexService
 from ..services.rt_si_service import RTSIService
+from ..services.capacity_sketch import capacity_sketch_store
+from ..services.query_stats import query_stats
 from ..core.config import settings
 from ..core.redis_cache import response_cache
+from ..core.intersection_registry import intersection_registry
+from ..core.snapshot import SnapshotRefresher
 from ..core.intersection_mapping import (
     normalize_intersection_name,
     validate_intersection_in_tables,
@@ -25,6 +33,12 @@ from ..core.intersection_mapping import (
 router = APIRouter(prefix="/safety/index", tags=["Safety Index"])
 logger = logging.getLogger(__name__)
 
+# Trend series are cached per (intersection, chunk, bin_minutes); chunks
+# ending less than TREND_CHUNK_SETTLE ago may still receive data
+TREND_CHUNK = timedelta(days=1)
+TREND_CHUNK_SETTLE = timedelta(days=1)
+
+
 def find_crash_intersection_for_bsm(bsm_intersection: str, db_client) -> list:
     """
     Find intersections for a BSM intersection by querying BOTH hiresdata AND PSM tables.
@@ -44,7 +58,14 @@ def find_crash_intersection_for_bsm(bsm_intersection: str, db_client) -> list:
         - crash_intersection_id: Nearest crash intersection ID (if found)
         - source: 'hiresdata' or 'psm'
         - valid_in_tables: Dict showing which tables have data
+
+    Served from the in-process intersection registry once it is loaded
+    (no queries); the per-request lookup below is the fallback.
     """
+    cached = intersection_registry.lookup(bsm_intersection)
+    if cached is not None:
+        return cached
+
     all_results = []
     bsm_intersection = bsm_intersection.strip()
     logger.info(
@@ -126,58 +147,13 @@ def _find_nearest_crash_intersection(short_name: str, db_client) -> Optional[int
         return None
 
 
-@router.get("/")
-def list_intersections(
-    alpha: float = Query(
-        0.7,
-        description="Blending coefficient: α×RT-SI + (1-α)×MCDM",
-        ge=0.0,
-        le=1.0,
-    ),
-    include_mcdm: bool = Query(
-        True,
-        description="Include MCDM scores for comparison (default: true)",
-    ),
-    bin_minutes: int = Query(
-        15, description="Time bin size in minutes for RT-SI", ge=1, le=60
-    ),
-):
+def _compute_safety_index_components(bin_minutes: int) -> list[dict]:
     """
-    Retrieve a list of all intersections with blended safety index.
-
-    **BEHAVIOR:** Returns blended safety index combining RT-SI and MCDM.
-
-    Parameters:
-    - alpha: Blending coefficient (default: 0.7) - higher values favor RT-SI
-    - include_mcdm: If True, includes MCDM scores (default: true)
-    - bin_minutes: Time window for RT-SI calculation (default: 15 minutes)
-
-    Returns:
-    - List[IntersectionRead] with:
-      - safety_index: Blended score (α×RT-SI + (1-α)×MCDM)
-      - rt_si_index: Raw RT-SI score
-      - mcdm_index: Raw MCDM score
-      - index_type: Calculation method used
-
-    Examples:
-    - GET /api/v1/safety/index/ - Blended with α=0.7
-    - GET /api/v1/safety/index/?alpha=1.0 - Pure RT-SI
-    - GET /api/v1/safety/index/?alpha=0.0 - Pure MCDM
+    Compute the alpha-independent part of the safety-index list: base
+    intersection data plus the raw RT-SI and clamped MCDM score for every
+    intersection. This is the expensive step run by the snapshot refresher;
+    requests only blend its output.
     """
-
-    cache_key = response_cache.make_key(
-        "safety-index-list",
-        round(alpha, 4),
-        include_mcdm,
-        bin_minutes,
-    )
-    hit, cached = response_cache.get(
-        cache_key, settings.SAFETY_INDEX_CACHE_TTL_SECONDS
-    )
-    if hit:
-        logger.info(f"safety-index cache hit for {cache_key}")
-        return cached
-
     db_client = get_db_client()
     rt_si_service = RTSIService(db_client)
     mcdm_service = MCDMSafetyIndexService(db_client)
@@ -199,26 +175,14 @@ def list_intersections(
     # Get base intersection data (coordinates, traffic volume, etc.)
     base_intersections = get_all(mapping_results)
 
-    # Calculate RT-SI and MCDM for each intersection
+    # Resolve each intersection's BSM name and crash intersection ID first so
+    # RT-SI can be computed for every site in one batched call.
     current_time = datetime.now()
-    results = []
+    rt_si_targets: dict[str, int] = {}
+    matched_bsm_names: dict[str, Optional[str]] = {}
 
     for intersection in base_intersections:
-        # Initialize result with base intersection data
-        result_data = {
-            "intersection_id": intersection.intersection_id,
-            "intersection_name": intersection.intersection_name,
-            "traffic_volume": intersection.traffic_volume,
-            "longitude": intersection.longitude,
-            "latitude": intersection.latitude,
-            "safety_index": None,  # Will be blended score
-            "rt_si_index": None,  # Raw RT-SI score
-            "mcdm_index": None,  # Raw MCDM score
-            "index_type": None,  # Will be set based on calculation
-        }
-
-        # Try to find matching BSM intersection and calculate RT-SI
-        # First, find corresponding BSM intersection name
+        # Find corresponding BSM intersection name
         bsm_intersection_name = None
         for bsm_name in bsm_intersections:
             # Normalize both names for comparison: remove hyphens and spaces
@@ -237,9 +201,8 @@ def list_intersections(
                     f"Matched BSM intersection '{bsm_name}' to '{intersection.intersection_name}'"
                 )
                 break
+        matched_bsm_names[intersection.intersection_name] = bsm_intersection_name
 
-        # Calculate RT-SI (primary safety index)
-        rt_si_calculated = False
         if bsm_intersection_name:
             # Reuse the crash mapping computed once above (avoids a second
             # find_crash_intersection_for_bsm round-trip per intersection).
@@ -254,93 +217,263 @@ def list_intersections(
                 crash_intersection_list[0] if crash_intersection_list else None,
             )
             if valid_crash and valid_crash["crash_intersection_id"]:
-                crash_intersection_id = valid_crash["crash_intersection_id"]
-                logger.info(
-                    f"Calculating RT-SI (Full) for {intersection.intersection_name} (Crash ID: {crash_intersection_id})"
-                )
-                try:
-                    rt_si_result = rt_si_service.calculate_rt_si(
-                        crash_intersection_id,
-                        current_time,
-                        bin_minutes=bin_minutes,
-                        realtime_intersection=bsm_intersection_name,
-                        lookback_hours=168,  # Look back up to 1 week for latest available data
-                    )
-
-                    if rt_si_result is not None:
-                        result_data["rt_si_index"] = rt_si_result["RT_SI"]
-                        result_data["index_type"] = "RT-SI-Full"
-                        rt_si_calculated = True
-                        logger.info(
-                            f"RT-SI calculated successfully: {rt_si_result['RT_SI']:.2f}"
-                        )
-                    else:
-                        logger.warning(
-                            f"RT-SI calculation returned None for {intersection.intersection_name}"
-                        )
-                except Exception as e:
-                    logger.warning(
-                        f"Could not calculate RT-SI for {intersection.intersection_name}: {e}",
-                        exc_info=True,
-                    )
+                rt_si_targets[bsm_intersection_name] = valid_crash[
+                    "crash_intersection_id"
+                ]
             else:
                 logger.info(
                     f"No crash data for '{bsm_intersection_name}', will use RT-SI-Realtime"
                 )
 
-        # Set MCDM index from base intersection data
+    # Calculate RT-SI (primary safety index) for all intersections at once:
+    # a fixed handful of grouped queries instead of several per intersection.
+    rt_si_results = rt_si_service.calculate_rt_si_batch(
+        rt_si_targets,
+        current_time,
+        bin_minutes=bin_minutes,
+        lookback_hours=168,  # Look back up to 1 week for latest available data
+    )
+
+    components = []
+    for intersection in base_intersections:
+        bsm_intersection_name = matched_bsm_names.get(intersection.intersection_name)
+        rt_si_result = (
+            rt_si_results.get(bsm_intersection_name) if bsm_intersection_name else None
+        )
+        rt_si_index = None
+        if rt_si_result is not None:
+            rt_si_index = rt_si_result["RT_SI"]
+            logger.info(
+                f"RT-SI calculated for {intersection.intersection_name} "
+                f"(Crash ID: {rt_si_result['intersection_id']}): {rt_si_result['RT_SI']:.2f}"
+            )
+        elif bsm_intersection_name in rt_si_targets:
+            logger.warning(
+                f"RT-SI calculation returned None for {intersection.intersection_name}"
+            )
+
+        # MCDM index from base intersection data, clamped to [0, 100]
         mcdm_value = (
             intersection.safety_index if intersection.safety_index is not None else 0.0
         )
-        # Clamp MCDM to [0, 100]
-        mcdm_value = max(0.0, min(100.0, mcdm_value))
-        if include_mcdm:
-            result_data["mcdm_index"] = mcdm_value
+        components.append(
+            {
+                "intersection_id": intersection.intersection_id,
+                "intersection_name": intersection.intersection_name,
+                "traffic_volume": intersection.traffic_volume,
+                "longitude": intersection.longitude,
+                "latitude": intersection.latitude,
+                "rt_si_index": rt_si_index,
+                "mcdm_index": max(0.0, min(100.0, mcdm_value)),
+            }
+        )
 
-        # Get RT-SI value (0 if not calculated)
+    logger.info(f"Computed safety-index components for {len(components)} intersections")
+    return components
+
+
+def _blend_safety_index(
+    components: list[dict], alpha: float, include_mcdm: bool
+) -> list[IntersectionRead]:
+    """Blend snapshot components into the list response: α×RT-SI + (1-α)×MCDM."""
+    results = []
+    for component in components:
+        mcdm_value = component["mcdm_index"]
+        # Get RT-SI value (0 if not calculated), clamped to [0, 100]
         rt_si_value = (
-            result_data["rt_si_index"]
-            if result_data["rt_si_index"] is not None
-            else 0.0
+            component["rt_si_index"] if component["rt_si_index"] is not None else 0.0
         )
-        # Clamp RT-SI to [0, 100]
         rt_si_value = max(0.0, min(100.0, rt_si_value))
-        result_data["rt_si_index"] = rt_si_value
 
-        # Calculate blended safety index: α×RT-SI + (1-α)×MCDM
+        result_data = {
+            "intersection_id": component["intersection_id"],
+            "intersection_name": component["intersection_name"],
+            "traffic_volume": component["traffic_volume"],
+            "longitude": component["longitude"],
+            "latitude": component["latitude"],
+            "rt_si_index": rt_si_value,
+            "mcdm_index": mcdm_value if include_mcdm else None,
+        }
+
         # Always apply blending formula if we have data
         if mcdm_value > 0 or rt_si_value > 0:
-            result_data["safety_index"] = alpha * rt_si_value + (1 - alpha) * mcdm_value
+            blended = alpha * rt_si_value + (1 - alpha) * mcdm_value
             # Clamp final result to [0, 100]
-            result_data["safety_index"] = max(
-                0.0, min(100.0, result_data["safety_index"])
-            )
+            result_data["safety_index"] = max(0.0, min(100.0, blended))
             # Always show "Blended" when using the alpha blending formula
             result_data["index_type"] = "Blended"
-            logger.debug(
-                f"Blended: {alpha:.2f}×{rt_si_value:.2f} + {1-alpha:.2f}×{mcdm_value:.2f} = {result_data['safety_index']:.2f}"
-            )
         else:
             # No data at all
             result_data["safety_index"] = 0.0
             result_data["index_type"] = "No Data"
-            logger.debug(f"No data available for blending")
 
         results.append(IntersectionRead(**result_data))
+    return results
+
+
+# Blended safety-index list inputs, keyed by bin_minutes and recomputed in
+# the background on the data cadence (started from the app lifespan)
+safety_index_snapshots = SnapshotRefresher(
+    "safety-index", _compute_safety_index_components
+)
+
+# Bin sizes kept as background snapshots, the only ones the list serves
+SNAPSHOT_BIN_MINUTES = (15,)
+
+
+def _snapshot_unavailable(detail: str) -> HTTPException:
+    return HTTPException(status_code=503, detail=detail, headers={"Retry-After": "30"})
+
+
+def _safety_index_snapshot(bin_minutes: int) -> tuple:
+    """
+    (components, computed_at) for the list endpoint. Never computes on the
+    request thread: waits for the background refresher, 503 when unavailable.
+    """
+    snapshot = safety_index_snapshots.get(bin_minutes)
+    if snapshot is None:
+        safety_index_snapshots.track(bin_minutes)
+        if not safety_index_snapshots.running:
+            # SAFETY_INDEX_SNAPSHOT_REFRESH_SECONDS=0 disables the snapshot
+            raise _snapshot_unavailable("Safety index snapshots are disabled")
+        snapshot = safety_index_snapshots.wait_for(
+            bin_minutes, settings.SAFETY_INDEX_SNAPSHOT_COLD_WAIT_SECONDS
+        )
+    if snapshot is None:
+        raise _snapshot_unavailable(
+            "Safety index snapshot is still being computed; retry shortly"
+        )
+    return snapshot
+
+
+@router.get("/")
+def list_intersections(
+    response: Response,
+    alpha: float = Query(
+        0.7,
+        description="Blending coefficient: α×RT-SI + (1-α)×MCDM",
+        ge=0.0,
+        le=1.0,
+    ),
+    include_mcdm: bool = Query(
+        True,
+        description="Include MCDM scores for comparison (default: true)",
+    ),
+    bin_minutes: int = Query(
+        15, description="Time bin size in minutes for RT-SI", ge=1, le=60
+    ),
+):
+    """
+    Retrieve a list of all intersections with blended safety index.
+
+    **BEHAVIOR:** Returns blended safety index combining RT-SI and MCDM.
+
+    Served from the last background-computed snapshot; the
+    X-Snapshot-Age-Seconds header reports how old it is. Until the first
+    snapshot of a bin size exists the request waits up to
+    SAFETY_INDEX_SNAPSHOT_COLD_WAIT_SECONDS for it (503 after). Only bin
+    sizes in SNAPSHOT_BIN_MINUTES are served (422 otherwise).
+
+    Parameters:
+    - alpha: Blending coefficient (default: 0.7) - higher values favor RT-SI
+    - include_mcdm: If True, includes MCDM scores (default: true)
+    - bin_minutes: Time window for RT-SI calculation (default: 15 minutes)
+
+    Returns:
+    - List[IntersectionRead] with:
+      - safety_index: Blended score (α×RT-SI + (1-α)×MCDM)
+      - rt_si_index: Raw RT-SI score
+      - mcdm_index: Raw MCDM score
+      - index_type: Calculation method used
 
+    Examples:
+    - GET /api/v1/safety/index/ - Blended with α=0.7
+    - GET /api/v1/safety/index/?alpha=1.0 - Pure RT-SI
+    - GET /api/v1/safety/index/?alpha=0.0 - Pure MCDM
+    """
+    if bin_minutes not in SNAPSHOT_BIN_MINUTES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"bin_minutes must be one of {list(SNAPSHOT_BIN_MINUTES)}",
+        )
+    components, computed_at = _safety_index_snapshot(bin_minutes)
+    response.headers["X-Snapshot-Age-Seconds"] = f"{datetime.now().timestamp() - computed_at:.0f}"
+    response.headers["X-Snapshot-Computed-At"] = datetime.fromtimestamp(
+        computed_at
+    ).isoformat()
+
+    results = _blend_safety_index(components, alpha, include_mcdm)
     if not results:
         logger.warning("No intersections returned")
-    else:
-        logger.info(
-            f"Returning {len(results)} intersections with RT-SI as primary index"
+    return results
+
+
+@router.post("/registry/refresh")
+def refresh_intersection_registry():
+    """
+    Reload the in-process intersection registry (name mapping, crash
+    intersection IDs, coordinates, table presence) from the database now,
+    instead of waiting for the next background refresh.
+    """
+    try:
+        return intersection_registry.refresh(get_db_client())
+    except Exception as e:
+        raise HTTPException(
+            status_code=503, detail=f"Intersection registry refresh failed: {e}"
         )
-        response_cache.set(
-            cache_key,
-            results,
-            settings.SAFETY_INDEX_CACHE_TTL_SECONDS,
+
+
+@router.get("/debug/capacity")
+def verify_capacity(
+    intersection: str = Query(..., description="Intersection name (e.g., 'glebe-potomac')"),
+    lookback_days: int = Query(30, ge=1, le=365),
+):
+    """
+    Compare the capacity served from the in-process sketch with the
+    database PERCENTILE_CONT(0.95) over the same lookback window.
+    """
+    rt_si_service = RTSIService(get_db_client())
+    sketch = (
+        capacity_sketch_store.quantile(
+            rt_si_service._to_short_name(intersection), 0.95, lookback_days
         )
+        if capacity_sketch_store.covers(lookback_days)
+        else None
+    )
+    database = rt_si_service.get_intersection_capacity(
+        intersection, lookback_days=lookback_days, use_sketch=False
+    )
+    return {
+        "intersection": intersection,
+        "lookback_days": lookback_days,
+        "sketch_capacity": sketch,
+        "database_capacity": database,
+        "abs_difference": abs(sketch - database) if sketch is not None else None,
+        "sketch": capacity_sketch_store.status(),
+    }
 
-    return results
+
+@router.get("/debug/queries")
+def query_statistics(
+    order_by: str = Query(
+        "total_ms",
+        pattern="^(total_ms|calls|mean_ms|max_ms|errors|rows)$",
+        description="Sort key, largest first",
+    ),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Per-query-fingerprint latency histograms, row and error counts recorded
+    by the database clients since startup (or the last reset).
+    """
+    return {"summary": query_stats.status(), "queries": query_stats.snapshot(order_by, limit)}
+
+
+@router.post("/debug/queries/reset")
+def reset_query_statistics():
+    """Clear the query statistics."""
+    query_stats.reset()
+    return query_stats.status()
 
 
 @router.get("/debug/status")
@@ -527,7 +660,15 @@ def get_sensitivity_analysis(
         le=0.5,
     ),
     n_samples: int = Query(
-        100, description="Number of parameter sets to test", ge=10, le=500
+        100, description="Number of parameter sets to test", ge=10, le=5000
+    ),
+    design: str = Query(
+        "random",
+        description="Sampling design: 'random' (Monte Carlo) or 'sobol' (quasi-random)",
+        pattern="^(random|sobol)$",
+    ),
+    seed: Optional[int] = Query(
+        None, description="Seed for a reproducible parameter design"
     ),
 ):
     """
@@ -539,7 +680,9 @@ def get_sensitivity_analysis(
     - Tier changes (Low→High risk reclassifications)
 
     This validates that the RT-SI methodology is robust and not overly sensitive
-    to parameter tuning choices.
+    to parameter tuning choices. All parameter sets are scored in one
+    vectorized sweep over data fetched once, so thousands of samples (or a
+    Sobol design) stay interactive.
 
     **Parameters analyzed:**
     - β₁, β₂, β₃: Uplift weights (speed, variance, conflict)
@@ -570,43 +713,44 @@ def get_sensitivity_analysis(
         bin_minutes,
         round(perturbation_pct, 4),
         n_samples,
+        design,
+        seed,
     )
-    hit, cached = response_cache.get(cache_key, settings.SAFETY_TIME_CACHE_TTL_SECONDS)
-    if hit:
-        return cached
 
-    db_client = get_db_client()
+    def compute():
+        db_client = get_db_client()
 
-    try:
-        from app.services.sensitivity_analysis_service import SensitivityAnalysisService
+        try:
+            from app.services.sensitivity_analysis_service import SensitivityAnalysisService
+
+            sensitivity_service = SensitivityAnalysisService(db_client)
+
+            results = sensitivity_service.analyze_sensitivity(
+                intersection=intersection,
+                start_time=start_time,
+                end_time=end_time,
+                bin_minutes=bin_minutes,
+                perturbation_pct=perturbation_pct,
+                n_samples=n_samples,
+                design=design,
+                seed=seed,
+            )
 
-        sensitivity_service = SensitivityAnalysisService(db_client)
+            if "error" in results:
+                raise HTTPException(status_code=404, detail=results["error"])
 
-        results = sensitivity_service.analyze_sensitivity(
-            intersection=intersection,
-            start_time=start_time,
-            end_time=end_time,
-            bin_minutes=bin_minutes,
-            perturbation_pct=perturbation_pct,
-            n_samples=n_samples,
-        )
-
-        if "error" in results:
-            raise HTTPException(status_code=404, detail=results["error"])
+            return results
 
-        response_cache.set(
-            cache_key,
-            results,
-            settings.SAFETY_TIME_CACHE_TTL_SECONDS,
-        )
-        return results
+        except Exception as e:
+            logger.error(f"Error performing sensitivity analysis: {e}", exc_info=True)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error performing sensitivity analysis: {str(e)}",
+            )
 
-    except Exception as e:
-        logger.error(f"Error performing sensitivity analysis: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error performing sensitivity analysis: {str(e)}",
-        )
+    return response_cache.get_or_compute(
+        cache_key, settings.SAFETY_TIME_CACHE_TTL_SECONDS, compute
+    )
 
 
 @router.get("/{intersection_id}", response_model=IntersectionRead)
@@ -632,7 +776,7 @@ def get_intersection(intersection_id: int):
 
 
 @router.get("/time/specific", response_model=SafetyScoreTimePoint)
-def get_safety_score_at_time(
+async def get_safety_score_at_time(
     intersection: str = Query(
         ..., description="Intersection name (e.g., 'glebe-potomac')"
     ),
@@ -656,6 +800,10 @@ def get_safety_score_at_time(
     - vehicle_index: Vehicle sub-index (0-100)
     - index_type: "Hybrid" when blending both, "RT-SI-Full", or "MCDM"
 
+    On a cache miss the MCDM criteria matrix and the RT-SI real-time
+    queries are fetched concurrently on the async database client, without
+    holding a thread; scoring then runs in the threadpool.
+
     Example:
     ```
     GET /api/v1/safety/index/time/specific?intersection=glebe-potomac&time=2025-11-09T10:00:00&bin_minutes=15&alpha=0.7
@@ -668,10 +816,92 @@ def get_safety_score_at_time(
         bin_minutes,
         round(alpha, 4),
     )
-    hit, cached = response_cache.get(cache_key, settings.SAFETY_TIME_CACHE_TTL_SECONDS)
+    ttl = settings.SAFETY_TIME_CACHE_TTL_SECONDS
+    hit, cached = await run_in_threadpool(response_cache.get, cache_key, ttl)
     if hit:
         return cached
 
+    prefetched = await _fetch_safety_score_inputs(intersection, time, bin_minutes)
+    return await run_in_threadpool(
+        response_cache.get_or_compute,
+        cache_key,
+        ttl,
+        lambda: _compute_safety_score_at_time(
+            intersection, time, bin_minutes, alpha, prefetched
+        ),
+    )
+
+
+def _rt_si_mapping(intersection_list: list) -> Optional[dict]:
+    """The crash-intersection mapping RT-SI is computed for: the first one with an ID."""
+    return next(
+        (
+            item
+            for item in intersection_list
+            if item["crash_intersection_id"] is not None
+        ),
+        intersection_list[0] if intersection_list else None,
+    )
+
+
+async def _fetch_safety_score_inputs(
+    intersection: str, time: datetime, bin_minutes: int
+) -> dict:
+    """
+    Fetch the inputs of _compute_safety_score_at_time that need the database
+    concurrently on the async client:
+
+    - ``matrix``: the MCDM criteria matrix for ``time``
+    - ``realtime`` / ``realtime_intersection``: RT-SI real-time data, when
+      the intersection registry is loaded and maps ``intersection`` to a
+      crash intersection (resolving it otherwise would need a blocking query)
+
+    Inputs that could not be fetched are left out and queried synchronously,
+    so this returns {} when the async client is unavailable.
+    """
+    try:
+        async_client = get_async_db_client()
+    except RuntimeError as e:
+        logger.debug(f"Async database client unavailable: {e}")
+        return {}
+
+    db_client = get_db_client()
+    fetches = {
+        "matrix": MCDMSafetyIndexService(
+            db_client, async_db_client=async_client
+        ).get_data_matrix_for_time_async(time, bin_minutes)
+    }
+    mapping = _rt_si_mapping(intersection_registry.lookup(intersection) or [])
+    if mapping and mapping["crash_intersection_id"]:
+        fetches["realtime"] = RTSIService(
+            db_client, async_client
+        ).get_realtime_data_async(mapping["intersection_name"], time, bin_minutes)
+
+    results = await asyncio.gather(*fetches.values(), return_exceptions=True)
+    prefetched = {}
+    for name, value in zip(fetches, results):
+        if isinstance(value, Exception):
+            logger.warning(f"Async fetch of {name} for {intersection} failed: {value}")
+        else:
+            prefetched[name] = value
+    if "realtime" in prefetched:
+        prefetched["realtime_intersection"] = mapping["intersection_name"]
+    return prefetched
+
+
+def _compute_safety_score_at_time(
+    intersection: str,
+    time: datetime,
+    bin_minutes: int,
+    alpha: float,
+    prefetched: Optional[dict] = None,
+) -> dict:
+    """
+    Uncached body of get_safety_score_at_time (computed once per cache key).
+    ``prefetched`` holds inputs already fetched by _fetch_safety_score_inputs.
+    """
+    prefetched = prefetched or {}
+    matrix = prefetched.get("matrix")
     db_client = get_db_client()
     mcdm_service = MCDMSafetyIndexService(db_client)
     rt_si_service = RTSIService(db_client)
@@ -679,7 +909,7 @@ def get_safety_score_at_time(
     # Attempt multiple intersection name forms when querying MCDM
     # 1) Try as-provided
     result = mcdm_service.calculate_safety_score_for_time(
-        intersection=intersection, target_time=time, bin_minutes=bin_minutes
+        intersection=intersection, target_time=time, bin_minutes=bin_minutes, matrix=matrix
     )
 
     # 2) If not found, try reverse lookup (short -> full) if caller provided a short name
@@ -691,7 +921,10 @@ def get_safety_score_at_time(
                     f"Reverse lookup found full name '{full_name}' for '{intersection}'"
                 )
                 result = mcdm_service.calculate_safety_score_for_time(
-                    intersection=full_name, target_time=time, bin_minutes=bin_minutes
+                    intersection=full_name,
+                    target_time=time,
+                    bin_minutes=bin_minutes,
+                    matrix=matrix,
                 )
         except Exception:
             # If reverse lookup fails, keep going
@@ -706,6 +939,7 @@ def get_safety_score_at_time(
                     intersection=normalized_intersection,
                     target_time=time,
                     bin_minutes=bin_minutes,
+                    matrix=matrix,
                 )
         except Exception:
             pass
@@ -721,18 +955,16 @@ def get_safety_score_at_time(
 
     if intersection_list:
         # Use first valid result with crash_intersection_id
-        valid_intersection = next(
-            (
-                item
-                for item in intersection_list
-                if item["crash_intersection_id"] is not None
-            ),
-            intersection_list[0] if intersection_list else None,
-        )
+        valid_intersection = _rt_si_mapping(intersection_list)
 
         if valid_intersection and valid_intersection["crash_intersection_id"]:
             crash_id = valid_intersection["crash_intersection_id"]
             realtime_name = valid_intersection["intersection_name"]
+            rt_data = (
+                prefetched.get("realtime")
+                if prefetched.get("realtime_intersection") == realtime_name
+                else None
+            )
 
             # Calculate RT-SI
             try:
@@ -741,6 +973,7 @@ def get_safety_score_at_time(
                     time,
                     bin_minutes=bin_minutes,
                     realtime_intersection=realtime_name,
+                    rt_data=rt_data,
                 )
 
                 if rt_si_result is not None:
@@ -793,11 +1026,6 @@ def get_safety_score_at_time(
     # Final clamp on safety_index
     result["safety_index"] = max(0.0, min(100.0, result["safety_index"]))
 
-    response_cache.set(
-        cache_key,
-        result,
-        settings.SAFETY_TIME_CACHE_TTL_SECONDS,
-    )
     return result
 
 
@@ -858,10 +1086,125 @@ def get_safety_score_trend(
         round(alpha, 4),
         include_correlations,
     )
-    hit, cached = response_cache.get(cache_key, settings.SAFETY_TIME_CACHE_TTL_SECONDS)
-    if hit:
-        return cached
+    return response_cache.get_or_compute(
+        cache_key,
+        settings.SAFETY_TIME_CACHE_TTL_SECONDS,
+        lambda: _compute_safety_score_trend(
+            intersection, start_time, end_time, bin_minutes, alpha, include_correlations
+        ),
+    )
+
+
+def _compute_safety_score_trend(
+    intersection: str,
+    start_time: datetime,
+    end_time: datetime,
+    bin_minutes: int,
+    alpha: float,
+    include_correlations: bool,
+) -> dict:
+    """Uncached body of get_safety_score_trend (computed once per cache key)."""
+    if (TREND_CHUNK // timedelta(minutes=1)) % bin_minutes == 0:
+        series = _assemble_trend_series(intersection, start_time, end_time, bin_minutes)
+    else:
+        # Bins would straddle chunk boundaries; compute the range directly
+        series = _compute_trend_series(intersection, start_time, end_time, bin_minutes)
+
+    if not series:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data available for intersection '{intersection}' in the specified time range",
+        )
+
+    # Chunk rows may be shared cache entries: blend into copies
+    results = [_blend_trend_point(dict(point), alpha) for point in series]
+
+    # Compute correlation analysis if requested and we have enough data
+    correlation_analysis = None
+    if include_correlations and len(results) >= 3:
+        try:
+            from app.services.correlation_service import CorrelationAnalysisService
+
+            correlation_service = CorrelationAnalysisService()
+            correlation_analysis = correlation_service.compute_correlations(results)
+            logger.info("Correlation analysis completed successfully")
+        except Exception as e:
+            logger.error(f"Error computing correlations: {e}", exc_info=True)
+            # Don't fail the request if correlation analysis fails
+            correlation_analysis = {"error": str(e)}
+
+    payload = {
+        "time_series": results,
+        "correlation_analysis": correlation_analysis,
+        "metadata": {
+            "intersection": intersection,
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "bin_minutes": bin_minutes,
+            "data_points": len(results),
+        },
+    }
+    return payload
+
+
+def _assemble_trend_series(
+    intersection: str, start_time: datetime, end_time: datetime, bin_minutes: int
+) -> list:
+    """
+    Trend series for [start_time, end_time) stitched from per-day chunks.
+
+    Each chunk covers one TREND_CHUNK-aligned day of (intersection,
+    bin_minutes) and is cached on its own, so a range that slides or
+    overlaps an earlier one only computes the days it has not seen.
+    """
+    chunk_start = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    series = []
+    while chunk_start < end_time:
+        for point in _trend_chunk(intersection, chunk_start, bin_minutes):
+            time_bin = datetime.fromisoformat(point["time_bin"])
+            if start_time <= time_bin < end_time:
+                series.append(point)
+        chunk_start += TREND_CHUNK
+    return series
+
+
+def _trend_chunk(intersection: str, chunk_start: datetime, bin_minutes: int) -> list:
+    """Cached unblended trend series for one chunk, time bins as ISO strings."""
+    chunk_end = chunk_start + TREND_CHUNK
+    # Recent chunks can still receive data; settled ones change only on backfill
+    settled = chunk_end + TREND_CHUNK_SETTLE <= datetime.now(chunk_start.tzinfo)
+    ttl = (
+        settings.SAFETY_TREND_CHUNK_TTL_SECONDS
+        if settled
+        else settings.SAFETY_TIME_CACHE_TTL_SECONDS
+    )
+    cache_key = response_cache.make_key(
+        "safety-trend-chunk",
+        normalize_intersection_name(intersection),
+        chunk_start.isoformat(),
+        bin_minutes,
+    )
+    # Encoded up front so a fresh computation and a cache hit look the same.
+    # Empty chunks (days without data) are cached too; an unsettled one only
+    # for the short TTL, so data arriving later still shows up.
+    return response_cache.get_or_compute(
+        cache_key,
+        ttl,
+        lambda: jsonable_encoder(
+            _compute_trend_series(intersection, chunk_start, chunk_end, bin_minutes)
+        ),
+        cache_empty=True,
+    )
 
+
+def _compute_trend_series(
+    intersection: str, start_time: datetime, end_time: datetime, bin_minutes: int
+) -> list:
+    """
+    MCDM trend for [start_time, end_time) with RT-SI components merged into
+    matching time bins. Values are clamped to [0, 100] but not blended, so
+    the series is independent of alpha.
+    """
     db_client = get_db_client()
     mcdm_service = MCDMSafetyIndexService(db_client)
     rt_si_service = RTSIService(db_client)
@@ -877,14 +1220,9 @@ def get_safety_score_trend(
 
         # Clamp all MCDM values immediately to handle floating-point errors
         for result in results:
-            if "mcdm_index" in result and result["mcdm_index"] is not None:
-                result["mcdm_index"] = max(0.0, min(100.0, result["mcdm_index"]))
-            if "saw_score" in result and result["saw_score"] is not None:
-                result["saw_score"] = max(0.0, min(100.0, result["saw_score"]))
-            if "edas_score" in result and result["edas_score"] is not None:
-                result["edas_score"] = max(0.0, min(100.0, result["edas_score"]))
-            if "codas_score" in result and result["codas_score"] is not None:
-                result["codas_score"] = max(0.0, min(100.0, result["codas_score"]))
+            for key in ("mcdm_index", "saw_score", "edas_score", "codas_score"):
+                if result.get(key) is not None:
+                    result[key] = max(0.0, min(100.0, result[key]))
 
     except Exception as e:
         logger.error(f"Error calculating MCDM trend: {e}", exc_info=True)
@@ -894,174 +1232,108 @@ def get_safety_score_trend(
         )
 
     if not results:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No data available for intersection '{intersection}' in the specified time range",
-        )
+        return []
 
     # Find corresponding crash intersections for RT-SI
     intersection_list = find_crash_intersection_for_bsm(intersection, db_client)
+    valid_intersection = next(
+        (item for item in intersection_list if item["crash_intersection_id"] is not None),
+        None,
+    )
+    if valid_intersection is None:
+        logger.warning(f"No valid crash intersection found for '{intersection}'")
+        return results
 
-    if intersection_list:
-        # Use first valid result with crash_intersection_id
-        valid_intersection = next(
-            (
-                item
-                for item in intersection_list
-                if item["crash_intersection_id"] is not None
-            ),
-            intersection_list[0] if intersection_list else None,
+    crash_id = valid_intersection["crash_intersection_id"]
+    realtime_name = valid_intersection["intersection_name"]
+
+    try:
+        # Calculate RT-SI trend using optimized method
+        logger.info(
+            f"Calculating RT-SI trend for {intersection} "
+            f"(crash ID: {crash_id}, Source: {valid_intersection['source']}) from {start_time} to {end_time}"
         )
 
-        if valid_intersection and valid_intersection["crash_intersection_id"]:
-            crash_id = valid_intersection["crash_intersection_id"]
-            realtime_name = valid_intersection["intersection_name"]
+        rt_si_columns = rt_si_service.calculate_rt_si_trend_columns(
+            crash_id,
+            start_time,
+            end_time,
+            bin_minutes=bin_minutes,
+            realtime_intersection=realtime_name,
+        )
+        rt_si_timestamps = rt_si_columns["timestamp"]
 
-            try:
-                # Calculate RT-SI trend using optimized method
-                logger.info(
-                    f"Calculating RT-SI trend for {intersection} "
-                    f"(crash ID: {crash_id}, Source: {valid_intersection['source']}) from {start_time} to {end_time}"
-                )
+        if not rt_si_timestamps:
+            logger.warning(
+                f"No RT-SI results returned for {intersection} from {start_time} to {end_time}. "
+                f"This may indicate no BSM data available for this time range."
+            )
 
-                rt_si_results = rt_si_service.calculate_rt_si_trend(
-                    crash_id,
-                    start_time,
-                    end_time,
-                    bin_minutes=bin_minutes,
-                    realtime_intersection=realtime_name,
-                )
+        # Map timestamp -> row position in the columnar RT-SI result;
+        # per-bin values are read straight from the arrays.
+        rt_si_rows = {t: i for i, t in enumerate(rt_si_timestamps)}
+        rt_si_values = {
+            key: rt_si_columns[key].tolist()
+            for key in (
+                "RT_SI",
+                "VRU_index",
+                "VEH_index",
+                "F_speed",
+                "F_variance",
+                "F_conflict",
+                "uplift_factor",
+            )
+        }
 
-                if not rt_si_results:
-                    logger.warning(
-                        f"No RT-SI results returned for {intersection} from {start_time} to {end_time}. "
-                        f"This may indicate no BSM data available for this time range."
-                    )
+        # Add RT-SI data to matching MCDM time points
+        for result in results:
+            row = rt_si_rows.get(result["time_bin"])
+            if row is None:
+                # No RT-SI data for this time bin - leave as None
+                result["rt_si_score"] = None
+                continue
+            result["rt_si_score"] = max(0.0, min(100.0, rt_si_values["RT_SI"][row]))
+            result["vru_index"] = max(0.0, min(100.0, rt_si_values["VRU_index"][row]))
+            result["vehicle_index"] = max(0.0, min(100.0, rt_si_values["VEH_index"][row]))
+            result["raw_crash_rate"] = rt_si_columns["raw_crash_rate"]
+            result["eb_crash_rate"] = rt_si_columns["eb_crash_rate"]
+            # Add uplift factors for correlation analysis
+            result["F_speed"] = rt_si_values["F_speed"][row]
+            result["F_variance"] = rt_si_values["F_variance"][row]
+            result["F_conflict"] = rt_si_values["F_conflict"][row]
+            result["uplift_factor"] = rt_si_values["uplift_factor"][row]
 
-                # Create a map of timestamp -> RT-SI result for quick lookup
-                rt_si_map = {
-                    datetime.fromisoformat(r["timestamp"]): r for r in rt_si_results
-                }
-
-                # Add RT-SI data to matching MCDM time points and calculate blended scores
-                for result in results:
-                    time_bin = result["time_bin"]
-                    rt_si_value = 0.0
-                    mcdm_value = result.get("mcdm_index", 0.0) or 0.0
-
-                    # Clamp MCDM value to [0, 100] to handle floating-point errors
-                    mcdm_value = max(0.0, min(100.0, mcdm_value))
-                    result["mcdm_index"] = mcdm_value
-
-                    if time_bin in rt_si_map:
-                        rt_si_data = rt_si_map[time_bin]
-                        rt_si_value = rt_si_data["RT_SI"]
-                        # Clamp RT-SI to [0, 100]
-                        rt_si_value = max(0.0, min(100.0, rt_si_value))
-                        result["rt_si_score"] = rt_si_value
-                        result["vru_index"] = max(
-                            0.0, min(100.0, rt_si_data["VRU_index"])
-                        )
-                        result["vehicle_index"] = max(
-                            0.0, min(100.0, rt_si_data["VEH_index"])
-                        )
-                        result["raw_crash_rate"] = rt_si_data["raw_crash_rate"]
-                        result["eb_crash_rate"] = rt_si_data["eb_crash_rate"]
-                    else:
-                        # No RT-SI data for this time bin - leave as None
-                        result["rt_si_score"] = None
-                        logger.debug(f"No RT-SI data for time bin {time_bin}")
-
-                    # Calculate blended safety index
-                    if rt_si_value > 0 and mcdm_value > 0:
-                        result["safety_index"] = (
-                            alpha * rt_si_value + (1 - alpha) * mcdm_value
-                        )
-                        result["index_type"] = "Hybrid"
-                    elif rt_si_value > 0:
-                        result["safety_index"] = rt_si_value
-                        result["index_type"] = "RT-SI-Full"
-                    elif mcdm_value > 0:
-                        result["safety_index"] = mcdm_value
-                        result["index_type"] = "Blended"  # Still using blending formula
-                    else:
-                        result["safety_index"] = 0.0
-                        result["index_type"] = "No Data"
-
-                    # Final clamp on safety_index to ensure it's within [0, 100]
-                    result["safety_index"] = max(
-                        0.0, min(100.0, result["safety_index"])
-                    )
+        logger.info(
+            f"Merged RT-SI into trend: {len(results)} MCDM points, "
+            f"{len(rt_si_timestamps)} RT-SI points"
+        )
 
-                # Add RT-SI component data for correlation analysis
-                for result in results:
-                    time_bin = result["time_bin"]
-                    if time_bin in rt_si_map:
-                        rt_si_data = rt_si_map[time_bin]
-                        # Add uplift factors for correlation analysis
-                        result["F_speed"] = rt_si_data.get("F_speed")
-                        result["F_variance"] = rt_si_data.get("F_variance")
-                        result["F_conflict"] = rt_si_data.get("F_conflict")
-                        result["uplift_factor"] = rt_si_data.get("uplift_factor")
+    except Exception as e:
+        # Serve MCDM-only points rather than failing the request
+        logger.error(f"Error calculating RT-SI trend: {e}", exc_info=True)
 
-                logger.info(
-                    f"Successfully calculated safety scores: {len(results)} MCDM points, "
-                    f"{len(rt_si_results)} RT-SI points, blended with alpha={alpha}"
-                )
+    return results
 
-            except Exception as e:
-                logger.error(f"Error calculating RT-SI trend: {e}", exc_info=True)
-                # Ensure all results have safety_index and index_type even if RT-SI fails
-                for result in results:
-                    if "safety_index" not in result:
-                        mcdm_value = result.get("mcdm_index", 0.0) or 0.0
-                        result["safety_index"] = mcdm_value
-                        result["index_type"] = (
-                            "Blended" if mcdm_value > 0 else "No Data"
-                        )
-        else:
-            logger.warning(f"No valid crash intersection found for '{intersection}'")
-            # Ensure all results have safety_index and index_type
-            for result in results:
-                mcdm_value = result.get("mcdm_index", 0.0) or 0.0
-                result["safety_index"] = mcdm_value
-                result["index_type"] = "Blended" if mcdm_value > 0 else "No Data"
-    else:
-        logger.warning(f"No crash intersection found for '{intersection}'")
-        # Ensure all results have safety_index and index_type
-        for result in results:
-            mcdm_value = result.get("mcdm_index", 0.0) or 0.0
-            result["safety_index"] = mcdm_value
-            result["index_type"] = "Blended" if mcdm_value > 0 else "No Data"
 
-    # Compute correlation analysis if requested and we have enough data
-    correlation_analysis = None
-    if include_correlations and len(results) >= 3:
-        try:
-            from app.services.correlation_service import CorrelationAnalysisService
+def _blend_trend_point(result: dict, alpha: float) -> dict:
+    """Set safety_index / index_type on one trend point: α×RT-SI + (1-α)×MCDM."""
+    rt_si_value = result.get("rt_si_score") or 0.0
+    mcdm_value = result.get("mcdm_index", 0.0) or 0.0
+    result["mcdm_index"] = mcdm_value
 
-            correlation_service = CorrelationAnalysisService()
-            correlation_analysis = correlation_service.compute_correlations(results)
-            logger.info("Correlation analysis completed successfully")
-        except Exception as e:
-            logger.error(f"Error computing correlations: {e}", exc_info=True)
-            # Don't fail the request if correlation analysis fails
-            correlation_analysis = {"error": str(e)}
+    if rt_si_value > 0 and mcdm_value > 0:
+        result["safety_index"] = alpha * rt_si_value + (1 - alpha) * mcdm_value
+        result["index_type"] = "Hybrid"
+    elif rt_si_value > 0:
+        result["safety_index"] = rt_si_value
+        result["index_type"] = "RT-SI-Full"
+    elif mcdm_value > 0:
+        result["safety_index"] = mcdm_value
+        result["index_type"] = "Blended"  # Still using blending formula
+    else:
+        result["safety_index"] = 0.0
+        result["index_type"] = "No Data"
 
-    payload = {
-        "time_series": results,
-        "correlation_analysis": correlation_analysis,
-        "metadata": {
-            "intersection": intersection,
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
-            "bin_minutes": bin_minutes,
-            "data_points": len(results),
-        },
-    }
-    response_cache.set(
-        cache_key,
-        payload,
-        settings.SAFETY_TIME_CACHE_TTL_SECONDS,
-    )
-    return payload
+    # Final clamp on safety_index to ensure it's within [0, 100]
+    result["safety_index"] = max(0.0, min(100.0, result["safety_index"]))
+    return result
@@ -9,12 +9,20 @@ Caching a whole response for a few minutes turns a multi-minute endpoint into
 a sub-second one for all but the first request.
 
 The clock is injectable so TTL expiry can be tested deterministically.
+
+MemoryCache is the bounded variant used as ResponseCache's in-process tier:
+one LRU ordered store with per-entry expiry, a byte budget computed from
+estimated payload sizes, periodic expiry sweeps and hit/miss/eviction
+counters.
 """
 
 from __future__ import annotations
 
+import json
+import sys
 import threading
 import time
+from collections import OrderedDict
 from typing import Any, Callable, Hashable
 
 
@@ -56,3 +64,133 @@ class TTLCache:
         """Drop every cached entry."""
         with self._lock:
             self._store.clear()
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory cost of a JSON-compatible payload, in bytes."""
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class MemoryCache:
+    """
+    A size-bounded LRU cache whose entries carry their own TTL.
+
+    Inserting beyond ``max_bytes`` evicts least-recently-used entries;
+    expired entries are dropped on access and by a sweep that runs at most
+    every ``sweep_interval`` seconds, so keys that are never read again do
+    not accumulate.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._sweep_interval = sweep_interval
+        self._clock = clock
+        # key -> (expires_at, size, value), least recently used first
+        self._store: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._next_sweep = clock() + sweep_interval
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return ``(hit, value)`` and mark the entry most recently used."""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, size, value = entry
+            if self._clock() >= expires_at:
+                self._drop(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._store.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float, size: int | None = None) -> bool:
+        """
+        Store ``value`` for ``ttl_seconds``. Returns False (storing nothing)
+        when the payload alone exceeds the byte budget.
+        """
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            old = self._store.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self._max_bytes or ttl_seconds <= 0:
+                return False
+
+            now = self._clock()
+            if now >= self._next_sweep:
+                self._sweep(now)
+            while self._store and self._bytes + size > self._max_bytes:
+                lru_key, (_, lru_size, _) = next(iter(self._store.items()))
+                self._drop(lru_key, lru_size)
+                self.evictions += 1
+            self._store[key] = (now + ttl_seconds, size, value)
+            self._bytes += size
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None:
+                self._drop(key, entry[1])
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Drop every string key starting with ``prefix``."""
+        with self._lock:
+            keys = [k for k in self._store if isinstance(k, str) and k.startswith(prefix)]
+            for key in keys:
+                self._drop(key, self._store[key][1])
+            return len(keys)
+
+    def sweep(self) -> int:
+        """Drop all expired entries now; returns how many were dropped."""
+        with self._lock:
+            return self._sweep(self._clock())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._store),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _drop(self, key: Hashable, size: int) -> None:
+        del self._store[key]
+        self._bytes -= size
+
+    def _sweep(self, now: float) -> int:
+        expired = [(k, e[1]) for k, e in self._store.items() if now >= e[0]]
+        for key, size in expired:
+            self._drop(key, size)
+        self.expirations += len(expired)
+        self._next_sweep = now + self._sweep_interval
+        return len(expired)
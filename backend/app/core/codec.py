@@ -0,0 +1,127 @@
+"""
+Cached payload codecs.
+
+ResponseCache stores jsonable_encoder output in Redis. Encoding it with the
+standard json module and parsing it back on every hit is a measurable part
+of warm latency for large responses (trend series with correlation
+analysis), and the text is bulky on the wire.
+
+PayloadCodec turns a JSON-compatible payload into bytes with a pluggable
+serializer (orjson, msgpack or stdlib json) and compresses it with zlib or
+zstd when it exceeds a size threshold. Every blob starts with a one-byte
+header naming its compression, and ``tag`` (serializer, compression and
+format version) goes into cache keys, so entries written with another codec
+are simply misses rather than misreads.
+
+orjson, msgpack and zstandard are optional; an unavailable choice falls
+back to json / zlib with a warning. See scripts/benchmark_cache_codec.py
+for size and speed comparisons.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import zlib
+from typing import Any, Callable
+
+try:
+    import orjson
+except ModuleNotFoundError:  # Optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ModuleNotFoundError:  # Optional dependency
+    msgpack = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ModuleNotFoundError:  # Optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Bump when the blob layout changes so old cache entries stop matching
+FORMAT_VERSION = 1
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+_ZSTD = b"\x02"
+
+
+def _json_dumps(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+SERIALIZERS: dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]] | None] = {
+    "json": (_json_dumps, json.loads),
+    "orjson": (orjson.dumps, orjson.loads) if orjson is not None else None,
+    "msgpack": (
+        (lambda p: msgpack.packb(p, use_bin_type=True), lambda b: msgpack.unpackb(b, raw=False))
+        if msgpack is not None
+        else None
+    ),
+}
+
+COMPRESSIONS = ("none", "zlib", "zstd")
+
+
+class PayloadCodec:
+    """Serialize and optionally compress JSON-compatible payloads to bytes."""
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "zstd",
+        compress_min_bytes: int = 16384,
+        level: int = 3,
+    ) -> None:
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer {serializer!r}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression {compression!r}")
+        if SERIALIZERS[serializer] is None:
+            logger.warning("%s is not installed; cache codec falls back to json", serializer)
+            serializer = "json"
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed; cache codec falls back to zlib")
+            compression = "zlib"
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self.level = level
+        self._dumps, self._loads = SERIALIZERS[serializer]  # type: ignore[misc]
+        self._zstd_c = zstandard.ZstdCompressor(level=level) if compression == "zstd" else None
+        self._zstd_d = zstandard.ZstdDecompressor() if compression == "zstd" else None
+
+    @property
+    def tag(self) -> str:
+        """Identifies the blob format; part of every cache key."""
+        return f"v{FORMAT_VERSION}.{self.serializer}.{self.compression}"
+
+    def encode(self, payload: Any) -> tuple[bytes, int]:
+        """Return ``(blob, serialized_size)``; the size is before compression."""
+        raw = self._dumps(payload)
+        if self.compression == "none" or len(raw) < self.compress_min_bytes:
+            return _RAW + raw, len(raw)
+        if self.compression == "zstd":
+            return _ZSTD + self._zstd_c.compress(raw), len(raw)
+        return _ZLIB + zlib.compress(raw, self.level), len(raw)
+
+    def decode(self, blob: bytes) -> Any:
+        return self.decode_sized(blob)[0]
+
+    def decode_sized(self, blob: bytes) -> tuple[Any, int]:
+        """Return ``(payload, serialized_size)`` for a blob made by encode()."""
+        header, body = blob[:1], blob[1:]
+        if header == _ZLIB:
+            body = zlib.decompress(body)
+        elif header == _ZSTD:
+            if self._zstd_d is None:
+                raise ValueError("zstd-compressed cache entry but zstandard is unavailable")
+            body = self._zstd_d.decompress(body)
+        elif header != _RAW:
+            raise ValueError(f"Unknown cache blob header {header!r}")
+        return self._loads(body), len(body)
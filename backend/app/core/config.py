@@ -50,16 +50,61 @@ class Settings(BaseSettings):
         env="CACHE_KEY_PREFIX",
         description="Prefix for Redis cache keys",
     )
-    SAFETY_INDEX_CACHE_TTL_SECONDS: int = Field(
+    CACHE_MEMORY_MAX_MB: int = Field(
+        64,
+        env="CACHE_MEMORY_MAX_MB",
+        description="Byte budget of the in-process response cache tier (LRU eviction beyond it)",
+    )
+    CACHE_L1_TTL_SECONDS: int = Field(
+        5,
+        env="CACHE_L1_TTL_SECONDS",
+        description="How long Redis values are also kept in process memory (0 disables the L1)",
+    )
+    CACHE_CODEC: str = Field(
+        "orjson",
+        env="CACHE_CODEC",
+        description="Serializer for Redis cache values: orjson, msgpack or json (falls back to json if not installed)",
+    )
+    CACHE_COMPRESSION: str = Field(
+        "zstd",
+        env="CACHE_COMPRESSION",
+        description="Compression for large Redis cache values: zstd, zlib or none (zstd falls back to zlib if not installed)",
+    )
+    CACHE_COMPRESS_MIN_BYTES: int = Field(
+        16384,
+        env="CACHE_COMPRESS_MIN_BYTES",
+        description="Serialized size above which Redis cache values are compressed",
+    )
+    CACHE_SINGLE_FLIGHT_WAIT_SECONDS: int = Field(
+        120,
+        env="CACHE_SINGLE_FLIGHT_WAIT_SECONDS",
+        description="Longest a request waits for another caller computing the same cache key",
+    )
+    CACHE_LEASE_SECONDS: int = Field(
         300,
-        env="SAFETY_INDEX_CACHE_TTL_SECONDS",
-        description="TTL for latest safety index responses",
+        env="CACHE_LEASE_SECONDS",
+        description="Expiry of the Redis lease held while one worker computes a cache key",
+    )
+    SAFETY_INDEX_SNAPSHOT_REFRESH_SECONDS: int = Field(
+        900,
+        env="SAFETY_INDEX_SNAPSHOT_REFRESH_SECONDS",
+        description="Background recompute interval for the safety index list snapshot (0 disables it; the list then answers 503)",
+    )
+    SAFETY_INDEX_SNAPSHOT_COLD_WAIT_SECONDS: int = Field(
+        30,
+        env="SAFETY_INDEX_SNAPSHOT_COLD_WAIT_SECONDS",
+        description="How long a request waits for a snapshot that is not computed yet before returning 503",
     )
     SAFETY_TIME_CACHE_TTL_SECONDS: int = Field(
         900,
         env="SAFETY_TIME_CACHE_TTL_SECONDS",
         description="TTL for historical safety time queries",
     )
+    SAFETY_TREND_CHUNK_TTL_SECONDS: int = Field(
+        86400,
+        env="SAFETY_TREND_CHUNK_TTL_SECONDS",
+        description="TTL for per-day trend chunks that no longer receive data; recent chunks use SAFETY_TIME_CACHE_TTL_SECONDS",
+    )
     ANALYTICS_CACHE_TTL_SECONDS: int = Field(
         900,
         env="ANALYTICS_CACHE_TTL_SECONDS",
@@ -75,6 +120,16 @@ class Settings(BaseSettings):
         env="DB_EXPLORER_CACHE_TTL_SECONDS",
         description="TTL for database explorer read responses",
     )
+    DB_EXPLORER_CATALOG_TTL_SECONDS: int = Field(
+        600,
+        env="DB_EXPLORER_CATALOG_TTL_SECONDS",
+        description="How long the database explorer keeps its table and column catalog",
+    )
+    DB_EXPLORER_EXPORT_BATCH_ROWS: int = Field(
+        5000,
+        env="DB_EXPLORER_EXPORT_BATCH_ROWS",
+        description="Rows fetched per server-side cursor batch when exporting a table",
+    )
     VCC_CACHE_TTL_SECONDS: int = Field(
         60,
         env="VCC_CACHE_TTL_SECONDS",
@@ -86,6 +141,52 @@ class Settings(BaseSettings):
         description="TTL for debug and diagnostic read responses",
     )
 
+    # Intersection registry (in-process catalog of intersection mappings)
+    INTERSECTION_REGISTRY_REFRESH_SECONDS: int = Field(
+        3600,
+        env="INTERSECTION_REGISTRY_REFRESH_SECONDS",
+        description="Background refresh interval for the intersection registry (0 disables it)",
+    )
+
+    # Precomputed crash-rate / Empirical Bayes baseline for RT-SI
+    CRASH_BASELINE_PATH: str = Field(
+        "",
+        env="CRASH_BASELINE_PATH",
+        description="Parquet file for the crash baseline (default: <PARQUET_STORAGE_PATH>/constants/crash_baseline.parquet)",
+    )
+    CRASH_BASELINE_MAX_AGE_DAYS: int = Field(
+        30,
+        env="CRASH_BASELINE_MAX_AGE_DAYS",
+        description="Rebuild the persisted crash baseline when older than this",
+    )
+    CRASH_BASELINE_RETRY_SECONDS: int = Field(
+        60,
+        env="CRASH_BASELINE_RETRY_SECONDS",
+        description="First retry delay after a failed crash baseline load or build; doubles up to an hour",
+    )
+
+    # Per-intersection vehicle-count sketches for the RT-SI capacity term
+    CAPACITY_SKETCH_PATH: str = Field(
+        "",
+        env="CAPACITY_SKETCH_PATH",
+        description="Parquet file for the capacity sketch (default: <PARQUET_STORAGE_PATH>/constants/capacity_sketch.parquet)",
+    )
+    CAPACITY_SKETCH_RETENTION_DAYS: int = Field(
+        30,
+        env="CAPACITY_SKETCH_RETENTION_DAYS",
+        description="Days of vehicle-count history kept in the capacity sketch",
+    )
+    CAPACITY_SKETCH_RESCAN_DAYS: int = Field(
+        2,
+        env="CAPACITY_SKETCH_RESCAN_DAYS",
+        description="Trailing UTC days rebuilt from scratch on every sketch refresh, so late vehicle-count rows are counted",
+    )
+    CAPACITY_SKETCH_REFRESH_SECONDS: int = Field(
+        300,
+        env="CAPACITY_SKETCH_REFRESH_SECONDS",
+        description="Interval for folding new vehicle-count rows into the sketch (0 disables it)",
+    )
+
     # Trino database configuration
     TRINO_HOST: str = "smart-cities-trino.pre-prod.cloud.vtti.vt.edu"
     TRINO_PORT: int = 443
@@ -104,6 +205,31 @@ class Settings(BaseSettings):
     # For local development: use VTTI_DB_HOST and VTTI_DB_PORT
     # For Cloud Run: use VTTI_DB_INSTANCE_CONNECTION_NAME (Unix socket)
     VTTI_DB_NAME: str = "vtsi"
+    VTTI_DB_POOL_WAIT_SECONDS: float = Field(
+        30.0,
+        env="VTTI_DB_POOL_WAIT_SECONDS",
+        description="How long a query waits for a free pooled connection before failing",
+    )
+    VTTI_DB_QUERY_DEADLINE_SECONDS: float = Field(
+        60.0,
+        env="VTTI_DB_QUERY_DEADLINE_SECONDS",
+        description="Overall deadline for a concurrent query batch; queries still running are cancelled",
+    )
+    VTTI_DB_PREPARE_THRESHOLD: int = Field(
+        3,
+        env="VTTI_DB_PREPARE_THRESHOLD",
+        description="Executions of the same read statement before it is prepared server-side (0 disables)",
+    )
+    VTTI_DB_PREPARED_STATEMENTS: int = Field(
+        64,
+        env="VTTI_DB_PREPARED_STATEMENTS",
+        description="Prepared statements kept per pooled connection (least recently used are deallocated)",
+    )
+    VTTI_DB_QUERY_STATS_MAX_FINGERPRINTS: int = Field(
+        500,
+        env="VTTI_DB_QUERY_STATS_MAX_FINGERPRINTS",
+        description="Distinct query shapes tracked by the query stats; further shapes share one overflow entry",
+    )
 
     # MCDM Safety Index settings
     MCDM_BIN_MINUTES: int = Field(
@@ -113,6 +239,21 @@ class Settings(BaseSettings):
         default=24,
         description="Hours of historical data to use for MCDM CRITIC weights",
     )
+    MCDM_MATRIX_CACHE_MAX_MB: int = Field(
+        256,
+        env="MCDM_MATRIX_CACHE_MAX_MB",
+        description="Memory budget for the shared per-bin MCDM data-matrix store (0 disables it)",
+    )
+    MCDM_MATRIX_SETTLE_SECONDS: int = Field(
+        900,
+        env="MCDM_MATRIX_SETTLE_SECONDS",
+        description="Bins ending less than this long ago are re-queried instead of stored",
+    )
+    MCDM_MATRIX_LATE_TTL_SECONDS: int = Field(
+        900,
+        env="MCDM_MATRIX_LATE_TTL_SECONDS",
+        description="Stored bins within CAPACITY_SKETCH_RESCAN_DAYS of now, which may still receive late rows, are re-queried after this long",
+    )
 
     # OpenAI / SafetyChat configuration
     OPENAI_API_KEY: str = Field(
@@ -0,0 +1,220 @@
+"""
+Intersection Registry
+
+In-process snapshot of the intersection catalog, so request paths resolve
+a BSM/short intersection name without touching the database.
+
+For every row of intersection_details_view the registry holds the same
+record find_crash_intersection_for_bsm builds per request:
+BSM name -> normalized short name -> crash_intersection_id -> coordinates
+-> per-table data presence. The whole catalog is loaded with a fixed
+handful of set-based queries (one per source, not one per intersection),
+swapped in atomically, and refreshed periodically by a background thread
+or on demand.
+"""
+
+import copy
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from psycopg2 import sql
+
+from .intersection_mapping import normalize_intersection_name
+
+logger = logging.getLogger(__name__)
+
+# Tables keyed by full intersection name vs. normalized short name
+# (same split as validate_intersection_in_tables)
+FULL_NAME_TABLES = ["vehicle-count", "vru-count", "speed-distribution"]
+SHORT_NAME_TABLES = ["safety-event"]
+
+
+class IntersectionRegistry:
+    """Thread-safe, periodically refreshed intersection catalog snapshot."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._by_name: Optional[Dict[str, List[Dict]]] = None
+        self._entries = 0
+        self._loaded_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._by_name is not None
+
+    def lookup(self, name: str) -> Optional[List[Dict]]:
+        """
+        Records matching a BSM intersection name or short name
+        (case-insensitive), in the shape returned by
+        find_crash_intersection_for_bsm.
+
+        Returns None while the registry has not been loaded, so callers can
+        fall back to querying the database.
+        """
+        by_name = self._by_name
+        if by_name is None:
+            return None
+        return copy.deepcopy(by_name.get(name.strip().lower(), []))
+
+    def refresh(self, db_client) -> Dict:
+        """Reload the catalog from the database and swap it in."""
+        with self._refresh_lock:
+            try:
+                by_name, entries = self._load(db_client)
+            except Exception as e:
+                self._last_error = str(e)
+                logger.error(f"Intersection registry refresh failed: {e}")
+                raise
+            with self._lock:
+                self._by_name = by_name
+                self._entries = entries
+                self._loaded_at = self._clock()
+                self._last_error = None
+            logger.info(f"Intersection registry loaded {entries} intersection(s)")
+            return self.status()
+
+    def clear(self) -> None:
+        """Forget the snapshot (lookups fall back to the database)."""
+        with self._lock:
+            self._by_name = None
+            self._entries = 0
+            self._loaded_at = None
+
+    def status(self) -> Dict:
+        """Snapshot size and age."""
+        loaded_at = self._loaded_at
+        return {
+            "loaded": self.loaded,
+            "entries": self._entries,
+            "age_seconds": (
+                round(self._clock() - loaded_at, 1) if loaded_at is not None else None
+            ),
+            "last_error": self._last_error,
+        }
+
+    def start_background_refresh(
+        self, client_factory: Callable, interval_seconds: float
+    ) -> None:
+        """
+        Load now and then every ``interval_seconds`` on a daemon thread.
+        Failures are logged and retried on the next tick; the last good
+        snapshot stays in place.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            while True:
+                try:
+                    self.refresh(client_factory())
+                except Exception:
+                    pass  # logged in refresh()
+                if self._stop.wait(interval_seconds):
+                    return
+
+        self._thread = threading.Thread(
+            target=_run, name="intersection-registry-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop_background_refresh(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _load(self, db_client):
+        rows = db_client.execute_query(
+            """
+            SELECT intersection_name, short_name, lat, lon, source
+            FROM public.intersection_details_view;
+            """
+        )
+
+        crash_rows = db_client.execute_query(
+            """
+            SELECT short_name, crash_intersection_id
+            FROM public.crash_intersection_id_with_coord
+            WHERE short_name IS NOT NULL;
+            """
+        )
+        crash_ids: Dict[str, int] = {}
+        for row in crash_rows:
+            crash_ids.setdefault(row["short_name"].lower(), row["crash_intersection_id"])
+
+        records = []
+        for row in rows:
+            if row["lat"] is None or row["lon"] is None:
+                continue
+            full_name = row["intersection_name"]
+            short_name = normalize_intersection_name(full_name)
+            records.append(
+                (
+                    row,
+                    {
+                        "intersection_name": full_name,
+                        "short_name": short_name,
+                        "lat": float(row["lat"]),
+                        "lon": float(row["lon"]),
+                        "crash_intersection_id": crash_ids.get(
+                            (short_name or "").lower()
+                        ),
+                        "source": row["source"],
+                    },
+                )
+            )
+
+        full_names = sorted({r["intersection_name"] for _, r in records if r["intersection_name"]})
+        short_names = sorted({r["short_name"] for _, r in records if r["short_name"]})
+        present = {
+            table: self._names_present(db_client, table, full_names)
+            for table in FULL_NAME_TABLES
+        }
+        present.update(
+            {
+                table: self._names_present(db_client, table, short_names)
+                for table in SHORT_NAME_TABLES
+            }
+        )
+
+        by_name: Dict[str, List[Dict]] = {}
+        for row, record in records:
+            record["valid_in_tables"] = {
+                **{t: record["intersection_name"] in present[t] for t in FULL_NAME_TABLES},
+                **{t: record["short_name"] in present[t] for t in SHORT_NAME_TABLES},
+            }
+            keys = {
+                (row["intersection_name"] or "").lower(),
+                (row["short_name"] or "").lower(),
+            }
+            for key in keys - {""}:
+                by_name.setdefault(key, []).append(record)
+
+        return by_name, len(records)
+
+    @staticmethod
+    def _names_present(db_client, table: str, names: List[str]) -> set:
+        """
+        Which of ``names`` have at least one row in ``table`` (one query).
+        Query errors propagate, so refresh() keeps the previous snapshot
+        instead of publishing one without data presence.
+        """
+        if not names:
+            return set()
+        query = sql.SQL(
+            "SELECT n.name FROM unnest(%(names)s::text[]) AS n(name) "
+            "WHERE EXISTS (SELECT 1 FROM {table} t WHERE t.intersection = n.name)"
+        ).format(table=sql.Identifier(table))
+        return {row["name"] for row in db_client.execute_query(query, {"names": names})}
+
+
+# Global registry instance
+intersection_registry = IntersectionRegistry()
@@ -0,0 +1,297 @@
+"""
+BinnedFrameStore
+================
+A process-wide, bin-aligned store for time-binned aggregate rows.
+
+The MCDM endpoints aggregate the raw count/speed/event tables into a
+(intersection, time_bin) criteria matrix on every call, and overlapping
+windows (latest scores, point-in-time lookups, trends with a day of
+lookback) re-aggregate the same bins again and again. This store keeps the
+aggregated rows per ``(bin_minutes, time_bin)``, fetches only the bins a
+request is missing (as contiguous ranges), and answers every window by
+slicing what it already holds.
+
+Rows are kept columnar (one NumPy array per column per bin). Entries are
+evicted least-recently-used first once the byte budget is exceeded. Bins
+that may still receive data (ending within ``settle_seconds`` of now) are
+always re-fetched and never stored; bins within the late-arrival window
+(ending within ``late_seconds`` of now) are stored but re-fetched after
+``late_ttl_seconds``, so rows that arrive late are picked up.
+
+Bin keys are microseconds since the epoch of the bin start read as UTC
+wall-clock time, the way pandas reads the naive ``time_column`` values, so
+they do not depend on the host time zone. Naive window bounds and "now" are
+local wall-clock times, like ``datetime.now()``.
+
+The clock is injectable so settling can be tested deterministically.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+Block = Dict[str, np.ndarray]
+
+
+def _block_nbytes(block: Block) -> int:
+    """Approximate memory held by one bin's columns."""
+    total = 64
+    for values in block.values():
+        total += values.nbytes
+        if values.dtype == object:
+            total += sum(sys.getsizeof(v) for v in values)
+    return total
+
+
+def _to_us(value: datetime) -> int:
+    """Bin key of a datetime: naive values as UTC, aware ones converted to UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return int(np.datetime64(value, "us").astype(np.int64))
+
+
+def _from_us(value: int, tz=None) -> datetime:
+    """Inverse of _to_us; aware (in ``tz``) when the window bounds were."""
+    stamp = pd.Timestamp(value, unit="us")
+    if tz is not None:
+        stamp = stamp.tz_localize("UTC").tz_convert(tz)
+    return stamp.to_pydatetime()
+
+
+class BinnedFrameStore:
+    """LRU store of per-time-bin columnar rows with a byte budget."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        settle_seconds: float = 900.0,
+        late_seconds: float = 0.0,
+        late_ttl_seconds: float = 900.0,
+        time_column: str = "time_bin",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._settle_seconds = settle_seconds
+        self._late_seconds = late_seconds
+        self._late_ttl_seconds = late_ttl_seconds
+        self._time_column = time_column
+        self._clock = clock
+        # (bin_minutes, bin start) -> (block, size, expiry or None)
+        self._bins: "OrderedDict[Tuple[int, int], Tuple[Block, int, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def slice(
+        self,
+        bin_minutes: int,
+        start: datetime,
+        end: datetime,
+        fetch: Callable[[datetime, datetime], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        Return the rows of every bin overlapping ``[start, end)``.
+
+        ``fetch(range_start, range_end)`` is called once per contiguous run
+        of missing bins, with bin-aligned bounds, and must return a frame
+        whose ``time_column`` holds bin starts as datetimes (or an empty
+        frame). An empty frame is returned when no bin has rows.
+        """
+        bins, blocks, missing, bin_us = self._lookup(bin_minutes, start, end)
+        now_us = _to_us(datetime.fromtimestamp(self._clock(), start.tzinfo))
+        for run_start, run_end in self._contiguous_runs(missing, bin_us):
+            frame = fetch(
+                _from_us(run_start, start.tzinfo), _from_us(run_end, start.tzinfo)
+            )
+            self._fill(bin_minutes, bin_us, run_start, run_end, frame, blocks, now_us)
+        return self._assemble([(b, blocks[b]) for b in bins])
+
+    async def slice_async(
+        self,
+        bin_minutes: int,
+        start: datetime,
+        end: datetime,
+        fetch: Callable[[datetime, datetime], Awaitable[pd.DataFrame]],
+    ) -> pd.DataFrame:
+        """slice() with an async ``fetch``; missing runs are fetched concurrently."""
+        bins, blocks, missing, bin_us = self._lookup(bin_minutes, start, end)
+        now_us = _to_us(datetime.fromtimestamp(self._clock(), start.tzinfo))
+        runs = self._contiguous_runs(missing, bin_us)
+        frames = await asyncio.gather(
+            *(
+                fetch(
+                    _from_us(run_start, start.tzinfo), _from_us(run_end, start.tzinfo)
+                )
+                for run_start, run_end in runs
+            )
+        )
+        for (run_start, run_end), frame in zip(runs, frames):
+            self._fill(bin_minutes, bin_us, run_start, run_end, frame, blocks, now_us)
+        return self._assemble([(b, blocks[b]) for b in bins])
+
+    def _lookup(
+        self, bin_minutes: int, start: datetime, end: datetime
+    ) -> Tuple[List[int], Dict[int, Block], List[int], int]:
+        """Bins overlapping ``[start, end)``, the stored blocks among them and the missing ones."""
+        bin_us = bin_minutes * 60 * 1_000_000
+        start_us = _to_us(start)
+        end_us = _to_us(end)
+        bins = list(range((start_us // bin_us) * bin_us, end_us, bin_us))
+
+        blocks: Dict[int, Block] = {}
+        missing: List[int] = []
+        now = self._clock()
+        with self._lock:
+            for bin_start in bins:
+                entry = self._bins.get((bin_minutes, bin_start))
+                if entry is not None and entry[2] is not None and entry[2] <= now:
+                    self._bins.pop((bin_minutes, bin_start))
+                    self._bytes -= entry[1]
+                    entry = None
+                if entry is None:
+                    missing.append(bin_start)
+                else:
+                    self._bins.move_to_end((bin_minutes, bin_start))
+                    blocks[bin_start] = entry[0]
+            self.hits += len(bins) - len(missing)
+            self.misses += len(missing)
+        return bins, blocks, missing, bin_us
+
+    def _fill(
+        self,
+        bin_minutes: int,
+        bin_us: int,
+        run_start: int,
+        run_end: int,
+        frame: pd.DataFrame,
+        blocks: Dict[int, Block],
+        now_us: int,
+    ) -> None:
+        """
+        Record a fetched run in ``blocks`` and store the bins that have
+        settled, with an expiry for those still in the late-arrival window.
+        """
+        fetched = self._split_by_bin(frame)
+        settled_before_us = now_us - int(self._settle_seconds * 1_000_000)
+        late_before_us = now_us - int(self._late_seconds * 1_000_000)
+        late_expiry = self._clock() + self._late_ttl_seconds
+        for bin_start in range(run_start, run_end, bin_us):
+            block = fetched.get(bin_start, {})
+            blocks[bin_start] = block
+            bin_end = bin_start + bin_us
+            if bin_end <= settled_before_us:
+                expiry = None if bin_end <= late_before_us else late_expiry
+                self._put((bin_minutes, bin_start), block, expiry)
+
+    def clear(self) -> None:
+        """Drop every stored bin."""
+        with self._lock:
+            self._bins.clear()
+            self._bytes = 0
+
+    def status(self) -> Dict[str, int]:
+        """Current size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "bins": len(self._bins),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _put(self, key: Tuple[int, int], block: Block, expiry: Optional[float]) -> None:
+        if self._max_bytes <= 0:
+            return
+        size = _block_nbytes(block)
+        with self._lock:
+            previous = self._bins.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._bins[key] = (block, size, expiry)
+            self._bytes += size
+            while self._bytes > self._max_bytes and self._bins:
+                _, (_, evicted_size, _) = self._bins.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    @staticmethod
+    def _contiguous_runs(missing: List[int], bin_us: int) -> List[Tuple[int, int]]:
+        """Group sorted bin starts into ``(run_start, run_end)`` ranges."""
+        runs: List[Tuple[int, int]] = []
+        for bin_start in missing:
+            if runs and runs[-1][1] == bin_start:
+                runs[-1] = (runs[-1][0], bin_start + bin_us)
+            else:
+                runs.append((bin_start, bin_start + bin_us))
+        return runs
+
+    def _split_by_bin(self, frame: pd.DataFrame) -> Dict[int, Block]:
+        """Split a fetched frame into per-bin column arrays keyed by bin start."""
+        if frame is None or len(frame) == 0:
+            return {}
+        codes = (
+            pd.to_datetime(frame[self._time_column])
+            .to_numpy()
+            .astype("datetime64[us]")
+            .astype(np.int64)
+        )
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        columns = {
+            name: frame[name].to_numpy()[order]
+            for name in frame.columns
+            if name != self._time_column
+        }
+        starts, offsets = np.unique(codes, return_index=True)
+        bounds = list(offsets[1:]) + [len(codes)]
+        return {
+            int(bin_start): {
+                name: values[lo:hi].copy() for name, values in columns.items()
+            }
+            for bin_start, lo, hi in zip(starts, offsets, bounds)
+        }
+
+    def _assemble(self, blocks: List[Tuple[int, Block]]) -> pd.DataFrame:
+        """Concatenate per-bin blocks into one frame; absent columns fill with 0."""
+        blocks = [(b, block) for b, block in blocks if block]
+        if not blocks:
+            return pd.DataFrame()
+
+        names: List[str] = []
+        for _, block in blocks:
+            names.extend(n for n in block if n not in names)
+
+        lengths = [len(next(iter(block.values()))) for _, block in blocks]
+        data = {
+            name: np.concatenate(
+                [
+                    block[name] if name in block else np.zeros(n)
+                    for (_, block), n in zip(blocks, lengths)
+                ]
+            )
+            for name in names
+        }
+        frame = pd.DataFrame(data)
+        frame.insert(
+            1 if names else 0,
+            self._time_column,
+            pd.to_datetime(
+                np.repeat([b for b, _ in blocks], lengths).astype(np.int64), unit="us"
+            ),
+        )
+        return frame
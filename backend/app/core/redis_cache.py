@@ -4,6 +4,20 @@ Redis-backed response cache with in-process fallback.
 The API has several expensive read endpoints whose inputs are small and whose
 results are stable for minutes at a time. This module keeps cache integration
 out of endpoint bodies and degrades to local memory when Redis is not configured.
+
+The in-process tier is a single bounded MemoryCache (LRU, per-entry TTL, byte
+budget). Without Redis it is the cache; with Redis it also serves as an L1
+holding values for at most CACHE_L1_TTL_SECONDS, so hot keys skip the network
+round-trip at the cost of that much cross-worker staleness.
+
+Redis values are bytes produced by PayloadCodec (orjson/msgpack/json with
+optional compression); the codec tag is part of every key.
+
+get_or_compute adds single-flight semantics on a miss: within a process, one
+caller per key computes while the others wait for its result; across uvicorn
+workers, the computing caller holds a short Redis lease on the key and the
+other workers poll the cache until the value appears. All waits are bounded,
+after which the waiter computes the value itself.
 """
 
 from __future__ import annotations
@@ -11,7 +25,11 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
-from typing import Any
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Callable
 
 from fastapi.encoders import jsonable_encoder
 
@@ -24,20 +42,45 @@ except ModuleNotFoundError:  # Local test environments may not install optional
     class RedisError(Exception):
         pass
 
-from .cache import TTLCache
+from .cache import MemoryCache
+from .codec import PayloadCodec
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Delete a lease only if we still own it (it may have expired and been retaken)
+RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class _Flight:
+    """An in-process computation of one key that other callers can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
 
 class ResponseCache:
     """Cache JSON-serializable endpoint responses in Redis or local memory."""
 
     def __init__(self) -> None:
-        self._memory = TTLCache(ttl_seconds=1)
-        self._memory_ttls: dict[str, TTLCache] = {}
+        self._memory = MemoryCache(max_bytes=settings.CACHE_MEMORY_MAX_MB * 1024 * 1024)
+        self._codec = PayloadCodec(
+            settings.CACHE_CODEC,
+            settings.CACHE_COMPRESSION,
+            settings.CACHE_COMPRESS_MIN_BYTES,
+        )
         self._redis: Any | None = None
         self._redis_checked = False
+        self._flights: dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        self._flight_stats = {"computed": 0, "coalesced": 0, "lease_waits": 0, "wait_timeouts": 0}
 
     def _client(self) -> Any | None:
         if not settings.CACHE_ENABLED or not settings.REDIS_URL:
@@ -56,7 +99,7 @@ class ResponseCache:
                 settings.REDIS_URL,
                 socket_connect_timeout=0.2,
                 socket_timeout=0.5,
-                decode_responses=True,
+                decode_responses=False,
             )
             client.ping()
             self._redis = client
@@ -69,23 +112,28 @@ class ResponseCache:
     def make_key(self, namespace: str, *parts: Any) -> str:
         encoded = json.dumps(jsonable_encoder(parts), sort_keys=True, separators=(",", ":"))
         digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
-        return f"{settings.CACHE_KEY_PREFIX}:{namespace}:{digest}"
+        return f"{settings.CACHE_KEY_PREFIX}:{namespace}:{self._codec.tag}:{digest}"
 
     def get(self, key: str, ttl_seconds: int) -> tuple[bool, Any]:
         if not settings.CACHE_ENABLED:
             return False, None
 
+        # Memory holds L1 copies of Redis values and anything Redis failed to store
+        hit, value = self._memory.get(key)
+        if hit:
+            return True, value
+
         client = self._client()
         if client is not None:
             try:
-                raw = client.get(key)
-                if raw is not None:
-                    return True, json.loads(raw)
-            except (RedisError, json.JSONDecodeError) as exc:
+                blob = client.get(key)
+                if blob is not None:
+                    value, size = self._codec.decode_sized(blob)
+                    self._set_l1(key, value, ttl_seconds, size)
+                    return True, value
+            except (RedisError, ValueError, zlib.error) as exc:
                 logger.warning("Redis cache read failed for %s: %s", key, exc)
-
-        memory = self._memory_ttls.setdefault(key, TTLCache(ttl_seconds=ttl_seconds))
-        return memory.get(key)
+        return False, None
 
     def set(self, key: str, value: Any, ttl_seconds: int, *, cache_empty: bool = False) -> None:
         if not settings.CACHE_ENABLED:
@@ -98,23 +146,142 @@ class ResponseCache:
         client = self._client()
         if client is not None:
             try:
-                client.setex(key, ttl_seconds, json.dumps(payload, separators=(",", ":")))
+                blob, size = self._codec.encode(payload)
+                client.setex(key, ttl_seconds, blob)
+                self._set_l1(key, payload, ttl_seconds, size)
                 return
             except (RedisError, TypeError, ValueError) as exc:
                 logger.warning("Redis cache write failed for %s: %s", key, exc)
 
-        memory = self._memory_ttls.setdefault(key, TTLCache(ttl_seconds=ttl_seconds))
-        memory.set(key, payload)
+        self._memory.set(key, payload, ttl_seconds)
+
+    def _set_l1(self, key: str, payload: Any, ttl_seconds: int, size: int) -> None:
+        l1_ttl = min(ttl_seconds, settings.CACHE_L1_TTL_SECONDS)
+        if l1_ttl > 0:
+            self._memory.set(key, payload, l1_ttl, size=size)
+
+    def get_or_compute(
+        self,
+        key: str,
+        ttl_seconds: int,
+        compute: Callable[[], Any],
+        *,
+        cache_empty: bool = False,
+        wait_seconds: float | None = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key``, or compute and cache it with
+        single-flight semantics.
+
+        Concurrent in-process callers for the same key share one ``compute()``
+        (its result or its exception); other workers wait on the Redis lease
+        and reuse the value it produces. A caller that waits longer than
+        ``wait_seconds`` (default CACHE_SINGLE_FLIGHT_WAIT_SECONDS) computes
+        the value itself.
+        """
+        hit, value = self.get(key, ttl_seconds)
+        if hit:
+            return value
+        if not settings.CACHE_ENABLED:
+            return compute()
+
+        wait = settings.CACHE_SINGLE_FLIGHT_WAIT_SECONDS if wait_seconds is None else wait_seconds
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(wait):
+                self._flight_stats["coalesced"] += 1
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+            self._flight_stats["wait_timeouts"] += 1
+            logger.warning("Single-flight wait for %s timed out after %ss; computing", key, wait)
+            return compute()
+
+        try:
+            flight.value = self._compute_with_lease(key, ttl_seconds, compute, cache_empty, wait)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _compute_with_lease(
+        self,
+        key: str,
+        ttl_seconds: int,
+        compute: Callable[[], Any],
+        cache_empty: bool,
+        wait: float,
+    ) -> Any:
+        """Compute ``key`` while holding its Redis lease, or wait for the worker that holds it."""
+        client = self._client()
+        lease_key = f"{key}:lease"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + wait
+
+        while client is not None:
+            try:
+                acquired = client.set(
+                    lease_key, token, nx=True, px=int(settings.CACHE_LEASE_SECONDS * 1000)
+                )
+            except RedisError as exc:
+                logger.warning("Redis lease failed for %s; computing without it: %s", key, exc)
+                break
+            if acquired:
+                try:
+                    return self._compute_and_set(key, ttl_seconds, compute, cache_empty)
+                finally:
+                    try:
+                        client.eval(RELEASE_LEASE_SCRIPT, 1, lease_key, token)
+                    except RedisError as exc:
+                        logger.warning("Redis lease release failed for %s: %s", key, exc)
+
+            # Another worker is computing: reuse its value once it lands
+            self._flight_stats["lease_waits"] += 1
+            poll = 0.05
+            while time.monotonic() < deadline:
+                time.sleep(poll)
+                poll = min(poll * 2, 1.0)
+                hit, value = self.get(key, ttl_seconds)
+                if hit:
+                    return value
+                try:
+                    if not client.exists(lease_key):
+                        break  # finished without a cacheable value, or died: retake
+                except RedisError:
+                    break
+            else:
+                self._flight_stats["wait_timeouts"] += 1
+                logger.warning("Redis lease wait for %s timed out after %ss; computing", key, wait)
+                break
+
+        return self._compute_and_set(key, ttl_seconds, compute, cache_empty)
+
+    def _compute_and_set(
+        self, key: str, ttl_seconds: int, compute: Callable[[], Any], cache_empty: bool
+    ) -> Any:
+        value = compute()
+        self._flight_stats["computed"] += 1
+        self.set(key, value, ttl_seconds, cache_empty=cache_empty)
+        return value
 
     def clear_namespace(self, namespace: str) -> int:
-        """Best-effort namespace clear for Redis. Memory fallback is process-local."""
+        """Best-effort namespace clear. Other workers' memory tiers expire on their own."""
+        prefix = f"{settings.CACHE_KEY_PREFIX}:{namespace}:"
+        deleted = self._memory.delete_prefix(prefix)
         client = self._client()
         if client is None:
-            self._memory_ttls.clear()
-            return 0
+            return deleted
 
-        pattern = f"{settings.CACHE_KEY_PREFIX}:{namespace}:*"
-        deleted = 0
+        pattern = f"{prefix}*"
         try:
             for key in client.scan_iter(pattern):
                 deleted += client.delete(key)
@@ -128,6 +295,9 @@ class ResponseCache:
             "enabled": settings.CACHE_ENABLED,
             "backend": "redis" if client is not None else "memory",
             "redis_configured": bool(settings.REDIS_URL),
+            "codec": self._codec.tag,
+            "single_flight": dict(self._flight_stats),
+            "memory": self._memory.status(),
         }
 
 
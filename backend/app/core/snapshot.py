@@ -0,0 +1,180 @@
+"""
+Snapshot Refresher
+
+Stale-while-revalidate holder for expensive, periodically recomputed
+results (the blended safety-index list).
+
+Each tracked key has at most one snapshot: the last successful result of
+``compute(key)`` and the time it was computed. A daemon thread recomputes
+every tracked key once its snapshot is older than the refresh interval and
+swaps the new one in atomically; readers always get the last good snapshot
+and never run ``compute`` themselves. A failed recompute is logged and the
+previous snapshot keeps being served.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cap on the wait before retrying a key whose refresh failed
+RETRY_SECONDS = 60.0
+
+# (value, computed_at)
+Snapshot = Tuple[Any, float]
+
+
+class SnapshotRefresher:
+    """Background-refreshed snapshots keyed by request parameters."""
+
+    def __init__(
+        self,
+        name: str,
+        compute: Callable[[Hashable], Any],
+        clock: Callable[[], float] = time.time,
+    ):
+        self.name = name
+        self._compute = compute
+        self._clock = clock
+        self._snapshots: Dict[Hashable, Snapshot] = {}
+        self._tracked: Dict[Hashable, None] = {}
+        self._durations: Dict[Hashable, float] = {}
+        self._retry_at: Dict[Hashable, float] = {}
+        self._last_error: Optional[str] = None
+        self._interval: Optional[float] = None
+        self._cond = threading.Condition()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get(self, key: Hashable) -> Optional[Snapshot]:
+        """Last good snapshot for ``key``, or None if none was computed yet."""
+        return self._snapshots.get(key)
+
+    def age(self, key: Hashable) -> Optional[float]:
+        snapshot = self._snapshots.get(key)
+        return self._clock() - snapshot[1] if snapshot is not None else None
+
+    def track(self, key: Hashable) -> None:
+        """Keep ``key`` refreshed from now on; computes it soon if it is new."""
+        if key not in self._tracked:
+            self._tracked[key] = None
+            self._wake.set()
+
+    def wait_for(self, key: Hashable, timeout: float) -> Optional[Snapshot]:
+        """Block up to ``timeout`` seconds for the first snapshot of ``key``."""
+        deadline = self._clock() + timeout
+        with self._cond:
+            while key not in self._snapshots:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._snapshots[key]
+
+    def refresh(self, key: Hashable) -> Snapshot:
+        """Recompute ``key`` now and swap the result in (one refresh at a time)."""
+        with self._refresh_lock:
+            started = time.monotonic()
+            try:
+                value = self._compute(key)
+            except Exception as e:
+                self._last_error = str(e)
+                logger.error(f"{self.name} snapshot refresh failed for {key!r}: {e}")
+                raise
+            snapshot = (value, self._clock())
+            with self._cond:
+                self._snapshots[key] = snapshot
+                self._durations[key] = time.monotonic() - started
+                self._last_error = None
+                self._cond.notify_all()
+            logger.info(
+                f"{self.name} snapshot for {key!r} refreshed in "
+                f"{self._durations[key]:.1f}s"
+            )
+            return snapshot
+
+    def refresh_due(self) -> float:
+        """
+        Refresh every tracked key without a snapshot or older than the
+        interval; a key whose refresh failed is retried after
+        min(interval, RETRY_SECONDS). Returns seconds until the next key is due.
+        """
+        interval = self._interval or 0.0
+        retry = min(interval, RETRY_SECONDS)
+        next_due = interval
+        for key in list(self._tracked):
+            now = self._clock()
+            age = self.age(key)
+            due_in = max(
+                interval - age if age is not None else 0.0,
+                self._retry_at.get(key, now) - now,
+            )
+            if due_in <= 0:
+                try:
+                    self.refresh(key)
+                    self._retry_at.pop(key, None)
+                    due_in = interval
+                except Exception:
+                    # logged in refresh()
+                    self._retry_at[key] = self._clock() + retry
+                    due_in = retry
+            next_due = min(next_due, due_in)
+        return next_due
+
+    def clear(self) -> None:
+        with self._cond:
+            self._snapshots = {}
+            self._tracked = {}
+            self._durations = {}
+            self._retry_at = {}
+            self._last_error = None
+
+    def status(self) -> Dict:
+        """Per-key snapshot age and last refresh duration."""
+        return {
+            "running": self.running,
+            "interval_seconds": self._interval,
+            "snapshots": {
+                str(key): {
+                    "age_seconds": round(self._clock() - computed_at, 1),
+                    "refresh_seconds": round(self._durations.get(key, 0.0), 1),
+                }
+                for key, (_, computed_at) in list(self._snapshots.items())
+            },
+            "last_error": self._last_error,
+        }
+
+    def start_background_refresh(self, interval_seconds: float) -> None:
+        """
+        Refresh tracked keys on a daemon thread whenever their snapshot is
+        ``interval_seconds`` old, and newly tracked keys right away.
+        """
+        if self.running:
+            return
+        self._interval = interval_seconds
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.is_set():
+                self._wake.clear()
+                self._wake.wait(max(self.refresh_due(), 1.0))
+
+        self._thread = threading.Thread(
+            target=_run, name=f"{self.name}-snapshot-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop_background_refresh(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -16,6 +16,7 @@ Make sure the required dependencies are installed:
 """
 
 import logging
+import threading
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -28,9 +29,18 @@ logger = logging.getLogger(__name__)
 from .schemas.intersection import IntersectionRead
 from .core.config import settings  # type: ignore
 from .core.redis_cache import response_cache
-from .api.intersection import router as intersection_router
+from .core.intersection_registry import intersection_registry
+from .api.intersection import (
+    router as intersection_router,
+    safety_index_snapshots,
+    SNAPSHOT_BIN_MINUTES,
+)
 from .db.connection import init_db, close_db, check_db_health
 from .services.db_client import get_db_client, close_db_client
+from .services.async_db_client import close_async_db_client
+from .services.crash_baseline import crash_baseline_store, warm_crash_baseline
+from .services.capacity_sketch import capacity_sketch_store
+from .services.query_stats import query_stats
 
 # Optional routers - import conditionally to avoid startup failures
 try:
@@ -82,6 +92,10 @@ async def lifespan(app: FastAPI):
     Handles:
     - PostgreSQL database connection initialization (if enabled)
     - MCDM database connection (lazy initialization)
+    - Intersection registry load and background refresh
+    - Crash-rate baseline load (or rebuild) for RT-SI
+    - Capacity sketch load and incremental refresh
+    - Background recompute of the safety-index list snapshot
     - Database connection cleanup
     """
     # Startup
@@ -115,11 +129,50 @@ async def lifespan(app: FastAPI):
 
     # MCDM database connection will be established lazily on first request
 
+    # Load the intersection registry off the request path; until the first
+    # load finishes, lookups fall back to querying the database
+    if settings.INTERSECTION_REGISTRY_REFRESH_SECONDS > 0:
+        intersection_registry.start_background_refresh(
+            get_db_client, settings.INTERSECTION_REGISTRY_REFRESH_SECONDS
+        )
+
+    # Crash baselines change yearly: load the persisted Parquet snapshot,
+    # rebuilding it in one grouped query when missing or stale, and retry
+    # with backoff when the database is unavailable
+    crash_baseline_stop = threading.Event()
+    threading.Thread(
+        target=warm_crash_baseline,
+        args=(get_db_client, crash_baseline_stop),
+        name="crash-baseline-warmup",
+        daemon=True,
+    ).start()
+
+    # Capacity percentiles: load the persisted sketch and fold in new
+    # vehicle-count rows periodically; until loaded, the database is queried
+    if settings.CAPACITY_SKETCH_REFRESH_SECONDS > 0:
+        capacity_sketch_store.start_background_refresh(
+            get_db_client, settings.CAPACITY_SKETCH_REFRESH_SECONDS
+        )
+
+    # Recompute the default safety-index list on the 15-minute data cadence;
+    # requests are served from the last good snapshot and never recompute
+    if settings.SAFETY_INDEX_SNAPSHOT_REFRESH_SECONDS > 0:
+        for bin_minutes in SNAPSHOT_BIN_MINUTES:
+            safety_index_snapshots.track(bin_minutes)
+        safety_index_snapshots.start_background_refresh(
+            settings.SAFETY_INDEX_SNAPSHOT_REFRESH_SECONDS
+        )
+
     yield  # Application is running
 
     # Shutdown
     logger.info("Shutting down Traffic Safety API...")
 
+    intersection_registry.stop_background_refresh()
+    capacity_sketch_store.stop_background_refresh()
+    safety_index_snapshots.stop_background_refresh()
+    crash_baseline_stop.set()
+
     # Close PostgreSQL connection
     if settings.USE_POSTGRESQL:
         try:
@@ -135,6 +188,12 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error closing MCDM database: {e}")
 
+    # Close the async database pool (only opened if an async path ran)
+    try:
+        await close_async_db_client()
+    except Exception as e:
+        logger.warning(f"Error closing async database pool: {e}")
+
 
 def create_app() -> FastAPI:
     """
@@ -197,6 +256,11 @@ def create_app() -> FastAPI:
                 "status": "not_configured",
             },
             "cache": response_cache.status(),
+            "intersection_registry": intersection_registry.status(),
+            "crash_baseline": crash_baseline_store.status(),
+            "capacity_sketch": capacity_sketch_store.status(),
+            "safety_index_snapshot": safety_index_snapshots.status(),
+            "query_stats": query_stats.status(),
         }
 
         if settings.USE_POSTGRESQL:
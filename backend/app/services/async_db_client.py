@@ -0,0 +1,190 @@
+"""
+Async PostgreSQL Client for VTTI Database
+
+asyncio counterpart of VTTIPostgresClient for code running on the event
+loop: awaiting a query yields the loop instead of holding a threadpool
+thread, and independent queries can run concurrently (asyncio.gather) on
+separate pooled connections.
+
+The contract matches VTTIPostgresClient.execute_query: psycopg2-style
+``%s`` / ``%(name)s`` parameters, rows returned as plain dicts. Cursors
+interpolate parameters client-side (psycopg's AsyncClientCursor), the way
+psycopg2 does, so the services' SQL strings run unchanged on either client.
+Composed SQL must use ``psycopg.sql`` rather than ``psycopg2.sql``.
+
+Executions are recorded in query_stats like the sync client's. Statements
+are not prepared: psycopg only prepares server-side bound queries, and
+client-side binding is what keeps the SQL strings shared.
+
+Requires psycopg 3 and psycopg-pool; the pool opens on first use.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    from psycopg import AsyncClientCursor
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+except ModuleNotFoundError:  # Optional dependency
+    AsyncConnectionPool = None  # type: ignore[assignment]
+
+from .db_client import connection_settings
+from .query_stats import query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncVTTIPostgresClient:
+    """Connection-pooled asyncio client with the VTTIPostgresClient query contract."""
+
+    def __init__(
+        self,
+        host: str = None,
+        database: str = None,
+        user: str = None,
+        password: str = None,
+        port: int = None,
+        min_connections: int = 1,
+        max_connections: int = 10,
+    ):
+        """
+        Configure the pool; connections are made when it is first used.
+
+        Arguments and environment defaults are those of VTTIPostgresClient.
+        """
+        if AsyncConnectionPool is None:
+            raise RuntimeError(
+                "The async database client requires psycopg 3 and psycopg-pool"
+            )
+
+        connection = connection_settings(host, database, user, password, port)
+        self.host = connection["host"]
+        self.database = connection["database"]
+        self.user = connection["user"]
+        self.port = connection["port"]
+
+        connect_kwargs = {
+            "host": self.host,
+            "dbname": self.database,
+            "user": self.user,
+            "password": connection["password"],
+            "row_factory": dict_row,
+            "cursor_factory": AsyncClientCursor,
+        }
+        if self.port is not None:
+            connect_kwargs["port"] = self.port
+
+        self.connection_pool = AsyncConnectionPool(
+            kwargs=connect_kwargs,
+            min_size=min_connections,
+            max_size=max_connections,
+            open=False,
+            name="vtti-async",
+        )
+        self._opened = False
+        self._open_lock = asyncio.Lock()
+
+    async def open(self) -> None:
+        """Open the pool (idempotent); waits for the minimum connections."""
+        if self._opened:
+            return
+        async with self._open_lock:
+            if not self._opened:
+                await self.connection_pool.open(wait=True)
+                self._opened = True
+                logger.info(
+                    f"✓ Opened async PostgreSQL pool: {self.database}@{self.host}"
+                )
+
+    @asynccontextmanager
+    async def get_cursor(self):
+        """
+        Get a dict-row cursor; the transaction commits when the block exits
+        normally and rolls back on an exception.
+
+        Usage:
+            async with client.get_cursor() as cursor:
+                await cursor.execute("SELECT * FROM table")
+                results = await cursor.fetchall()
+        """
+        await self.open()
+        async with self.connection_pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                yield cursor
+
+    async def execute_query(self, query: Any, params: Any = None) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT query and return results as list of dictionaries.
+
+        Args:
+            query: SQL query string or psycopg.sql Composable
+            params: Query parameters (for parameterized queries)
+
+        Returns:
+            List of dictionaries representing rows
+        """
+        async with self.get_cursor() as cursor:
+            with query_stats.timed(_query_text(query, cursor)) as timer:
+                await cursor.execute(query, params)
+                rows = await cursor.fetchall()
+                timer.rows = len(rows)
+                return rows
+
+    async def execute_update(self, query: str, params: Any = None) -> int:
+        """
+        Execute an INSERT, UPDATE, or DELETE query.
+
+        Returns:
+            Number of rows affected
+        """
+        async with self.get_cursor() as cursor:
+            with query_stats.timed(_query_text(query, cursor)) as timer:
+                await cursor.execute(query, params)
+                timer.rows = cursor.rowcount
+                return cursor.rowcount
+
+    def status(self) -> Dict[str, Any]:
+        """Pool size and usage counters (psycopg-pool get_stats)."""
+        if not self._opened:
+            return {"open": False}
+        return {"open": True, **self.connection_pool.get_stats()}
+
+    async def close(self):
+        """Close all connections in the pool."""
+        if self._opened:
+            await self.connection_pool.close()
+            self._opened = False
+            logger.info("✓ All async database connections closed")
+
+
+def _query_text(query: Any, cursor: Any) -> str:
+    """SQL text of a query string or psycopg.sql Composable."""
+    return query if isinstance(query, str) else query.as_string(cursor)
+
+
+# Global async database client instance
+_async_db_client: Optional[AsyncVTTIPostgresClient] = None
+
+
+def get_async_db_client() -> AsyncVTTIPostgresClient:
+    """
+    Get or create the global async database client instance.
+
+    Returns:
+        AsyncVTTIPostgresClient instance (its pool opens on the first query)
+    """
+    global _async_db_client
+    if _async_db_client is None:
+        _async_db_client = AsyncVTTIPostgresClient()
+    return _async_db_client
+
+
+async def close_async_db_client():
+    """Close the global async database client."""
+    global _async_db_client
+    if _async_db_client is not None:
+        await _async_db_client.close()
+        _async_db_client = None
@@ -0,0 +1,326 @@
+"""
+Capacity Sketch Store
+
+Per-intersection vehicle-count distributions for the RT-SI capacity term.
+
+get_intersection_capacity computes PERCENTILE_CONT(0.95) over 30 days of
+"vehicle-count" rows on every RT-SI and trend call. This store keeps, for
+every intersection, one count histogram per UTC day: {count value: rows}.
+Vehicle counts are small integers, so a histogram is an exact, mergeable
+quantile sketch whose size is bounded by the number of distinct counts,
+and because days can simply be dropped it supports the sliding lookback
+window that t-digest/KLL sketches cannot (they have no deletion).
+
+The store is filled with one grouped query, then refreshed incrementally:
+each update rebuilds the histograms of the last CAPACITY_SKETCH_RESCAN_DAYS
+UTC days up to its watermark (the newest publish_timestamp seen) from
+scratch, so rows that arrive late for those days are still counted. The
+histograms are persisted to Parquet and refreshed on a background thread.
+Quantiles are memoized per window until the next update. The lookback
+window is resolved to whole UTC days, so it may include up to one extra
+partial day compared with the database query, which stays available as a
+verification path.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DAY_US = 24 * 60 * 60 * 1_000_000
+
+INGEST_QUERY = """
+SELECT intersection,
+       (publish_timestamp / %(day_us)s)::bigint AS day,
+       count AS value,
+       COUNT(*) AS n,
+       MAX(publish_timestamp) AS max_ts
+FROM "vehicle-count"
+WHERE publish_timestamp >= %(since_us)s
+  AND count IS NOT NULL
+GROUP BY 1, 2, 3;
+"""
+
+
+def default_sketch_path() -> Path:
+    """CAPACITY_SKETCH_PATH, or constants/capacity_sketch.parquet under PARQUET_STORAGE_PATH."""
+    if settings.CAPACITY_SKETCH_PATH:
+        return Path(settings.CAPACITY_SKETCH_PATH)
+    return Path(settings.PARQUET_STORAGE_PATH) / "constants" / "capacity_sketch.parquet"
+
+
+def percentile_cont(values: np.ndarray, counts: np.ndarray, q: float) -> Optional[float]:
+    """
+    PERCENTILE_CONT(q) of a histogram: ``values`` sorted ascending, each
+    occurring ``counts`` times. Linear interpolation between the two
+    neighbouring ranks, exactly as PostgreSQL computes it.
+    """
+    total = int(counts.sum()) if len(counts) else 0
+    if total == 0:
+        return None
+    h = q * (total - 1)
+    lo, hi = int(np.floor(h)), int(np.ceil(h))
+    cum = np.cumsum(counts)
+    v_lo = values[np.searchsorted(cum, lo, side="right")]
+    v_hi = values[np.searchsorted(cum, hi, side="right")]
+    return float(v_lo + (h - lo) * (v_hi - v_lo))
+
+
+class CapacitySketchStore:
+    """Thread-safe per-intersection, per-day vehicle-count histograms."""
+
+    COLUMNS = ["intersection", "day", "value", "n", "watermark_us"]
+
+    def __init__(
+        self,
+        retention_days: Optional[int] = None,
+        rescan_days: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.retention_days = (
+            retention_days
+            if retention_days is not None
+            else settings.CAPACITY_SKETCH_RETENTION_DAYS
+        )
+        self.rescan_days = (
+            rescan_days
+            if rescan_days is not None
+            else settings.CAPACITY_SKETCH_RESCAN_DAYS
+        )
+        self._clock = clock
+        # intersection -> day index -> {count value: rows}
+        self._days: Dict[str, Dict[int, Dict[float, int]]] = {}
+        self._watermark_us: Optional[int] = None
+        self._memo: Dict[tuple, Optional[float]] = {}
+        self._updated_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._watermark_us is not None
+
+    def covers(self, lookback_days: int) -> bool:
+        """Whether quantiles over ``lookback_days`` can be served from the store."""
+        return self.loaded and lookback_days <= self.retention_days
+
+    def quantile(
+        self, intersection: str, q: float = 0.95, lookback_days: int = 30
+    ) -> Optional[float]:
+        """
+        PERCENTILE_CONT(q) of the intersection's vehicle counts over the last
+        ``lookback_days``, or None when it has no rows in that window.
+
+        Callers must check covers() first; an uncovered window also
+        returns None.
+        """
+        if not self.covers(lookback_days):
+            return None
+        first_day = self._now_us() // DAY_US - lookback_days
+        key = (intersection, q, first_day)
+        memo = self._memo
+        if key in memo:
+            return memo[key]
+
+        merged: Dict[float, int] = {}
+        with self._lock:
+            for day, hist in self._days.get(intersection, {}).items():
+                if day >= first_day:
+                    for value, n in hist.items():
+                        merged[value] = merged.get(value, 0) + n
+        values = np.fromiter(sorted(merged), dtype=float, count=len(merged))
+        counts = np.fromiter((merged[v] for v in values), dtype=np.int64, count=len(merged))
+        result = percentile_cont(values, counts, q)
+        memo[key] = result
+        return result
+
+    def update(self, db_client) -> int:
+        """
+        Rebuild the histograms of the days from rescan_days before the
+        watermark onwards (the whole retention window on the first call) and
+        drop days that left the window. Returns the number of histogram
+        cells read.
+        """
+        with self._update_lock:
+            now_us = self._now_us()
+            if self._watermark_us is None:
+                first_day = now_us // DAY_US - self.retention_days
+            else:
+                last_day = min(self._watermark_us, now_us) // DAY_US
+                first_day = last_day - max(self.rescan_days - 1, 0)
+            since_us = first_day * DAY_US
+            try:
+                rows = db_client.execute_query(
+                    INGEST_QUERY, {"day_us": DAY_US, "since_us": int(since_us)}
+                )
+            except Exception as e:
+                self._last_error = str(e)
+                logger.error(f"Capacity sketch update failed: {e}")
+                raise
+
+            with self._lock:
+                days = self._days
+                # Rescanned days are replaced, not added to
+                for name in list(days):
+                    for day in [d for d in days[name] if d >= first_day]:
+                        del days[name][day]
+                watermark = max(self._watermark_us or 0, since_us)
+                for row in rows:
+                    hist = days.setdefault(row["intersection"], {}).setdefault(
+                        int(row["day"]), {}
+                    )
+                    value = float(row["value"])
+                    hist[value] = hist.get(value, 0) + int(row["n"])
+                    watermark = max(watermark, int(row["max_ts"]))
+                self._prune(now_us)
+                self._watermark_us = watermark
+                self._memo = {}
+                self._updated_at = self._clock()
+                self._last_error = None
+
+            logger.info(f"Capacity sketch updated with {len(rows)} histogram cell(s)")
+            return len(rows)
+
+    def rebuild(self, db_client) -> int:
+        """Discard the histograms and reload the whole retention window."""
+        self.clear()
+        return self.update(db_client)
+
+    def clear(self) -> None:
+        """Forget all histograms (capacity lookups fall back to the database)."""
+        with self._lock:
+            self._days = {}
+            self._watermark_us = None
+            self._memo = {}
+            self._updated_at = None
+
+    def to_frame(self) -> pd.DataFrame:
+        rows = [
+            (name, day, value, n, self._watermark_us)
+            for name, days in self._days.items()
+            for day, hist in days.items()
+            for value, n in hist.items()
+        ]
+        return pd.DataFrame(rows, columns=self.COLUMNS)
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Write the histograms and watermark to one Parquet file (atomically replaced)."""
+        path = Path(path or default_sketch_path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        self.to_frame().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, path: Optional[Path] = None) -> bool:
+        """
+        Load histograms from Parquet. Returns False (leaving the store as is)
+        when the file is missing, unreadable or empty; update() then catches
+        up from the persisted watermark, rescanning its last days.
+        """
+        path = Path(path or default_sketch_path())
+        if not path.exists():
+            return False
+        try:
+            frame = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Could not read capacity sketch {path}: {e}")
+            return False
+        if frame.empty:
+            return False
+
+        days: Dict[str, Dict[int, Dict[float, int]]] = {}
+        for name, day, value, n in zip(
+            frame["intersection"], frame["day"], frame["value"], frame["n"]
+        ):
+            days.setdefault(name, {}).setdefault(int(day), {})[float(value)] = int(n)
+
+        with self._lock:
+            self._days = days
+            self._watermark_us = int(frame["watermark_us"].iloc[0])
+            self._prune(self._now_us())
+            self._memo = {}
+            self._updated_at = path.stat().st_mtime
+        logger.info(f"Capacity sketch loaded from {path} ({len(frame)} rows)")
+        return True
+
+    def status(self) -> Dict:
+        """Sketch size and freshness."""
+        watermark = self._watermark_us
+        updated_at = self._updated_at
+        return {
+            "loaded": self.loaded,
+            "intersections": len(self._days),
+            "cells": sum(len(h) for d in self._days.values() for h in d.values()),
+            "retention_days": self.retention_days,
+            "watermark_age_seconds": (
+                round((self._now_us() - watermark) / 1e6, 1) if watermark is not None else None
+            ),
+            "updated_age_seconds": (
+                round(self._clock() - updated_at, 1) if updated_at is not None else None
+            ),
+            "last_error": self._last_error,
+        }
+
+    def start_background_refresh(
+        self, client_factory: Callable, interval_seconds: float
+    ) -> None:
+        """
+        Load the persisted sketch, then every ``interval_seconds`` fold in
+        new rows and persist again, on a daemon thread. Failures are logged
+        and retried on the next tick.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            if not self.loaded:
+                self.load()
+            while True:
+                try:
+                    self.update(client_factory())
+                    self.save()
+                except Exception as e:
+                    logger.error(f"Capacity sketch refresh failed: {e}")
+                if self._stop.wait(interval_seconds):
+                    return
+
+        self._thread = threading.Thread(
+            target=_run, name="capacity-sketch-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop_background_refresh(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _now_us(self) -> int:
+        return int(self._clock() * 1_000_000)
+
+    def _prune(self, now_us: int) -> None:
+        first_day = now_us // DAY_US - self.retention_days
+        for name in list(self._days):
+            days = self._days[name]
+            for day in [d for d in days if d < first_day]:
+                del days[day]
+            if not days:
+                del self._days[name]
+
+
+# Global store instance
+capacity_sketch_store = CapacitySketchStore()
@@ -0,0 +1,273 @@
+"""
+Crash Baseline Store
+
+Precomputed historical crash rates and Empirical Bayes baselines for RT-SI.
+
+get_historical_crash_rate aggregates vdot_crashes_with_intersections on
+every RT-SI call, although the crash data changes at most yearly. This
+store computes the severity-weighted crashes, exposure and raw rate for
+every crash intersection in one grouped pass, keyed by
+(crash_intersection_id, year range, severity weights), persists them to
+Parquet and serves lookups from memory. The EB-stabilized rate r_hat is not
+stored: it depends on LAMBDA and R0, and RTSIService.compute_eb_rate
+derives it from the stored raw rate and exposure.
+
+A (year range, weights) partition that has been built is authoritative:
+an intersection missing from it had no crashes in that range. Lookups for
+partitions that were never built return None so callers fall back to
+querying the database.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (start_year, end_year, w_fatal, w_injury, w_pdo)
+PartitionKey = Tuple[int, int, float, float, float]
+
+BASELINE_QUERY = """
+SELECT
+    matched_intersection_id,
+    COALESCE(
+        COUNT(*) FILTER (WHERE crash_severity IN ('K', 'Fatal')) * %(w_fatal)s +
+        COUNT(*) FILTER (WHERE crash_severity IN ('A', 'B', 'Injury')) * %(w_injury)s +
+        COUNT(*) * %(w_pdo)s,
+        0
+    ) as weighted_crashes,
+    1 as exposure
+FROM vdot_crashes_with_intersections
+WHERE matched_intersection_id IS NOT NULL
+  AND crash_year BETWEEN %(start_year)s AND %(end_year)s
+GROUP BY matched_intersection_id;
+"""
+
+
+def default_baseline_path() -> Path:
+    """CRASH_BASELINE_PATH, or constants/crash_baseline.parquet under PARQUET_STORAGE_PATH."""
+    if settings.CRASH_BASELINE_PATH:
+        return Path(settings.CRASH_BASELINE_PATH)
+    return Path(settings.PARQUET_STORAGE_PATH) / "constants" / "crash_baseline.parquet"
+
+
+def partition_key(
+    start_year: int, end_year: int, weights: Tuple[float, float, float]
+) -> PartitionKey:
+    w_fatal, w_injury, w_pdo = weights
+    return (int(start_year), int(end_year), float(w_fatal), float(w_injury), float(w_pdo))
+
+
+class CrashBaselineStore:
+    """In-memory crash baseline partitions with Parquet persistence."""
+
+    COLUMNS = [
+        "crash_intersection_id",
+        "start_year",
+        "end_year",
+        "w_fatal",
+        "w_injury",
+        "w_pdo",
+        "weighted_crashes",
+        "exposure",
+        "raw_rate",
+    ]
+
+    def __init__(self):
+        self._partitions: Dict[PartitionKey, Dict[int, Dict]] = {}
+        self._lock = threading.Lock()
+        self.built_at: Optional[float] = None
+
+    def get(
+        self,
+        crash_intersection_id: int,
+        start_year: int,
+        end_year: int,
+        weights: Tuple[float, float, float],
+    ) -> Optional[Dict]:
+        """
+        Baseline record (weighted_crashes, exposure, raw_rate) or None when
+        the partition has not been built.
+        """
+        partition = self._partitions.get(partition_key(start_year, end_year, weights))
+        if partition is None:
+            return None
+        return dict(partition.get(int(crash_intersection_id), partition[_ZERO]))
+
+    def has_partition(
+        self, start_year: int, end_year: int, weights: Tuple[float, float, float]
+    ) -> bool:
+        return partition_key(start_year, end_year, weights) in self._partitions
+
+    def build(
+        self,
+        db_client,
+        start_year: int,
+        end_year: int,
+        weights: Tuple[float, float, float],
+    ) -> int:
+        """Compute one partition for every crash intersection in a single grouped query."""
+        key = partition_key(start_year, end_year, weights)
+        rows = db_client.execute_query(
+            BASELINE_QUERY,
+            {
+                "w_fatal": key[2],
+                "w_injury": key[3],
+                "w_pdo": key[4],
+                "start_year": key[0],
+                "end_year": key[1],
+            },
+        )
+
+        partition: Dict[int, Dict] = {}
+        for row in rows:
+            crashes = float(row["weighted_crashes"]) if row["weighted_crashes"] else 0.0
+            exposure = max(float(row["exposure"]) if row["exposure"] else 1.0, 1.0)
+            partition[int(row["matched_intersection_id"])] = _record(crashes, exposure)
+        # Template for intersections without crashes in this range
+        partition[_ZERO] = _record(0.0, 1.0)
+
+        with self._lock:
+            self._partitions[key] = partition
+            self.built_at = time.time()
+        logger.info(
+            f"Crash baseline built for {len(partition) - 1} intersection(s), "
+            f"years {start_year}-{end_year}"
+        )
+        return len(partition) - 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._partitions = {}
+            self.built_at = None
+
+    def to_frame(self) -> pd.DataFrame:
+        rows = []
+        for key, partition in self._partitions.items():
+            for crash_id, record in partition.items():
+                rows.append(
+                    {
+                        "crash_intersection_id": crash_id,
+                        "start_year": key[0],
+                        "end_year": key[1],
+                        "w_fatal": key[2],
+                        "w_injury": key[3],
+                        "w_pdo": key[4],
+                        **record,
+                    }
+                )
+        return pd.DataFrame(rows, columns=self.COLUMNS)
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Write every partition to one Parquet file (atomically replaced)."""
+        path = Path(path or default_baseline_path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        self.to_frame().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, path: Optional[Path] = None, max_age_days: Optional[float] = None) -> bool:
+        """
+        Load partitions from Parquet. Returns False (leaving the store as is)
+        when the file is missing, unreadable or older than max_age_days.
+        """
+        path = Path(path or default_baseline_path())
+        if not path.exists():
+            return False
+        mtime = path.stat().st_mtime
+        if max_age_days is not None and time.time() - mtime > max_age_days * 86400:
+            logger.info(f"Crash baseline at {path} is stale; it will be rebuilt")
+            return False
+        try:
+            frame = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Could not read crash baseline {path}: {e}")
+            return False
+
+        partitions: Dict[PartitionKey, Dict[int, Dict]] = {}
+        value_columns = ["weighted_crashes", "exposure", "raw_rate"]
+        for row in frame.to_dict(orient="records"):
+            key = partition_key(
+                row["start_year"],
+                row["end_year"],
+                (row["w_fatal"], row["w_injury"], row["w_pdo"]),
+            )
+            partitions.setdefault(key, {})[int(row["crash_intersection_id"])] = {
+                col: float(row[col]) for col in value_columns
+            }
+
+        with self._lock:
+            self._partitions = partitions
+            self.built_at = mtime
+        logger.info(f"Crash baseline loaded from {path} ({len(frame)} rows)")
+        return True
+
+    def status(self) -> Dict:
+        return {
+            "partitions": len(self._partitions),
+            "intersections": sum(max(len(p) - 1, 0) for p in self._partitions.values()),
+            "built_at": self.built_at,
+        }
+
+
+# Reserved ID holding a partition's zero-crash record
+_ZERO = -1
+
+
+def _record(crashes: float, exposure: float) -> Dict:
+    return {
+        "weighted_crashes": crashes,
+        "exposure": exposure,
+        "raw_rate": crashes / exposure,
+    }
+
+
+# Upper bound for the doubling retry delay after failed warm-ups
+MAX_RETRY_SECONDS = 3600
+
+
+def warm_crash_baseline(
+    client_factory: Callable, stop: Optional[threading.Event] = None
+) -> None:
+    """
+    Keep the crash baseline loaded until ``stop`` is set.
+
+    Loads the persisted baseline, or rebuilds and persists it when it is
+    missing or older than CRASH_BASELINE_MAX_AGE_DAYS, then sleeps until it
+    becomes stale and repeats. Failures are retried after
+    CRASH_BASELINE_RETRY_SECONDS, doubling up to MAX_RETRY_SECONDS; until
+    the first success, lookups fall back to the database. Meant to run on a
+    daemon thread, off the request path.
+    """
+    from .rt_si_service import RTSIService
+
+    stop = stop or threading.Event()
+    path = default_baseline_path()
+    max_age_seconds = settings.CRASH_BASELINE_MAX_AGE_DAYS * 86400
+    retry = settings.CRASH_BASELINE_RETRY_SECONDS
+    while True:
+        try:
+            if not crash_baseline_store.load(path, settings.CRASH_BASELINE_MAX_AGE_DAYS):
+                RTSIService(client_factory()).build_crash_baseline()
+                crash_baseline_store.save(path)
+            age = time.time() - crash_baseline_store.built_at
+            delay = max(max_age_seconds - age, settings.CRASH_BASELINE_RETRY_SECONDS)
+            retry = settings.CRASH_BASELINE_RETRY_SECONDS
+        except Exception as e:
+            logger.error(f"Crash baseline warm-up failed: {e}; retrying in {retry}s")
+            delay = retry
+            retry = min(retry * 2, MAX_RETRY_SECONDS)
+        if stop.wait(delay):
+            return
+
+
+# Global store instance
+crash_baseline_store = CrashBaselineStore()
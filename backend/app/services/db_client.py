@@ -5,16 +5,68 @@ Adapted from data-integration/gcp_postgres_client.py for backend use.
 """
 
 import os
+import threading
+import time
+import uuid
+import pandas as pd
 import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
-from typing import List, Dict, Any, Optional
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 from contextlib import contextmanager
 from dotenv import load_dotenv
 import logging
 
+from .prepared_statements import PreparingConnection, StatementPreparer
+from .query_stats import query_stats
+
 logger = logging.getLogger(__name__)
 
+class QueryDeadlineExceeded(TimeoutError):
+    """A concurrent query batch did not finish before its deadline."""
+
+
+def connection_settings(
+    host: str = None,
+    database: str = None,
+    user: str = None,
+    password: str = None,
+    port: int = None,
+) -> Dict[str, Any]:
+    """
+    Resolve connection parameters from arguments and the VTTI_DB_* environment.
+
+    A Cloud SQL instance connection name (INSTANCE_CONNECTION_NAME or
+    VTTI_DB_INSTANCE_CONNECTION_NAME) selects the Unix socket Cloud Run
+    mounts, in which case ``port`` is None.
+    """
+    load_dotenv()  # Load environment variables from .env file
+    password = password or os.getenv("VTTI_DB_PASSWORD")
+    if not password:
+        raise ValueError(
+            "Database password must be provided via VTTI_DB_PASSWORD environment variable or password parameter"
+        )
+
+    instance_connection_name = os.getenv("INSTANCE_CONNECTION_NAME") or os.getenv(
+        "VTTI_DB_INSTANCE_CONNECTION_NAME"
+    )
+    if instance_connection_name:
+        # Cloud Run automatically mounts sockets here; socket mode ignores port
+        host, port = f"/cloudsql/{instance_connection_name}", None
+    else:
+        # Local / TCP fallback
+        host = host or os.getenv("VTTI_DB_HOST", "127.0.0.1")
+        port = int(port or os.getenv("VTTI_DB_PORT", "9470"))
+
+    return {
+        "host": host,
+        "database": database or os.getenv("VTTI_DB_NAME", "vtsi"),
+        "user": user or os.getenv("VTTI_DB_USER", "postgres"),
+        "password": password,
+        "port": port,
+    }
+
 
 class VTTIPostgresClient:
     """
@@ -50,27 +102,23 @@ class VTTIPostgresClient:
             min_connections: Minimum connections in pool
             max_connections: Maximum connections in pool
         """
-        load_dotenv()  # Load environment variables from .env file
-        self.database = database or os.getenv("VTTI_DB_NAME", "vtsi")
-        self.user = user or os.getenv("VTTI_DB_USER", "postgres")
-        self.password = password or os.getenv("VTTI_DB_PASSWORD")
-        instance_connection_name = os.getenv("INSTANCE_CONNECTION_NAME") or os.getenv(
-            "VTTI_DB_INSTANCE_CONNECTION_NAME"
-        )
+        connection = connection_settings(host, database, user, password, port)
+        self.host = connection["host"]
+        self.database = connection["database"]
+        self.user = connection["user"]
+        self.password = connection["password"]
+        self.port = connection["port"]
 
-        # If Cloud SQL instance connection name is provided → use Unix socket
-        if instance_connection_name:
-            # Cloud Run automatically mounts sockets here
-            self.host = f"/cloudsql/{instance_connection_name}"
-            self.port = None  # socket mode ignores port
-        else:
-            # Local / TCP fallback
-            self.host = host or os.getenv("VTTI_DB_HOST", "127.0.0.1")
-            self.port = int(port or os.getenv("VTTI_DB_PORT", "9470"))
-        if not self.password:
-            raise ValueError(
-                "Database password must be provided via VTTI_DB_PASSWORD environment variable or password parameter"
-            )
+        from ..core.config import settings
+
+        # One slot per pooled connection. ThreadedConnectionPool.getconn
+        # raises PoolError instead of waiting when every connection is out,
+        # so callers wait here (bounded) for a free one first.
+        self._connection_slots = threading.BoundedSemaphore(max_connections)
+        self.statements = StatementPreparer(
+            threshold=settings.VTTI_DB_PREPARE_THRESHOLD,
+            cache_size=settings.VTTI_DB_PREPARED_STATEMENTS,
+        )
 
         try:
             # ThreadedConnectionPool (not SimpleConnectionPool): FastAPI runs
@@ -86,6 +134,7 @@ class VTTIPostgresClient:
                     database=self.database,
                     user=self.user,
                     password=self.password,
+                    connection_factory=PreparingConnection,
                 )
             else:
                 self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
@@ -96,6 +145,7 @@ class VTTIPostgresClient:
                     user=self.user,
                     password=self.password,
                     port=self.port,
+                    connection_factory=PreparingConnection,
                 )
             logger.info(
                 f"✓ Connected to PostgreSQL database: {self.database}@{self.host}"
@@ -114,11 +164,36 @@ class VTTIPostgresClient:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM table")
         """
-        conn = self.connection_pool.getconn()
+        from ..core.config import settings
+
+        conn = self._getconn(settings.VTTI_DB_POOL_WAIT_SECONDS)
+        if conn is None:
+            raise pool.PoolError(
+                f"no pooled connection free after {settings.VTTI_DB_POOL_WAIT_SECONDS}s"
+            )
         try:
             yield conn
         finally:
-            self.connection_pool.putconn(conn)
+            self._putconn(conn)
+
+    def _getconn(self, timeout: float):
+        """
+        A pooled connection once one is free, or None after ``timeout``
+        seconds. Pair with _putconn.
+        """
+        if not self._connection_slots.acquire(timeout=max(timeout, 0.0)):
+            return None
+        try:
+            return self.connection_pool.getconn()
+        except BaseException:
+            self._connection_slots.release()
+            raise
+
+    def _putconn(self, conn, close: bool = False) -> None:
+        try:
+            self.connection_pool.putconn(conn, close=close)
+        finally:
+            self._connection_slots.release()
 
     @contextmanager
     def get_cursor(self, dict_cursor=True):
@@ -156,12 +231,183 @@ class VTTIPostgresClient:
         Returns:
             List of dictionaries representing rows
         """
-        with self.get_cursor() as cursor:
-            cursor.execute(query, params)
+        with self.get_cursor() as cursor, self._execute(cursor, query, params) as timer:
             results = cursor.fetchall()
+            timer.rows = len(results)
             # Convert RealDictRow to plain dict to avoid serialization issues
             return [dict(row) for row in results]
 
+    @contextmanager
+    def _execute(self, cursor, query: Any, params: Any):
+        """
+        Execute a read statement as the first of its transaction, through a
+        prepared statement once it recurs, and record it in query_stats.
+
+        Yields the QueryTimer; set ``timer.rows`` once the rows are fetched.
+        """
+        text = _query_text(query, cursor.connection)
+        with query_stats.timed(text) as timer:
+            timer.prepared = self.statements.execute(cursor, text, params)
+            yield timer
+
+    def execute_query_rows(
+        self, query: Any, params: Any = None
+    ) -> Tuple[List[str], List[tuple]]:
+        """
+        Execute a SELECT query and return ``(column names, rows as tuples)``.
+
+        Lean counterpart of execute_query: rows stay the driver's tuples,
+        with no per-row dictionary.
+        """
+        with self.get_cursor(dict_cursor=False) as cursor, self._execute(
+            cursor, query, params
+        ) as timer:
+            rows = cursor.fetchall()
+            timer.rows = len(rows)
+            return [column.name for column in cursor.description], rows
+
+    def execute_query_frame(self, query: Any, params: Any = None) -> pd.DataFrame:
+        """
+        Execute a SELECT query and return the result as a DataFrame.
+
+        Built straight from the driver's row tuples, so a large aggregate is
+        materialized twice (tuples, frame) instead of three times (dict rows,
+        copied dicts, frame). An empty result keeps its columns.
+        """
+        columns, rows = self.execute_query_rows(query, params)
+        return rows_to_frame(columns, rows)
+
+    def iter_query_batches(
+        self, query: Any, params: Any = None, batch_size: int = 10000
+    ) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """
+        Stream a SELECT through a server-side (named) cursor, yielding
+        ``(column names, rows as tuples)`` for at most ``batch_size`` rows at
+        a time, so only one batch is held in memory.
+
+        The generator holds a pooled connection until it is exhausted or
+        closed; closing it early rolls the read transaction back.
+
+        Usage:
+            for columns, rows in client.iter_query_batches(query, params):
+                ...
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor(name=f"vtti_stream_{uuid.uuid4().hex}")
+            cursor.itersize = batch_size
+            try:
+                with query_stats.timed(_query_text(query, conn)) as timer:
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        timer.rows += len(rows)
+                        yield [column.name for column in cursor.description], rows
+                cursor.close()
+                conn.commit()
+            except BaseException:
+                # Includes GeneratorExit when the caller stops early
+                cursor.close()
+                conn.rollback()
+                raise
+
+    def execute_queries(
+        self,
+        queries: Sequence[Tuple[Any, Any]],
+        timeout: Optional[float] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run independent SELECT queries concurrently, each on its own pooled
+        connection, and return their rows in the order given.
+
+        The batch shares one deadline of ``timeout`` seconds (default
+        VTTI_DB_QUERY_DEADLINE_SECONDS). If it passes, or a query fails,
+        queries not yet started are dropped, running ones are cancelled on
+        the server, and QueryDeadlineExceeded (or the first error) is raised.
+        Connections whose query was cancelled are closed rather than
+        returned to the pool.
+
+        Each call runs on its own short-lived threads, one per query, so
+        concurrent requests do not queue behind each other. A query that
+        finds every pooled connection in use waits for one within the same
+        deadline instead of failing with "connection pool exhausted".
+
+        Args:
+            queries: (query, params) pairs as for execute_query
+            timeout: Seconds until the whole batch is abandoned
+
+        Returns:
+            One list of row dictionaries per query
+        """
+        if timeout is None:
+            from ..core.config import settings
+
+            timeout = settings.VTTI_DB_QUERY_DEADLINE_SECONDS
+
+        if not queries:
+            return []
+
+        deadline_at = time.monotonic() + timeout
+        running: Dict[int, Any] = {}
+        running_lock = threading.Lock()
+        abandoned = threading.Event()
+
+        def run(index: int, query: Any, params: Any) -> List[Dict[str, Any]]:
+            conn = None
+            if not abandoned.is_set():
+                conn = self._getconn(deadline_at - time.monotonic())
+            if conn is None or abandoned.is_set():
+                if conn is not None:
+                    self._putconn(conn)
+                raise QueryDeadlineExceeded("query batch abandoned before it started")
+            with running_lock:
+                running[index] = conn
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor, self._execute(
+                    cursor, query, params
+                ) as timer:
+                    rows = [dict(row) for row in cursor.fetchall()]
+                    timer.rows = len(rows)
+                conn.commit()
+                return rows
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                with running_lock:
+                    del running[index]
+                # A cancel request may still be in flight; never reuse the connection
+                self._putconn(conn, close=abandoned.is_set())
+
+        executor = ThreadPoolExecutor(
+            max_workers=len(queries), thread_name_prefix="db-fanout"
+        )
+        try:
+            futures = [
+                executor.submit(run, index, query, params)
+                for index, (query, params) in enumerate(queries)
+            ]
+            done, pending = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+        finally:
+            # Cancelled queries finish on their own threads; don't wait for them
+            executor.shutdown(wait=False)
+        failed = next((f for f in futures if f in done and f.exception() is not None), None)
+        if pending:
+            abandoned.set()
+            for future in pending:
+                future.cancel()
+            with running_lock:
+                for conn in running.values():
+                    conn.cancel()
+            if failed is None:
+                raise QueryDeadlineExceeded(
+                    f"{len(pending)} of {len(futures)} queries unfinished after {timeout}s"
+                )
+        if failed is not None:
+            raise failed.exception()
+        return [future.result() for future in futures]
+
     def execute_update(self, query: str, params: Any = None) -> int:
         """
         Execute an INSERT, UPDATE, or DELETE query.
@@ -173,8 +419,11 @@ class VTTIPostgresClient:
         Returns:
             Number of rows affected
         """
-        with self.get_cursor() as cursor:
+        with self.get_cursor() as cursor, query_stats.timed(
+            _query_text(query, cursor.connection)
+        ) as timer:
             cursor.execute(query, params)
+            timer.rows = cursor.rowcount
             return cursor.rowcount
 
     def close(self):
@@ -184,6 +433,16 @@ class VTTIPostgresClient:
             logger.info("✓ All database connections closed")
 
 
+def _query_text(query: Any, conn: Any) -> str:
+    """SQL text of a query string or psycopg2.sql Composable."""
+    return query if isinstance(query, str) else query.as_string(conn)
+
+
+def rows_to_frame(columns: List[str], rows: List[tuple]) -> pd.DataFrame:
+    """DataFrame from row tuples and their column names (see execute_query_rows)."""
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=False)
+
+
 # Global database client instance
 _db_client: Optional[VTTIPostgresClient] = None
 
@@ -9,6 +9,7 @@ import pandas as pd
 import numpy as np
 from .trino_client import trino_client
 from .data_collection import collect_baseline_events, _trino_string_literal
+from .kinematics import group_features
 
 
 def calculate_heading_change_rate(heading_series):
@@ -16,23 +17,16 @@ def calculate_heading_change_rate(heading_series):
     Calculate rate of heading changes as a proxy for weaving behavior.
     Returns standard deviation of heading changes.
     """
-    if len(heading_series) < 2:
-        return 0.0
-
-    headings = heading_series.dropna().values
+    headings = heading_series.dropna().to_numpy(dtype=float)
     if len(headings) < 2:
         return 0.0
 
-    # Calculate angular differences (handle circular nature of heading)
-    diffs = []
-    for i in range(1, len(headings)):
-        diff = abs(headings[i] - headings[i-1])
-        # Handle wrap-around (e.g., 359° to 1° is a 2° change, not 358°)
-        if diff > 180:
-            diff = 360 - diff
-        diffs.append(diff)
+    # Angular differences (handle circular nature of heading):
+    # 359° to 1° is a 2° change, not 358°
+    diffs = np.abs(np.diff(headings))
+    diffs = np.where(diffs > 180, 360 - diffs, diffs)
 
-    return np.std(diffs) if len(diffs) > 0 else 0.0
+    return float(np.std(diffs))
 
 
 def collect_bsm_features(
@@ -69,19 +63,23 @@ def collect_bsm_features(
         print(f"✓ Retrieved {len(df):,} BSM records")
         df['time'] = pd.to_datetime(df['time'], utc=True)
         df['time_15min'] = df['time'].dt.floor('15min')
-        df['hard_braking'] = df['brake_applied_status'].apply(
-            lambda x: 1 if pd.notna(x) and (int(x) & 0x04) else 0)
+        # Full-resolution message time for the per-vehicle kinematics
+        df['timestamp'] = pd.to_datetime(df['publish_timestamp'], unit='us')
+        brake_status = pd.to_numeric(df['brake_applied_status'], errors='coerce').fillna(0)
+        df['hard_braking'] = ((brake_status.astype(np.int64) & 0x04) != 0).astype(np.int64)
 
         grouped = df.groupby(['intersection', 'time_15min'])
         features = grouped.agg({
             'vehicle_id': 'nunique', 'speed': ['mean', 'std'], 'hard_braking': 'sum',
-            'heading': lambda x: calculate_heading_change_rate(x),
             'accel_lon': 'std', 'accel_lat': 'std'
         }).reset_index()
 
         features.columns = ['intersection', 'time_15min', 'vehicle_count', 'avg_speed',
-                            'speed_variance', 'hard_braking_count', 'heading_change_rate',
+                            'speed_variance', 'hard_braking_count',
                             'accel_lon_variance', 'accel_lat_variance']
+        motion = group_features(df, grouped)
+        features.insert(6, 'heading_change_rate', motion.pop('heading_change_rate').to_numpy())
+        features = pd.concat([features, motion], axis=1)
         features['hour_of_day'] = features['time_15min'].dt.hour
         features['day_of_week'] = features['time_15min'].dt.dayofweek
         print(f"✓ Generated {len(features)} 15-minute feature records")
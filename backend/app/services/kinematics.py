@@ -0,0 +1,199 @@
+"""
+Kinematics
+==========
+Grouped, vectorized motion features for BSM batches.
+
+The feature extractors aggregate BSMs per (intersection, interval) group.
+Instead of applying a Python function to every group, the functions here
+work on whole columns plus an integer group id per row (``groupby.ngroup()``)
+and reduce with ``np.bincount`` / sorted segment boundaries:
+
+- heading_change_rate: the extractors' weaving proxy, std of the wrapped
+  differences between consecutive headings of a group (row order).
+- kinematic_features: per-vehicle motion within each group, from rows
+  sorted by (group, vehicle, timestamp) and ``np.diff`` inside each
+  (group, vehicle) segment:
+
+  * ``yaw_rate_p95``: 95th percentile of |wrapped heading delta| / dt (deg/s)
+  * ``accel_p5`` / ``accel_p50`` / ``accel_p95``: percentiles of the
+    acceleration derived from consecutive speeds (speed units per second)
+  * ``jerk_abs_p95``: 95th percentile of |d accel / dt|
+  * ``hard_braking_max_streak``: longest run of consecutive hard-braking
+    messages of one vehicle
+  * ``hard_braking_episodes``: number of such runs
+
+Pairs with a zero or negative time step (duplicate timestamps) do not give
+a rate. Groups without any value get 0, like the other extractor features.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+KINEMATIC_COLUMNS = [
+    'yaw_rate_p95', 'accel_p5', 'accel_p50', 'accel_p95', 'jerk_abs_p95',
+    'hard_braking_max_streak', 'hard_braking_episodes',
+]
+
+
+def wrap_heading_delta(delta: np.ndarray) -> np.ndarray:
+    """Signed heading change in degrees, wrapped to [-180, 180)."""
+    return (np.asarray(delta, dtype=float) + 180.0) % 360.0 - 180.0
+
+
+def heading_change_rate(headings, group: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Per group: std of the absolute differences between consecutive non-null
+    headings (in row order), with 359 -> 1 counting as 2 degrees; 0 for
+    groups with fewer than two headings.
+
+    Same values as calculate_heading_change_rate applied to every group.
+    """
+    headings = np.asarray(headings, dtype=float)
+    group = np.asarray(group, dtype=np.int64)
+    valid = ~np.isnan(headings)
+    headings, group = headings[valid], group[valid]
+
+    # Stable: rows of a group keep their order
+    order = np.argsort(group, kind='stable')
+    headings, group = headings[order], group[order]
+
+    same = group[1:] == group[:-1]
+    diffs = np.abs(headings[1:] - headings[:-1])[same]
+    diffs = np.where(diffs > 180, 360 - diffs, diffs)
+    return _group_std(diffs, group[1:][same], n_groups)
+
+
+def kinematic_features(
+    df: pd.DataFrame,
+    group: np.ndarray,
+    n_groups: int,
+    vehicle_col: str = 'vehicle_id',
+    time_col: str = 'timestamp',
+) -> pd.DataFrame:
+    """
+    Per-vehicle kinematic features of each group (rows 0..n_groups-1, see
+    KINEMATIC_COLUMNS), from ``speed``, ``heading`` and ``hard_braking``.
+    """
+    group = np.asarray(group, dtype=np.int64)
+    vehicle, _ = pd.factorize(df[vehicle_col])
+    time_s = _seconds(df[time_col])
+
+    order = np.lexsort((time_s, vehicle, group))
+    group, vehicle, time_s = group[order], vehicle[order], time_s[order]
+    speed = _column(df, 'speed')[order]
+    heading = _column(df, 'heading')[order]
+    hard_braking = _column(df, 'hard_braking')[order] > 0
+
+    # Consecutive messages of one vehicle within one group
+    same = (group[1:] == group[:-1]) & (vehicle[1:] == vehicle[:-1])
+    dt = np.diff(time_s)
+    step = same & (dt > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        yaw_rate = np.where(step, np.abs(wrap_heading_delta(np.diff(heading))) / dt, np.nan)
+        accel = np.where(step, np.diff(speed) / dt, np.nan)
+        # Jerk between consecutive accelerations of the same segment,
+        # over the time between their midpoints
+        mid_dt = (dt[1:] + dt[:-1]) / 2
+        jerk = np.where(step[1:] & step[:-1], np.diff(accel) / mid_dt, np.nan)
+    pair_group = group[1:]
+
+    features: Dict[str, np.ndarray] = {
+        'yaw_rate_p95': _group_percentile(yaw_rate, pair_group, n_groups, 95),
+        'accel_p5': _group_percentile(accel, pair_group, n_groups, 5),
+        'accel_p50': _group_percentile(accel, pair_group, n_groups, 50),
+        'accel_p95': _group_percentile(accel, pair_group, n_groups, 95),
+        'jerk_abs_p95': _group_percentile(np.abs(jerk), group[2:], n_groups, 95),
+    }
+
+    # Runs of hard braking within a (group, vehicle) segment
+    segment_start = np.concatenate([[True], ~same])
+    run_start = hard_braking & (segment_start | ~np.concatenate([[False], hard_braking[:-1]]))
+    run_id = np.cumsum(run_start) - 1
+    run_length = np.bincount(run_id[hard_braking], minlength=int(run_start.sum()))
+    run_group = group[run_start]
+    max_streak = np.zeros(n_groups, dtype=np.int64)
+    np.maximum.at(max_streak, run_group, run_length)
+    features['hard_braking_max_streak'] = max_streak
+    features['hard_braking_episodes'] = np.bincount(run_group, minlength=n_groups).astype(np.int64)
+
+    return pd.DataFrame(features, columns=KINEMATIC_COLUMNS)
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+
+
+def _seconds(times: pd.Series) -> np.ndarray:
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        times = pd.to_datetime(times)
+    if getattr(times.dt, 'tz', None) is not None:
+        times = times.dt.tz_convert(None)
+    ns = times.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(float)
+    ns[times.isna().to_numpy()] = np.nan
+    return ns / 1e9
+
+
+def _group_std(values: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    """Population std per group; 0 for empty groups."""
+    counts = np.bincount(group, minlength=n_groups)
+    sums = np.bincount(group, weights=values, minlength=n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts
+    squares = np.bincount(group, weights=(values - means[group]) ** 2, minlength=n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, np.sqrt(squares / counts), 0.0)
+
+
+def _group_percentile(
+    values: np.ndarray, group: np.ndarray, n_groups: int, percentile: float
+) -> np.ndarray:
+    """Linear-interpolated percentile per group (as np.percentile); 0 for empty groups."""
+    valid = ~np.isnan(values)
+    values, group = values[valid], group[valid]
+    result = np.zeros(n_groups)
+    if len(values) == 0:
+        return result
+
+    order = np.lexsort((values, group))
+    values, group = values[order], group[order]
+    counts = np.bincount(group, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    present = np.flatnonzero(counts)
+
+    position = (counts[present] - 1) * (percentile / 100.0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, counts[present] - 1)
+    low = values[starts[present] + lower]
+    high = values[starts[present] + upper]
+    result[present] = low + (high - low) * (position - lower)
+    return result
+
+
+def group_features(
+    df: pd.DataFrame,
+    grouped,
+    vehicle_col: str = 'vehicle_id',
+    time_col: str = 'timestamp',
+) -> pd.DataFrame:
+    """
+    heading_change_rate and KINEMATIC_COLUMNS for the groups of
+    ``grouped = df.groupby(...)``, one row per group in the order of
+    ``grouped.agg(...).reset_index()``.
+    """
+    group = grouped.ngroup().to_numpy(dtype=float)
+    # Rows of groups the groupby drops (missing keys with dropna=True)
+    keep = ~np.isnan(group)
+    if not keep.all():
+        df, group = df[keep], group[keep]
+    group = group.astype(np.int64)
+    n_groups = grouped.ngroups
+
+    features = kinematic_features(df, group, n_groups, vehicle_col=vehicle_col, time_col=time_col)
+    features.insert(0, 'heading_change_rate', heading_change_rate(_column(df, 'heading'), group, n_groups))
+    return features
@@ -0,0 +1,144 @@
+"""
+MapDataIndex
+============
+Grid index over MapData intersection reference points for mapping BSM/PSM
+positions to intersections.
+
+map_to_intersection used to compare each message against every ref point of
+every MapData message. The index buckets ref points into square cells twice
+the match threshold wide, so a position only needs the ref points of its
+own and the eight neighbouring cells, and it looks up whole coordinate
+arrays at once with NumPy (one pass per neighbour cell and cell slot rather
+than one Python loop per message).
+
+Matching is unchanged: a position matches a ref point when both the
+latitude and longitude differences are below the threshold, and when
+several ref points match, the one that comes first in MapData order wins.
+
+Indexes are cached by MapData content, so a processor that passes the same
+MapData every minute reuses one index until the MapData changes.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ~100 meters in degrees
+DEFAULT_THRESHOLD_DEG = 0.001
+
+_OFFSET = 2**31
+_SPAN = 2**32
+
+RefPoints = Tuple[Tuple[str, float, float], ...]
+
+
+def mapdata_ref_points(mapdata_list: Optional[List[Dict]]) -> RefPoints:
+    """``(intersection id, lat, lon)`` of every MapData ref point, in order."""
+    points = []
+    for mapdata in mapdata_list or ():
+        if 'intersections' not in mapdata:
+            continue
+        for intersection in mapdata['intersections']:
+            ref_point = intersection.get('refPoint', {})
+            ref_lat = ref_point.get('lat')
+            ref_lon = ref_point.get('lon')
+            if ref_lat is None or ref_lon is None:
+                continue
+            int_id = intersection.get('id', {})
+            if isinstance(int_id, dict):
+                int_id = int_id.get('id', intersection.get('id'))
+            points.append((str(int_id), float(ref_lat), float(ref_lon)))
+    return tuple(points)
+
+
+class MapDataIndex:
+    """Cell grid over intersection ref points with bulk lookups."""
+
+    def __init__(self, ref_points: RefPoints, threshold_deg: float = DEFAULT_THRESHOLD_DEG) -> None:
+        self.threshold = threshold_deg
+        # Twice the threshold: a match is always in an adjacent cell, even
+        # when float rounding puts a coordinate on the wrong side of an edge
+        self._cell = 2.0 * threshold_deg
+        self._ids = np.array([p[0] for p in ref_points], dtype=object)
+        self._lats = np.array([p[1] for p in ref_points], dtype=float)
+        self._lons = np.array([p[2] for p in ref_points], dtype=float)
+
+        keys = self._keys(np.floor(self._lats / self._cell), np.floor(self._lons / self._cell))
+        # Stable, so ref points sharing a cell stay in MapData order
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+        self._slots = int(np.unique(keys, return_counts=True)[1].max()) if len(keys) else 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def _keys(cell_lat: np.ndarray, cell_lon: np.ndarray) -> np.ndarray:
+        return (cell_lat.astype(np.int64) + _OFFSET) * _SPAN + (cell_lon.astype(np.int64) + _OFFSET)
+
+    def lookup(self, lats: Sequence[Any], lons: Sequence[Any]) -> np.ndarray:
+        """
+        Intersection id (or None) for each position; missing or non-numeric
+        coordinates map to None.
+        """
+        lat = _as_float_array(lats)
+        lon = _as_float_array(lons)
+        result = np.full(len(lat), None, dtype=object)
+        if len(self) == 0 or len(lat) == 0:
+            return result
+
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        cell_lat = np.where(valid, np.floor(lat / self._cell), 0.0)
+        cell_lon = np.where(valid, np.floor(lon / self._cell), 0.0)
+
+        none = len(self)
+        best = np.full(len(lat), none, dtype=np.int64)
+        for d_lat in (-1, 0, 1):
+            for d_lon in (-1, 0, 1):
+                keys = self._keys(cell_lat + d_lat, cell_lon + d_lon)
+                start = np.searchsorted(self._sorted_keys, keys, side='left')
+                end = np.searchsorted(self._sorted_keys, keys, side='right')
+                for slot in range(self._slots):
+                    position = start + slot
+                    present = valid & (position < end)
+                    ref = self._order[np.minimum(position, none - 1)]
+                    match = (
+                        present
+                        & (np.abs(lat - self._lats[ref]) < self.threshold)
+                        & (np.abs(lon - self._lons[ref]) < self.threshold)
+                    )
+                    best = np.where(match & (ref < best), ref, best)
+
+        found = best < none
+        result[found] = self._ids[best[found]]
+        return result
+
+
+def _as_float_array(values: Sequence[Any]) -> np.ndarray:
+    array = np.asarray(values)
+    if array.dtype.kind in 'fiu':
+        return array.astype(float, copy=False)
+    return pd.to_numeric(pd.Series(array, dtype=object), errors='coerce').to_numpy(dtype=float)
+
+
+_cache_lock = threading.Lock()
+_cache: Dict[Tuple[RefPoints, float], MapDataIndex] = {}
+_CACHE_SIZE = 4
+
+
+def get_mapdata_index(
+    mapdata_list: Optional[List[Dict]], threshold_deg: float = DEFAULT_THRESHOLD_DEG
+) -> MapDataIndex:
+    """The index for this MapData, built on first use and reused until it changes."""
+    key = (mapdata_ref_points(mapdata_list), threshold_deg)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is None:
+            if len(_cache) >= _CACHE_SIZE:
+                _cache.pop(next(iter(_cache)))
+            index = _cache[key] = MapDataIndex(key[0], threshold_deg)
+        return index
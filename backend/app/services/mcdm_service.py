@@ -7,18 +7,81 @@ Simplified version adapted from data-integration/mcdm_safety_index.py
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
 from .db_client import VTTIPostgresClient
+from .async_db_client import AsyncVTTIPostgresClient
+from ..core.config import settings
 from ..core.intersection_mapping import normalize_intersection_name
+from ..core.matrix_store import BinnedFrameStore
 
 logger = logging.getLogger(__name__)
 # Ensure INFO logs are shown for this module
 logger.setLevel(logging.INFO)
 
 
+class _ColumnStats:
+    """
+    Column means, population std and correlations accumulated chunk by chunk.
+
+    Chunks are merged with the pairwise (Chan et al.) update of the mean
+    and centered co-moment matrix, so memory stays O(chunk * columns)
+    however many rows are fed in.
+    """
+
+    def __init__(self, n_columns: int):
+        self.count = 0
+        self.mean = np.zeros(n_columns)
+        self.comoment = np.zeros((n_columns, n_columns))
+
+    @classmethod
+    def of(cls, matrix: np.ndarray, chunk_rows: int) -> "_ColumnStats":
+        stats = cls(matrix.shape[1])
+        for start in range(0, matrix.shape[0], chunk_rows):
+            stats.update(matrix[start : start + chunk_rows])
+        return stats
+
+    def update(self, chunk: np.ndarray) -> None:
+        n_b = chunk.shape[0]
+        if n_b == 0:
+            return
+        mean_b = chunk.mean(axis=0)
+        centered = chunk - mean_b
+        comoment_b = centered.T @ centered
+
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (n_b / n)
+        self.comoment = self.comoment + comoment_b + np.outer(delta, delta) * (n_a * n_b / n)
+        self.count = n
+
+    @property
+    def std(self) -> np.ndarray:
+        """Population standard deviation (np.std with ddof=0)."""
+        return np.sqrt(np.maximum(np.diag(self.comoment), 0.0) / max(self.count, 1))
+
+    @property
+    def corr(self) -> np.ndarray:
+        """Correlation matrix; NaN where a column has zero variance."""
+        diag = np.sqrt(np.maximum(np.diag(self.comoment), 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.comoment / np.outer(diag, diag)
+
+
+# Aggregated criteria rows per (bin_minutes, time_bin), shared by every
+# MCDMSafetyIndexService instance in the process
+mcdm_matrix_store = BinnedFrameStore(
+    (settings.MCDM_MATRIX_CACHE_MAX_MB * 1024 * 1024) if settings.CACHE_ENABLED else 0,
+    settle_seconds=settings.MCDM_MATRIX_SETTLE_SECONDS,
+    # Late rows arrive within the window the capacity sketch rescans
+    late_seconds=settings.CAPACITY_SKETCH_RESCAN_DAYS * 86400,
+    late_ttl_seconds=settings.MCDM_MATRIX_LATE_TTL_SECONDS,
+)
+
+
 class MCDMSafetyIndexService:
     """
     Multi-Criteria Decision Making (MCDM) Safety Index Calculator.
@@ -27,9 +90,20 @@ class MCDMSafetyIndexService:
     combining SAW, EDAS, and CODAS methods.
     """
 
-    def __init__(self, db_client: VTTIPostgresClient):
+    # Rows processed per chunk by normalization and CRITIC statistics
+    STATS_CHUNK_ROWS = 65536
+
+    def __init__(
+        self,
+        db_client: VTTIPostgresClient,
+        matrix_store: Optional[BinnedFrameStore] = None,
+        async_db_client: Optional[AsyncVTTIPostgresClient] = None,
+    ):
         """Initialize MCDM calculator with database client."""
         self.client = db_client
+        # Used by the *_async data-fetch methods
+        self.async_client = async_db_client
+        self.matrix_store = mcdm_matrix_store if matrix_store is None else matrix_store
         self.criteria_list = [
             "vehicle_count",
             "vru_count",
@@ -91,7 +165,7 @@ class MCDMSafetyIndexService:
             )
 
             # Collect data
-            matrix = self._collect_data_matrix(start_time, end_time, bin_minutes)
+            matrix = self._get_data_matrix(start_time, end_time, bin_minutes)
 
             logger.info(
                 f"Data matrix collected: {len(matrix)} rows, {len(matrix.columns) if len(matrix) > 0 else 0} columns"
@@ -146,10 +220,84 @@ class MCDMSafetyIndexService:
             logger.error(f"Error calculating MCDM safety scores: {e}", exc_info=True)
             return []
 
+    def _get_data_matrix(
+        self, start_time: datetime, end_time: datetime, bin_minutes: int
+    ) -> pd.DataFrame:
+        """
+        Criteria matrix for every time bin overlapping [start_time, end_time).
+
+        Served from the shared bin-aligned store; only bins it does not hold
+        yet are aggregated from the raw tables (see _collect_data_matrix).
+        """
+
+        def fetch(range_start: datetime, range_end: datetime) -> pd.DataFrame:
+            return self._prepare_fetched_matrix(
+                self._collect_data_matrix(range_start, range_end, bin_minutes)
+            )
+
+        return self.matrix_store.slice(bin_minutes, start_time, end_time, fetch)
+
+    async def _get_data_matrix_async(
+        self, start_time: datetime, end_time: datetime, bin_minutes: int
+    ) -> pd.DataFrame:
+        """
+        _get_data_matrix on the async database client; runs of bins missing
+        from the store are fetched concurrently.
+        """
+
+        async def fetch(range_start: datetime, range_end: datetime) -> pd.DataFrame:
+            return self._prepare_fetched_matrix(
+                await self._collect_data_matrix_async(range_start, range_end, bin_minutes)
+            )
+
+        return await self.matrix_store.slice_async(bin_minutes, start_time, end_time, fetch)
+
+    def _prepare_fetched_matrix(self, matrix: pd.DataFrame) -> pd.DataFrame:
+        """Fill absent criteria with 0 and coerce aggregates to floats for the store."""
+        if len(matrix) == 0:
+            return matrix
+        # Tables with no rows in this range leave their criteria out
+        for column in self.criteria_list + ["near_miss_count"]:
+            if column not in matrix.columns:
+                matrix[column] = 0.0
+        # SUM()/COUNT() come back as Decimal; store plain float columns
+        numeric = [c for c in matrix.columns if c not in ("intersection", "time_bin")]
+        matrix[numeric] = matrix[numeric].astype(float)
+        matrix["intersection"] = matrix["intersection"].astype(str)
+        return matrix
+
     def _collect_data_matrix(
         self, start_time: datetime, end_time: datetime, bin_minutes: int
     ) -> pd.DataFrame:
-        """Collect and aggregate data into criteria matrix."""
+        """
+        Collect and aggregate data into criteria matrix.
+
+        One query scans each source table once and joins the per-table
+        aggregates server-side, so a single finished criteria row per
+        (intersection, time_bin) crosses the wire. Speed mean and variance
+        are the count-weighted moments of the speed_interval midpoints
+        ('20-30 mph' -> 25; unparseable labels count as 0).
+        """
+        matrix_query, query_params = self._matrix_query(start_time, end_time, bin_minutes)
+        return self._matrix_frame(self._query_frame(matrix_query, query_params))
+
+    async def _collect_data_matrix_async(
+        self, start_time: datetime, end_time: datetime, bin_minutes: int
+    ) -> pd.DataFrame:
+        """_collect_data_matrix on the async database client."""
+        if self.async_client is None:
+            raise RuntimeError(
+                "MCDMSafetyIndexService was created without an async database client"
+            )
+        matrix_query, query_params = self._matrix_query(start_time, end_time, bin_minutes)
+        rows = await self.async_client.execute_query(matrix_query, query_params)
+        return self._matrix_frame(pd.DataFrame(rows))
+
+    @staticmethod
+    def _matrix_query(
+        start_time: datetime, end_time: datetime, bin_minutes: int
+    ) -> Tuple[str, Dict]:
+        """Single-pass criteria matrix query and its parameters."""
         # Convert timestamps to microseconds
         start_ts = int(start_time.timestamp() * 1_000_000)
         end_ts = int(end_time.timestamp() * 1_000_000)
@@ -160,144 +308,118 @@ class MCDMSafetyIndexService:
             "bin_us": bin_microseconds,
         }
 
-        # Collect vehicle count data (column is 'count', not 'vehicle_count')
-        vehicle_query = """
-        SELECT 
-            intersection,
-            FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
-            SUM(count) as vehicle_count
-        FROM "vehicle-count"
-        WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
-        GROUP BY intersection, time_bin
+        matrix_query = """
+        WITH vehicle AS (
+            SELECT
+                intersection,
+                FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
+                SUM(count) as vehicle_count
+            FROM "vehicle-count"
+            WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
+            GROUP BY intersection, time_bin
+        ),
+        vru AS (
+            SELECT
+                intersection,
+                FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
+                SUM(count) as vru_count
+            FROM "vru-count"
+            WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
+            GROUP BY intersection, time_bin
+        ),
+        speed_bins AS (
+            SELECT
+                intersection,
+                FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
+                CASE
+                    WHEN speed_interval ~ '^ *[0-9]+([.][0-9]+)? *- *[0-9]+([.][0-9]+)? *( mph)?$'
+                    THEN (
+                        split_part(replace(speed_interval, ' mph', ''), '-', 1)::float8
+                        + split_part(replace(speed_interval, ' mph', ''), '-', 2)::float8
+                    ) / 2
+                    ELSE 0.0
+                END as midpoint,
+                SUM(count)::float8 as event_count
+            FROM "speed-distribution"
+            WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
+            GROUP BY intersection, time_bin, speed_interval
+        ),
+        speed_mean AS (
+            SELECT
+                intersection,
+                time_bin,
+                SUM(event_count * midpoint) / NULLIF(SUM(event_count), 0) as avg_speed
+            FROM speed_bins
+            GROUP BY intersection, time_bin
+        ),
+        speed AS (
+            SELECT
+                b.intersection,
+                b.time_bin,
+                m.avg_speed,
+                SUM(b.event_count * (b.midpoint - m.avg_speed) ^ 2)
+                    / NULLIF(SUM(b.event_count), 0) as speed_variance
+            FROM speed_bins b
+            JOIN speed_mean m
+              ON m.intersection = b.intersection AND m.time_bin = b.time_bin
+            GROUP BY b.intersection, b.time_bin, m.avg_speed
+        ),
+        events AS (
+            SELECT
+                intersection,
+                FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
+                COUNT(*) as incident_count,
+                COUNT(*) FILTER (WHERE event_type IN ('NM-VRU', 'NM-VV')) as near_miss_count
+            FROM "safety-event"
+            WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
+            GROUP BY intersection, time_bin
+        ),
+        bins AS (
+            SELECT intersection, time_bin FROM vehicle
+            UNION SELECT intersection, time_bin FROM vru
+            UNION SELECT intersection, time_bin FROM speed
+            UNION SELECT intersection, time_bin FROM events
+        )
+        SELECT
+            k.intersection,
+            k.time_bin,
+            COALESCE(v.vehicle_count, 0) as vehicle_count,
+            COALESCE(r.vru_count, 0) as vru_count,
+            COALESCE(s.avg_speed, 0) as avg_speed,
+            COALESCE(s.speed_variance, 0) as speed_variance,
+            COALESCE(e.incident_count, 0) as incident_count,
+            COALESCE(e.near_miss_count, 0) as near_miss_count
+        FROM bins k
+        LEFT JOIN vehicle v ON v.intersection = k.intersection AND v.time_bin = k.time_bin
+        LEFT JOIN vru r ON r.intersection = k.intersection AND r.time_bin = k.time_bin
+        LEFT JOIN speed s ON s.intersection = k.intersection AND s.time_bin = k.time_bin
+        LEFT JOIN events e ON e.intersection = k.intersection AND e.time_bin = k.time_bin
+        -- No vehicle counts in the window means no usable matrix
+        WHERE EXISTS (SELECT 1 FROM vehicle)
+        ORDER BY k.time_bin, k.intersection
         """
-        vehicle_data = pd.DataFrame(self.client.execute_query(vehicle_query, query_params))
+        return matrix_query, query_params
 
-        if len(vehicle_data) == 0:
+    @staticmethod
+    def _matrix_frame(matrix: pd.DataFrame) -> pd.DataFrame:
+        if len(matrix) == 0:
             return pd.DataFrame()
 
-        # Collect VRU count data (column is 'count', not 'vru_count')
-        vru_query = """
-        SELECT 
-            intersection,
-            FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
-            SUM(count) as vru_count
-        FROM "vru-count"
-        WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
-        GROUP BY intersection, time_bin
-        """
-        vru_data = pd.DataFrame(self.client.execute_query(vru_query, query_params))
-
-        # Collect speed distribution data (column is 'speed_interval', use 'count')
-        # Aggregate speed distribution by intersection/time_bin/speed_bin to
-        # reduce rows and push work to the database.
-        speed_query = """
-        SELECT 
-            intersection,
-            FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
-            speed_interval as speed_bin,
-            SUM(count) as event_count
-        FROM "speed-distribution"
-        WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
-        GROUP BY intersection, time_bin, speed_bin
-        """
-        speed_data = pd.DataFrame(self.client.execute_query(speed_query, query_params))
-
-        # Collect incident data (use publish_timestamp, not timestamp)
-        incident_query = """
-        SELECT 
-            intersection,
-            FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
-            COUNT(*) as incident_count
-        FROM "safety-event"
-        WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
-        GROUP BY intersection, time_bin
-        """
-        incident_data = pd.DataFrame(self.client.execute_query(incident_query, query_params))
-
-        # Collect near miss data (NM-VRU or NM-VV)
-        near_miss_query = """
-        SELECT 
-            intersection,
-            FLOOR(publish_timestamp / %(bin_us)s) * %(bin_us)s as time_bin,
-            COUNT(*) as near_miss_count
-        FROM "safety-event"
-        WHERE publish_timestamp >= %(start_ts)s AND publish_timestamp < %(end_ts)s
-          AND event_type IN ('NM-VRU', 'NM-VV')
-        GROUP BY intersection, time_bin
-        """
-        near_miss_data = pd.DataFrame(
-            self.client.execute_query(near_miss_query, query_params)
-        )
-
-        # Process speed data
-        speed_stats = self._process_speed_distribution(speed_data)
-
-        # Merge all data
-        matrix = vehicle_data.merge(
-            vru_data, on=["intersection", "time_bin"], how="outer"
-        )
-        if len(speed_stats) > 0:
-            matrix = matrix.merge(
-                speed_stats, on=["intersection", "time_bin"], how="outer"
-            )
-        if len(incident_data) > 0:
-            matrix = matrix.merge(
-                incident_data, on=["intersection", "time_bin"], how="outer"
-            )
-        if len(near_miss_data) > 0:
-            matrix = matrix.merge(
-                near_miss_data, on=["intersection", "time_bin"], how="outer"
-            )
-
-        # Fill missing values
-        matrix = matrix.fillna(0)
-
         # Convert time_bin to datetime
         matrix["time_bin"] = pd.to_datetime(matrix["time_bin"], unit="us")
 
         return matrix
 
-    def _process_speed_distribution(self, speed_data: pd.DataFrame) -> pd.DataFrame:
-        """Extract avg_speed and speed_variance from speed distribution."""
-        if len(speed_data) == 0:
-            return pd.DataFrame()
-
-        def extract_midpoint(speed_bin: str) -> float:
-            """Extract midpoint from speed bin like '20-30 mph'."""
-            try:
-                parts = speed_bin.replace(" mph", "").split("-")
-                if len(parts) == 2:
-                    return (float(parts[0]) + float(parts[1])) / 2
-                return 0.0
-            except:
-                return 0.0
-
-        speed_data["midpoint"] = speed_data["speed_bin"].apply(extract_midpoint)
-
-        # Calculate weighted average and variance
-        stats = (
-            speed_data.groupby(["intersection", "time_bin"])
-            .apply(
-                lambda x: pd.Series(
-                    {
-                        "avg_speed": np.average(
-                            x["midpoint"], weights=x["event_count"]
-                        ),
-                        "speed_variance": np.average(
-                            (
-                                x["midpoint"]
-                                - np.average(x["midpoint"], weights=x["event_count"])
-                            )
-                            ** 2,
-                            weights=x["event_count"],
-                        ),
-                    }
-                )
-            )
-            .reset_index()
-        )
-
-        return stats
+    def _query_frame(self, query: str, params: Dict) -> pd.DataFrame:
+        """
+        Query result as a DataFrame, built from row tuples when the client
+        supports it (VTTIPostgresClient.execute_query_frame) rather than
+        from a list of row dicts.
+        """
+        execute_query_frame = getattr(self.client, "execute_query_frame", None)
+        if execute_query_frame is None:
+            return pd.DataFrame(self.client.execute_query(query, params))
+        return execute_query_frame(query, params)
 
     def _calculate_hybrid_mcdm(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate hybrid MCDM safety index."""
@@ -344,16 +466,27 @@ class MCDMSafetyIndexService:
         return result
 
     def _normalize_matrix(self, matrix: np.ndarray) -> np.ndarray:
-        """Normalize decision matrix using min-max normalization."""
-        normalized = np.zeros_like(matrix, dtype=float)
-        for j in range(matrix.shape[1]):
-            col = matrix[:, j]
-            min_val = np.min(col)
-            max_val = np.max(col)
-            if max_val - min_val > 0:
-                normalized[:, j] = (col - min_val) / (max_val - min_val)
-            else:
-                normalized[:, j] = 0
+        """
+        Normalize decision matrix using min-max normalization.
+
+        Written chunk by chunk into the output, so no full-size temporaries
+        are created beyond the result itself.
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        normalized = np.zeros_like(matrix)
+        if matrix.shape[0] == 0:
+            return normalized
+
+        min_val = matrix.min(axis=0)
+        span = matrix.max(axis=0) - min_val
+        constant = ~(span > 0)
+        divisor = np.where(constant, 1.0, span)
+
+        for start in range(0, matrix.shape[0], self.STATS_CHUNK_ROWS):
+            out = normalized[start : start + self.STATS_CHUNK_ROWS]
+            np.subtract(matrix[start : start + self.STATS_CHUNK_ROWS], min_val, out=out)
+            np.divide(out, divisor, out=out)
+            out[:, constant] = 0
         return normalized
 
     def _calculate_critic_weights(
@@ -362,26 +495,19 @@ class MCDMSafetyIndexService:
         """Calculate CRITIC weights."""
         if criteria is None:
             criteria = self.criteria_list
-        # Standard deviations
-        std_devs = np.std(matrix, axis=0)
+        # Standard deviations and correlations, accumulated in chunks
+        stats = _ColumnStats.of(np.asarray(matrix, dtype=float), self.STATS_CHUNK_ROWS)
+        std_devs = stats.std
 
         # If all std devs are zero, return uniform weights
         if np.all(std_devs == 0):
             return dict(zip(criteria, np.ones(len(criteria)) / len(criteria)))
 
-        # Compute correlation matrix safely, suppressing divide warnings
-        with np.errstate(divide="ignore", invalid="ignore"):
-            corr_matrix = np.corrcoef(matrix, rowvar=False)
-
         # Replace NaNs that result from zero-variance columns
-        if np.isnan(corr_matrix).any():
-            corr_matrix = np.nan_to_num(corr_matrix, nan=0.0)
+        corr_matrix = np.nan_to_num(stats.corr, nan=0.0, posinf=0.0, neginf=0.0)
 
         # Ensure diagonal is 1.0
-        try:
-            np.fill_diagonal(corr_matrix, 1.0)
-        except Exception:
-            pass
+        np.fill_diagonal(corr_matrix, 1.0)
 
         # Conflict measures: sum of (1 - correlation) per criterion
         conflicts = np.sum(1 - corr_matrix, axis=1)
@@ -457,12 +583,21 @@ class MCDMSafetyIndexService:
         euclidean = np.sqrt(np.sum((weighted_matrix - nis) ** 2, axis=1))
         taxicab = np.sum(np.abs(weighted_matrix - nis), axis=1)
 
-        # Construct relative assessment matrix
-        psi = euclidean[:, np.newaxis] - euclidean
-        psi[psi == 0] = (taxicab[:, np.newaxis] - taxicab)[psi == 0]
-
-        # Assessment scores
-        scores = np.sum(psi, axis=1)
+        # Relative assessment: psi_ij = e_i - e_j, or t_i - t_j where the
+        # Euclidean distances tie. Row sums reduce to
+        #   n * e_i - sum(e) + k_i * t_i - sum(t over i's tie group),
+        # computed from sorted groups in O(n log n) without the n x n matrix.
+        n = len(euclidean)
+        _, group, group_size = np.unique(
+            euclidean, return_inverse=True, return_counts=True
+        )
+        group_taxicab = np.bincount(group, weights=taxicab)
+        scores = (
+            n * euclidean
+            - euclidean.sum()
+            + group_size[group] * taxicab
+            - group_taxicab[group]
+        )
 
         return self._scale_to_100(scores)
 
@@ -474,8 +609,36 @@ class MCDMSafetyIndexService:
             return ((scores - min_score) / (max_score - min_score)) * 100
         return np.ones_like(scores) * 50
 
+    @staticmethod
+    def _time_window(
+        target_time: datetime, bin_minutes: int
+    ) -> Tuple[datetime, datetime, datetime]:
+        """(lookback_start, bin_start, bin_end) scored for one point in time."""
+        # Floor to nearest bin
+        bin_start = target_time.replace(
+            minute=(target_time.minute // bin_minutes) * bin_minutes,
+            second=0,
+            microsecond=0,
+        )
+        # Collect data from 1 day before for CRITIC calculation
+        return bin_start - timedelta(days=1), bin_start, bin_start + timedelta(minutes=bin_minutes)
+
+    async def get_data_matrix_for_time_async(
+        self, target_time: datetime, bin_minutes: int = 15
+    ) -> pd.DataFrame:
+        """
+        The criteria matrix calculate_safety_score_for_time scores, fetched on
+        the async database client; pass it back as ``matrix``.
+        """
+        lookback_start, _, bin_end = self._time_window(target_time, bin_minutes)
+        return await self._get_data_matrix_async(lookback_start, bin_end, bin_minutes)
+
     def calculate_safety_score_for_time(
-        self, intersection: str, target_time: datetime, bin_minutes: int = 15
+        self,
+        intersection: str,
+        target_time: datetime,
+        bin_minutes: int = 15,
+        matrix: Optional[pd.DataFrame] = None,
     ) -> Optional[Dict]:
         """
         Calculate safety score for a specific intersection at a specific time.
@@ -484,27 +647,24 @@ class MCDMSafetyIndexService:
             intersection: Intersection name
             target_time: Target datetime
             bin_minutes: Time bin size in minutes (default: 15)
+            matrix: Criteria matrix already fetched for this time (see
+                get_data_matrix_for_time_async); queried when omitted
 
         Returns:
             Dictionary with safety score details or None if no data
         """
         try:
-            # Floor to nearest bin
-            bin_start = target_time.replace(
-                minute=(target_time.minute // bin_minutes) * bin_minutes,
-                second=0,
-                microsecond=0,
-            )
-            bin_end = bin_start + timedelta(minutes=bin_minutes)
-
-            # Collect data from 1 day before for CRITIC calculation
-            lookback_start = bin_start - timedelta(days=1)
+            lookback_start, bin_start, bin_end = self._time_window(target_time, bin_minutes)
 
             logger.info(
                 f"Calculating safety score for {intersection} at {bin_start} (lookback from {lookback_start})"
             )
 
-            matrix = self._collect_data_matrix(lookback_start, bin_end, bin_minutes)
+            if matrix is None:
+                matrix = self._get_data_matrix(lookback_start, bin_end, bin_minutes)
+            else:
+                # Columns are added below; keep the caller's frame reusable
+                matrix = matrix.copy()
 
             if len(matrix) == 0:
                 logger.warning(f"No data available for {intersection} at {bin_start}")
@@ -645,7 +805,7 @@ class MCDMSafetyIndexService:
             # Collect data from 1 day before start time for CRITIC calculation
             lookback_start = start_time - timedelta(days=1)
 
-            matrix = self._collect_data_matrix(lookback_start, end_time, bin_minutes)
+            matrix = self._get_data_matrix(lookback_start, end_time, bin_minutes)
 
             if len(matrix) == 0:
                 logger.warning(
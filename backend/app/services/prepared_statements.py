@@ -0,0 +1,212 @@
+"""
+Prepared statements for VTTIPostgresClient
+==========================================
+psycopg2 interpolates parameters client-side and sends plain text, so the
+server parses and plans every RT-SI / MCDM query from scratch even though
+the same few shapes run thousands of times an hour.
+
+A statement that recurs (``threshold`` executions of the same text and
+parameter types) is turned into a server-side ``PREPARE``: its ``%s`` /
+``%(name)s`` placeholders are rewritten to ``$n`` and later calls send only
+``EXECUTE name(values)``. Prepared statements live on a connection, so each
+pooled connection (PreparingConnection) keeps its own LRU of them and
+DEALLOCATEs the least recently used beyond ``cache_size``.
+
+Parameter types are declared from the Python values the way psycopg2's
+literals would type them (timestamps, dates, integers, booleans, numerics)
+and left to server inference otherwise, so results keep the types the
+unprepared query returns. A statement the server refuses to prepare is
+remembered and always runs unprepared.
+"""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+
+_PLACEHOLDER = re.compile(r"%(?:\(([^)]*)\))?(.)", re.DOTALL)
+_PREPARABLE = re.compile(r"^\s*(select|with|values)\b", re.IGNORECASE)
+
+# Statements seen but not prepared yet; one-off queries must not pile up
+MAX_TRACKED_STATEMENTS = 10000
+
+_statement_ids = itertools.count(1)
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """psycopg2 connection carrying its own prepared-statement LRU."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: "OrderedDict[Tuple[str, Tuple[str, ...]], str]" = OrderedDict()
+
+
+def to_positional(query: str, params: Any) -> Optional[Tuple[str, List[Any]]]:
+    """
+    Rewrite psycopg2 placeholders to ``$n`` and order the values to match.
+
+    Returns None when the query and parameters do not pair up the way
+    psycopg2 expects; the caller then runs the query unprepared and lets
+    psycopg2 report the problem.
+    """
+    if params is None:
+        return query, []
+
+    named = isinstance(params, dict)
+    values: List[Any] = []
+    numbers: Dict[str, int] = {}
+    unsupported = False
+
+    def replace(match: "re.Match[str]") -> str:
+        nonlocal unsupported
+        name, conversion = match.group(1), match.group(2)
+        if conversion == "%" and name is None:
+            return "%"
+        if conversion != "s" or named != (name is not None):
+            unsupported = True
+            return match.group(0)
+        if named:
+            if name not in params:
+                unsupported = True
+                return match.group(0)
+            if name not in numbers:
+                values.append(params[name])
+                numbers[name] = len(values)
+            return f"${numbers[name]}"
+        values.append(None)
+        return f"${len(values)}"
+
+    body = _PLACEHOLDER.sub(replace, query)
+    if unsupported:
+        return None
+    if not named:
+        if len(values) != len(params):
+            return None
+        values = list(params)
+    return body, values
+
+
+def param_type(value: Any) -> str:
+    """Type psycopg2's literal for ``value`` would have; ``unknown`` to infer."""
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        if -(2**31) <= value < 2**31:
+            return "integer"
+        return "bigint" if -(2**63) <= value < 2**63 else "numeric"
+    if isinstance(value, (float, decimal.Decimal)):
+        return "numeric"
+    if isinstance(value, datetime.datetime):
+        return "timestamp" if value.tzinfo is None else "timestamptz"
+    if isinstance(value, datetime.date):
+        return "date"
+    if isinstance(value, datetime.time):
+        return "time" if value.tzinfo is None else "timetz"
+    return "unknown"
+
+
+class StatementPreparer:
+    """
+    Decides which statements to prepare and runs them on a cursor.
+
+    Shared by all connections of one client: it counts how often each
+    (statement, parameter types) pair has been seen and remembers the ones
+    the server would not prepare.
+    """
+
+    def __init__(self, threshold: int = 3, cache_size: int = 64) -> None:
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._seen: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        self._refused: set = set()
+        self._lock = threading.Lock()
+
+    def execute(self, cursor: Any, query: str, params: Any) -> bool:
+        """
+        Execute ``query`` on ``cursor``; returns True if it ran prepared.
+
+        Must be the first statement of its transaction: a failed PREPARE is
+        rolled back before the query runs unprepared.
+        """
+        conn = cursor.connection
+        cache = getattr(conn, "prepared_statements", None)
+        if cache is None or self.threshold <= 0 or not _PREPARABLE.match(query):
+            cursor.execute(query, params)
+            return False
+
+        positional = to_positional(query, params)
+        if positional is None or positional[0] in self._refused:
+            cursor.execute(query, params)
+            return False
+        body, values = positional
+        types = tuple(param_type(value) for value in values)
+        key = (body, types)
+
+        name = cache.get(key)
+        if name is None:
+            with self._lock:
+                if key not in self._seen and len(self._seen) >= MAX_TRACKED_STATEMENTS:
+                    self._seen.clear()
+                seen = self._seen[key] = self._seen.get(key, 0) + 1
+            if seen < self.threshold:
+                cursor.execute(query, params)
+                return False
+            name = self._prepare(cursor, cache, key)
+            if name is None:
+                cursor.execute(query, params)
+                return False
+        else:
+            cache.move_to_end(key)
+
+        try:
+            cursor.execute(_execute_statement(name, len(values)), values or None)
+        except psycopg2.errors.InvalidSqlStatementName:
+            # The server dropped it (e.g. DISCARD ALL); start this connection over
+            conn.rollback()
+            cache.clear()
+            cursor.execute(query, params)
+            return False
+        return True
+
+    def _prepare(self, cursor: Any, cache: "OrderedDict", key: Tuple[str, Tuple[str, ...]]) -> Optional[str]:
+        body, types = key
+        name = f"vtti_stmt_{next(_statement_ids)}"
+        declared = f" ({', '.join(types)})" if types else ""
+        try:
+            # No parameters: psycopg2 must not interpret % signs in the body
+            cursor.execute(f"PREPARE {name}{declared} AS {body}")
+        except (psycopg2.ProgrammingError, psycopg2.DataError):
+            cursor.connection.rollback()
+            with self._lock:
+                self._refused.add(body)
+            return None
+
+        cache[key] = name
+        while len(cache) > self.cache_size:
+            _, evicted = cache.popitem(last=False)
+            cursor.execute(f"DEALLOCATE {evicted}")
+        return name
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "cache_size": self.cache_size,
+            "tracked": len(self._seen),
+            "refused": len(self._refused),
+        }
+
+
+def _execute_statement(name: str, count: int) -> str:
+    if count == 0:
+        return f"EXECUTE {name}"
+    return f"EXECUTE {name} ({', '.join(['%s'] * count)})"
+
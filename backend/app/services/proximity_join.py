@@ -0,0 +1,231 @@
+"""
+Proximity join
+==============
+Spatio-temporal join used by the VCC conflict detectors: all pairs of
+positions that share a group (intersection), lie within ``window_ns`` of
+each other in time and within ``threshold_deg`` of each other in both
+latitude and longitude, either between two sets (proximity_pairs) or
+within one set, each unordered pair once (proximity_self_pairs).
+
+The detectors used to scan every candidate row once per query row
+(O(queries x candidates) per intersection). Here the candidates are
+bucketed by (group, grid cell) and sorted by time inside each bucket, so a
+query only visits the candidates of its own and the eight neighbouring
+cells that fall in its time window: two ``searchsorted`` calls per
+neighbour cell, for all queries at once. The exact coordinate test is then
+applied to that short candidate list.
+
+Comparisons are the detectors' own: ``|dt| <= window`` and strict
+``|dlat| < threshold``, ``|dlon| < threshold``, so the matches are the ones
+the row-by-row scan found.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Candidate pairs materialized at once; bounds memory on dense inputs
+MAX_CANDIDATES = 2_000_000
+
+
+class Positions(NamedTuple):
+    """Column arrays of one side of the join; ``group`` -1 never matches."""
+
+    group: np.ndarray
+    time_ns: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+
+
+def positions(df: pd.DataFrame, group: np.ndarray) -> Positions:
+    """Positions of a parsed BSM/PSM frame with precomputed group codes."""
+    return Positions(
+        group=np.asarray(group, dtype=np.int64),
+        time_ns=_datetimes(df['timestamp']).to_numpy(dtype='datetime64[ns]').view(np.int64),
+        lat=pd.to_numeric(df['lat'], errors='coerce').to_numpy(dtype=float),
+        lon=pd.to_numeric(df['lon'], errors='coerce').to_numpy(dtype=float),
+    )
+
+
+def _datetimes(values: pd.Series) -> pd.Series:
+    # pd.to_datetime rescans values that already are datetimes
+    if pd.api.types.is_datetime64_dtype(values):
+        return values
+    return pd.to_datetime(values)
+
+
+def group_codes(*columns: pd.Series) -> Tuple[np.ndarray, ...]:
+    """Shared integer codes for the values of several group columns (missing -> -1)."""
+    codes, _ = pd.factorize(pd.concat(columns, ignore_index=True))
+    splits = np.cumsum([len(column) for column in columns])[:-1]
+    return tuple(np.split(codes.astype(np.int64), splits))
+
+
+def proximity_pairs(
+    left: Positions,
+    right: Positions,
+    threshold_deg: float,
+    window_ns: int,
+    max_candidates: int = MAX_CANDIDATES,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield ``(left_index, right_index)`` arrays of matching pairs, in chunks.
+
+    Indices are positions in the input arrays. Every matching pair is
+    yielded exactly once; the order of pairs is unspecified.
+    """
+    yield from _join(left, right, threshold_deg, window_ns, max_candidates, self_join=False)
+
+
+def proximity_self_pairs(
+    points: Positions,
+    threshold_deg: float,
+    window_ns: int,
+    max_candidates: int = MAX_CANDIDATES,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield ``(i, j)`` arrays of matching pairs of distinct points, in chunks.
+
+    Each unordered pair is yielded once, in either orientation. Within a
+    cell the search sweeps forward in time only; across cells it visits
+    half of the neighbours (the other half finds the same pairs from the
+    opposite side).
+    """
+    yield from _join(points, points, threshold_deg, window_ns, max_candidates, self_join=True)
+
+
+# Neighbour cell offsets; HALF and its mirror image cover the eight neighbours
+_ALL_NEIGHBOURS = tuple((d_lat, d_lon) for d_lat in (-1, 0, 1) for d_lon in (-1, 0, 1))
+_HALF_NEIGHBOURS = ((0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _join(
+    left: Positions,
+    right: Positions,
+    threshold_deg: float,
+    window_ns: int,
+    max_candidates: int,
+    self_join: bool,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    left_rows = np.flatnonzero((left.group >= 0) & np.isfinite(left.lat) & np.isfinite(left.lon))
+    right_rows = (
+        left_rows if self_join
+        else np.flatnonzero((right.group >= 0) & np.isfinite(right.lat) & np.isfinite(right.lon))
+    )
+    if len(left_rows) == 0 or len(right_rows) == 0:
+        return
+
+    # Cells twice the threshold wide: a match is always in a neighbouring
+    # cell, even when float rounding lands a coordinate on the wrong side
+    cell = 2.0 * threshold_deg
+    r_lat_cell = np.floor(right.lat[right_rows] / cell).astype(np.int64)
+    r_lon_cell = np.floor(right.lon[right_rows] / cell).astype(np.int64)
+    l_lat_cell = np.floor(left.lat[left_rows] / cell).astype(np.int64)
+    l_lon_cell = np.floor(left.lon[left_rows] / cell).astype(np.int64)
+    l_group = left.group[left_rows]
+
+    # Dense (group, cell) bucket ids of the right side
+    lat_cells = np.unique(r_lat_cell)
+    lon_cells = np.unique(r_lon_cell)
+    bucket_keys = _bucket_key(
+        right.group[right_rows],
+        np.searchsorted(lat_cells, r_lat_cell),
+        np.searchsorted(lon_cells, r_lon_cell),
+        len(lat_cells),
+        len(lon_cells),
+    )
+    buckets, r_bucket = np.unique(bucket_keys, return_inverse=True)
+
+    # Times as dense ranks over every value compared, so (bucket, time)
+    # fits one int64 sort key
+    l_time = left.time_ns[left_rows]
+    times, time_rank = np.unique(
+        np.concatenate([right.time_ns[right_rows], l_time - window_ns, l_time + window_ns]),
+        return_inverse=True,
+    )
+    n_right, n_left = len(right_rows), len(left_rows)
+    r_rank = time_rank[:n_right]
+    from_rank = time_rank[n_right:n_right + n_left]
+    to_rank = time_rank[n_right + n_left:]
+
+    sort_key = r_bucket.astype(np.int64) * len(times) + r_rank
+    order = np.argsort(sort_key, kind='stable')
+    sort_key = sort_key[order]
+    r_sorted = right_rows[order]
+    if self_join:
+        # Each point's own position in the sorted order
+        own = np.empty(n_right, dtype=np.int64)
+        own[order] = np.arange(n_right)
+
+    neighbours = ((0, 0),) + _HALF_NEIGHBOURS if self_join else _ALL_NEIGHBOURS
+    for d_lat, d_lon in neighbours:
+        lat_pos, lat_ok = _lookup(lat_cells, l_lat_cell + d_lat)
+        lon_pos, lon_ok = _lookup(lon_cells, l_lon_cell + d_lon)
+        bucket, found = _lookup(
+            buckets, _bucket_key(l_group, lat_pos, lon_pos, len(lat_cells), len(lon_cells))
+        )
+        found &= lat_ok & lon_ok
+        base = bucket.astype(np.int64) * len(times)
+        if self_join and (d_lat, d_lon) == (0, 0):
+            # Own cell: only the points after this one (forward sweep)
+            start = own + 1
+        else:
+            start = np.searchsorted(sort_key, base + from_rank, side='left')
+        end = np.searchsorted(sort_key, base + to_rank, side='right')
+        end = np.where(found, np.maximum(end, start), start)
+
+        for query, candidate in _expand(start, end, max_candidates):
+            li = left_rows[query]
+            ri = r_sorted[candidate]
+            match = (
+                (np.abs(right.lat[ri] - left.lat[li]) < threshold_deg)
+                & (np.abs(right.lon[ri] - left.lon[li]) < threshold_deg)
+            )
+            if match.any():
+                yield li[match], ri[match]
+
+
+def any_within(
+    left: Positions, right: Positions, threshold_deg: float, window_ns: int
+) -> np.ndarray:
+    """Boolean mask of the left positions with at least one match on the right."""
+    hit = np.zeros(len(left.group), dtype=bool)
+    for li, _ in proximity_pairs(left, right, threshold_deg, window_ns):
+        hit[li] = True
+    return hit
+
+
+def _bucket_key(group, lat_pos, lon_pos, n_lat: int, n_lon: int) -> np.ndarray:
+    return (group * n_lat + lat_pos) * n_lon + lon_pos
+
+
+def _lookup(sorted_values: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Position of each value in ``sorted_values`` and whether it is present."""
+    pos = np.searchsorted(sorted_values, values)
+    clipped = np.minimum(pos, len(sorted_values) - 1)
+    return clipped, (pos < len(sorted_values)) & (sorted_values[clipped] == values)
+
+
+def _expand(
+    start: np.ndarray, end: np.ndarray, max_candidates: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """``(query, candidate)`` index pairs of the ranges ``start[q]:end[q]``, in chunks."""
+    counts = end - start
+    queries = np.flatnonzero(counts > 0)
+    if len(queries) == 0:
+        return
+    totals = np.cumsum(counts[queries])
+    first = 0
+    while first < len(queries):
+        done = totals[first - 1] if first else 0
+        # At least one query per chunk, however many candidates it has
+        last = max(int(np.searchsorted(totals, done + max_candidates, side='right')), first + 1)
+        chunk = queries[first:last]
+        sizes = counts[chunk]
+        query = np.repeat(chunk, sizes)
+        offsets = np.arange(len(query)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        yield query, start[query] + offsets
+        first = last
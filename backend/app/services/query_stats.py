@@ -0,0 +1,232 @@
+"""
+QueryStats
+==========
+Per-query latency, row and error accounting for the database clients.
+
+The services send a small set of SQL shapes over and over, with the values
+either bound as parameters or formatted into the text (bin sizes, limits,
+interval literals). Each statement is reduced to a fingerprint: string and
+numeric literals and placeholders become ``?``, ``IN (?, ?, ...)`` lists
+collapse and whitespace is normalized, so every execution of a shape lands
+in one entry.
+
+An entry counts calls, errors, rows and prepared executions and keeps a
+fixed-bucket latency histogram, from which p50/p95/p99 are estimated (as
+the upper bound of the bucket holding that rank). The number of entries is
+capped; once full, new shapes are counted under a single overflow entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+OVERFLOW_FINGERPRINT = "overflow"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\([^)]*\)s|%s|\$\d+")
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Query text with literals and placeholders replaced by ``?``."""
+    text = _STRING_LITERAL.sub("?", query)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _VALUE_LIST.sub("(?...)", text)
+
+
+def fingerprint(query: str) -> str:
+    """Stable short identifier of a query's shape (see normalize_query)."""
+    return _digest(normalize_query(query))
+
+
+def _digest(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _percentile(buckets: List[int], count: int, fraction: float, max_ms: float) -> Optional[float]:
+    """Upper bound of the bucket holding the rank; the open bucket reports the max."""
+    if count == 0:
+        return None
+    rank = fraction * count
+    seen = 0
+    for bound, hits in zip(LATENCY_BUCKETS_MS, buckets):
+        seen += hits
+        if seen >= rank:
+            return round(min(float(bound), max_ms), 3)
+    return round(max_ms, 3)
+
+
+class _Entry:
+    __slots__ = ("query", "calls", "errors", "rows", "prepared", "total_ms", "max_ms", "buckets", "last_error")
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.prepared = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.last_error: Optional[str] = None
+
+    def as_dict(self, key: str) -> Dict[str, Any]:
+        calls = self.calls
+        return {
+            "fingerprint": key,
+            "query": self.query,
+            "calls": calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "prepared_calls": self.prepared,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / calls, 3) if calls else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": _percentile(self.buckets, calls, 0.50, self.max_ms),
+            "p95_ms": _percentile(self.buckets, calls, 0.95, self.max_ms),
+            "p99_ms": _percentile(self.buckets, calls, 0.99, self.max_ms),
+            "histogram": {
+                **{f"le_{bound}": hits for bound, hits in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                "inf": self.buckets[-1],
+            },
+            "last_error": self.last_error,
+        }
+
+
+class QueryTimer:
+    """Times one execution; set ``rows`` / ``prepared`` before the block exits."""
+
+    __slots__ = ("_stats", "_query", "_started", "rows", "prepared")
+
+    def __init__(self, stats: "QueryStats", query: str) -> None:
+        self._stats = stats
+        self._query = query
+        self.rows = 0
+        self.prepared = False
+
+    def __enter__(self) -> "QueryTimer":
+        self._started = self._stats._clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed_ms = (self._stats._clock() - self._started) * 1000.0
+        self._stats.record(
+            self._query,
+            elapsed_ms,
+            rows=self.rows,
+            prepared=self.prepared,
+            # A stream the caller stopped reading early did not fail
+            error=None if exc is None or exc_type is GeneratorExit else f"{exc_type.__name__}: {exc}",
+        )
+        return False
+
+
+class QueryStats:
+    """Thread-safe per-fingerprint counters and latency histograms."""
+
+    def __init__(
+        self,
+        max_fingerprints: int = 500,
+        *,
+        max_query_chars: int = 500,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._max_fingerprints = max_fingerprints
+        self._max_query_chars = max_query_chars
+        self._clock = clock
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._since = time.time()
+
+    def timed(self, query: str) -> QueryTimer:
+        """
+        Context manager recording one execution of ``query``.
+
+        Usage:
+            with query_stats.timed(text) as timer:
+                cursor.execute(text, params)
+                rows = cursor.fetchall()
+                timer.rows = len(rows)
+        """
+        return QueryTimer(self, query)
+
+    def record(
+        self,
+        query: str,
+        elapsed_ms: float,
+        *,
+        rows: int = 0,
+        prepared: bool = False,
+        error: Optional[str] = None,
+    ) -> None:
+        normalized = normalize_query(query)
+        key = _digest(normalized)
+        bucket = len(LATENCY_BUCKETS_MS)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                bucket = index
+                break
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self._max_fingerprints:
+                    key = OVERFLOW_FINGERPRINT
+                    entry = self._entries.get(key)
+                if entry is None:
+                    text = "(other queries)" if key == OVERFLOW_FINGERPRINT else normalized
+                    entry = self._entries[key] = _Entry(text[: self._max_query_chars])
+            entry.calls += 1
+            entry.rows += rows
+            entry.prepared += int(prepared)
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            entry.buckets[bucket] += 1
+            if error is not None:
+                entry.errors += 1
+                entry.last_error = error[:200]
+
+    def snapshot(self, order_by: str = "total_ms", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per-fingerprint stats, largest ``order_by`` value first."""
+        with self._lock:
+            rows = [entry.as_dict(key) for key, entry in self._entries.items()]
+        rows.sort(key=lambda row: row[order_by] or 0, reverse=True)
+        return rows if limit is None else rows[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._since = time.time()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "fingerprints": len(entries),
+            "calls": sum(e.calls for e in entries),
+            "errors": sum(e.errors for e in entries),
+            "prepared_calls": sum(e.prepared for e in entries),
+            "total_ms": round(sum(e.total_ms for e in entries), 3),
+            "since": self._since,
+        }
+
+
+def _make_query_stats() -> QueryStats:
+    from ..core.config import settings
+
+    return QueryStats(settings.VTTI_DB_QUERY_STATS_MAX_FINGERPRINTS)
+
+
+# Global instance shared by the sync and async database clients
+query_stats = _make_query_stats()
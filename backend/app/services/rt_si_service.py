@@ -9,12 +9,17 @@ Implements the RT-SI methodology:
 5. Combined and scaled index (0-100)
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 import numpy as np
 
-from .db_client import VTTIPostgresClient
+from .db_client import QueryDeadlineExceeded, VTTIPostgresClient
+from .async_db_client import AsyncVTTIPostgresClient
+from .crash_baseline import crash_baseline_store
+from .capacity_sketch import capacity_sketch_store
+from ..core.config import settings
 from ..core.intersection_mapping import (
     normalize_intersection_name,
     reverse_lookup_intersection,
@@ -68,8 +73,34 @@ class RTSIService:
     # Assumed capacity (vehicles per 15-min bin)
     DEFAULT_CAPACITY = 500.0
 
-    def __init__(self, db_client: VTTIPostgresClient):
+    # Tunable parameters, in the column order used by parameter sweeps
+    PARAMETER_NAMES = (
+        "LAMBDA",
+        "BETA1",
+        "BETA2",
+        "BETA3",
+        "K1_SPEED",
+        "K2_VAR",
+        "K3_CONF",
+        "K4_VRU_RATIO",
+        "K5_VOL_CAPACITY",
+        "OMEGA_VRU",
+        "OMEGA_VEH",
+    )
+
+    def __init__(
+        self,
+        db_client: VTTIPostgresClient,
+        async_db_client: Optional[AsyncVTTIPostgresClient] = None,
+    ):
         self.db_client = db_client
+        # Used by the *_async data-fetch methods
+        self.async_db_client = async_db_client
+
+    def _require_async_client(self) -> AsyncVTTIPostgresClient:
+        if self.async_db_client is None:
+            raise RuntimeError("RTSIService was created without an async database client")
+        return self.async_db_client
 
     def _to_short_name(self, intersection) -> str:
         """
@@ -86,6 +117,41 @@ class RTSIService:
             pass
         return intersection
 
+    def severity_weights(self) -> Tuple[float, float, float]:
+        """(W_FATAL, W_INJURY, W_PDO), the key of a crash baseline partition."""
+        return (self.W_FATAL, self.W_INJURY, self.W_PDO)
+
+    def build_crash_baseline(self, start_year: int = 2017, end_year: int = 2024) -> int:
+        """
+        Precompute the crash baseline (weighted crashes, exposure and raw
+        rate) for every crash intersection in one grouped query.
+
+        Returns the number of intersections with crashes in the range.
+        """
+        return crash_baseline_store.build(
+            self.db_client,
+            start_year,
+            end_year,
+            self.severity_weights(),
+        )
+
+    def get_eb_params(
+        self, intersection_id: int, start_year: int = 2017, end_year: int = 2024
+    ) -> Dict:
+        """
+        Empirical Bayes parameters and stabilized rate for one intersection.
+
+        Returns dict with lambda_star, global_mean (r0), weighted_crashes,
+        exposure, raw_rate and r_hat.
+        """
+        hist = self.get_historical_crash_rate(intersection_id, start_year, end_year)
+        return {
+            "lambda_star": self.LAMBDA,
+            "global_mean": self.R0,
+            **hist,
+            "r_hat": self.compute_eb_rate(hist["raw_rate"], hist["exposure"]),
+        }
+
     def get_historical_crash_rate(
         self, intersection_id: int, start_year: int = 2017, end_year: int = 2024
     ) -> Dict:
@@ -96,7 +162,20 @@ class RTSIService:
         - weighted_crashes: severity-weighted crash count
         - exposure: total vehicle volume
         - raw_rate: crashes per vehicle
+
+        Served from the precomputed crash baseline when it covers the year
+        range and severity weights; otherwise queried directly.
         """
+        baseline = crash_baseline_store.get(
+            intersection_id, start_year, end_year, self.severity_weights()
+        )
+        if baseline is not None:
+            return {
+                "weighted_crashes": baseline["weighted_crashes"],
+                "exposure": baseline["exposure"],
+                "raw_rate": baseline["raw_rate"],
+            }
+
         # Query crashes for the intersection across the provided year range.
         params = {
             "intersection_id": intersection_id,
@@ -139,31 +218,119 @@ class RTSIService:
             "raw_rate": raw_rate,
         }
 
-    def compute_eb_rate(self, raw_rate: float, exposure: float) -> float:
+    def get_historical_crash_rates(
+        self,
+        intersection_ids: List[int],
+        start_year: int = 2017,
+        end_year: int = 2024,
+    ) -> Dict[int, Dict]:
+        """
+        Batched variant of get_historical_crash_rate.
+
+        Runs one grouped query for every crash intersection ID instead of one
+        query per intersection. IDs with no crashes in the year range get the
+        same zero-crash result the single-intersection query returns.
+
+        Returns dict mapping crash_intersection_id -> historical crash dict.
+        """
+        ids = sorted({int(i) for i in intersection_ids if i is not None})
+        if crash_baseline_store.has_partition(start_year, end_year, self.severity_weights()):
+            return {
+                i: self.get_historical_crash_rate(i, start_year, end_year) for i in ids
+            }
+
+        rates = {
+            i: {"weighted_crashes": 0.0, "exposure": 1.0, "raw_rate": 0.0}
+            for i in ids
+        }
+        if not ids:
+            return rates
+
+        query = """
+        SELECT
+            matched_intersection_id,
+            COALESCE(
+                COUNT(*) FILTER (WHERE crash_severity IN ('K', 'Fatal')) * %(w_fatal)s +
+                COUNT(*) FILTER (WHERE crash_severity IN ('A', 'B', 'Injury')) * %(w_injury)s +
+                COUNT(*) * %(w_pdo)s,
+                0
+            ) as weighted_crashes,
+            1 as exposure
+        FROM vdot_crashes_with_intersections
+        WHERE matched_intersection_id = ANY(%(intersection_ids)s)
+          AND crash_year BETWEEN %(start_year)s AND %(end_year)s
+        GROUP BY matched_intersection_id;
+        """
+        results = self.db_client.execute_query(
+            query,
+            {
+                "intersection_ids": ids,
+                "w_fatal": self.W_FATAL,
+                "w_injury": self.W_INJURY,
+                "w_pdo": self.W_PDO,
+                "start_year": start_year,
+                "end_year": end_year,
+            },
+        )
+
+        for row in results:
+            crashes = float(row["weighted_crashes"]) if row["weighted_crashes"] else 0.0
+            exposure = max(float(row["exposure"]) if row["exposure"] else 1.0, 1.0)
+            rates[int(row["matched_intersection_id"])] = {
+                "weighted_crashes": crashes,
+                "exposure": exposure,
+                "raw_rate": crashes / exposure,
+            }
+        return rates
+
+    def get_parameters(self) -> Dict[str, float]:
+        """Current values of the tunable parameters, keyed by PARAMETER_NAMES."""
+        return {name: getattr(self, name) for name in self.PARAMETER_NAMES}
+
+    def compute_eb_rate(self, raw_rate: float, exposure: float, lam=None) -> float:
         """
         Compute Empirical Bayes stabilized rate.
 
         r_hat = α * r + (1 - α) * r0
         where α = E / (E + λ)
+
+        lam overrides LAMBDA; an array of λ values yields an array of rates.
         """
-        alpha = exposure / (exposure + self.LAMBDA)
+        if lam is None:
+            lam = self.LAMBDA
+        alpha = exposure / (exposure + lam)
         r_hat = alpha * raw_rate + (1 - alpha) * self.R0
         return r_hat
 
     def get_intersection_capacity(
-        self, intersection_id, bin_minutes: int = 15, lookback_days: int = 30
+        self,
+        intersection_id,
+        bin_minutes: int = 15,
+        lookback_days: int = 30,
+        use_sketch: bool = True,
     ) -> float:
         """
         Compute intersection capacity as the 95th percentile of historical vehicle counts.
 
+        Served from the in-process capacity sketch once it is loaded; the
+        database percentile is used before that, and with use_sketch=False
+        to verify the sketch.
+
         Args:
             intersection_id: BSM intersection name (e.g., 'glebe-potomac')
             bin_minutes: Time bin size in minutes
             lookback_days: How many days of historical data to use
+            use_sketch: Answer from the capacity sketch when it covers lookback_days
 
         Returns:
             Capacity value (95th percentile of vehicle counts), or DEFAULT_CAPACITY if insufficient data
         """
+        if use_sketch and capacity_sketch_store.covers(lookback_days):
+            capacity = capacity_sketch_store.quantile(
+                self._to_short_name(intersection_id), 0.95, lookback_days
+            )
+            return capacity if capacity else self.DEFAULT_CAPACITY
+
         try:
             # Get historical vehicle counts for the last N days
             lookback_us = (
@@ -213,6 +380,62 @@ class RTSIService:
             )
             return self.DEFAULT_CAPACITY
 
+    def get_intersection_capacities(
+        self, intersections: List[str], bin_minutes: int = 15, lookback_days: int = 30
+    ) -> Dict[str, float]:
+        """
+        Batched variant of get_intersection_capacity.
+
+        Computes the 95th percentile of vehicle counts for every intersection in
+        a single grouped query. Intersections without history fall back to
+        DEFAULT_CAPACITY, as in the single-intersection path.
+
+        Returns dict mapping normalized short name -> capacity.
+        """
+        short_names = sorted({self._to_short_name(i) for i in intersections if i})
+        capacities = {name: self.DEFAULT_CAPACITY for name in short_names}
+        if not short_names:
+            return capacities
+
+        if capacity_sketch_store.covers(lookback_days):
+            for name in short_names:
+                capacity = capacity_sketch_store.quantile(name, 0.95, lookback_days)
+                if capacity:
+                    capacities[name] = capacity
+            return capacities
+
+        capacity_query = """
+        SELECT intersection,
+               PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY count) as capacity
+        FROM "vehicle-count"
+        WHERE intersection = ANY(%(intersections)s)
+          AND publish_timestamp >= (EXTRACT(EPOCH FROM NOW()) * 1000000 - %(lookback_us)s)::bigint
+        GROUP BY intersection;
+        """
+        try:
+            results = self.db_client.execute_query(
+                capacity_query,
+                {
+                    "intersections": short_names,
+                    "lookback_us": lookback_days * 24 * 60 * 60 * 1000000,
+                },
+            )
+        except Exception as e:
+            logger.warning(
+                f"Error computing batched capacity: {e}, "
+                f"using default: {self.DEFAULT_CAPACITY}"
+            )
+            return capacities
+
+        for row in results:
+            if row["capacity"]:
+                capacities[row["intersection"]] = float(row["capacity"])
+        logger.info(
+            f"Computed capacity for {len(results)}/{len(short_names)} intersections "
+            f"(95th percentile over {lookback_days} days)"
+        )
+        return capacities
+
     def get_data_at_specific_time(
         self,
         intersection_id,
@@ -449,22 +672,37 @@ class RTSIService:
             "free_flow_speed": free_flow_speed,
         }
 
+    # Returned by get_realtime_data when the lookback window has no data
+    EMPTY_REALTIME_DATA = {
+        "vehicle_count": 0,
+        "turning_count": 0,
+        "vru_count": 0,
+        "avg_speed": 0.0,
+        "speed_variance": 0.0,
+        "free_flow_speed": 30.0,
+    }
+
     def get_realtime_data(
         self,
         intersection_id,
         timestamp: datetime,
         bin_minutes: int = 15,
         lookback_hours: int = 24,
+        deadline: Optional[float] = None,
     ) -> Dict:
         """
         Get real-time traffic data for the given time bin.
         If no data available at the exact timestamp, looks back to find a previous bin with data.
 
+        The vehicle, speed and VRU queries each locate the latest bin
+        themselves, so all three run concurrently in a single round-trip.
+
         Args:
             intersection_id: Can be int (crash intersection ID) or str (BSM intersection name)
             timestamp: Time to query data for
             bin_minutes: Time bin size in minutes
             lookback_hours: Maximum hours to look back for data if exact timestamp unavailable (default: 168 = 1 week)
+            deadline: Seconds for the whole fetch (default VTTI_DB_QUERY_DEADLINE_SECONDS)
 
         Returns dict with:
         - vehicle_count: number of vehicles
@@ -478,87 +716,138 @@ class RTSIService:
         # Normalize to short-name for real-time tables
         intersection_identifier = self._to_short_name(intersection_id)
 
-        # OPTIMIZATION: Find the latest available data timestamp within lookback window
-        # in a single query instead of checking each bin sequentially
-        lookback_limit = timestamp - timedelta(hours=lookback_hours)
-        lookback_limit_us = int(lookback_limit.timestamp() * 1000000)
-        timestamp_us = int(timestamp.timestamp() * 1000000)
+        vehicle_results, speed_results, vru_results = self._execute_concurrently(
+            self._realtime_queries(
+                intersection_identifier, timestamp, bin_minutes, lookback_hours
+            ),
+            deadline,
+        )
+        if self._latest_bin_start(
+            vehicle_results, intersection_id, timestamp, lookback_hours
+        ) is None:
+            return dict(self.EMPTY_REALTIME_DATA)
+        return self._build_realtime_data(vehicle_results, speed_results, vru_results)
 
-        latest_data_query = """
-        SELECT MAX(publish_timestamp) as latest_ts
-        FROM "vehicle-count"
-        WHERE intersection = %(intersection_id)s::text
-          AND publish_timestamp >= %(lookback_limit)s
-          AND publish_timestamp <= %(timestamp)s;
-        """
+    async def get_realtime_data_async(
+        self,
+        intersection_id,
+        timestamp: datetime,
+        bin_minutes: int = 15,
+        lookback_hours: int = 24,
+        deadline: Optional[float] = None,
+    ) -> Dict:
+        """get_realtime_data on the async database client."""
+        intersection_identifier = self._to_short_name(intersection_id)
 
-        latest_result = self.db_client.execute_query(
-            latest_data_query,
-            {
-                "intersection_id": intersection_identifier,
-                "lookback_limit": lookback_limit_us,
-                "timestamp": timestamp_us,
-            },
+        vehicle_results, speed_results, vru_results = await self._execute_concurrently_async(
+            self._realtime_queries(
+                intersection_identifier, timestamp, bin_minutes, lookback_hours
+            ),
+            deadline,
         )
-
-        if not latest_result or not latest_result[0]["latest_ts"]:
-            # No data found within lookback window
-            logger.warning(
-                f"No data found for intersection {intersection_id} within {lookback_hours} hours of {timestamp}. "
-                "Returning empty data."
+        if self._latest_bin_start(
+            vehicle_results, intersection_id, timestamp, lookback_hours
+        ) is None:
+            return dict(self.EMPTY_REALTIME_DATA)
+        return self._build_realtime_data(vehicle_results, speed_results, vru_results)
+
+    def _execute_concurrently(
+        self, queries: List[Tuple[str, Dict]], deadline: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """
+        Run independent queries on separate pooled connections under one
+        deadline (VTTIPostgresClient.execute_queries). Clients without
+        execute_queries run them one after another.
+        """
+        execute_queries = getattr(self.db_client, "execute_queries", None)
+        if execute_queries is None:
+            return [self.db_client.execute_query(query, params) for query, params in queries]
+        return execute_queries(queries, timeout=deadline)
+
+    async def _execute_concurrently_async(
+        self, queries: List[Tuple[str, Dict]], deadline: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """
+        Run independent queries concurrently on the async client. Past the
+        deadline the pending queries are cancelled and QueryDeadlineExceeded
+        is raised.
+        """
+        client = self._require_async_client()
+        timeout = settings.VTTI_DB_QUERY_DEADLINE_SECONDS if deadline is None else deadline
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(client.execute_query(q, p) for q, p in queries)),
+                timeout,
             )
-            return {
-                "vehicle_count": 0,
-                "turning_count": 0,
-                "vru_count": 0,
-                "avg_speed": 0.0,
-                "speed_variance": 0.0,
-                "free_flow_speed": 30.0,
-            }
-
-        # Find the time bin that contains the latest data
-        latest_ts_us = latest_result[0]["latest_ts"]
-        latest_ts = datetime.fromtimestamp(latest_ts_us / 1000000)
-
-        # Align to bin boundaries
-        bin_microseconds = bin_minutes * 60 * 1000000
-        bin_start_us = (latest_ts_us // bin_microseconds) * bin_microseconds
-        current_timestamp = datetime.fromtimestamp(bin_start_us / 1000000)
+        except asyncio.TimeoutError:
+            raise QueryDeadlineExceeded(
+                f"{len(queries)} concurrent queries unfinished after {timeout}s"
+            ) from None
+
+    @staticmethod
+    def _realtime_queries(
+        intersection_identifier: str,
+        timestamp: datetime,
+        bin_minutes: int,
+        lookback_hours: int,
+    ) -> List[Tuple[str, Dict]]:
+        """
+        Vehicle, speed and VRU queries for the latest bin with data, in that order.
 
-        if current_timestamp != timestamp:
-            hours_back = (timestamp - current_timestamp).total_seconds() / 3600
-            logger.info(
-                f"No data at {timestamp}, using data from time bin starting at {current_timestamp} "
-                f"({hours_back:.1f} hours earlier)"
-            )
+        OPTIMIZATION: each query finds the latest available data timestamp
+        within the lookback window in the same statement (latest_bin CTE)
+        instead of checking each bin sequentially or in a separate round-trip.
+        """
+        lookback_limit = timestamp - timedelta(hours=lookback_hours)
+        params = {
+            "intersection_id": intersection_identifier,
+            "lookback_limit": int(lookback_limit.timestamp() * 1000000),
+            "timestamp": int(timestamp.timestamp() * 1000000),
+            "bin_us": bin_minutes * 60 * 1000000,
+        }
 
-        # Calculate bin time range for queries
-        end_time = current_timestamp + timedelta(minutes=bin_minutes)
-        start_time_us = int(current_timestamp.timestamp() * 1000000)
-        end_time_us = int(end_time.timestamp() * 1000000)
+        # Start of the bin holding the latest vehicle count, aligned to bin boundaries
+        latest_bin_cte = """
+        WITH latest_bin AS (
+            SELECT (MAX(publish_timestamp) / %(bin_us)s) * %(bin_us)s as start_us
+            FROM "vehicle-count"
+            WHERE intersection = %(intersection_id)s::text
+              AND publish_timestamp >= %(lookback_limit)s
+              AND publish_timestamp <= %(timestamp)s
+        )
+        """
 
         # Query vehicle count and turning movements
-        vehicle_query = """
+        vehicle_query = (
+            latest_bin_cte
+            + """
         SELECT 
-            SUM(count) as vehicle_count,
-            SUM(CASE WHEN movement IN ('LT', 'RT', 'UT') THEN count ELSE 0 END) as turning_count
-        FROM "vehicle-count"
-        WHERE intersection = %(intersection_id)s::text
-          AND publish_timestamp >= %(start_time)s
-          AND publish_timestamp < %(end_time)s;
+            b.start_us as bin_start_us,
+            SUM(v.count) as vehicle_count,
+            SUM(CASE WHEN v.movement IN ('LT', 'RT', 'UT') THEN v.count ELSE 0 END) as turning_count
+        FROM latest_bin b
+        LEFT JOIN "vehicle-count" v
+          ON v.intersection = %(intersection_id)s::text
+         AND v.publish_timestamp >= b.start_us
+         AND v.publish_timestamp < b.start_us + %(bin_us)s
+        GROUP BY b.start_us;
         """
+        )
 
         # Query speed distribution for avg speed and variance
-        speed_query = """
-        WITH speed_data AS (
+        speed_query = (
+            latest_bin_cte
+            + """
+        , speed_data AS (
             SELECT 
-                speed_interval,
-                SUM(count) as bin_count
-            FROM "speed-distribution"
-            WHERE intersection = %(intersection_id)s::text
-              AND publish_timestamp >= %(start_time)s
-              AND publish_timestamp < %(end_time)s
-            GROUP BY speed_interval
+                s.speed_interval,
+                SUM(s.count) as bin_count
+            FROM latest_bin b
+            JOIN "speed-distribution" s
+              ON s.intersection = %(intersection_id)s::text
+             AND s.publish_timestamp >= b.start_us
+             AND s.publish_timestamp < b.start_us + %(bin_us)s
+            GROUP BY s.speed_interval
         )
         SELECT 
             SUM(bin_count) as total_count,
@@ -572,42 +861,56 @@ class RTSIService:
             ) as free_flow_speed
         FROM speed_data;
         """
+        )
 
         # Query VRU count
-        vru_query = """
+        vru_query = (
+            latest_bin_cte
+            + """
         SELECT 
-            SUM(count) as vru_count
-        FROM "vru-count"
-        WHERE intersection = %(intersection_id)s::text
-          AND publish_timestamp >= %(start_time)s
-          AND publish_timestamp < %(end_time)s;
+            SUM(r.count) as vru_count
+        FROM latest_bin b
+        JOIN "vru-count" r
+          ON r.intersection = %(intersection_id)s::text
+         AND r.publish_timestamp >= b.start_us
+         AND r.publish_timestamp < b.start_us + %(bin_us)s;
         """
-
-        vehicle_results = self.db_client.execute_query(
-            vehicle_query,
-            {
-                "intersection_id": intersection_identifier,
-                "start_time": start_time_us,
-                "end_time": end_time_us,
-            },
         )
 
-        speed_results = self.db_client.execute_query(
-            speed_query,
-            {
-                "intersection_id": intersection_identifier,
-                "start_time": start_time_us,
-                "end_time": end_time_us,
-            },
-        )
-        vru_results = self.db_client.execute_query(
-            vru_query,
-            {
-                "intersection_id": intersection_identifier,
-                "start_time": start_time_us,
-                "end_time": end_time_us,
-            },
+        return [(vehicle_query, params), (speed_query, params), (vru_query, params)]
+
+    @staticmethod
+    def _latest_bin_start(
+        vehicle_results: List[Dict],
+        intersection_id,
+        timestamp: datetime,
+        lookback_hours: int,
+    ) -> Optional[datetime]:
+        """Start of the bin the realtime queries used, or None if there was no data."""
+        if not vehicle_results or vehicle_results[0]["bin_start_us"] is None:
+            # No data found within lookback window
+            logger.warning(
+                f"No data found for intersection {intersection_id} within {lookback_hours} hours of {timestamp}. "
+                "Returning empty data."
+            )
+            return None
+
+        current_timestamp = datetime.fromtimestamp(
+            int(vehicle_results[0]["bin_start_us"]) / 1000000
         )
+        if current_timestamp != timestamp:
+            hours_back = (timestamp - current_timestamp).total_seconds() / 3600
+            logger.info(
+                f"No data at {timestamp}, using data from time bin starting at {current_timestamp} "
+                f"({hours_back:.1f} hours earlier)"
+            )
+        return current_timestamp
+
+    @staticmethod
+    def _build_realtime_data(
+        vehicle_results: List[Dict], speed_results: List[Dict], vru_results: List[Dict]
+    ) -> Dict:
+        """Combine the per-table rows of one time bin into get_realtime_data's dict."""
         # Extract vehicle / turning counts
         vehicle_count = 0
         turning_count = 0
@@ -618,6 +921,7 @@ class RTSIService:
                 if vehicle_results[0]["turning_count"]
                 else 0
             )
+        avg_speed = 0.0
         free_flow_speed = 30.0  # Default
         speed_variance = 0.0
 
@@ -647,6 +951,180 @@ class RTSIService:
             "free_flow_speed": free_flow_speed,
         }
 
+    def get_realtime_data_batch(
+        self,
+        intersections: List[str],
+        timestamp: datetime,
+        bin_minutes: int = 15,
+        lookback_hours: int = 24,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Dict]:
+        """
+        Batched variant of get_realtime_data for many intersections at once.
+
+        Issues four grouped queries regardless of how many intersections are
+        requested: one to find each intersection's latest time bin within the
+        lookback window, then one each for vehicle, speed and VRU aggregates
+        joined against that per-intersection bin list. The three aggregate
+        queries run concurrently under ``deadline`` seconds (default
+        VTTI_DB_QUERY_DEADLINE_SECONDS).
+
+        Returns dict mapping normalized short name -> traffic data (same keys
+        as get_realtime_data). Intersections with no data in the lookback
+        window get the same empty defaults.
+        """
+        short_names = sorted({self._to_short_name(i) for i in intersections if i})
+        data_map = {name: dict(self.EMPTY_REALTIME_DATA) for name in short_names}
+        if not short_names:
+            return data_map
+
+        lookback_limit = timestamp - timedelta(hours=lookback_hours)
+        bin_microseconds = bin_minutes * 60 * 1000000
+
+        latest_data_query = """
+        SELECT intersection, MAX(publish_timestamp) as latest_ts
+        FROM "vehicle-count"
+        WHERE intersection = ANY(%(intersections)s)
+          AND publish_timestamp >= %(lookback_limit)s
+          AND publish_timestamp <= %(timestamp)s
+        GROUP BY intersection;
+        """
+        latest_results = self.db_client.execute_query(
+            latest_data_query,
+            {
+                "intersections": short_names,
+                "lookback_limit": int(lookback_limit.timestamp() * 1000000),
+                "timestamp": int(timestamp.timestamp() * 1000000),
+            },
+        )
+
+        # Align each intersection's latest observation to its bin start
+        bin_starts = {}
+        for row in latest_results:
+            if row["latest_ts"]:
+                latest_ts_us = int(row["latest_ts"])
+                bin_starts[row["intersection"]] = (
+                    latest_ts_us // bin_microseconds
+                ) * bin_microseconds
+
+        missing = set(short_names) - set(bin_starts)
+        if missing:
+            logger.warning(
+                f"No data found within {lookback_hours} hours of {timestamp} for "
+                f"{len(missing)} intersection(s): {sorted(missing)}. Returning empty data."
+            )
+        if not bin_starts:
+            return data_map
+
+        names = list(bin_starts.keys())
+        bin_params = {
+            "intersections": names,
+            "bin_starts": [bin_starts[n] for n in names],
+            "bin_us": bin_microseconds,
+        }
+
+        # Per-intersection bins as a relation the aggregate queries join against
+        bins_cte = """
+        WITH bins AS (
+            SELECT *
+            FROM unnest(%(intersections)s::text[], %(bin_starts)s::bigint[])
+                AS b(intersection, start_us)
+        )
+        """
+
+        vehicle_query = (
+            bins_cte
+            + """
+        SELECT
+            b.intersection,
+            SUM(v.count) as vehicle_count,
+            SUM(CASE WHEN v.movement IN ('LT', 'RT', 'UT') THEN v.count ELSE 0 END) as turning_count
+        FROM bins b
+        JOIN "vehicle-count" v
+          ON v.intersection = b.intersection
+         AND v.publish_timestamp >= b.start_us
+         AND v.publish_timestamp < b.start_us + %(bin_us)s
+        GROUP BY b.intersection;
+        """
+        )
+
+        speed_query = (
+            bins_cte
+            + """
+        , speed_data AS (
+            SELECT
+                b.intersection,
+                s.speed_interval,
+                SUM(s.count) as bin_count
+            FROM bins b
+            JOIN "speed-distribution" s
+              ON s.intersection = b.intersection
+             AND s.publish_timestamp >= b.start_us
+             AND s.publish_timestamp < b.start_us + %(bin_us)s
+            GROUP BY b.intersection, s.speed_interval
+        )
+        SELECT
+            intersection,
+            SUM(bin_count) as total_count,
+            SUM(
+                (CAST(SPLIT_PART(SPLIT_PART(speed_interval, '-', 1), ' ', 1) AS FLOAT) +
+                 CAST(SPLIT_PART(SPLIT_PART(speed_interval, '-', 2), ' ', 1) AS FLOAT)) / 2.0 * bin_count
+            ) / NULLIF(SUM(bin_count), 0) as avg_speed,
+            PERCENTILE_CONT(0.85) WITHIN GROUP (
+                ORDER BY (CAST(SPLIT_PART(SPLIT_PART(speed_interval, '-', 1), ' ', 1) AS FLOAT) +
+                         CAST(SPLIT_PART(SPLIT_PART(speed_interval, '-', 2), ' ', 1) AS FLOAT)) / 2.0
+            ) as free_flow_speed
+        FROM speed_data
+        GROUP BY intersection;
+        """
+        )
+
+        vru_query = (
+            bins_cte
+            + """
+        SELECT
+            b.intersection,
+            SUM(r.count) as vru_count
+        FROM bins b
+        JOIN "vru-count" r
+          ON r.intersection = b.intersection
+         AND r.publish_timestamp >= b.start_us
+         AND r.publish_timestamp < b.start_us + %(bin_us)s
+        GROUP BY b.intersection;
+        """
+        )
+
+        vehicle_results, speed_results, vru_results = self._execute_concurrently(
+            [(vehicle_query, bin_params), (speed_query, bin_params), (vru_query, bin_params)],
+            deadline,
+        )
+
+        for row in vehicle_results:
+            entry = data_map[row["intersection"]]
+            if row["vehicle_count"]:
+                entry["vehicle_count"] = int(row["vehicle_count"])
+                entry["turning_count"] = (
+                    int(row["turning_count"]) if row["turning_count"] else 0
+                )
+
+        for row in speed_results:
+            if not row["total_count"]:
+                continue
+            entry = data_map[row["intersection"]]
+            avg_speed = float(row["avg_speed"]) if row["avg_speed"] else 0.0
+            entry["avg_speed"] = avg_speed
+            entry["free_flow_speed"] = (
+                float(row["free_flow_speed"]) if row["free_flow_speed"] else 30.0
+            )
+            # Same approximation as get_realtime_data: 10% of avg_speed as std dev
+            entry["speed_variance"] = (avg_speed * 0.1) ** 2
+
+        for row in vru_results:
+            if row["vru_count"]:
+                data_map[row["intersection"]]["vru_count"] = int(row["vru_count"])
+
+        return data_map
+
     def compute_uplift_factors(
         self,
         avg_speed: float,
@@ -761,6 +1239,89 @@ class RTSIService:
         scaled = 100.0 * (1.0 - (COMB - min_val) / (max_val - min_val))
         return max(0.0, min(100.0, scaled))  # Clamp to 0-100
 
+    def compute_rt_si_arrays(
+        self,
+        r_hat,
+        avg_speed,
+        free_flow_speed,
+        speed_variance,
+        vehicle_count,
+        vru_count,
+        turning_count,
+        capacity,
+        params: Optional[Dict] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized uplift factors, sub-indices and combined index.
+
+        Array counterpart of compute_uplift_factors, compute_sub_indices and
+        compute_combined_index: every argument may be a scalar or an array and
+        is broadcast with NumPy, so one call scores many intersections (or
+        time bins) at once. The arithmetic mirrors the scalar methods term by
+        term, so results are identical to calling them element-wise.
+
+        params optionally overrides the BETA*, K* and OMEGA_* parameters
+        (LAMBDA only enters through r_hat). Overrides may be arrays too: a
+        (samples, 1) column of values against (bins,) traffic arrays scores
+        every parameter set for every bin in one pass.
+
+        Returns dict of arrays keyed F_speed, F_variance, F_conflict, U, G,
+        VRU_index, H, VEH_index, COMB and RT_SI.
+        """
+        epsilon = 1e-6
+        p = self.get_parameters()
+        if params:
+            p.update(params)
+
+        avg_speed = np.asarray(avg_speed, dtype=float)
+        free_flow_speed = np.asarray(free_flow_speed, dtype=float)
+        speed_variance = np.asarray(speed_variance, dtype=float)
+        vehicle_count = np.asarray(vehicle_count, dtype=float)
+        vru_count = np.asarray(vru_count, dtype=float)
+        turning_count = np.asarray(turning_count, dtype=float)
+        r_hat = np.asarray(r_hat, dtype=float)
+        capacity = np.asarray(capacity, dtype=float)
+
+        # Uplift factors
+        speed_reduction = np.maximum(0.0, free_flow_speed - avg_speed)
+        F_speed = np.minimum(
+            1.0, p["K1_SPEED"] * (speed_reduction / (free_flow_speed + epsilon))
+        )
+        F_variance = np.minimum(
+            1.0, p["K2_VAR"] * (np.sqrt(speed_variance) / (avg_speed + epsilon))
+        )
+        conflict_exposure = turning_count * vru_count
+        F_conflict = np.minimum(1.0, p["K3_CONF"] * (conflict_exposure / 1000.0))
+        U = (
+            1.0
+            + p["BETA1"] * F_speed
+            + p["BETA2"] * F_variance
+            + p["BETA3"] * F_conflict
+        )
+
+        # Sub-indices
+        G = np.minimum(1.0, p["K4_VRU_RATIO"] * (vru_count / (vehicle_count + epsilon)))
+        VRU_index = self.GAMMA * r_hat * U * G
+        H = np.minimum(1.0, p["K5_VOL_CAPACITY"] * (vehicle_count / capacity))
+        VEH_index = self.GAMMA * r_hat * U * H
+
+        # Combined index, capped at 100
+        COMB = p["OMEGA_VRU"] * VRU_index + p["OMEGA_VEH"] * VEH_index
+        RT_SI = np.minimum(100.0, COMB)
+
+        return {
+            "F_speed": F_speed,
+            "F_variance": F_variance,
+            "F_conflict": F_conflict,
+            "U": U,
+            "G": G,
+            "VRU_index": VRU_index,
+            "H": H,
+            "VEH_index": VEH_index,
+            "COMB": COMB,
+            "RT_SI": RT_SI,
+        }
+
     def calculate_rt_si(
         self,
         intersection_id: int,
@@ -768,6 +1329,7 @@ class RTSIService:
         bin_minutes: int = 15,
         realtime_intersection: Optional[str] = None,
         lookback_hours: int = 24,
+        rt_data: Optional[Dict] = None,
     ) -> Optional[Dict]:
         """
         Calculate Real-Time Safety Index for an intersection at a given time.
@@ -780,6 +1342,8 @@ class RTSIService:
             realtime_intersection: Optional string intersection name for real-time data
                                   (e.g., 'glebe-potomac'). If None, uses intersection_id.
             lookback_hours: Maximum hours to look back for data if exact timestamp unavailable (default: 168 = 1 week)
+            rt_data: get_realtime_data result already fetched (e.g. by
+                     get_realtime_data_async); queried when omitted
 
         Returns dict with all components of RT-SI calculation.
         """
@@ -800,9 +1364,10 @@ class RTSIService:
             logger.info(
                 f"RT-SI: resolved realtime_intersection for DB queries: {repr(rt_intersection)}"
             )
-            rt_data = self.get_realtime_data(
-                rt_intersection, timestamp, bin_minutes, lookback_hours
-            )
+            if rt_data is None:
+                rt_data = self.get_realtime_data(
+                    rt_intersection, timestamp, bin_minutes, lookback_hours
+                )
             logger.info(
                 f"RT-SI: realtime data for {repr(rt_intersection)} at {timestamp.isoformat()}: {rt_data}"
             )
@@ -899,45 +1464,228 @@ class RTSIService:
             )
             return None
 
+    def calculate_rt_si_batch(
+        self,
+        targets: Dict[str, int],
+        timestamp: datetime,
+        bin_minutes: int = 15,
+        lookback_hours: int = 24,
+    ) -> Dict[str, Dict]:
+        """
+        Calculate RT-SI for many intersections with a fixed number of queries.
+
+        Batched equivalent of calling calculate_rt_si once per intersection:
+        crash rates, capacities and real-time traffic are fetched with grouped
+        queries keyed by intersection, then uplift factors, sub-indices and the
+        combined index are computed as arrays over all intersections.
+
+        Args:
+            targets: Mapping of realtime intersection name (e.g. 'glebe-potomac')
+                     -> crash intersection ID for historical data
+            timestamp: Time to calculate RT-SI for
+            bin_minutes: Time bin size in minutes
+            lookback_hours: Maximum hours to look back for each intersection's latest data
+
+        Returns dict mapping realtime intersection name -> RT-SI result dict
+        (same keys as calculate_rt_si).
+
+        Query errors propagate instead of returning an empty result, so a
+        caller that keeps a previous result (the safety-index snapshot) goes
+        on serving it rather than dropping every intersection to MCDM-only.
+        """
+        if not targets:
+            return {}
+
+        names = list(targets.keys())
+        crash_ids = [targets[n] for n in names]
+        short_names = [self._to_short_name(n) for n in names]
+
+        hist_map = self.get_historical_crash_rates(crash_ids)
+        rt_map = self.get_realtime_data_batch(
+            names, timestamp, bin_minutes, lookback_hours
+        )
+        capacity_map = self.get_intersection_capacities(
+            names, bin_minutes=bin_minutes, lookback_days=30
+        )
+
+        hist_rows = [hist_map[int(c)] for c in crash_ids]
+        rt_rows = [rt_map[s] for s in short_names]
+
+        raw_rate = np.array([h["raw_rate"] for h in hist_rows], dtype=float)
+        exposure = np.array([h["exposure"] for h in hist_rows], dtype=float)
+        r_hat = self.compute_eb_rate(raw_rate, exposure)
+
+        columns = {
+            key: np.array([r[key] for r in rt_rows], dtype=float)
+            for key in (
+                "vehicle_count",
+                "turning_count",
+                "vru_count",
+                "avg_speed",
+                "speed_variance",
+                "free_flow_speed",
+            )
+        }
+        capacity = np.array(
+            [capacity_map.get(s, self.DEFAULT_CAPACITY) for s in short_names],
+            dtype=float,
+        )
+
+        idx = self.compute_rt_si_arrays(
+            r_hat,
+            columns["avg_speed"],
+            columns["free_flow_speed"],
+            columns["speed_variance"],
+            columns["vehicle_count"],
+            columns["vru_count"],
+            columns["turning_count"],
+            capacity,
+        )
+
+        results = {}
+        for i, name in enumerate(names):
+            results[name] = {
+                "intersection_id": crash_ids[i],
+                "timestamp": timestamp.isoformat(),
+                "time_bin_minutes": bin_minutes,
+                # Historical data
+                "historical_crashes": hist_rows[i]["weighted_crashes"],
+                "historical_exposure": hist_rows[i]["exposure"],
+                "raw_crash_rate": hist_rows[i]["raw_rate"],
+                "eb_crash_rate": float(r_hat[i]),
+                # Real-time data
+                "vehicle_count": rt_rows[i]["vehicle_count"],
+                "vru_count": rt_rows[i]["vru_count"],
+                "avg_speed": rt_rows[i]["avg_speed"],
+                "speed_variance": rt_rows[i]["speed_variance"],
+                "free_flow_speed": rt_rows[i]["free_flow_speed"],
+                # Uplift factors
+                "F_speed": float(idx["F_speed"][i]),
+                "F_variance": float(idx["F_variance"][i]),
+                "F_conflict": float(idx["F_conflict"][i]),
+                "uplift_factor": float(idx["U"][i]),
+                # Sub-indices
+                "VRU_exposure_ratio": float(idx["G"][i]),
+                "VRU_index": float(idx["VRU_index"][i]),
+                "vehicle_congestion_ratio": float(idx["H"][i]),
+                "VEH_index": float(idx["VEH_index"][i]),
+                # Final index
+                "combined_index": float(idx["COMB"][i]),
+                "RT_SI": float(idx["RT_SI"][i]),
+                "safety_score": float(idx["RT_SI"][i]),
+            }
+
+        logger.info(
+            f"RT-SI batch: computed {len(results)} intersections at {timestamp.isoformat()}"
+        )
+        return results
+
     def get_bulk_traffic_data(
         self,
         intersection_id,
         start_time: datetime,
         end_time: datetime,
         bin_minutes: int = 15,
+        deadline: Optional[float] = None,
     ) -> Dict[datetime, Dict]:
         """
         Get traffic data for all time bins in a range using batched queries.
         Much faster than querying each time bin individually.
 
+        The vehicle, speed and VRU queries run concurrently on separate
+        pooled connections, under one ``deadline`` in seconds (default
+        VTTI_DB_QUERY_DEADLINE_SECONDS).
+
         Returns dict mapping timestamp -> traffic data
         """
+        return self.get_bulk_traffic_data_batch(
+            [intersection_id], start_time, end_time, bin_minutes, deadline
+        )[intersection_id]
+
+    def get_bulk_traffic_data_batch(
+        self,
+        intersection_ids: List,
+        start_time: datetime,
+        end_time: datetime,
+        bin_minutes: int = 15,
+        deadline: Optional[float] = None,
+    ) -> Dict:
+        """
+        Batched variant of get_bulk_traffic_data for several intersections.
+
+        Still three grouped queries (run concurrently) however many
+        intersections are requested. Returns dict mapping each requested
+        intersection_id -> (timestamp -> traffic data).
+        """
+        short_names = {i: self._to_short_name(i) for i in intersection_ids}
+        vehicle_results, speed_results, vru_results = self._execute_concurrently(
+            self._bulk_traffic_queries(
+                sorted(set(short_names.values())), start_time, end_time, bin_minutes
+            ),
+            deadline,
+        )
+        return self._split_bulk_traffic(
+            short_names, vehicle_results, speed_results, vru_results,
+            start_time, end_time, bin_minutes,
+        )
+
+    async def get_bulk_traffic_data_async(
+        self,
+        intersection_id,
+        start_time: datetime,
+        end_time: datetime,
+        bin_minutes: int = 15,
+        deadline: Optional[float] = None,
+    ) -> Dict[datetime, Dict]:
+        """
+        get_bulk_traffic_data on the async database client; the vehicle,
+        speed and VRU queries run concurrently.
+        """
+        short_names = {intersection_id: self._to_short_name(intersection_id)}
+        vehicle_results, speed_results, vru_results = await self._execute_concurrently_async(
+            self._bulk_traffic_queries(
+                list(short_names.values()), start_time, end_time, bin_minutes
+            ),
+            deadline,
+        )
+        return self._split_bulk_traffic(
+            short_names, vehicle_results, speed_results, vru_results,
+            start_time, end_time, bin_minutes,
+        )[intersection_id]
+
+    @staticmethod
+    def _bulk_traffic_queries(
+        short_names: List[str],
+        start_time: datetime,
+        end_time: datetime,
+        bin_minutes: int,
+    ) -> List[Tuple[str, Dict]]:
+        """Vehicle, speed and VRU queries binned per intersection, in that order."""
         start_time_us = int(start_time.timestamp() * 1000000)
         end_time_us = int(end_time.timestamp() * 1000000)
         bin_microseconds = bin_minutes * 60 * 1000000
 
-        # Normalize to short-name for real-time tables
-        intersection_identifier = self._to_short_name(intersection_id)
-
-        # Single query for all vehicle data, grouped by time bin
+        # Single query for all vehicle data, grouped by intersection and time bin
         vehicle_query = """
         SELECT 
+            intersection,
             ((publish_timestamp - %(start_time)s) / %(bin_us)s) * %(bin_us)s + %(start_time)s as time_bin,
             SUM(count) as vehicle_count,
             SUM(CASE WHEN movement IN ('LT', 'RT', 'UT') THEN count ELSE 0 END) as turning_count
         FROM "vehicle-count"
-        WHERE intersection = %(intersection_id)s::text
+        WHERE intersection = ANY(%(intersections)s)
           AND publish_timestamp >= %(start_time)s
           AND publish_timestamp < %(end_time)s
-        GROUP BY time_bin
-        ORDER BY time_bin;
+        GROUP BY intersection, time_bin
+        ORDER BY intersection, time_bin;
         """
 
-        # Single query for all speed data, grouped by time bin
+        # Single query for all speed data, grouped by intersection and time bin
         # Handle both "X-Y mph" ranges and "X+" format (e.g., "91+")
         speed_query = """
         WITH binned_speed AS (
             SELECT 
+                intersection,
                 ((publish_timestamp - %(start_time)s) / %(bin_us)s) * %(bin_us)s + %(start_time)s as time_bin,
                 speed_interval,
                 SUM(count) as bin_count,
@@ -952,66 +1700,97 @@ class RTSIService:
                          CAST(SPLIT_PART(SPLIT_PART(speed_interval, '-', 2), ' ', 1) AS FLOAT)) / 2.0
                 END as speed_midpoint
             FROM "speed-distribution"
-            WHERE intersection = %(intersection_id)s::text
+            WHERE intersection = ANY(%(intersections)s)
               AND publish_timestamp >= %(start_time)s
               AND publish_timestamp < %(end_time)s
-            GROUP BY time_bin, speed_interval
+            GROUP BY intersection, time_bin, speed_interval
         )
         SELECT 
+            intersection,
             time_bin,
             SUM(bin_count) as total_count,
             SUM(speed_midpoint * bin_count) / NULLIF(SUM(bin_count), 0) as avg_speed,
             PERCENTILE_CONT(0.85) WITHIN GROUP (ORDER BY speed_midpoint) as free_flow_speed
         FROM binned_speed
-        GROUP BY time_bin
-        ORDER BY time_bin;
+        GROUP BY intersection, time_bin
+        ORDER BY intersection, time_bin;
         """
 
-        # Single query for all VRU data, grouped by time bin
+        # Single query for all VRU data, grouped by intersection and time bin
         vru_query = """
         SELECT 
+            intersection,
             ((publish_timestamp - %(start_time)s) / %(bin_us)s) * %(bin_us)s + %(start_time)s as time_bin,
             SUM(count) as vru_count
         FROM "vru-count"
-        WHERE intersection = %(intersection_id)s::text
+        WHERE intersection = ANY(%(intersections)s)
           AND publish_timestamp >= %(start_time)s
           AND publish_timestamp < %(end_time)s
-        GROUP BY time_bin
-        ORDER BY time_bin;
+        GROUP BY intersection, time_bin
+        ORDER BY intersection, time_bin;
         """
 
-        vehicle_results = self.db_client.execute_query(
-            vehicle_query,
-            {
-                "intersection_id": intersection_identifier,
-                "start_time": start_time_us,
-                "end_time": end_time_us,
-                "bin_us": bin_microseconds,
-            },
-        )
-        logger.info(f"Vehicle data: {len(vehicle_results)} time bins")
-
-        speed_results = self.db_client.execute_query(
-            speed_query,
-            {
-                "intersection_id": intersection_identifier,
-                "start_time": start_time_us,
-                "end_time": end_time_us,
-                "bin_us": bin_microseconds,
-            },
+        params = {
+            "intersections": list(short_names),
+            "start_time": start_time_us,
+            "end_time": end_time_us,
+            "bin_us": bin_microseconds,
+        }
+        return [(vehicle_query, params), (speed_query, params), (vru_query, params)]
+
+    @classmethod
+    def _split_bulk_traffic(
+        cls,
+        short_names: Dict,
+        vehicle_results: List[Dict],
+        speed_results: List[Dict],
+        vru_results: List[Dict],
+        start_time: datetime,
+        end_time: datetime,
+        bin_minutes: int,
+    ) -> Dict:
+        """Per-intersection traffic maps from the grouped bulk query rows."""
+
+        def rows_for(results: List[Dict]) -> Dict[str, List[Dict]]:
+            grouped: Dict[str, List[Dict]] = {}
+            for row in results:
+                grouped.setdefault(row["intersection"], []).append(row)
+            return grouped
+
+        vehicle_rows, speed_rows, vru_rows = (
+            rows_for(vehicle_results),
+            rows_for(speed_results),
+            rows_for(vru_results),
         )
-        logger.info(f"Speed data: {len(speed_results)} time bins")
+        return {
+            intersection_id: cls._build_bulk_traffic_map(
+                vehicle_rows.get(name, []),
+                speed_rows.get(name, []),
+                vru_rows.get(name, []),
+                start_time,
+                end_time,
+                bin_minutes,
+            )
+            for intersection_id, name in short_names.items()
+        }
 
-        vru_results = self.db_client.execute_query(
-            vru_query,
-            {
-                "intersection_id": intersection_identifier,
-                "start_time": start_time_us,
-                "end_time": end_time_us,
-                "bin_us": bin_microseconds,
-            },
+    @staticmethod
+    def _build_bulk_traffic_map(
+        vehicle_results: List[Dict],
+        speed_results: List[Dict],
+        vru_results: List[Dict],
+        start_time: datetime,
+        end_time: datetime,
+        bin_minutes: int,
+    ) -> Dict[datetime, Dict]:
+        """
+        Merge the binned per-table rows into one entry per time bin of
+        [start_time, end_time), forward-filling short gaps.
+        """
+        logger.info(
+            f"Vehicle data: {len(vehicle_results)} time bins, speed data: "
+            f"{len(speed_results)} time bins, VRU data: {len(vru_results)} time bins"
         )
-        logger.info(f"VRU data: {len(vru_results)} time bins")
 
         # Build lookup maps
         vehicle_map = {}
@@ -1141,17 +1920,160 @@ class RTSIService:
 
         return result_map
 
-    def calculate_rt_si_trend(
+    # Traffic columns consumed by the vectorized RT-SI kernel, in record order
+    TRAFFIC_COLUMNS = (
+        "vehicle_count",
+        "turning_count",
+        "vru_count",
+        "avg_speed",
+        "speed_variance",
+        "free_flow_speed",
+    )
+
+    def traffic_columns(
+        self, traffic_data_map: Dict[datetime, Dict]
+    ) -> Tuple[List[datetime], Dict[str, np.ndarray]]:
+        """
+        Convert a timestamp -> traffic dict map into sorted columnar arrays.
+
+        Returns (timestamps, columns) where columns maps each name in
+        TRAFFIC_COLUMNS to a NumPy array aligned with timestamps. Counts keep
+        an integer dtype so records built from them match the dict path.
+        """
+        timestamps = sorted(traffic_data_map.keys())
+        rows = [traffic_data_map[t] for t in timestamps]
+        columns = {}
+        for key in self.TRAFFIC_COLUMNS:
+            dtype = np.int64 if key.endswith("_count") else float
+            columns[key] = np.array([row[key] for row in rows], dtype=dtype)
+        return timestamps, columns
+
+    def compute_rt_si_columns(
+        self,
+        timestamps: List[datetime],
+        traffic: Dict[str, np.ndarray],
+        capacity: float,
+        hist_data: Dict,
+    ) -> Dict:
+        """
+        Columnar RT-SI kernel for a series of time bins.
+
+        Scores every bin in one vectorized pass (see compute_rt_si_arrays)
+        instead of building intermediate dicts per bin. The historical crash
+        rate and capacity are shared by all bins.
+
+        Returns a columnar result: "timestamp" (list of datetimes), the
+        scalar historical fields, the traffic columns and one array per index
+        column. Use rt_si_records to turn it into per-bin dicts.
+        """
+        raw_rate = hist_data["raw_rate"]
+        exposure = hist_data["exposure"]
+        r_hat = self.compute_eb_rate(raw_rate, exposure)
+
+        idx = self.compute_rt_si_arrays(
+            r_hat,
+            traffic["avg_speed"],
+            traffic["free_flow_speed"],
+            traffic["speed_variance"],
+            traffic["vehicle_count"],
+            traffic["vru_count"],
+            traffic["turning_count"],
+            capacity,
+        )
+
+        return {
+            "timestamp": list(timestamps),
+            "historical_crashes": hist_data["weighted_crashes"],
+            "historical_exposure": exposure,
+            "raw_crash_rate": raw_rate,
+            "eb_crash_rate": r_hat,
+            **{key: traffic[key] for key in self.TRAFFIC_COLUMNS},
+            "F_speed": idx["F_speed"],
+            "F_variance": idx["F_variance"],
+            "F_conflict": idx["F_conflict"],
+            "uplift_factor": idx["U"],
+            "VRU_exposure_ratio": idx["G"],
+            "VRU_index": idx["VRU_index"],
+            "vehicle_congestion_ratio": idx["H"],
+            "VEH_index": idx["VEH_index"],
+            "combined_index": idx["COMB"],
+            "RT_SI": idx["RT_SI"],
+        }
+
+    def rt_si_records(
+        self, columns: Dict, intersection_id: int, bin_minutes: int
+    ) -> List[Dict]:
+        """
+        Build per-bin RT-SI result dicts from a columnar result.
+
+        Only the serialization edge (API responses, debug payloads) should
+        need this; the keys match calculate_rt_si.
+        """
+        n = len(columns["timestamp"])
+        if n == 0:
+            return []
+
+        array_keys = (
+            "vehicle_count",
+            "vru_count",
+            "avg_speed",
+            "speed_variance",
+            "free_flow_speed",
+            "F_speed",
+            "F_variance",
+            "F_conflict",
+            "uplift_factor",
+            "VRU_exposure_ratio",
+            "VRU_index",
+            "vehicle_congestion_ratio",
+            "VEH_index",
+            "combined_index",
+            "RT_SI",
+        )
+        values = {key: np.asarray(columns[key]).tolist() for key in array_keys}
+
+        return [
+            {
+                "intersection_id": intersection_id,
+                "timestamp": columns["timestamp"][i].isoformat(),
+                "time_bin_minutes": bin_minutes,
+                "historical_crashes": columns["historical_crashes"],
+                "historical_exposure": columns["historical_exposure"],
+                "raw_crash_rate": columns["raw_crash_rate"],
+                "eb_crash_rate": columns["eb_crash_rate"],
+                "vehicle_count": values["vehicle_count"][i],
+                "vru_count": values["vru_count"][i],
+                "avg_speed": values["avg_speed"][i],
+                "speed_variance": values["speed_variance"][i],
+                "free_flow_speed": values["free_flow_speed"][i],
+                "F_speed": values["F_speed"][i],
+                "F_variance": values["F_variance"][i],
+                "F_conflict": values["F_conflict"][i],
+                "uplift_factor": values["uplift_factor"][i],
+                "VRU_exposure_ratio": values["VRU_exposure_ratio"][i],
+                "VRU_index": values["VRU_index"][i],
+                "vehicle_congestion_ratio": values["vehicle_congestion_ratio"][i],
+                "VEH_index": values["VEH_index"][i],
+                "combined_index": values["combined_index"][i],
+                "RT_SI": values["RT_SI"][i],
+                "safety_score": values["RT_SI"][i],
+            }
+            for i in range(n)
+        ]
+
+    def calculate_rt_si_trend_columns(
         self,
         intersection_id: int,
         start_time: datetime,
         end_time: datetime,
         bin_minutes: int = 15,
         realtime_intersection: Optional[str] = None,
-    ) -> List[Dict]:
+    ) -> Dict:
         """
-        Calculate RT-SI trend over a time range.
-        OPTIMIZED: Uses bulk query to fetch all data at once instead of per-bin queries.
+        Calculate RT-SI trend over a time range as a columnar result.
+
+        Fetches all bins with the bulk traffic query, then scores them with
+        the vectorized kernel. See compute_rt_si_columns for the layout.
 
         Args:
             intersection_id: Crash intersection ID for historical data
@@ -1159,11 +2081,7 @@ class RTSIService:
             end_time: End of time range
             bin_minutes: Time bin size in minutes
             realtime_intersection: Optional BSM intersection name for real-time data
-
-        Returns list of RT-SI calculations for each time bin with data.
         """
-        results = []
-
         # Calculate capacity once for all time bins (doesn't change per bin)
         rt_intersection = (
             realtime_intersection if realtime_intersection else intersection_id
@@ -1179,95 +2097,61 @@ class RTSIService:
         )
         logger.info(f"Retrieved data for {len(traffic_data_map)} time bins")
 
+        timestamps, traffic = self.traffic_columns(traffic_data_map)
+
         # Count bins with actual traffic data
-        bins_with_data = sum(
-            1
-            for v in traffic_data_map.values()
-            if v.get("vehicle_count", 0) > 0
-            or v.get("vru_count", 0) > 0
-            or v.get("avg_speed", 0) > 0
+        bins_with_data = int(
+            np.count_nonzero(
+                (traffic["vehicle_count"] > 0)
+                | (traffic["vru_count"] > 0)
+                | (traffic["avg_speed"] > 0)
+            )
         )
         logger.info(
-            f"Time bins with actual traffic data: {bins_with_data}/{len(traffic_data_map)}"
+            f"Time bins with actual traffic data: {bins_with_data}/{len(timestamps)}"
         )
 
         # Use year-only historical crash rate (same for all bins)
         hist_data = self.get_historical_crash_rate(intersection_id)
-        raw_rate = hist_data["raw_rate"]
-        exposure = hist_data["exposure"]
-        r_hat = self.compute_eb_rate(raw_rate, exposure)
-
-        # Process each time bin that has data
-        for current_time, rt_data in sorted(traffic_data_map.items()):
-            try:
-
-                # Compute uplift factors
-                uplift = self.compute_uplift_factors(
-                    rt_data["avg_speed"],
-                    rt_data["free_flow_speed"],
-                    rt_data["speed_variance"],
-                    rt_data["vehicle_count"],
-                    rt_data["vru_count"],
-                    rt_data["turning_count"],
-                )
 
-                # Compute sub-indices
-                sub_indices = self.compute_sub_indices(
-                    r_hat,
-                    uplift["U"],
-                    rt_data["vehicle_count"],
-                    rt_data["vru_count"],
-                    capacity,
-                )
-
-                # Compute combined index
-                COMB = self.compute_combined_index(
-                    sub_indices["VRU_index"], sub_indices["VEH_index"]
-                )
-
-                # Cap at 100
-                RT_SI = min(100.0, COMB)
-
-                result = {
-                    "intersection_id": intersection_id,
-                    "timestamp": current_time.isoformat(),
-                    "time_bin_minutes": bin_minutes,
-                    "historical_crashes": hist_data["weighted_crashes"],
-                    "historical_exposure": exposure,
-                    "raw_crash_rate": raw_rate,
-                    "eb_crash_rate": r_hat,
-                    "vehicle_count": rt_data["vehicle_count"],
-                    "vru_count": rt_data["vru_count"],
-                    "avg_speed": rt_data["avg_speed"],
-                    "speed_variance": rt_data["speed_variance"],
-                    "free_flow_speed": rt_data["free_flow_speed"],
-                    "F_speed": uplift["F_speed"],
-                    "F_variance": uplift["F_variance"],
-                    "F_conflict": uplift["F_conflict"],
-                    "uplift_factor": uplift["U"],
-                    "VRU_exposure_ratio": sub_indices["G"],
-                    "VRU_index": sub_indices["VRU_index"],
-                    "vehicle_congestion_ratio": sub_indices["H"],
-                    "VEH_index": sub_indices["VEH_index"],
-                    "combined_index": COMB,
-                    "RT_SI": RT_SI,
-                    "safety_score": RT_SI,
-                }
-
-                results.append(result)
-
-            except Exception as e:
-                logger.error(
-                    f"Error calculating RT-SI for time bin {current_time}: {e}",
-                    exc_info=True,
-                )
+        columns = self.compute_rt_si_columns(timestamps, traffic, capacity, hist_data)
 
         logger.info(
             f"Calculated RT-SI trend for intersection {intersection_id}: "
-            f"{len(results)} time bins processed, {len(results)} results from {start_time} to {end_time}"
+            f"{len(timestamps)} time bins processed from {start_time} to {end_time}"
         )
+        return columns
 
-        return results
+    def calculate_rt_si_trend(
+        self,
+        intersection_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        bin_minutes: int = 15,
+        realtime_intersection: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Calculate RT-SI trend over a time range.
+        OPTIMIZED: Uses bulk query to fetch all data at once instead of per-bin
+        queries, and scores all bins in one vectorized pass.
+
+        Args:
+            intersection_id: Crash intersection ID for historical data
+            start_time: Start of time range
+            end_time: End of time range
+            bin_minutes: Time bin size in minutes
+            realtime_intersection: Optional BSM intersection name for real-time data
+
+        Returns list of RT-SI calculations for each time bin with data.
+        """
+        columns = self.calculate_rt_si_trend_columns(
+            intersection_id,
+            start_time,
+            end_time,
+            bin_minutes=bin_minutes,
+            realtime_intersection=realtime_intersection,
+        )
+        return self.rt_si_records(columns, intersection_id, bin_minutes)
 
     def calculate_rt_si_from_data(
         self,
@@ -1289,78 +2173,11 @@ class RTSIService:
         Returns:
             List of RT-SI result dicts
         """
-        results = []
-
         # Use year-only historical crash rate for all bins
         hist_data = self.get_historical_crash_rate(intersection_id)
-        raw_rate = hist_data["raw_rate"]
-        exposure = hist_data["exposure"]
-        r_hat = self.compute_eb_rate(raw_rate, exposure)
-
-        for current_time, rt_data in sorted(traffic_data_map.items()):
-            try:
-
-                # Compute uplift factors
-                uplift = self.compute_uplift_factors(
-                    rt_data["avg_speed"],
-                    rt_data["free_flow_speed"],
-                    rt_data["speed_variance"],
-                    rt_data["vehicle_count"],
-                    rt_data["vru_count"],
-                    rt_data["turning_count"],
-                )
-
-                # Compute sub-indices
-                sub_indices = self.compute_sub_indices(
-                    r_hat,
-                    uplift["U"],
-                    rt_data["vehicle_count"],
-                    rt_data["vru_count"],
-                    capacity,
-                )
-
-                # Compute combined index
-                COMB = self.compute_combined_index(
-                    sub_indices["VRU_index"], sub_indices["VEH_index"]
-                )
-
-                # Cap at 100
-                RT_SI = min(100.0, COMB)
-
-                result = {
-                    "intersection_id": intersection_id,
-                    "timestamp": current_time.isoformat(),
-                    "time_bin_minutes": bin_minutes,
-                    "historical_crashes": hist_data["weighted_crashes"],
-                    "historical_exposure": exposure,
-                    "raw_crash_rate": raw_rate,
-                    "eb_crash_rate": r_hat,
-                    "vehicle_count": rt_data["vehicle_count"],
-                    "vru_count": rt_data["vru_count"],
-                    "avg_speed": rt_data["avg_speed"],
-                    "speed_variance": rt_data["speed_variance"],
-                    "free_flow_speed": rt_data["free_flow_speed"],
-                    "F_speed": uplift["F_speed"],
-                    "F_variance": uplift["F_variance"],
-                    "F_conflict": uplift["F_conflict"],
-                    "uplift_factor": uplift["U"],
-                    "VRU_exposure_ratio": sub_indices["G"],
-                    "VRU_index": sub_indices["VRU_index"],
-                    "vehicle_congestion_ratio": sub_indices["H"],
-                    "VEH_index": sub_indices["VEH_index"],
-                    "combined_index": COMB,
-                    "RT_SI": RT_SI,
-                    "safety_score": RT_SI,
-                }
-
-                results.append(result)
-
-            except Exception as e:
-                logger.warning(
-                    f"Error calculating RT-SI for time bin {current_time}: {e}"
-                )
-
-        return results
+        timestamps, traffic = self.traffic_columns(traffic_data_map)
+        columns = self.compute_rt_si_columns(timestamps, traffic, capacity, hist_data)
+        return self.rt_si_records(columns, intersection_id, bin_minutes)
 
 
 def main():
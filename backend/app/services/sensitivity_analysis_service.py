@@ -13,11 +13,11 @@ Parameters analyzed:
 """
 
 import logging
-import random
+import warnings
 from typing import Dict, List, Optional
 from datetime import datetime
 import numpy as np
-from scipy.stats import spearmanr
+from scipy.stats import qmc, rankdata
 
 from app.services.rt_si_service import RTSIService
 from app.services.mcdm_service import MCDMSafetyIndexService
@@ -34,6 +34,60 @@ class SensitivityAnalysisService:
         self.base_rt_si_service = RTSIService(db_client)
         self.base_mcdm_service = MCDMSafetyIndexService(db_client)
 
+    # Parameter sets scored per vectorized pass; bounds the (samples x bins)
+    # intermediates to a few MB regardless of n_samples
+    SWEEP_CHUNK_SIZE = 256
+
+    # Risk tier boundaries on the RT-SI scale (Critical / Low / Medium / High)
+    TIER_THRESHOLDS = (25.0, 50.0, 75.0)
+
+    def generate_parameter_matrix(
+        self,
+        perturbation_pct: float = 0.25,
+        n_samples: int = 100,
+        design: str = "random",
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Generate perturbed parameter sets as a matrix.
+
+        Args:
+            perturbation_pct: Percentage to perturb (0.25 = ±25%)
+            n_samples: Number of parameter sets to generate
+            design: "random" (uniform Monte Carlo) or "sobol" (scrambled
+                Sobol low-discrepancy sequence, better space coverage for
+                the same sample count)
+            seed: Optional seed for reproducible designs
+
+        Returns:
+            (n_samples, n_params) array, columns in RTSIService.PARAMETER_NAMES
+            order, with OMEGA and BETA groups normalized to sum to 1.0
+        """
+        names = RTSIService.PARAMETER_NAMES
+        base_params = self.base_rt_si_service.get_parameters()
+        base = np.array([base_params[name] for name in names], dtype=float)
+
+        if design == "sobol":
+            sampler = qmc.Sobol(d=len(names), scramble=True, seed=seed)
+            with warnings.catch_warnings():
+                # Balance warning for non power-of-two n is expected here
+                warnings.simplefilter("ignore", UserWarning)
+                unit = sampler.random(n_samples)
+        elif design == "random":
+            unit = np.random.default_rng(seed).random((n_samples, len(names)))
+        else:
+            raise ValueError(f"Unknown sampling design: {design}")
+
+        # Map [0, 1) onto [-perturbation_pct, +perturbation_pct]
+        matrix = base * (1.0 + (2.0 * unit - 1.0) * perturbation_pct)
+
+        col = {name: i for i, name in enumerate(names)}
+        for group in (("OMEGA_VRU", "OMEGA_VEH"), ("BETA1", "BETA2", "BETA3")):
+            idx = [col[name] for name in group]
+            matrix[:, idx] /= matrix[:, idx].sum(axis=1, keepdims=True)
+
+        return matrix
+
     def generate_parameter_perturbations(
         self, perturbation_pct: float = 0.25, n_samples: int = 100
     ) -> List[Dict]:
@@ -47,47 +101,63 @@ class SensitivityAnalysisService:
         Returns:
             List of parameter dictionaries
         """
-        base_params = {
-            "LAMBDA": self.base_rt_si_service.LAMBDA,
-            "BETA1": self.base_rt_si_service.BETA1,
-            "BETA2": self.base_rt_si_service.BETA2,
-            "BETA3": self.base_rt_si_service.BETA3,
-            "K1_SPEED": self.base_rt_si_service.K1_SPEED,
-            "K2_VAR": self.base_rt_si_service.K2_VAR,
-            "K3_CONF": self.base_rt_si_service.K3_CONF,
-            "K4_VRU_RATIO": self.base_rt_si_service.K4_VRU_RATIO,
-            "K5_VOL_CAPACITY": self.base_rt_si_service.K5_VOL_CAPACITY,
-            "OMEGA_VRU": self.base_rt_si_service.OMEGA_VRU,
-            "OMEGA_VEH": self.base_rt_si_service.OMEGA_VEH,
-        }
-
-        perturbations = []
-
-        # Include baseline
-        perturbations.append({"params": base_params.copy(), "label": "baseline"})
-
-        # Generate random perturbations
-        for i in range(n_samples):
-            perturbed = {}
-            for param, base_value in base_params.items():
-                # Random perturbation between -perturbation_pct and +perturbation_pct
-                perturbation = random.uniform(-perturbation_pct, perturbation_pct)
-                perturbed[param] = base_value * (1 + perturbation)
+        names = RTSIService.PARAMETER_NAMES
+        perturbations = [
+            {"params": self.base_rt_si_service.get_parameters(), "label": "baseline"}
+        ]
+        matrix = self.generate_parameter_matrix(perturbation_pct, n_samples)
+        for i, row in enumerate(matrix.tolist()):
+            perturbations.append(
+                {"params": dict(zip(names, row)), "label": f"perturb_{i+1}"}
+            )
+        return perturbations
 
-            # Normalize OMEGA values to sum to 1.0
-            omega_sum = perturbed["OMEGA_VRU"] + perturbed["OMEGA_VEH"]
-            perturbed["OMEGA_VRU"] /= omega_sum
-            perturbed["OMEGA_VEH"] /= omega_sum
+    def evaluate_parameter_sweep(
+        self,
+        param_matrix: np.ndarray,
+        traffic: Dict[str, np.ndarray],
+        capacity: float,
+        hist_data: Dict,
+    ) -> np.ndarray:
+        """
+        Score every parameter set for every time bin.
 
-            # Normalize BETA values to sum to 1.0
-            beta_sum = perturbed["BETA1"] + perturbed["BETA2"] + perturbed["BETA3"]
-            perturbed["BETA1"] /= beta_sum
-            perturbed["BETA2"] /= beta_sum
-            perturbed["BETA3"] /= beta_sum
+        Args:
+            param_matrix: (n_samples, n_params) array from generate_parameter_matrix
+            traffic: Traffic columns from RTSIService.traffic_columns
+            capacity: Intersection capacity
+            hist_data: Historical crash rate (fetched once by the caller)
 
-            perturbations.append({"params": perturbed, "label": f"perturb_{i+1}"})
+        Returns:
+            (n_samples, n_bins) RT-SI matrix. Each row equals what
+            calculate_rt_si_from_data would return with that parameter set.
+        """
+        names = RTSIService.PARAMETER_NAMES
+        param_matrix = np.atleast_2d(np.asarray(param_matrix, dtype=float))
+        n_bins = len(traffic["vehicle_count"])
+        scores = np.empty((param_matrix.shape[0], n_bins))
+
+        for start in range(0, param_matrix.shape[0], self.SWEEP_CHUNK_SIZE):
+            block = param_matrix[start : start + self.SWEEP_CHUNK_SIZE]
+            # (chunk, 1) parameter columns broadcast against (n_bins,) traffic
+            params = {name: block[:, [i]] for i, name in enumerate(names)}
+            r_hat = self.base_rt_si_service.compute_eb_rate(
+                hist_data["raw_rate"], hist_data["exposure"], lam=params["LAMBDA"]
+            )
+            idx = self.base_rt_si_service.compute_rt_si_arrays(
+                r_hat,
+                traffic["avg_speed"],
+                traffic["free_flow_speed"],
+                traffic["speed_variance"],
+                traffic["vehicle_count"],
+                traffic["vru_count"],
+                traffic["turning_count"],
+                capacity,
+                params=params,
+            )
+            scores[start : start + len(block)] = idx["RT_SI"]
 
-        return perturbations
+        return scores
 
     def analyze_sensitivity(
         self,
@@ -97,10 +167,13 @@ class SensitivityAnalysisService:
         bin_minutes: int = 15,
         perturbation_pct: float = 0.25,
         n_samples: int = 100,
+        design: str = "random",
+        seed: Optional[int] = None,
     ) -> Dict:
         """
         Perform sensitivity analysis across a time range.
-        OPTIMIZED: Fetches data once, then re-calculates scores in memory.
+        OPTIMIZED: Fetches data once, then scores all parameter sets as one
+        (samples x bins) matrix.
 
         Args:
             intersection: BSM intersection name
@@ -109,6 +182,8 @@ class SensitivityAnalysisService:
             bin_minutes: Time bin size
             perturbation_pct: Percentage to perturb parameters
             n_samples: Number of parameter sets to test
+            design: Sampling design, "random" or "sobol"
+            seed: Optional seed for reproducible designs
 
         Returns:
             Dictionary with sensitivity analysis results
@@ -146,8 +221,8 @@ class SensitivityAnalysisService:
         realtime_name = valid_intersection["intersection_name"]
 
         # Generate parameter perturbations
-        perturbations = self.generate_parameter_perturbations(
-            perturbation_pct, n_samples
+        param_matrix = self.generate_parameter_matrix(
+            perturbation_pct, n_samples, design=design, seed=seed
         )
 
         # 1. Fetch Capacity (ONCE)
@@ -170,69 +245,38 @@ class SensitivityAnalysisService:
                 "intersection": intersection,
             }
 
-        # 3. Calculate Baseline Scores (In Memory)
-        logger.info(f"Computing baseline RT-SI trend")
-        baseline_results = self.base_rt_si_service.calculate_rt_si_from_data(
-            crash_intersection_id, traffic_data_map, capacity, bin_minutes
+        # 3. Historical crash rate (ONCE) and baseline scores
+        hist_data = self.base_rt_si_service.get_historical_crash_rate(
+            crash_intersection_id
         )
-
-        baseline_scores = [r["RT_SI"] for r in baseline_results]
-        timestamps = [r["timestamp"] for r in baseline_results]
-
-        # Store all perturbed results
-        all_perturbed_scores = []
-        parameter_details = []
-
-        logger.info(f"Running {n_samples} sensitivity iterations (in-memory)")
-
-        # 4. Compute RT-SI for each parameter set (In Memory)
-        for idx, perturb in enumerate(perturbations[1:], 1):  # Skip baseline
-            params = perturb["params"]
-            label = perturb["label"]
-
-            # Create temporary service with perturbed parameters
-            temp_service = RTSIService(self.db_client)
-
-            # Override parameters
-            temp_service.LAMBDA = params["LAMBDA"]
-            temp_service.BETA1 = params["BETA1"]
-            temp_service.BETA2 = params["BETA2"]
-            temp_service.BETA3 = params["BETA3"]
-            temp_service.K1_SPEED = params["K1_SPEED"]
-            temp_service.K2_VAR = params["K2_VAR"]
-            temp_service.K3_CONF = params["K3_CONF"]
-            temp_service.K4_VRU_RATIO = params["K4_VRU_RATIO"]
-            temp_service.K5_VOL_CAPACITY = params["K5_VOL_CAPACITY"]
-            temp_service.OMEGA_VRU = params["OMEGA_VRU"]
-            temp_service.OMEGA_VEH = params["OMEGA_VEH"]
-
-            # Calculate scores using pre-fetched data
-            perturbed_results = temp_service.calculate_rt_si_from_data(
-                crash_intersection_id, traffic_data_map, capacity, bin_minutes
-            )
-
-            if perturbed_results:
-                perturbed_scores = [r["RT_SI"] for r in perturbed_results]
-            else:
-                perturbed_scores = baseline_scores[:]
-
-            all_perturbed_scores.append(perturbed_scores)
-
-            # Store parameter set for reference
-            parameter_details.append(
-                {"label": label, "params": params, "scores": perturbed_scores}
-            )
-
-        # Compute stability metrics
-        stability_metrics = self._compute_stability_metrics(
-            baseline_scores, all_perturbed_scores, timestamps
+        bin_times, traffic = self.base_rt_si_service.traffic_columns(traffic_data_map)
+        baseline = self.base_rt_si_service.compute_rt_si_columns(
+            bin_times, traffic, capacity, hist_data
+        )["RT_SI"]
+        timestamps = [t.isoformat() for t in bin_times]
+
+        # 4. Score every parameter set in one vectorized sweep
+        logger.info(f"Running {n_samples} sensitivity samples ({design} design)")
+        perturbed = self.evaluate_parameter_sweep(
+            param_matrix, traffic, capacity, hist_data
         )
 
-        # Compute parameter importance
+        stability_metrics = self._compute_stability_metrics(baseline, perturbed)
         parameter_importance = self._compute_parameter_importance(
-            parameter_details, baseline_scores
+            param_matrix, perturbed, baseline
         )
 
+        # Per-sample details only for the few samples returned for inspection
+        names = RTSIService.PARAMETER_NAMES
+        parameter_details = [
+            {
+                "label": f"perturb_{i+1}",
+                "params": dict(zip(names, param_matrix[i].tolist())),
+                "scores": perturbed[i].tolist(),
+            }
+            for i in range(min(10, len(param_matrix)))
+        ]
+
         return {
             "intersection": intersection,
             "time_range": {
@@ -243,176 +287,144 @@ class SensitivityAnalysisService:
             "perturbation_settings": {
                 "perturbation_pct": perturbation_pct,
                 "n_samples": n_samples,
+                "design": design,
             },
             "baseline": {
                 "timestamps": timestamps,
-                "rt_si_scores": baseline_scores,
+                "rt_si_scores": baseline.tolist(),
             },
             "stability_metrics": stability_metrics,
             "parameter_importance": parameter_importance,
-            "perturbed_samples": parameter_details[
-                :10
-            ],  # Return first 10 for inspection
+            "perturbed_samples": parameter_details,  # First 10 for inspection
         }
 
+    @staticmethod
+    def _rowwise_spearman(matrix: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """
+        Spearman correlation of each row of matrix with reference.
+
+        Pearson correlation of average ranks, i.e. scipy.stats.spearmanr per
+        row without the Python loop. Rows (or a reference) with no variance
+        yield 0.0 where spearmanr would return NaN.
+        """
+        ref_ranks = rankdata(reference)
+        ref_ranks -= ref_ranks.mean()
+        ranks = rankdata(matrix, axis=1)
+        ranks -= ranks.mean(axis=1, keepdims=True)
+
+        denom = np.sqrt((ranks**2).sum(axis=1) * (ref_ranks**2).sum())
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = (ranks @ ref_ranks) / denom
+        return np.where(np.isfinite(corr), np.clip(corr, -1.0, 1.0), 0.0)
+
     def _compute_stability_metrics(
-        self,
-        baseline: List[float],
-        perturbed_list: List[List[float]],
-        timestamps: List[str],
+        self, baseline: np.ndarray, perturbed: np.ndarray
     ) -> Dict:
         """
         Compute stability metrics comparing baseline to perturbed results.
 
+        Args:
+            baseline: (n_bins,) baseline RT-SI scores
+            perturbed: (n_samples, n_bins) RT-SI matrix
+
         Returns:
             - spearman_correlations: rank correlation for each perturbation
             - mean_spearman: average correlation
             - score_changes: statistics on score differences
             - tier_changes: number of risk tier changes
         """
-        spearman_correlations = []
-        score_differences = []
-
-        for perturbed in perturbed_list:
-            # Spearman rank correlation
-            if len(baseline) >= 3:
-                corr, _ = spearmanr(baseline, perturbed)
-                spearman_correlations.append(float(corr) if not np.isnan(corr) else 0.0)
-
-            # Score differences
-            diffs = [abs(b - p) for b, p in zip(baseline, perturbed)]
-            score_differences.extend(diffs)
-
-        # Risk tier classification
-        def classify_tier(score):
-            if score >= 75:
-                return "High Safety"
-            elif score >= 50:
-                return "Medium Safety"
-            elif score >= 25:
-                return "Low Safety"
-            else:
-                return "Critical"
-
-        # Count tier changes
-        tier_changes = []
-        for perturbed in perturbed_list:
-            changes = sum(
-                1
-                for b, p in zip(baseline, perturbed)
-                if classify_tier(b) != classify_tier(p)
-            )
-            tier_changes.append(changes)
+        n_samples, n_bins = perturbed.shape
+
+        if n_bins >= 3 and n_samples:
+            spearman_correlations = self._rowwise_spearman(perturbed, baseline)
+        else:
+            spearman_correlations = np.empty(0)
+
+        score_differences = np.abs(perturbed - baseline).ravel()
+
+        # Risk tier per cell: 0 Critical, 1 Low, 2 Medium, 3 High Safety
+        thresholds = np.asarray(self.TIER_THRESHOLDS)
+        baseline_tiers = np.digitize(baseline, thresholds)
+        tier_changes = (np.digitize(perturbed, thresholds) != baseline_tiers).sum(
+            axis=1
+        )
+
+        def _summary(values: np.ndarray, stats: Dict) -> Dict:
+            return {
+                key: (float(fn(values)) if values.size else 0.0)
+                for key, fn in stats.items()
+            }
 
         return {
             "spearman_correlations": {
-                "values": spearman_correlations,
-                "mean": (
-                    float(np.mean(spearman_correlations))
-                    if spearman_correlations
-                    else 0.0
-                ),
-                "std": (
-                    float(np.std(spearman_correlations))
-                    if spearman_correlations
-                    else 0.0
-                ),
-                "min": (
-                    float(np.min(spearman_correlations))
-                    if spearman_correlations
-                    else 0.0
-                ),
-                "max": (
-                    float(np.max(spearman_correlations))
-                    if spearman_correlations
-                    else 0.0
-                ),
-            },
-            "score_changes": {
-                "mean": float(np.mean(score_differences)) if score_differences else 0.0,
-                "std": float(np.std(score_differences)) if score_differences else 0.0,
-                "max": float(np.max(score_differences)) if score_differences else 0.0,
-                "percentile_95": (
-                    float(np.percentile(score_differences, 95))
-                    if score_differences
-                    else 0.0
+                "values": spearman_correlations.tolist(),
+                **_summary(
+                    spearman_correlations,
+                    {"mean": np.mean, "std": np.std, "min": np.min, "max": np.max},
                 ),
             },
+            "score_changes": _summary(
+                score_differences,
+                {
+                    "mean": np.mean,
+                    "std": np.std,
+                    "max": np.max,
+                    "percentile_95": lambda x: np.percentile(x, 95),
+                },
+            ),
             "tier_changes": {
-                "values": tier_changes,
-                "mean": float(np.mean(tier_changes)) if tier_changes else 0.0,
-                "max": int(np.max(tier_changes)) if tier_changes else 0,
+                "values": tier_changes.tolist(),
+                "mean": float(tier_changes.mean()) if n_samples else 0.0,
+                "max": int(tier_changes.max()) if n_samples else 0,
                 "percentage_no_change": (
-                    sum(1 for x in tier_changes if x == 0) / len(tier_changes) * 100
-                    if tier_changes
-                    else 0.0
+                    float((tier_changes == 0).mean() * 100) if n_samples else 0.0
                 ),
             },
-            "total_perturbations": len(perturbed_list),
-            "total_time_points": len(baseline),
+            "total_perturbations": int(n_samples),
+            "total_time_points": int(n_bins),
         }
 
     def _compute_parameter_importance(
-        self, parameter_details: List[Dict], baseline: List[float]
+        self,
+        param_matrix: np.ndarray,
+        perturbed: np.ndarray,
+        baseline: np.ndarray,
     ) -> Dict:
         """
         Compute which parameters have the most impact on results.
 
         Uses correlation between parameter deviation and score deviation.
         """
-        if not parameter_details:
+        if len(param_matrix) == 0:
             return {}
 
-        param_names = list(parameter_details[0]["params"].keys())
-        baseline_params = self.base_rt_si_service
-
-        # Get baseline parameter values
-        baseline_param_values = {
-            "LAMBDA": baseline_params.LAMBDA,
-            "BETA1": baseline_params.BETA1,
-            "BETA2": baseline_params.BETA2,
-            "BETA3": baseline_params.BETA3,
-            "K1_SPEED": baseline_params.K1_SPEED,
-            "K2_VAR": baseline_params.K2_VAR,
-            "K3_CONF": baseline_params.K3_CONF,
-            "K4_VRU_RATIO": baseline_params.K4_VRU_RATIO,
-            "K5_VOL_CAPACITY": baseline_params.K5_VOL_CAPACITY,
-            "OMEGA_VRU": baseline_params.OMEGA_VRU,
-            "OMEGA_VEH": baseline_params.OMEGA_VEH,
-        }
+        names = RTSIService.PARAMETER_NAMES
+        base_params = self.base_rt_si_service.get_parameters()
+        base = np.array([base_params[name] for name in names], dtype=float)
 
-        importance = {}
+        # Parameter deviation (normalized), one column per parameter
+        param_deviations = np.abs(param_matrix - base) / (base + 1e-10)
+        # Score deviation (mean absolute difference), one value per sample
+        score_deviations = np.abs(perturbed - baseline).mean(axis=1)
+
+        if len(param_matrix) < 3:
+            return {
+                name: {"correlation": 0.0, "interpretation": "Unknown"}
+                for name in names
+            }
 
-        for param in param_names:
-            param_deviations = []
-            score_deviations = []
-
-            for detail in parameter_details:
-                # Parameter deviation (normalized)
-                param_value = detail["params"][param]
-                baseline_value = baseline_param_values[param]
-                param_dev = abs(param_value - baseline_value) / (baseline_value + 1e-10)
-
-                # Score deviation (mean absolute difference)
-                scores = detail["scores"]
-                score_dev = np.mean([abs(s - b) for s, b in zip(scores, baseline)])
-
-                param_deviations.append(param_dev)
-                score_deviations.append(score_dev)
-
-            # Correlation between parameter deviation and score deviation
-            if len(param_deviations) >= 3:
-                corr, _ = spearmanr(param_deviations, score_deviations)
-                importance[param] = {
-                    "correlation": float(corr) if not np.isnan(corr) else 0.0,
-                    "interpretation": (
-                        "High Impact"
-                        if abs(corr) > 0.5
-                        else "Moderate Impact" if abs(corr) > 0.3 else "Low Impact"
-                    ),
-                }
-            else:
-                importance[param] = {"correlation": 0.0, "interpretation": "Unknown"}
+        correlations = self._rowwise_spearman(param_deviations.T, score_deviations)
+
+        importance = {}
+        for name, corr in zip(names, correlations.tolist()):
+            importance[name] = {
+                "correlation": corr,
+                "interpretation": (
+                    "High Impact"
+                    if abs(corr) > 0.5
+                    else "Moderate Impact" if abs(corr) > 0.3 else "Low Impact"
+                ),
+            }
 
         # Sort by absolute correlation
         sorted_importance = dict(
@@ -0,0 +1,137 @@
+"""
+TableCatalog
+============
+Tables and columns of the VTTI database's public schema, as the Database
+Explorer needs them to allowlist identifiers and pick a pagination key.
+
+The explorer used to re-query information_schema for the table list (and
+again for the columns) on every data request. The catalog keeps both in
+memory for ``ttl_seconds``: the table list is loaded once, each table's
+columns on first use. Each database client gets its own catalog, since it
+describes the database behind that client.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Set
+
+from ..core.cache import TTLCache
+
+TABLES_QUERY = """
+    SELECT table_name
+    FROM information_schema.tables
+    WHERE table_schema = %s
+      AND table_type = %s
+"""
+
+# One row per column; primary_key_position is NULL for non-key columns
+COLUMNS_QUERY = """
+    SELECT c.column_name, c.data_type, c.is_nullable, k.ordinal_position AS primary_key_position
+    FROM information_schema.columns c
+    LEFT JOIN (
+        SELECT kcu.column_name, kcu.ordinal_position
+        FROM information_schema.table_constraints tc
+        JOIN information_schema.key_column_usage kcu
+          ON kcu.constraint_schema = tc.constraint_schema
+         AND kcu.constraint_name = tc.constraint_name
+         AND kcu.table_name = tc.table_name
+        WHERE tc.table_schema = %(schema)s
+          AND tc.table_name = %(table)s
+          AND tc.constraint_type = 'PRIMARY KEY'
+    ) k ON k.column_name = c.column_name
+    WHERE c.table_schema = %(schema)s
+      AND c.table_name = %(table)s
+    ORDER BY c.ordinal_position
+"""
+
+# Preferred ordering columns for tables without a primary key
+TIMESTAMP_COLUMN_NAMES = ("publish_timestamp", "timestamp", "time_bin")
+TIMESTAMP_TYPES = ("timestamp without time zone", "timestamp with time zone", "date")
+
+
+class TableCatalog:
+    """Cached table and column metadata for one database client."""
+
+    def __init__(self, client: Any, ttl_seconds: float, schema: str = "public") -> None:
+        self._client = client
+        self._schema = schema
+        self._cache = TTLCache(ttl_seconds)
+
+    def tables(self) -> List[str]:
+        """Base tables of the schema, in catalog order."""
+        hit, tables = self._cache.get("tables")
+        if not hit:
+            rows = self._client.execute_query(TABLES_QUERY, (self._schema, "BASE TABLE"))
+            tables = [row["table_name"] for row in rows]
+            self._cache.set("tables", tables)
+        return tables
+
+    def table_names(self) -> Set[str]:
+        return set(self.tables())
+
+    def columns(self, table: str) -> List[Dict[str, Any]]:
+        """
+        Column rows (column_name, data_type, is_nullable,
+        primary_key_position) of a table known to the catalog.
+        """
+        key = ("columns", table)
+        hit, columns = self._cache.get(key)
+        if not hit:
+            columns = self._client.execute_query(
+                COLUMNS_QUERY, {"schema": self._schema, "table": table}
+            )
+            self._cache.set(key, columns)
+        return columns
+
+    def column_names(self, table: str) -> Set[str]:
+        return {column["column_name"] for column in self.columns(table)}
+
+    def ordering_key(self, table: str) -> List[str]:
+        """
+        Columns giving ``table`` a stable total order for keyset pagination:
+        the primary key, else a timestamp column with ``ctid`` as the tie
+        breaker, else ``ctid`` alone (physical order).
+        """
+        columns = self.columns(table)
+        primary_key = sorted(
+            (c for c in columns if c.get("primary_key_position") is not None),
+            key=lambda c: c["primary_key_position"],
+        )
+        if primary_key:
+            return [c["column_name"] for c in primary_key]
+
+        timestamp = _timestamp_column(columns)
+        return [timestamp, "ctid"] if timestamp else ["ctid"]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+def _timestamp_column(columns: List[Dict[str, Any]]) -> Optional[str]:
+    names = {c["column_name"] for c in columns}
+    for name in TIMESTAMP_COLUMN_NAMES:
+        if name in names:
+            return name
+    for column in columns:
+        if column.get("data_type") in TIMESTAMP_TYPES:
+            return column["column_name"]
+    return None
+
+
+_catalogs: "weakref.WeakKeyDictionary[Any, TableCatalog]" = weakref.WeakKeyDictionary()
+_catalogs_lock = threading.Lock()
+
+
+def get_table_catalog(client: Any) -> TableCatalog:
+    """The catalog of ``client``'s database, created on first use."""
+    with _catalogs_lock:
+        catalog = _catalogs.get(client)
+        if catalog is None:
+            from ..core.config import settings
+
+            catalog = _catalogs[client] = TableCatalog(
+                client, settings.DB_EXPLORER_CATALOG_TTL_SECONDS
+            )
+        return catalog
@@ -11,6 +11,10 @@ import numpy as np
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
 from .vcc_client import vcc_client
+from .kinematics import group_features
+from .mapdata_index import get_mapdata_index
+from .proximity_join import any_within, group_codes, positions, proximity_self_pairs
+from .vcc_message_batch import decode_bsm_messages, decode_psm_messages
 
 
 def parse_vcc_bsm_message(bsm_message: Dict) -> Optional[Dict]:
@@ -120,7 +124,8 @@ def map_to_intersection(lat: float, lon: float, mapdata_list: List[Dict]) -> Opt
     """
     Map lat/lon coordinates to intersection ID using MapData.
     
-    Uses proximity matching to find nearest intersection within threshold.
+    Uses proximity matching: the first MapData intersection whose ref point
+    is within the threshold (~100 m) in both latitude and longitude.
     
     Args:
         lat: Latitude
@@ -133,29 +138,66 @@ def map_to_intersection(lat: float, lon: float, mapdata_list: List[Dict]) -> Opt
     if not mapdata_list or lat is None or lon is None:
         return None
     
-    threshold_distance = 0.001  # ~100 meters in degrees
+    return map_to_intersections([lat], [lon], mapdata_list)[0]
+
+
+def map_to_intersections(lats, lons, mapdata_list: Optional[List[Dict]]) -> np.ndarray:
+    """
+    Bulk map_to_intersection: intersection ID (or None) for every position.
     
-    for mapdata in mapdata_list:
-        if 'intersections' not in mapdata:
-            continue
-        
-        for intersection in mapdata['intersections']:
-            ref_point = intersection.get('refPoint', {})
-            ref_lat = ref_point.get('lat')
-            ref_lon = ref_point.get('lon')
-            
-            if ref_lat is None or ref_lon is None:
-                continue
-            
-            # Simple distance calculation (Haversine would be more accurate but this is faster)
-            lat_diff = abs(lat - ref_lat)
-            lon_diff = abs(lon - ref_lon)
-            
-            if lat_diff < threshold_distance and lon_diff < threshold_distance:
-                int_id = intersection.get('id', {})
-                return str(int_id.get('id', intersection.get('id')))
-    
-    return None
+    Looks positions up in a grid index over the MapData ref points, built
+    once per MapData content (see mapdata_index).
+    """
+    return get_mapdata_index(mapdata_list).lookup(lats, lons)
+
+
+def _messages_frame(messages, decode, mapdata_list: Optional[List[Dict]]) -> pd.DataFrame:
+    """Decoded messages as a DataFrame, plus 'mapped_intersection' when MapData is given."""
+    df = messages if isinstance(messages, pd.DataFrame) else decode(messages)
+    if mapdata_list and 'mapped_intersection' not in df.columns and len(df) > 0:
+        df = df.assign(mapped_intersection=map_to_intersections(df['lat'], df['lon'], mapdata_list))
+    return df
+
+
+def prepare_bsm_frame(bsm_messages, mapdata_list: Optional[List[Dict]] = None) -> pd.DataFrame:
+    """
+    Decode BSM messages once (columnar, see vcc_message_batch) for the
+    feature extractor and both conflict detectors.
+    
+    With MapData, every position is mapped to an intersection in bulk
+    ('mapped_intersection'). extract_bsm_features, detect_vru_vehicle_conflicts
+    and detect_vehicle_vehicle_conflicts accept the returned frame in place
+    of the raw messages.
+    """
+    return _messages_frame(bsm_messages, decode_bsm_messages, mapdata_list)
+
+
+def prepare_psm_frame(psm_messages, mapdata_list: Optional[List[Dict]] = None) -> pd.DataFrame:
+    """PSM counterpart of prepare_bsm_frame."""
+    return _messages_frame(psm_messages, decode_psm_messages, mapdata_list)
+
+
+def _with_intersection(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Feature extraction's intersection: VCC's locationName when present,
+    otherwise the MapData match; rows with neither source are dropped.
+    """
+    location = df['location_name'] if 'location_name' in df.columns else pd.Series(None, index=df.index)
+    has_location = location.notna() & location.astype(bool)
+    if 'mapped_intersection' in df.columns:
+        return df.assign(intersection=location.where(has_location, df['mapped_intersection']))
+    return df[has_location].assign(intersection=location[has_location])
+
+
+def _mapped_intersection(df: pd.DataFrame) -> pd.Series:
+    """Conflict detection's intersection: the MapData match only."""
+    if 'mapped_intersection' in df.columns:
+        return df['mapped_intersection']
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _with_mapped_intersection(df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(intersection=_mapped_intersection(df))
 
 
 def calculate_heading_change_rate(heading_series: pd.Series) -> float:
@@ -168,23 +210,16 @@ def calculate_heading_change_rate(heading_series: pd.Series) -> float:
     Returns:
         Standard deviation of heading changes
     """
-    if len(heading_series) < 2:
-        return 0.0
-    
-    headings = heading_series.dropna().values
+    headings = heading_series.dropna().to_numpy(dtype=float)
     if len(headings) < 2:
         return 0.0
     
-    # Calculate angular differences (handle circular nature of heading 0-360)
-    diffs = []
-    for i in range(1, len(headings)):
-        diff = abs(headings[i] - headings[i-1])
-        # Handle wrap-around (e.g., 359° to 1° is a 2° change, not 358°)
-        if diff > 180:
-            diff = 360 - diff
-        diffs.append(diff)
+    # Angular differences (handle circular nature of heading 0-360):
+    # 359° to 1° is a 2° change, not 358°
+    diffs = np.abs(np.diff(headings))
+    diffs = np.where(diffs > 180, 360 - diffs, diffs)
     
-    return np.std(diffs) if len(diffs) > 0 else 0.0
+    return float(np.std(diffs))
 
 
 def extract_bsm_features(bsm_messages: List[Dict], mapdata_list: Optional[List[Dict]] = None,
@@ -193,39 +228,26 @@ def extract_bsm_features(bsm_messages: List[Dict], mapdata_list: Optional[List[D
     Extract and aggregate vehicle features from VCC API BSM messages.
     
     Args:
-        bsm_messages: List of BSM messages from VCC API
+        bsm_messages: List of BSM messages from VCC API (or a prepare_bsm_frame frame)
         mapdata_list: Optional MapData for intersection mapping
         interval_minutes: Aggregation interval in minutes (1 for real-time, 15 for historical)
         
     Returns:
         DataFrame with aggregated features per interval
     """
-    if not bsm_messages:
+    if bsm_messages is None or len(bsm_messages) == 0:
         return pd.DataFrame()
     
-    # Parse all BSM messages
-    parsed_data = []
-    for bsm in bsm_messages:
-        parsed = parse_vcc_bsm_message(bsm)
-        if parsed:
-            # Use locationName as intersection identifier if available, otherwise try lat/lon mapping
-            if parsed.get('location_name'):
-                parsed['intersection'] = parsed['location_name']
-            elif mapdata_list:
-                parsed['intersection'] = map_to_intersection(
-                    parsed['lat'], parsed['lon'], mapdata_list
-                )
-            else:
-                # No location name and no mapdata - skip this BSM
-                continue
-            parsed_data.append(parsed)
-    
-    if not parsed_data:
+    # Parse all BSM messages; use locationName as intersection identifier if
+    # available, otherwise the lat/lon mapping (skipped without MapData)
+    df = prepare_bsm_frame(bsm_messages, mapdata_list)
+    if len(df) > 0:
+        df = _with_intersection(df)
+    
+    if len(df) == 0:
         print("⚠ No valid BSM data after parsing")
         return pd.DataFrame()
     
-    df = pd.DataFrame(parsed_data)
-    
     # Convert timestamp to datetime (already done in parse, but ensure consistency)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     
@@ -241,7 +263,6 @@ def extract_bsm_features(bsm_messages: List[Dict], mapdata_list: Optional[List[D
         'vehicle_id': 'nunique',  # Unique vehicle count
         'speed': ['mean', 'std'],  # Average speed and speed variance
         'hard_braking': 'sum',  # Count of hard braking events
-        'heading': lambda x: calculate_heading_change_rate(x),  # Heading change rate
         'accel_lon': 'std',  # Longitudinal acceleration variance
         'accel_lat': 'std',  # Lateral acceleration variance
     }).reset_index()
@@ -250,10 +271,16 @@ def extract_bsm_features(bsm_messages: List[Dict], mapdata_list: Optional[List[D
     features.columns = [
         'intersection', 'time_interval',
         'vehicle_count', 'avg_speed', 'speed_variance',
-        'hard_braking_count', 'heading_change_rate',
+        'hard_braking_count',
         'accel_lon_variance', 'accel_lat_variance'
     ]
     
+    # Heading change rate and per-vehicle kinematics (yaw rate, acceleration
+    # percentiles, jerk, hard-braking streaks), vectorized over all groups
+    motion = group_features(df, grouped)
+    features.insert(6, 'heading_change_rate', motion.pop('heading_change_rate').to_numpy())
+    features = pd.concat([features, motion], axis=1)
+    
     # Rename time_interval to appropriate column name based on interval
     time_col_name = 'time_15min'  # Default for historical processing
     if interval_minutes == 15:
@@ -288,39 +315,26 @@ def extract_psm_features(psm_messages: List[Dict], mapdata_list: Optional[List[D
     Extract and aggregate VRU features from VCC API PSM messages.
     
     Args:
-        psm_messages: List of PSM messages from VCC API
+        psm_messages: List of PSM messages from VCC API (or a prepare_psm_frame frame)
         mapdata_list: Optional MapData for intersection mapping
         interval_minutes: Aggregation interval in minutes (1 for real-time, 15 for historical)
         
     Returns:
         DataFrame with aggregated VRU features per interval
     """
-    if not psm_messages:
+    if psm_messages is None or len(psm_messages) == 0:
         return pd.DataFrame()
     
-    # Parse all PSM messages
-    parsed_data = []
-    for psm in psm_messages:
-        parsed = parse_vcc_psm_message(psm)
-        if parsed:
-            # Use locationName as intersection identifier if available, otherwise try lat/lon mapping
-            if parsed.get('location_name'):
-                parsed['intersection'] = parsed['location_name']
-            elif mapdata_list:
-                parsed['intersection'] = map_to_intersection(
-                    parsed['lat'], parsed['lon'], mapdata_list
-                )
-            else:
-                # No location name and no mapdata - skip this PSM
-                continue
-            parsed_data.append(parsed)
-    
-    if not parsed_data:
+    # Parse all PSM messages; use locationName as intersection identifier if
+    # available, otherwise the lat/lon mapping (skipped without MapData)
+    df = prepare_psm_frame(psm_messages, mapdata_list)
+    if len(df) > 0:
+        df = _with_intersection(df)
+    
+    if len(df) == 0:
         print("⚠ No valid PSM data after parsing")
         return pd.DataFrame()
     
-    df = pd.DataFrame(parsed_data)
-    
     # Convert timestamp to datetime
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     
@@ -380,8 +394,8 @@ def detect_vru_vehicle_conflicts(bsm_messages: List[Dict], psm_messages: List[Di
     Detect VRU-vehicle conflicts using spatial-temporal proximity.
     
     Args:
-        bsm_messages: List of BSM messages
-        psm_messages: List of PSM messages
+        bsm_messages: List of BSM messages (or a prepare_bsm_frame frame)
+        psm_messages: List of PSM messages (or a prepare_psm_frame frame)
         mapdata_list: Optional MapData for intersection mapping
         proximity_threshold_m: Distance threshold in meters (default 10m)
         time_window_seconds: Time window for matching in seconds (default 5s)
@@ -391,31 +405,13 @@ def detect_vru_vehicle_conflicts(bsm_messages: List[Dict], psm_messages: List[Di
         DataFrame with conflict counts per interval (I_VRU)
     """
     # Parse BSM and PSM messages
-    bsm_parsed = []
-    for bsm in bsm_messages:
-        parsed = parse_vcc_bsm_message(bsm)
-        if parsed:
-            if mapdata_list:
-                parsed['intersection'] = map_to_intersection(parsed['lat'], parsed['lon'], mapdata_list)
-            bsm_parsed.append(parsed)
-    
-    psm_parsed = []
-    for psm in psm_messages:
-        parsed = parse_vcc_psm_message(psm)
-        if parsed:
-            if mapdata_list:
-                parsed['intersection'] = map_to_intersection(parsed['lat'], parsed['lon'], mapdata_list)
-            psm_parsed.append(parsed)
-    
-    if not bsm_parsed or not psm_parsed:
-        return pd.DataFrame(columns=['intersection', 'time_15min', 'I_VRU', 'vru_event_count'])
+    df_bsm = prepare_bsm_frame(bsm_messages, mapdata_list)
+    df_psm = prepare_psm_frame(psm_messages, mapdata_list)
     
-    df_bsm = pd.DataFrame(bsm_parsed)
-    df_psm = pd.DataFrame(psm_parsed)
+    if len(df_bsm) == 0 or len(df_psm) == 0:
+        return pd.DataFrame(columns=['intersection', 'time_15min', 'I_VRU', 'vru_event_count'])
     
-    # Convert timestamps
-    df_bsm['timestamp'] = pd.to_datetime(df_bsm['timestamp'])
-    df_psm['timestamp'] = pd.to_datetime(df_psm['timestamp'])
+    psm_intersection = _mapped_intersection(df_psm)
     
     # Simple proximity-based conflict detection
     # Convert proximity threshold from meters to approximate degrees
@@ -423,43 +419,23 @@ def detect_vru_vehicle_conflicts(bsm_messages: List[Dict], psm_messages: List[Di
     threshold_deg = proximity_threshold_m / 111000.0
     time_window_td = pd.Timedelta(seconds=time_window_seconds)
     
-    conflicts = []
-    
-    # Group by intersection for efficiency
-    for intersection in df_psm['intersection'].dropna().unique():
-        psm_int = df_psm[df_psm['intersection'] == intersection]
-        bsm_int = df_bsm[df_bsm['intersection'] == intersection]
-        
-        for _, psm_row in psm_int.iterrows():
-            psm_time = psm_row['timestamp']
-            psm_lat = psm_row['lat']
-            psm_lon = psm_row['lon']
-            
-            # Find nearby vehicles within time window
-            nearby = bsm_int[
-                (abs(bsm_int['timestamp'] - psm_time) <= time_window_td) &
-                (abs(bsm_int['lat'] - psm_lat) < threshold_deg) &
-                (abs(bsm_int['lon'] - psm_lon) < threshold_deg)
-            ]
-            
-            if len(nearby) > 0:
-                # Create conflict record
-                interval_time = psm_time.floor(f'{interval_minutes}min')
-                # Use appropriate time column name based on interval
-                time_col = 'time_15min' if interval_minutes == 15 else f'time_{interval_minutes}min'
-                conflicts.append({
-                    'intersection': intersection,
-                    time_col: interval_time,
-                    'conflict_id': f"{psm_row['vru_id']}_{nearby.iloc[0]['vehicle_id']}_{psm_time.timestamp()}",
-                })
+    # A PSM is a conflict when any vehicle of its intersection is within the
+    # time window and the proximity box (spatio-temporal join, see proximity_join)
+    psm_group, bsm_group = group_codes(psm_intersection, _mapped_intersection(df_bsm))
+    psm = positions(df_psm, psm_group)
+    in_conflict = any_within(psm, positions(df_bsm, bsm_group), threshold_deg, time_window_td.value)
     
     # Determine time column name based on interval
     time_col = 'time_15min' if interval_minutes == 15 else f'time_{interval_minutes}min'
     
-    if not conflicts:
+    if not in_conflict.any():
         return pd.DataFrame(columns=['intersection', time_col, 'I_VRU', 'vru_event_count'])
     
-    df_conflicts = pd.DataFrame(conflicts)
+    df_conflicts = pd.DataFrame({
+        'intersection': psm_intersection.to_numpy()[in_conflict],
+        time_col: pd.DatetimeIndex(psm.time_ns[in_conflict]).floor(f'{interval_minutes}min'),
+        'conflict_id': df_psm['vru_id'].astype(str).to_numpy()[in_conflict],
+    })
     
     # Aggregate conflicts per interval
     conflict_agg = df_conflicts.groupby(['intersection', time_col]).agg({
@@ -482,7 +458,7 @@ def detect_vehicle_vehicle_conflicts(bsm_messages: List[Dict],
     Detect vehicle-vehicle conflicts using proximity and speed variance.
     
     Args:
-        bsm_messages: List of BSM messages
+        bsm_messages: List of BSM messages (or a prepare_bsm_frame frame)
         mapdata_list: Optional MapData for intersection mapping
         proximity_threshold_m: Distance threshold in meters
         speed_variance_threshold: Speed variance threshold for conflict detection
@@ -493,68 +469,53 @@ def detect_vehicle_vehicle_conflicts(bsm_messages: List[Dict],
         DataFrame with vehicle conflict counts per interval (I_vehicle)
     """
     # Parse BSM messages
-    bsm_parsed = []
-    for bsm in bsm_messages:
-        parsed = parse_vcc_bsm_message(bsm)
-        if parsed:
-            if mapdata_list:
-                parsed['intersection'] = map_to_intersection(parsed['lat'], parsed['lon'], mapdata_list)
-            bsm_parsed.append(parsed)
-    
-    if len(bsm_parsed) < 2:
+    df_bsm = prepare_bsm_frame(bsm_messages, mapdata_list)
+    
+    if len(df_bsm) < 2:
         return pd.DataFrame(columns=['intersection', 'time_15min', 'I_vehicle', 'vehicle_event_count'])
     
-    df_bsm = pd.DataFrame(bsm_parsed)
-    df_bsm['timestamp'] = pd.to_datetime(df_bsm['timestamp'])
+    intersection = _mapped_intersection(df_bsm)
     
     threshold_deg = proximity_threshold_m / 111000.0
     time_window_td = pd.Timedelta(seconds=time_window_seconds)
     
-    conflicts = []
+    (group,) = group_codes(intersection)
+    bsm = positions(df_bsm, group)
+    speed = pd.to_numeric(df_bsm['speed'], errors='coerce').to_numpy(dtype=float)
     
-    # Group by intersection
-    for intersection in df_bsm['intersection'].dropna().unique():
-        bsm_int = df_bsm[df_bsm['intersection'] == intersection].sort_values('timestamp')
-        
-        # Check pairs of vehicles
-        for i, row1 in bsm_int.iterrows():
-            nearby = bsm_int[
-                (abs(bsm_int['timestamp'] - row1['timestamp']) <= time_window_td) &
-                (abs(bsm_int['lat'] - row1['lat']) < threshold_deg) &
-                (abs(bsm_int['lon'] - row1['lon']) < threshold_deg) &
-                (bsm_int.index != i)
-            ]
-            
-            for j, row2 in nearby.iterrows():
-                # Check if speed variance indicates conflict
-                speed_diff = abs(row1['speed'] - row2['speed'])
-                if speed_diff > speed_variance_threshold:
-                    interval_time = row1['timestamp'].floor(f'{interval_minutes}min')
-                    # Use appropriate time column name based on interval
-                    time_col = 'time_15min' if interval_minutes == 15 else f'time_{interval_minutes}min'
-                    conflicts.append({
-                        'intersection': intersection,
-                        time_col: interval_time,
-                        'conflict_id': f"{row1['vehicle_id']}_{row2['vehicle_id']}_{row1['timestamp'].timestamp()}",
-                    })
+    # Each nearby pair of BSMs of one intersection once (see proximity_join);
+    # a speed difference above the threshold indicates a conflict
+    first, second = [], []
+    for i, j in proximity_self_pairs(bsm, threshold_deg, time_window_td.value):
+        conflict = np.abs(speed[i] - speed[j]) > speed_variance_threshold
+        first.append(i[conflict])
+        second.append(j[conflict])
     
     # Determine time column name based on interval
     time_col = 'time_15min' if interval_minutes == 15 else f'time_{interval_minutes}min'
     
-    if not conflicts:
+    if sum(len(i) for i in first) == 0:
         return pd.DataFrame(columns=['intersection', time_col, 'I_vehicle', 'vehicle_event_count'])
     
-    df_conflicts = pd.DataFrame(conflicts)
-    
-    # Remove duplicate conflicts (same vehicle pair in same interval)
-    df_conflicts = df_conflicts.drop_duplicates(subset=['intersection', time_col, 'conflict_id'])
+    # A conflict is recorded from both vehicles' side, at that BSM's time
+    first, second = np.concatenate(first), np.concatenate(second)
+    row1, row2 = np.concatenate([first, second]), np.concatenate([second, first])
+    vehicle, _ = pd.factorize(df_bsm['vehicle_id'].astype(str))
+    df_conflicts = pd.DataFrame({
+        'intersection': intersection.to_numpy()[row1],
+        time_col: pd.DatetimeIndex(bsm.time_ns[row1]).floor(f'{interval_minutes}min'),
+        'timestamp_ns': bsm.time_ns[row1],
+        'vehicle': vehicle[row1],
+        'other_vehicle': vehicle[row2],
+    })
+    
+    # Remove duplicate conflicts (same vehicle pair at the same BSM time)
+    df_conflicts = df_conflicts.drop_duplicates(
+        subset=['intersection', 'timestamp_ns', 'vehicle', 'other_vehicle']
+    )
     
     # Aggregate
-    conflict_agg = df_conflicts.groupby(['intersection', time_col]).agg({
-        'conflict_id': 'count'
-    }).reset_index()
-    
-    conflict_agg.columns = ['intersection', time_col, 'I_vehicle']
+    conflict_agg = df_conflicts.groupby(['intersection', time_col]).size().reset_index(name='I_vehicle')
     conflict_agg['vehicle_event_count'] = conflict_agg['I_vehicle']
     
     return conflict_agg
@@ -11,7 +11,8 @@ from datetime import datetime, timedelta, date
 from .vcc_data_collection import collect_historical_vcc_data
 from .vcc_feature_engineering import (
     extract_bsm_features, extract_psm_features,
-    detect_vru_vehicle_conflicts, detect_vehicle_vehicle_conflicts
+    detect_vru_vehicle_conflicts, detect_vehicle_vehicle_conflicts,
+    prepare_bsm_frame, prepare_psm_frame
 )
 from .parquet_storage import parquet_storage
 from .index_computation import (
@@ -82,10 +83,14 @@ def process_historical_vcc_data(
     print("\n[Step 2/6] Extracting features at 15-minute intervals...")
     
     # Extract BSM features
+    # Parse and map positions to intersections once for all four steps
+    bsm_frame = prepare_bsm_frame(bsm_messages, mapdata_list)
+    psm_frame = prepare_psm_frame(psm_messages, mapdata_list)
+    
     bsm_features = pd.DataFrame()
     if bsm_messages:
         bsm_features = extract_bsm_features(
-            bsm_messages,
+            bsm_frame,
             mapdata_list=mapdata_list,
             interval_minutes=15  # Historical baseline uses 15-minute intervals
         )
@@ -95,7 +100,7 @@ def process_historical_vcc_data(
     psm_features = pd.DataFrame()
     if psm_messages:
         psm_features = extract_psm_features(
-            psm_messages,
+            psm_frame,
             mapdata_list=mapdata_list,
             interval_minutes=15
         )
@@ -107,8 +112,8 @@ def process_historical_vcc_data(
     vru_conflicts = pd.DataFrame()
     if bsm_messages and psm_messages:
         vru_conflicts = detect_vru_vehicle_conflicts(
-            bsm_messages,
-            psm_messages,
+            bsm_frame,
+            psm_frame,
             mapdata_list=mapdata_list,
             interval_minutes=15
         )
@@ -117,7 +122,7 @@ def process_historical_vcc_data(
     vehicle_conflicts = pd.DataFrame()
     if bsm_messages and len(bsm_messages) >= 2:
         vehicle_conflicts = detect_vehicle_vehicle_conflicts(
-            bsm_messages,
+            bsm_frame,
             mapdata_list=mapdata_list,
             interval_minutes=15
         )
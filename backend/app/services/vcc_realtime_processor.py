@@ -11,7 +11,8 @@ from collections import deque
 from datetime import datetime, timedelta
 from .vcc_feature_engineering import (
     extract_bsm_features, extract_psm_features,
-    detect_vru_vehicle_conflicts, detect_vehicle_vehicle_conflicts
+    detect_vru_vehicle_conflicts, detect_vehicle_vehicle_conflicts,
+    prepare_bsm_frame, prepare_psm_frame
 )
 from .parquet_storage import parquet_storage
 from .index_computation import (
@@ -85,10 +86,14 @@ class VCCRealtimeProcessor:
         print(f"\n[{interval_start.strftime('%Y-%m-%d %H:%M:%S')}] Processing 1-minute interval...")
         
         # Step 1: Extract features at 1-minute intervals
+        # Parse and map positions to intersections once for all four steps
+        bsm_frame = prepare_bsm_frame(bsm_messages, self.mapdata_list)
+        psm_frame = prepare_psm_frame(psm_messages, self.mapdata_list)
+        
         bsm_features = pd.DataFrame()
         if bsm_messages:
             bsm_features = extract_bsm_features(
-                bsm_messages,
+                bsm_frame,
                 mapdata_list=self.mapdata_list,
                 interval_minutes=1  # Real-time uses 1-minute intervals
             )
@@ -97,7 +102,7 @@ class VCCRealtimeProcessor:
         psm_features = pd.DataFrame()
         if psm_messages:
             psm_features = extract_psm_features(
-                psm_messages,
+                psm_frame,
                 mapdata_list=self.mapdata_list,
                 interval_minutes=1
             )
@@ -107,8 +112,8 @@ class VCCRealtimeProcessor:
         vru_conflicts = pd.DataFrame()
         if bsm_messages and psm_messages:
             vru_conflicts = detect_vru_vehicle_conflicts(
-                bsm_messages,
-                psm_messages,
+                bsm_frame,
+                psm_frame,
                 mapdata_list=self.mapdata_list,
                 interval_minutes=1  # Real-time uses 1-minute intervals
             )
@@ -116,7 +121,7 @@ class VCCRealtimeProcessor:
         vehicle_conflicts = pd.DataFrame()
         if bsm_messages and len(bsm_messages) >= 2:
             vehicle_conflicts = detect_vehicle_vehicle_conflicts(
-                bsm_messages,
+                bsm_frame,
                 mapdata_list=self.mapdata_list,
                 interval_minutes=1
             )
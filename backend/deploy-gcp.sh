@@ -42,6 +42,7 @@ gcloud run deploy ${SERVICE_NAME} \
   --memory 2Gi \
   --cpu 2 \
   --timeout 300 \
+  --no-cpu-throttling \
   --max-instances 10 \
   --min-instances 0 \
   --network default \
@@ -61,8 +62,9 @@ PARQUET_STORAGE_PATH=/gcs/cs6604-trafficsafety-parquet,\
 USE_POSTGRESQL=false,\
 FALLBACK_TO_PARQUET=true,\
 CACHE_ENABLED=true,\
-SAFETY_INDEX_CACHE_TTL_SECONDS=300,\
+SAFETY_INDEX_SNAPSHOT_REFRESH_SECONDS=900,\
 SAFETY_TIME_CACHE_TTL_SECONDS=900,\
+SAFETY_TREND_CHUNK_TTL_SECONDS=86400,\
 ANALYTICS_CACHE_TTL_SECONDS=900,\
 API_METADATA_CACHE_TTL_SECONDS=3600,\
 DB_EXPLORER_CACHE_TTL_SECONDS=300,\
@@ -0,0 +1,154 @@
+"""
+Cache Codec Benchmark
+
+Compares stored size and encode/decode time of cached payloads for the
+previous Redis path (json.dumps text + json.loads) and every available
+PayloadCodec serializer/compression combination, on a synthetic
+/safety/index/time/range response with correlation analysis.
+
+Usage:
+    python scripts/benchmark_cache_codec.py
+    python scripts/benchmark_cache_codec.py --points 2112 --repeat 50
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.core.codec import COMPRESSIONS, SERIALIZERS, PayloadCodec  # noqa: E402
+
+
+def trend_payload(points: int, seed: int = 0) -> dict:
+    """A jsonable_encoder-shaped trend response of ``points`` 15-minute bins."""
+    rng = random.Random(seed)
+    start = datetime(2025, 11, 1, 8, 0)
+    series = []
+    for i in range(points):
+        rt_si = rng.uniform(0, 100)
+        mcdm = rng.uniform(0, 100)
+        series.append(
+            {
+                "intersection": "glebe-potomac",
+                "time_bin": (start + timedelta(minutes=15 * i)).isoformat(),
+                "safety_index": 0.7 * rt_si + 0.3 * mcdm,
+                "index_type": "RT-SI-Full",
+                "rt_si_score": rt_si,
+                "vehicle_count": rng.randint(0, 400),
+                "vru_count": rng.randint(0, 30),
+                "avg_speed": rng.uniform(15, 45),
+                "speed_variance": rng.uniform(0, 60),
+                "incident_count": rng.randint(0, 3),
+                "near_miss_count": rng.randint(0, 5),
+                "mcdm_index": mcdm,
+                "saw_score": rng.uniform(0, 100),
+                "edas_score": rng.uniform(0, 100),
+                "codas_score": rng.uniform(0, 100),
+                "vru_index": rng.uniform(0, 100),
+                "vehicle_index": rng.uniform(0, 100),
+                "raw_crash_rate": rng.uniform(0, 10),
+                "eb_crash_rate": rng.uniform(0, 10),
+                "F_speed": rng.uniform(0, 1),
+                "F_variance": rng.uniform(0, 1),
+                "F_conflict": rng.uniform(0, 1),
+                "uplift_factor": rng.uniform(1, 2),
+                "final_safety_index": rng.uniform(0, 100),
+            }
+        )
+    variables = ["vehicle_count", "vru_count", "avg_speed", "speed_variance", "incident_count"]
+    correlation_analysis = {
+        target: {
+            var: {
+                "pearson": rng.uniform(-1, 1),
+                "spearman": rng.uniform(-1, 1),
+                "p_value": rng.uniform(0, 0.1),
+                "interpretation": "moderate positive monotonic relationship",
+            }
+            for var in variables
+        }
+        for target in ("rt_si_score", "mcdm_index", "safety_index")
+    }
+    return {
+        "time_series": series,
+        "correlation_analysis": correlation_analysis,
+        "metadata": {
+            "intersection": "glebe-potomac",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=15 * points)).isoformat(),
+            "bin_minutes": 15,
+            "data_points": points,
+        },
+    }
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--points", type=int, default=2112, help="Time bins in the payload")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed runs per codec")
+    parser.add_argument(
+        "--min-bytes", type=int, default=16384, help="Compression threshold for PayloadCodec"
+    )
+    args = parser.parse_args()
+
+    payload = trend_payload(args.points)
+
+    # The previous ResponseCache path: JSON text in Redis
+    text = json.dumps(payload, separators=(",", ":"))
+    rows = [
+        (
+            "json text (previous)",
+            len(text.encode("utf-8")),
+            _median_ms(lambda: json.dumps(payload, separators=(",", ":")), args.repeat),
+            _median_ms(lambda: json.loads(text), args.repeat),
+        )
+    ]
+
+    for serializer, available in SERIALIZERS.items():
+        if available is None:
+            print(f"(skipping {serializer}: not installed)")
+            continue
+        for compression in COMPRESSIONS:
+            codec = PayloadCodec(serializer, compression, args.min_bytes)
+            if codec.compression != compression:
+                print(f"(skipping {compression}: not installed)")
+                continue
+            blob, _ = codec.encode(payload)
+            assert codec.decode(blob) == json.loads(text)
+            rows.append(
+                (
+                    codec.tag,
+                    len(blob),
+                    _median_ms(lambda: codec.encode(payload), args.repeat),
+                    _median_ms(lambda: codec.decode(blob), args.repeat),
+                )
+            )
+
+    baseline = rows[0]
+    print(f"\nPayload: {args.points} time points, median of {args.repeat} runs\n")
+    print(f"{'codec':<24}{'bytes':>12}{'size':>8}{'encode ms':>12}{'decode ms':>12}{'hit speedup':>13}")
+    for name, size, encode_ms, decode_ms in rows:
+        print(
+            f"{name:<24}{size:>12,}{size / baseline[1]:>8.2f}"
+            f"{encode_ms:>12.2f}{decode_ms:>12.2f}{baseline[3] / decode_ms:>12.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
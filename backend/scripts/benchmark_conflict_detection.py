@@ -0,0 +1,229 @@
+"""
+Conflict Detection Benchmark
+
+Times detect_vru_vehicle_conflicts and detect_vehicle_vehicle_conflicts
+on a synthetic minute of VCC traffic (BSMs and PSMs spread over the
+MapData intersections), reports their throughput in messages per second
+and checks their conflict counts against the previous row-by-row scans,
+which are timed on a smaller sample because they grow quadratically.
+
+With --min-throughput the script exits non-zero when either detector
+processes fewer messages per second, so it can gate the real-time path.
+
+Usage:
+    python scripts/benchmark_conflict_detection.py
+    python scripts/benchmark_conflict_detection.py --messages 100000 --vru-share 0.1
+    python scripts/benchmark_conflict_detection.py --min-throughput 500000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.services.vcc_feature_engineering import (  # noqa: E402
+    _with_mapped_intersection,
+    detect_vehicle_vehicle_conflicts,
+    detect_vru_vehicle_conflicts,
+    prepare_bsm_frame,
+    prepare_psm_frame,
+)
+
+T0_MS = 1_762_000_020_000  # minute-aligned
+
+
+def synthetic_minute(messages: int, vru_share: float, intersections: int, seed: int = 0):
+    """MapData plus one minute of BSM and PSM messages around its intersections."""
+    rng = random.Random(seed)
+    refs = [(37.20 + rng.uniform(0, 0.1), -80.45 + rng.uniform(0, 0.1)) for _ in range(intersections)]
+    mapdata = [
+        {
+            "intersections": [
+                {"id": {"id": 100 + i}, "refPoint": {"lat": lat, "lon": lon}}
+                for i, (lat, lon) in enumerate(refs)
+            ]
+        }
+    ]
+
+    def near(ref):
+        # Within ~250 m of the intersection center
+        return ref[0] + rng.uniform(-2.25e-3, 2.25e-3), ref[1] + rng.uniform(-2.25e-3, 2.25e-3)
+
+    n_psm = int(messages * vru_share)
+    bsm, psm = [], []
+    for k in range(messages - n_psm):
+        lat, lon = near(rng.choice(refs))
+        bsm.append({
+            "timestamp": T0_MS + rng.randint(0, 59_999),
+            "bsmJson": {"coreData": {
+                "id": f"veh-{k % 2000}",
+                "lat": lat,
+                "lon": lon,
+                "speed": rng.uniform(0, 20),
+                "heading": rng.uniform(0, 360),
+                "brakeAppliedStatus": rng.choice([0, 0, 0, 4]),
+            }},
+        })
+    for k in range(n_psm):
+        lat, lon = near(rng.choice(refs))
+        psm.append({
+            "timestamp": T0_MS + rng.randint(0, 59_999),
+            "psmJson": {
+                "id": f"vru-{k % 300}",
+                "position": {"lat": lat, "lon": lon},
+                "speed": rng.uniform(0, 3),
+                "heading": rng.uniform(0, 360),
+                "basicType": 1,
+            },
+        })
+    return mapdata, bsm, psm
+
+
+def previous_vru_conflicts(df_bsm, df_psm, interval_minutes=1,
+                           proximity_threshold_m=10.0, time_window_seconds=5.0):
+    """The per-PSM scan detect_vru_vehicle_conflicts used before the join."""
+    df_bsm = _with_mapped_intersection(df_bsm)
+    df_psm = _with_mapped_intersection(df_psm)
+    threshold_deg = proximity_threshold_m / 111000.0
+    time_window_td = pd.Timedelta(seconds=time_window_seconds)
+    time_col = 'time_15min' if interval_minutes == 15 else f'time_{interval_minutes}min'
+
+    conflicts = []
+    for intersection in df_psm['intersection'].dropna().unique():
+        psm_int = df_psm[df_psm['intersection'] == intersection]
+        bsm_int = df_bsm[df_bsm['intersection'] == intersection]
+        for _, psm_row in psm_int.iterrows():
+            nearby = bsm_int[
+                (abs(bsm_int['timestamp'] - psm_row['timestamp']) <= time_window_td) &
+                (abs(bsm_int['lat'] - psm_row['lat']) < threshold_deg) &
+                (abs(bsm_int['lon'] - psm_row['lon']) < threshold_deg)
+            ]
+            if len(nearby) > 0:
+                conflicts.append({
+                    'intersection': intersection,
+                    time_col: psm_row['timestamp'].floor(f'{interval_minutes}min'),
+                    'conflict_id': psm_row['vru_id'],
+                })
+    if not conflicts:
+        return pd.DataFrame(columns=['intersection', time_col, 'I_VRU'])
+    agg = pd.DataFrame(conflicts).groupby(['intersection', time_col]).agg({'conflict_id': 'count'}).reset_index()
+    agg.columns = ['intersection', time_col, 'I_VRU']
+    return agg
+
+
+def previous_vehicle_conflicts(df_bsm, interval_minutes=1, proximity_threshold_m=10.0,
+                               speed_variance_threshold=5.0, time_window_seconds=5.0):
+    """The nested per-BSM scan detect_vehicle_vehicle_conflicts used before the join."""
+    df_bsm = _with_mapped_intersection(df_bsm)
+    threshold_deg = proximity_threshold_m / 111000.0
+    time_window_td = pd.Timedelta(seconds=time_window_seconds)
+    time_col = 'time_15min' if interval_minutes == 15 else f'time_{interval_minutes}min'
+
+    conflicts = []
+    for intersection in df_bsm['intersection'].dropna().unique():
+        bsm_int = df_bsm[df_bsm['intersection'] == intersection].sort_values('timestamp')
+        for i, row1 in bsm_int.iterrows():
+            nearby = bsm_int[
+                (abs(bsm_int['timestamp'] - row1['timestamp']) <= time_window_td) &
+                (abs(bsm_int['lat'] - row1['lat']) < threshold_deg) &
+                (abs(bsm_int['lon'] - row1['lon']) < threshold_deg) &
+                (bsm_int.index != i)
+            ]
+            for j, row2 in nearby.iterrows():
+                if abs(row1['speed'] - row2['speed']) > speed_variance_threshold:
+                    conflicts.append({
+                        'intersection': intersection,
+                        time_col: row1['timestamp'].floor(f'{interval_minutes}min'),
+                        'conflict_id': f"{row1['vehicle_id']}_{row2['vehicle_id']}_{row1['timestamp'].timestamp()}",
+                    })
+    if not conflicts:
+        return pd.DataFrame(columns=['intersection', time_col, 'I_vehicle'])
+    df_conflicts = pd.DataFrame(conflicts).drop_duplicates(subset=['intersection', time_col, 'conflict_id'])
+    agg = df_conflicts.groupby(['intersection', time_col]).agg({'conflict_id': 'count'}).reset_index()
+    agg.columns = ['intersection', time_col, 'I_vehicle']
+    return agg
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--messages", type=int, default=100_000, help="BSM + PSM messages in the minute")
+    parser.add_argument("--vru-share", type=float, default=0.1, help="Fraction of messages that are PSMs")
+    parser.add_argument("--intersections", type=int, default=20, help="MapData intersections")
+    parser.add_argument("--reference-messages", type=int, default=10_000,
+                        help="Sample size for the previous row-by-row scans (0 to skip)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs")
+    parser.add_argument("--min-throughput", type=float, default=0,
+                        help="Fail when a detector handles fewer messages per second")
+    args = parser.parse_args()
+
+    mapdata, bsm, psm = synthetic_minute(args.messages, args.vru_share, args.intersections)
+    started = time.perf_counter()
+    bsm_frame = prepare_bsm_frame(bsm, mapdata)
+    psm_frame = prepare_psm_frame(psm, mapdata)
+    prepare_ms = (time.perf_counter() - started) * 1000
+
+    detectors = [
+        (
+            "detect_vru_vehicle_conflicts", "I_VRU", True,
+            lambda b, p: detect_vru_vehicle_conflicts(b, p, mapdata_list=mapdata, interval_minutes=1),
+            previous_vru_conflicts,
+        ),
+        (
+            "detect_vehicle_vehicle_conflicts", "I_vehicle", False,
+            lambda b, p: detect_vehicle_vehicle_conflicts(b, mapdata_list=mapdata, interval_minutes=1),
+            lambda b, p: previous_vehicle_conflicts(b),
+        ),
+    ]
+
+    print(f"\n{len(bsm):,} BSMs + {len(psm):,} PSMs over {args.intersections} intersections, one minute")
+    print(f"prepare frames (parse + map): {prepare_ms:,.0f} ms\n")
+    print(f"{'detector':<34}{'conflicts':>10}{'ms':>10}{'messages/s':>14}")
+    too_slow = []
+    for name, column, uses_psm, run, _ in detectors:
+        result = run(bsm_frame, psm_frame)
+        elapsed_ms = _median_ms(lambda: run(bsm_frame, psm_frame), args.repeat)
+        throughput = (len(bsm) + (len(psm) if uses_psm else 0)) / (elapsed_ms / 1000)
+        print(f"{name:<34}{int(result[column].sum()):>10,}{elapsed_ms:>10.1f}{throughput:>14,.0f}")
+        if throughput < args.min_throughput:
+            too_slow.append(name)
+    print(f"(median of {args.repeat} runs)")
+
+    if args.reference_messages:
+        share = args.reference_messages / args.messages
+        b = bsm_frame.iloc[: int(len(bsm_frame) * share)]
+        p = psm_frame.iloc[: int(len(psm_frame) * share)]
+        print(f"\nSample of {len(b) + len(p):,} messages against the previous row-by-row scans:")
+        for name, column, _, run, previous in detectors:
+            started = time.perf_counter()
+            expected = previous(b, p)
+            previous_ms = (time.perf_counter() - started) * 1000
+            current = run(b, p)
+            pd.testing.assert_frame_equal(expected, current[expected.columns])
+            current_ms = _median_ms(lambda: run(b, p), args.repeat)
+            print(f"  {name}: identical {column} counts, "
+                  f"{previous_ms:,.1f} ms -> {current_ms:,.1f} ms ({previous_ms / current_ms:,.0f}x)")
+
+    if too_slow:
+        print(f"\nBelow {args.min_throughput:,.0f} messages/s: {', '.join(too_slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Backend tests - async database access path
+==========================================
+The *_async RT-SI fetch methods must return exactly what their sync
+counterparts return, with their independent queries in flight together.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+T0 = datetime(2025, 11, 9, 8, 0)
+T0_US = int(T0.timestamp() * 1_000_000)
+BIN_US = 15 * 60 * 1_000_000
+
+
+class FakeTrafficClient:
+    """Answers the latest-bin and per-intersection binned traffic queries."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        q = str(query)
+        if "time_bin" in q:
+            keys = [{"intersection": name, "time_bin": T0_US} for name in params["intersections"]]
+        else:
+            keys = [{"bin_start_us": T0_US}]
+        # Every latest-bin query reads "vehicle-count"; match the others first
+        if '"speed-distribution"' in q:
+            row = {"total_count": 50, "avg_speed": 22.0, "free_flow_speed": 35.0}
+            return [{**key, **row} for key in keys]
+        if '"vru-count"' in q:
+            return [{**key, "vru_count": 4} for key in keys]
+        if '"vehicle-count"' in q:
+            return [{**key, "vehicle_count": 120, "turning_count": 30} for key in keys]
+        return []
+
+
+class FakeAsyncClient:
+    """Async wrapper over FakeTrafficClient that records peak concurrency."""
+
+    def __init__(self, sync_client):
+        self.sync_client = sync_client
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute_query(self, query, params=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return self.sync_client.execute_query(query, params)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def services():
+    from app.services.rt_si_service import RTSIService
+
+    async_client = FakeAsyncClient(FakeTrafficClient())
+    return RTSIService(FakeTrafficClient(), async_client), async_client
+
+
+class TestRTSIAsyncFetch:
+    def test_bulk_traffic_matches_sync_and_runs_concurrently(self, services):
+        service, async_client = services
+        end = T0 + timedelta(hours=2)
+
+        expected = service.get_bulk_traffic_data("glebe-potomac", T0, end, 15)
+        result = asyncio.run(service.get_bulk_traffic_data_async("glebe-potomac", T0, end, 15))
+
+        assert result == expected
+        assert len(result) == 8
+        assert async_client.peak == 3
+
+    def test_realtime_data_matches_sync(self, services):
+        service, async_client = services
+
+        expected = service.get_realtime_data("glebe-potomac", T0, 15)
+        result = asyncio.run(service.get_realtime_data_async("glebe-potomac", T0, 15))
+
+        assert result == expected
+        assert result["vehicle_count"] == 120 and result["vru_count"] == 4
+        assert async_client.peak == 3
+
+    def test_async_methods_require_an_async_client(self):
+        from app.services.rt_si_service import RTSIService
+
+        service = RTSIService(FakeTrafficClient())
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(service.get_realtime_data_async("glebe-potomac", T0))
+
+
+class TestAsyncClientDependency:
+    def test_missing_psycopg_is_reported(self, monkeypatch):
+        from app.services import async_db_client
+
+        monkeypatch.setattr(async_db_client, "AsyncConnectionPool", None)
+
+        with pytest.raises(RuntimeError, match="psycopg"):
+            async_db_client.AsyncVTTIPostgresClient(password="secret")
+
+
+class TestSafetyScoreAtTimeFanOut:
+    @pytest.fixture
+    def endpoint(self, monkeypatch):
+        import pandas as pd
+        from app.api import intersection
+        from app.services.mcdm_service import MCDMSafetyIndexService
+
+        async_client = FakeAsyncClient(FakeTrafficClient())
+        monkeypatch.setattr(intersection, "get_async_db_client", lambda: async_client)
+        monkeypatch.setattr(intersection, "get_db_client", FakeTrafficClient)
+        monkeypatch.setattr(
+            intersection.intersection_registry,
+            "lookup",
+            lambda name: [{"intersection_name": "glebe-potomac", "crash_intersection_id": 7}],
+        )
+
+        async def matrix_for_time(self, target_time, bin_minutes=15):
+            await self.async_client.execute_query("SELECT criteria matrix")
+            return pd.DataFrame({"intersection": ["glebe-potomac"], "vehicle_count": [120.0]})
+
+        monkeypatch.setattr(MCDMSafetyIndexService, "get_data_matrix_for_time_async", matrix_for_time)
+        return intersection, async_client
+
+    def test_matrix_and_realtime_queries_run_together(self, endpoint):
+        from app.services.rt_si_service import RTSIService
+
+        intersection, async_client = endpoint
+
+        prefetched = asyncio.run(intersection._fetch_safety_score_inputs("glebe-potomac", T0, 15))
+
+        assert async_client.peak == 4
+        assert len(prefetched["matrix"]) == 1
+        assert prefetched["realtime_intersection"] == "glebe-potomac"
+        assert prefetched["realtime"] == RTSIService(FakeTrafficClient()).get_realtime_data("glebe-potomac", T0, 15)
+
+    def test_unmapped_intersection_fetches_only_the_matrix(self, endpoint, monkeypatch):
+        intersection, async_client = endpoint
+        monkeypatch.setattr(intersection.intersection_registry, "lookup", lambda name: None)
+
+        prefetched = asyncio.run(intersection._fetch_safety_score_inputs("glebe-potomac", T0, 15))
+
+        assert set(prefetched) == {"matrix"}
+        assert async_client.peak == 1
+
+    def test_missing_async_client_prefetches_nothing(self, monkeypatch):
+        from app.api import intersection
+
+        def unavailable():
+            raise RuntimeError("The async database client requires psycopg 3 and psycopg-pool")
+
+        monkeypatch.setattr(intersection, "get_async_db_client", unavailable)
+
+        assert asyncio.run(intersection._fetch_safety_score_inputs("glebe-potomac", T0, 15)) == {}
+
+    def test_prefetched_realtime_data_is_not_queried_again(self, monkeypatch):
+        from app.services.rt_si_service import RTSIService
+
+        service = RTSIService(FakeTrafficClient())
+        rt_data = service.get_realtime_data("glebe-potomac", T0, 15)
+        expected = service.calculate_rt_si(7, T0, 15, realtime_intersection="glebe-potomac")
+
+        def no_query(*args, **kwargs):
+            raise AssertionError("realtime data queried again")
+
+        monkeypatch.setattr(service, "get_realtime_data", no_query)
+        result = service.calculate_rt_si(
+            7, T0, 15, realtime_intersection="glebe-potomac", rt_data=rt_data
+        )
+
+        assert result is not None
+        assert result == expected
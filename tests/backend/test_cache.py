@@ -1,8 +1,10 @@
 """
-Backend tests - TTLCache
-========================
+Backend tests - TTLCache, MemoryCache and ResponseCache
+=======================================================
 Tests for the time-to-live response cache used to make the expensive
-/api/v1/safety/index/ endpoint cheap on repeat calls.
+/api/v1/safety/index/ endpoint cheap on repeat calls, the bounded memory
+tier, and the single-flight coalescing of concurrent misses in
+ResponseCache.
 """
 
 
@@ -84,3 +86,300 @@ class TestTTLCache:
 
         assert cache.get(("alpha", 0.7)) == (True, "blended")
         assert cache.get(("alpha", 1.0)) == (True, "pure-rtsi")
+
+
+class TestMemoryCache:
+    def test_lru_entries_are_evicted_beyond_byte_budget(self):
+        from app.core.cache import MemoryCache
+
+        cache = MemoryCache(max_bytes=30)
+        cache.set("a", "x" * 8, 60)  # 10 bytes as JSON
+        cache.set("b", "x" * 8, 60)
+        cache.set("c", "x" * 8, 60)
+        cache.get("a")  # a becomes most recently used
+        cache.set("d", "x" * 8, 60)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, "x" * 8)
+        assert cache.status()["evictions"] == 1
+        assert cache.status()["bytes"] == 30
+
+    def test_oversized_payload_is_not_stored(self):
+        from app.core.cache import MemoryCache
+
+        cache = MemoryCache(max_bytes=10)
+        assert cache.set("big", list(range(100)), 60) is False
+        assert len(cache) == 0
+
+    def test_entries_expire_by_their_own_ttl(self):
+        from app.core.cache import MemoryCache
+
+        clock = FakeClock()
+        cache = MemoryCache(max_bytes=1000, clock=clock)
+        cache.set("short", 1, 10)
+        cache.set("long", 2, 100)
+
+        clock.advance(11)
+        assert cache.get("short") == (False, None)
+        assert cache.get("long") == (True, 2)
+
+    def test_sweep_drops_expired_keys_that_are_never_read(self):
+        from app.core.cache import MemoryCache
+
+        clock = FakeClock()
+        cache = MemoryCache(max_bytes=10_000, sweep_interval=30, clock=clock)
+        for i in range(50):
+            cache.set(f"range-{i}", {"i": i}, 10)
+
+        clock.advance(31)
+        cache.set("fresh", 1, 10)  # triggers the periodic sweep
+
+        assert len(cache) == 1
+        assert cache.status()["expirations"] == 50
+        assert cache.status()["bytes"] == 1
+
+    def test_counters_and_prefix_delete(self):
+        from app.core.cache import MemoryCache
+
+        cache = MemoryCache(max_bytes=1000)
+        cache.set("ns:a", 1, 60)
+        cache.set("ns:b", 2, 60)
+        cache.set("other", 3, 60)
+        cache.get("ns:a")
+        cache.get("missing")
+
+        assert cache.delete_prefix("ns:") == 2
+        status = cache.status()
+        assert (status["hits"], status["misses"], status["entries"]) == (1, 1, 1)
+
+
+
+class TestPayloadCodec:
+    PAYLOAD = {
+        "time_series": [{"time_bin": "2025-11-01T08:00:00", "rt_si_score": 41.5, "vru_index": None}] * 200,
+        "metadata": {"intersection": "glebe-potomac", "data_points": 200},
+    }
+
+    def test_round_trip_for_every_available_codec(self):
+        from app.core.codec import COMPRESSIONS, SERIALIZERS, PayloadCodec
+
+        for serializer in [name for name, impl in SERIALIZERS.items() if impl is not None]:
+            for compression in COMPRESSIONS:
+                codec = PayloadCodec(serializer, compression, compress_min_bytes=64)
+                blob, size = codec.encode(self.PAYLOAD)
+
+                assert codec.decode_sized(blob) == (self.PAYLOAD, size)
+                if codec.compression != "none":
+                    assert len(blob) < size
+
+    def test_small_payloads_are_not_compressed(self):
+        from app.core.codec import PayloadCodec
+
+        codec = PayloadCodec("json", "zlib", compress_min_bytes=1024)
+        blob, size = codec.encode({"score": 1})
+
+        assert blob[:1] == b"\x00" and len(blob) == size + 1
+
+    def test_missing_serializer_falls_back_to_json(self, monkeypatch):
+        from app.core import codec as codec_module
+
+        monkeypatch.setitem(codec_module.SERIALIZERS, "msgpack", None)
+        codec = codec_module.PayloadCodec("msgpack", "none")
+
+        assert codec.serializer == "json"
+        assert codec.tag == f"v{codec_module.FORMAT_VERSION}.json.none"
+
+    def test_codec_tag_is_part_of_the_key(self, monkeypatch):
+        from app.core.codec import PayloadCodec
+        from app.core.redis_cache import ResponseCache
+
+        cache = ResponseCache()
+        key = cache.make_key("safety-time-range", "glebe-potomac")
+        cache._codec = PayloadCodec("json", "none")
+
+        assert cache._codec.tag in cache.make_key("safety-time-range", "glebe-potomac")
+        assert cache.make_key("safety-time-range", "glebe-potomac") != key
+
+    def test_unknown_blob_header_is_rejected(self):
+        import pytest
+        from app.core.codec import PayloadCodec
+
+        with pytest.raises(ValueError):
+            PayloadCodec("json", "none").decode(b"\x09{}")
+
+
+class FakeRedis:
+    """The subset of redis-py used by ResponseCache, shared across 'workers'."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+class TestResponseCacheSingleFlight:
+    def _cache(self, monkeypatch, redis=None):
+        from app.core.config import settings
+        from app.core.redis_cache import ResponseCache
+
+        monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+        cache = ResponseCache()
+        monkeypatch.setattr(cache, "_client", lambda: redis)
+        return cache
+
+    def test_concurrent_misses_compute_once(self, monkeypatch):
+        import threading
+
+        cache = self._cache(monkeypatch)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {"score": 42}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("k", 60, compute)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        started.wait(5)
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        assert len(calls) == 1
+        assert results == [{"score": 42}] * 8
+        assert cache.get_or_compute("k", 60, compute) == {"score": 42}
+        assert len(calls) == 1
+
+    def test_waiters_share_the_leaders_error(self, monkeypatch):
+        import threading
+
+        import pytest
+
+        cache = self._cache(monkeypatch)
+        started, release, waiting = threading.Event(), threading.Event(), threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            raise RuntimeError("database unavailable")
+
+        errors = []
+
+        def call():
+            try:
+                cache.get_or_compute("k", 60, compute)
+            except RuntimeError as exc:
+                errors.append(str(exc))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+
+        done = cache._flights["k"].done
+        original_wait = done.wait
+        monkeypatch.setattr(done, "wait", lambda timeout: (waiting.set(), original_wait(timeout))[1])
+        follower = threading.Thread(target=call)
+        follower.start()
+        waiting.wait(5)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        assert errors == ["database unavailable"] * 2
+        assert len(calls) == 1
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute("k", 60, compute)  # errors are not cached
+
+    def test_wait_is_bounded(self, monkeypatch):
+        import threading
+
+        cache = self._cache(monkeypatch)
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "slow"
+
+        leader = threading.Thread(target=lambda: cache.get_or_compute("k", 60, slow))
+        leader.start()
+        started.wait(5)
+
+        assert cache.get_or_compute("k", 60, lambda: "own", wait_seconds=0.05) == "own"
+        release.set()
+        leader.join(5)
+
+    def test_other_worker_holding_lease_is_waited_for(self, monkeypatch):
+        import threading
+
+        redis = FakeRedis()
+        cache = self._cache(monkeypatch, redis)
+        redis.set("k:lease", "other-worker", nx=True)
+
+        def other_worker_finishes():
+            redis.setex("k", 60, cache._codec.encode({"score": 7})[0])
+            redis.eval(None, 1, "k:lease", "other-worker")
+
+        threading.Timer(0.1, other_worker_finishes).start()
+
+        assert cache.get_or_compute("k", 60, lambda: {"score": 0}) == {"score": 7}
+        assert cache.status()["single_flight"]["computed"] == 0
+
+    def test_lease_is_released_after_compute(self, monkeypatch):
+        redis = FakeRedis()
+        cache = self._cache(monkeypatch, redis)
+
+        assert cache.get_or_compute("k", 60, lambda: [1, 2]) == [1, 2]
+
+        assert "k:lease" not in redis.data
+        assert cache.get("k", 60) == (True, [1, 2])
+
+    def test_redis_values_are_served_from_l1(self, monkeypatch):
+        from app.core.cache import MemoryCache
+        from app.core.config import settings
+
+        redis = FakeRedis()
+        reads = []
+        original_get = redis.get
+        monkeypatch.setattr(redis, "get", lambda key: (reads.append(key), original_get(key))[1])
+        monkeypatch.setattr(settings, "CACHE_L1_TTL_SECONDS", 5)
+        cache = self._cache(monkeypatch, redis)
+        clock = FakeClock()
+        cache._memory = MemoryCache(max_bytes=1000, clock=clock)
+
+        cache.set("k", {"score": 1}, 60)
+        assert cache.get("k", 60) == (True, {"score": 1})
+        assert reads == []
+
+        clock.advance(6)  # L1 copy expired, Redis still has it
+        assert cache.get("k", 60) == (True, {"score": 1})
+        assert cache.get("k", 60) == (True, {"score": 1})
+        assert reads == ["k"]
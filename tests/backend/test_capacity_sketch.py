@@ -0,0 +1,168 @@
+"""
+Backend tests - CapacitySketchStore
+===================================
+Capacity served from the per-day count histograms must equal
+PERCENTILE_CONT(0.95) over the same rows, pick up new rows incrementally
+including late rows for recently scanned days, and leave the database
+query as a fallback and verification path.
+"""
+import time
+
+import pytest
+
+try:
+    import pyarrow
+
+    HAS_PARQUET = isinstance(getattr(pyarrow, "__version__", None), str)
+except ImportError:
+    HAS_PARQUET = False
+
+requires_parquet = pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not available")
+
+NOW = 1_730_000_000.0
+NOW_US = int(NOW * 1_000_000)
+DAY_US = 24 * 60 * 60 * 1_000_000
+
+
+class FakeVehicleCountClient:
+    """Aggregates raw (intersection, publish_timestamp, count) rows like the ingest query."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        if "PERCENTILE_CONT" in query:
+            import numpy as np
+
+            since = NOW_US - params["lookback_us"]
+            counts = [
+                c for name, ts, c in self.rows
+                if name == params["intersection_id"] and ts >= since
+            ]
+            return [{"capacity": float(np.percentile(counts, 95)) if counts else None}]
+
+        cells = {}
+        for name, ts, count in self.rows:
+            if ts >= params["since_us"]:
+                key = (name, ts // params["day_us"], count)
+                n, max_ts = cells.get(key, (0, ts))
+                cells[key] = (n + 1, max(max_ts, ts))
+        return [
+            {"intersection": k[0], "day": k[1], "value": k[2], "n": n, "max_ts": max_ts}
+            for k, (n, max_ts) in cells.items()
+        ]
+
+
+def _rows(n=2000, seed=5):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return [
+        (
+            str(rng.choice(["glebe-potomac", "birch-broad"])),
+            NOW_US - int(rng.integers(0, 29 * DAY_US)),
+            int(rng.integers(0, 250)),
+        )
+        for _ in range(n)
+    ]
+
+
+@pytest.fixture
+def store():
+    from app.services.capacity_sketch import capacity_sketch_store
+
+    capacity_sketch_store.clear()
+    capacity_sketch_store._clock = lambda: NOW
+    yield capacity_sketch_store
+    capacity_sketch_store.clear()
+    capacity_sketch_store._clock = time.time
+
+
+class TestCapacitySketch:
+    def test_matches_database_percentile(self, store):
+        from app.services.rt_si_service import RTSIService
+
+        client = FakeVehicleCountClient(_rows())
+        service = RTSIService(client)
+        expected = {
+            name: service.get_intersection_capacity(name)
+            for name in ("glebe-potomac", "birch-broad")
+        }
+        assert len(client.calls) == 2  # not loaded yet: database fallback
+
+        store.update(client)
+        client.calls.clear()
+
+        for name, capacity in expected.items():
+            assert service.get_intersection_capacity(name) == pytest.approx(capacity)
+        assert service.get_intersection_capacities(list(expected)) == pytest.approx(expected)
+        assert service.get_intersection_capacity("nowhere") == RTSIService.DEFAULT_CAPACITY
+        assert client.calls == []
+
+    def test_update_rescans_only_recent_days(self, store):
+        client = FakeVehicleCountClient(_rows(500))
+        store.update(client)
+        before = store.quantile("glebe-potomac")
+        watermark = max(ts for _, ts, _ in client.rows)
+
+        client.rows.extend(("glebe-potomac", NOW_US + i, 10_000) for i in range(1, 200))
+        store.update(client)
+        expected_since = (watermark // DAY_US - (store.rescan_days - 1)) * DAY_US
+        assert client.calls[-1][1]["since_us"] == expected_since
+        assert before < 250
+        assert store.quantile("glebe-potomac") == 10_000.0
+
+    def test_late_rows_are_counted_without_double_counting(self, store):
+        from app.services.rt_si_service import RTSIService
+
+        client = FakeVehicleCountClient(_rows(500))
+        store.update(client)
+        # Published before the watermark, inserted after the last update
+        client.rows.extend(("birch-broad", NOW_US - 3_600_000_000, 10_000) for _ in range(40))
+        store.update(client)
+        store.update(client)
+
+        expected = RTSIService(client).get_intersection_capacity("birch-broad")
+        store.clear()
+        store.update(client)
+        assert store.quantile("birch-broad") == pytest.approx(expected)
+
+    def test_days_outside_retention_are_dropped(self, store):
+        client = FakeVehicleCountClient(_rows(300))
+        store.update(client)
+
+        store._clock = lambda: NOW + 60 * 86400
+        store.update(client)
+
+        assert store.status()["intersections"] == 0
+        assert store.quantile("glebe-potomac") is None
+
+    def test_lookback_beyond_retention_uses_database(self, store):
+        from app.services.rt_si_service import RTSIService
+
+        client = FakeVehicleCountClient(_rows(300))
+        store.update(client)
+        client.calls.clear()
+
+        RTSIService(client).get_intersection_capacity("glebe-potomac", lookback_days=90)
+
+        assert len(client.calls) == 1
+
+    @requires_parquet
+    def test_parquet_round_trip(self, store, tmp_path):
+        client = FakeVehicleCountClient(_rows(800))
+        store.update(client)
+        before = store.quantile("birch-broad")
+        path = store.save(tmp_path / "capacity_sketch.parquet")
+
+        store.clear()
+        assert store.load(path) is True
+        assert store.quantile("birch-broad") == before
+
+        client.calls.clear()
+        store.update(client)
+        watermark = max(ts for _, ts, _ in client.rows)
+        assert client.calls[0][1]["since_us"] == (watermark // DAY_US - (store.rescan_days - 1)) * DAY_US
+        assert store.quantile("birch-broad") == before
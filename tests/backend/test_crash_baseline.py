@@ -0,0 +1,174 @@
+"""
+Backend tests - CrashBaselineStore
+==================================
+A built baseline must answer get_historical_crash_rate with the same values
+the per-intersection query produces, survive a Parquet round trip, and
+keep RT-SI scoring off vdot_crashes_with_intersections.
+"""
+import pytest
+
+try:
+    import pyarrow
+
+    HAS_PARQUET = isinstance(getattr(pyarrow, "__version__", None), str)
+except ImportError:
+    HAS_PARQUET = False
+
+requires_parquet = pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not available")
+
+CRASHES = {7: 70.0, 11: 4.0, 12: 0.0}
+
+
+class FakeCrashClient:
+    """Serves both the grouped baseline query and the per-intersection one."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        if "GROUP BY matched_intersection_id" in query and "ANY" not in query:
+            return [
+                {"matched_intersection_id": i, "weighted_crashes": w, "exposure": 1}
+                for i, w in CRASHES.items()
+            ]
+        if "vdot_crashes_with_intersections" in query:
+            return [{"weighted_crashes": CRASHES.get(params["intersection_id"], 0), "exposure": 1}]
+        return []
+
+
+@pytest.fixture
+def store():
+    from app.services.crash_baseline import crash_baseline_store
+
+    crash_baseline_store.clear()
+    yield crash_baseline_store
+    crash_baseline_store.clear()
+
+
+class TestCrashBaseline:
+    def test_matches_per_intersection_query(self, store):
+        from app.services.rt_si_service import RTSIService
+
+        client = FakeCrashClient()
+        service = RTSIService(client)
+        expected = {i: service.get_historical_crash_rate(i) for i in (7, 11, 12, 99)}
+
+        assert service.build_crash_baseline() == 3
+        client.calls.clear()
+
+        for crash_id, hist in expected.items():
+            assert service.get_historical_crash_rate(crash_id) == hist
+        assert service.get_historical_crash_rates([7, 99]) == {7: expected[7], 99: expected[99]}
+        assert client.calls == []
+
+    def test_other_year_ranges_fall_back_to_the_database(self, store):
+        from app.services.rt_si_service import RTSIService
+
+        client = FakeCrashClient()
+        service = RTSIService(client)
+        service.build_crash_baseline()
+        client.calls.clear()
+
+        service.get_historical_crash_rate(7, start_year=2020, end_year=2024)
+
+        assert len(client.calls) == 1
+
+    @requires_parquet
+    def test_parquet_round_trip(self, store, tmp_path):
+        from app.services.rt_si_service import RTSIService
+
+        service = RTSIService(FakeCrashClient())
+        service.build_crash_baseline()
+        before = {i: service.get_eb_params(i) for i in (7, 11, 99)}
+        path = store.save(tmp_path / "crash_baseline.parquet")
+
+        store.clear()
+        assert store.load(path) is True
+
+        client = FakeCrashClient()
+        service = RTSIService(client)
+        assert {i: service.get_eb_params(i) for i in (7, 11, 99)} == before
+        assert client.calls == []
+
+    @requires_parquet
+    def test_stale_or_missing_file_is_not_loaded(self, store, tmp_path):
+        from app.services.rt_si_service import RTSIService
+
+        assert store.load(tmp_path / "missing.parquet") is False
+
+        RTSIService(FakeCrashClient()).build_crash_baseline()
+        path = store.save(tmp_path / "crash_baseline.parquet")
+        store.clear()
+
+        assert store.load(path, max_age_days=-1) is False
+        assert store.status()["partitions"] == 0
+
+    def test_eb_params_report_stabilized_rate(self, store):
+        from app.services.rt_si_service import RTSIService
+
+        service = RTSIService(FakeCrashClient())
+        service.build_crash_baseline()
+        params = service.get_eb_params(7)
+
+        assert params["lambda_star"] == RTSIService.LAMBDA
+        assert params["global_mean"] == RTSIService.R0
+        assert params["r_hat"] == service.compute_eb_rate(70.0, 1.0)
+        assert "r_hat" not in store.get(7, 2017, 2024, service.severity_weights())
+
+        # r_hat follows the service's LAMBDA, not the one the baseline was built with
+        service.LAMBDA = 0.5
+        assert service.get_eb_params(7)["r_hat"] == service.compute_eb_rate(70.0, 1.0, lam=0.5)
+
+
+class StopAfter:
+    """Stands in for the stop event: records the delays, stops after ``n`` waits."""
+
+    def __init__(self, n):
+        self.n = n
+        self.delays = []
+
+    def wait(self, delay):
+        self.delays.append(delay)
+        return len(self.delays) >= self.n
+
+
+class TestWarmCrashBaseline:
+    @pytest.fixture
+    def warm(self, store, monkeypatch):
+        from app.core.config import settings
+        from app.services import crash_baseline
+
+        monkeypatch.setattr(settings, "CRASH_BASELINE_RETRY_SECONDS", 10)
+        monkeypatch.setattr(settings, "CRASH_BASELINE_MAX_AGE_DAYS", 30)
+        monkeypatch.setattr(store, "load", lambda *args: False)
+        saved = []
+        monkeypatch.setattr(store, "save", lambda path=None: saved.append(path))
+        return crash_baseline.warm_crash_baseline, saved
+
+    def test_failures_are_retried_with_backoff(self, store, warm):
+        warm_crash_baseline, saved = warm
+        attempts = []
+
+        def client_factory():
+            attempts.append(1)
+            if len(attempts) < 4:
+                raise ConnectionError("database unavailable")
+            return FakeCrashClient()
+
+        stop = StopAfter(4)
+        warm_crash_baseline(client_factory, stop)
+
+        assert stop.delays[:3] == [10, 20, 40]
+        assert len(attempts) == 4
+        assert store.status()["partitions"] == 1
+        assert len(saved) == 1
+
+    def test_rebuilds_when_baseline_becomes_stale(self, store, warm):
+        warm_crash_baseline, saved = warm
+
+        stop = StopAfter(2)
+        warm_crash_baseline(FakeCrashClient, stop)
+
+        assert stop.delays[0] == pytest.approx(30 * 86400, abs=5)
+        assert len(saved) == 2
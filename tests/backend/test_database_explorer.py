@@ -0,0 +1,134 @@
+"""
+Backend tests - Database Explorer catalog, keyset pages and export
+==================================================================
+Table and column lookups come from a per-client cached catalog; keyset
+pages continue after the last row's ordering key via an opaque cursor;
+exports stream server-side cursor batches as CSV.
+"""
+import pytest
+from fastapi import HTTPException
+
+
+class FakeExplorerClient:
+    """Catalog rows plus a ``readings`` table ordered by (site, seq)."""
+
+    COLUMNS = {
+        "readings": [
+            {"column_name": "site", "data_type": "text", "is_nullable": "NO", "primary_key_position": 1},
+            {"column_name": "seq", "data_type": "integer", "is_nullable": "NO", "primary_key_position": 2},
+            {"column_name": "value", "data_type": "double precision", "is_nullable": "YES", "primary_key_position": None},
+        ],
+        "vehicle-count": [
+            {"column_name": "intersection", "data_type": "text", "is_nullable": "YES", "primary_key_position": None},
+            {"column_name": "publish_timestamp", "data_type": "bigint", "is_nullable": "YES", "primary_key_position": None},
+        ],
+    }
+    ROWS = [{"site": site, "seq": seq, "value": seq / 2} for site in ("a", "b") for seq in range(3)]
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        text = str(query)
+        if "information_schema.tables" in text:
+            return [{"table_name": name} for name in self.COLUMNS]
+        if "information_schema.columns" in text:
+            return self.COLUMNS[params["table"]]
+        if "OFFSET" in text:
+            limit, offset = params
+            return [dict(r) for r in self.ROWS[offset : offset + limit]]
+        *bounds, limit = params
+        rows = [dict(r) for r in self.ROWS if not bounds or (r["site"], r["seq"]) > tuple(bounds)]
+        return rows[:limit]
+
+    def iter_query_batches(self, query, params=None, batch_size=10000):
+        self.calls.append((query, params))
+        rows = [(r["site"], r["seq"], r["value"]) for r in self.ROWS]
+        for i in range(0, len(rows), 4):
+            yield ["site", "seq", "value"], rows[i : i + 4]
+
+
+@pytest.fixture
+def explorer(monkeypatch):
+    from app.api import database_explorer
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    client = FakeExplorerClient()
+    monkeypatch.setattr(database_explorer, "get_db_client", lambda: client)
+    return database_explorer, client
+
+
+class TestKeysetPagination:
+    @pytest.mark.asyncio
+    async def test_cursor_walks_the_primary_key(self, explorer):
+        database_explorer, client = explorer
+
+        first = await database_explorer.get_table_data("readings", limit=4, paginate="keyset")
+        assert first["order_by"] == ["site", "seq"]
+        assert [(r["site"], r["seq"]) for r in first["rows"]] == [("a", 0), ("a", 1), ("a", 2), ("b", 0)]
+
+        second = await database_explorer.get_table_data("readings", limit=4, cursor=first["next_cursor"])
+        assert [(r["site"], r["seq"]) for r in second["rows"]] == [("b", 1), ("b", 2)]
+        assert second["next_cursor"] is None
+        assert client.calls[-1][1] == ("b", 0, 4)
+
+    @pytest.mark.asyncio
+    async def test_catalog_is_queried_once(self, explorer):
+        database_explorer, client = explorer
+
+        await database_explorer.get_table_data("readings", limit=2, paginate="keyset")
+        await database_explorer.get_table_data("readings", limit=2, offset=2)
+        await database_explorer.get_table_schema("readings")
+
+        catalog_calls = [q for q, _ in client.calls if "information_schema" in str(q)]
+        assert len(catalog_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cursor_must_match_table_and_filter(self, explorer):
+        database_explorer, _ = explorer
+        page = await database_explorer.get_table_data("readings", limit=2, paginate="keyset")
+
+        for kwargs in (
+            {"cursor": page["next_cursor"], "filter_col": "site", "filter_val": "a"},
+            {"cursor": "not-a-cursor"},
+        ):
+            with pytest.raises(HTTPException) as exc:
+                await database_explorer.get_table_data("readings", limit=2, **kwargs)
+            assert exc.value.status_code == 400
+
+    def test_tables_without_primary_key_order_by_timestamp(self, explorer):
+        from app.services.table_catalog import get_table_catalog
+
+        _, client = explorer
+        assert get_table_catalog(client).ordering_key("vehicle-count") == ["publish_timestamp", "ctid"]
+
+
+class TestExport:
+    def test_csv_streams_header_and_batches(self, explorer):
+        import asyncio
+
+        database_explorer, client = explorer
+        response = database_explorer.export_table(
+            "readings", format="csv", filter_col="site", filter_val="a", limit=None
+        )
+
+        async def collect():
+            return [chunk async for chunk in response.body_iterator]
+
+        chunks = asyncio.run(collect())
+        assert len(chunks) == 2
+        lines = b"".join(chunks).decode().splitlines()
+        assert lines[0] == "site,seq,value"
+        assert lines[1:3] == ["a,0,0.0", "a,1,0.5"]
+        assert len(lines) == 7
+        assert client.calls[-1][1] == ("a",)
+        assert response.headers["content-disposition"] == 'attachment; filename="readings.csv"'
+
+    def test_unknown_table_is_404(self, explorer):
+        database_explorer, _ = explorer
+
+        with pytest.raises(HTTPException) as exc:
+            database_explorer.export_table("users", format="csv", filter_col=None, filter_val=None, limit=None)
+        assert exc.value.status_code == 404
@@ -0,0 +1,253 @@
+"""
+Backend tests - concurrent query fan-out
+========================================
+VTTIPostgresClient.execute_queries must run a batch on separate pooled
+connections under one deadline, cancelling whatever is still running when
+the deadline passes or a query fails; the RT-SI bulk fetch must cover
+several intersections with the same three grouped queries.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = self.connection = conn
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.pool.started.append(query)
+        if query == "slow":
+            if not self.conn.cancelled.wait(5):
+                raise AssertionError("slow query was never cancelled")
+            raise RuntimeError("canceling statement due to user request")
+        if query == "fail":
+            raise ValueError("syntax error")
+        if query == "busy":
+            time.sleep(0.02)
+        self.rows = [{"query": query, "params": params}]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+        self.cancelled = threading.Event()
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    """
+    ThreadedConnectionPool stand-in that records how connections come back
+    and, like the real pool, raises instead of waiting when exhausted.
+    """
+
+    def __init__(self, max_connections=10):
+        self.max_connections = max_connections
+        self.started = []
+        self.returned = []
+        self.out = self.peak = 0
+        self.lock = threading.Lock()
+
+    def getconn(self):
+        from psycopg2.pool import PoolError
+
+        with self.lock:
+            if self.out == self.max_connections:
+                raise PoolError("connection pool exhausted")
+            self.out += 1
+            self.peak = max(self.peak, self.out)
+        return FakeConnection(self)
+
+    def putconn(self, conn, close=False):
+        with self.lock:
+            self.out -= 1
+            self.returned.append((conn, close))
+
+
+def _client(max_connections=10):
+    from app.services.db_client import VTTIPostgresClient
+    from app.services.prepared_statements import StatementPreparer
+
+    db = object.__new__(VTTIPostgresClient)
+    db.connection_pool = FakePool(max_connections)
+    db._connection_slots = threading.BoundedSemaphore(max_connections)
+    db.statements = StatementPreparer()
+    return db
+
+
+@pytest.fixture
+def client():
+    return _client()
+
+
+class TestExecuteQueries:
+    def test_results_come_back_in_query_order(self, client):
+        results = client.execute_queries([("a", {"n": 1}), ("b", None), ("c", (3,))], timeout=5)
+
+        assert [rows[0]["query"] for rows in results] == ["a", "b", "c"]
+        assert results[0][0]["params"] == {"n": 1}
+        assert [close for _, close in client.connection_pool.returned] == [False] * 3
+
+    def test_deadline_cancels_running_queries(self, client):
+        from app.services.db_client import QueryDeadlineExceeded
+
+        with pytest.raises(QueryDeadlineExceeded):
+            client.execute_queries([("fast", None), ("slow", None)], timeout=0.2)
+
+        pool = client.connection_pool
+        slow_conn = next(conn for conn, _ in _wait_for_returns(pool, 2) if conn.cancelled.is_set())
+        assert (slow_conn, True) in pool.returned
+
+    def test_failure_cancels_the_rest_of_the_batch(self, client):
+        with pytest.raises(ValueError, match="syntax error"):
+            client.execute_queries([("slow", None), ("fail", None)], timeout=5)
+
+        returned = _wait_for_returns(client.connection_pool, 2)
+        assert any(conn.cancelled.is_set() and close for conn, close in returned)
+
+    def test_concurrent_batches_wait_for_pooled_connections(self):
+        # More concurrent batches (plus single queries) than connections:
+        # every query waits for a free connection instead of exhausting the pool
+        client = _client(max_connections=4)
+        results, errors = [], []
+
+        def batch():
+            try:
+                results.append(client.execute_queries([("busy", None)] * 3, timeout=10))
+            except Exception as e:
+                errors.append(e)
+
+        def single():
+            try:
+                with client.get_connection():
+                    time.sleep(0.02)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=batch) for _ in range(8)]
+        threads += [threading.Thread(target=single) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(results) == 8
+        pool = client.connection_pool
+        assert pool.peak == 4
+        assert pool.out == 0
+        assert client._connection_slots.acquire(blocking=False)
+
+    def test_waiting_for_a_connection_respects_the_deadline(self):
+        from app.services.db_client import QueryDeadlineExceeded
+
+        client = _client(max_connections=1)
+        assert client._connection_slots.acquire(blocking=False)  # pool fully in use
+
+        with pytest.raises(QueryDeadlineExceeded):
+            client.execute_queries([("a", None)], timeout=0.1)
+        assert client.connection_pool.started == []
+
+
+def _wait_for_returns(pool, count, timeout=5.0):
+    """Cancelled workers hand their connection back shortly after the raise."""
+    deadline = time.monotonic() + timeout
+    while len(pool.returned) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return list(pool.returned)
+
+
+class FakeBulkClient:
+    """Grouped bulk traffic rows: one vehicle/speed/VRU row per intersection and bin."""
+
+    T0_US = int(datetime(2025, 11, 9, 8, 0).timestamp() * 1_000_000)
+    SCALE = {"birch-broad": 1, "glebe-potomac": 2}
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_queries(self, queries, timeout=None):
+        self.calls.append(len(queries))
+        return [self._rows(query, params) for query, params in queries]
+
+    def _rows(self, query, params):
+        rows = []
+        for name in params["intersections"]:
+            i = self.SCALE[name]
+            key = {"intersection": name, "time_bin": self.T0_US}
+            if '"speed-distribution"' in query:
+                rows.append({**key, "total_count": 5, "avg_speed": 20.0 + i, "free_flow_speed": 35.0})
+            elif '"vru-count"' in query:
+                rows.append({**key, "vru_count": i})
+            else:
+                rows.append({**key, "vehicle_count": 100 * i, "turning_count": 10})
+        return rows
+
+
+class TestBulkTrafficBatch:
+    def test_several_intersections_share_one_batch(self):
+        from app.services.rt_si_service import RTSIService
+
+        client = FakeBulkClient()
+        service = RTSIService(client)
+        start = datetime(2025, 11, 9, 8, 0)
+        end = start + timedelta(hours=1)
+
+        batch = service.get_bulk_traffic_data_batch(["glebe-potomac", "birch-broad"], start, end, 15)
+
+        assert client.calls == [3]
+        assert set(batch) == {"glebe-potomac", "birch-broad"}
+        assert batch["birch-broad"][start]["vehicle_count"] == 100
+        assert batch["glebe-potomac"][start]["vehicle_count"] == 200
+        assert len(batch["glebe-potomac"]) == 4
+        assert batch["glebe-potomac"] == service.get_bulk_traffic_data("glebe-potomac", start, end, 15)
+
+
+class TestAsyncDeadline:
+    def test_slow_async_batch_is_cancelled(self):
+        import asyncio
+
+        from app.services.db_client import QueryDeadlineExceeded
+        from app.services.rt_si_service import RTSIService
+
+        cancelled = []
+
+        class SlowAsyncClient:
+            async def execute_query(self, query, params=None):
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(query)
+                    raise
+
+        service = RTSIService(None, SlowAsyncClient())
+        with pytest.raises(QueryDeadlineExceeded):
+            asyncio.run(
+                service.get_realtime_data_async(
+                    "glebe-potomac", datetime(2025, 11, 9, 8), deadline=0.05
+                )
+            )
+        assert len(cancelled) == 3
@@ -0,0 +1,132 @@
+"""
+Backend tests - lean query result modes
+=======================================
+execute_query_frame builds a DataFrame straight from driver tuples (keeping
+the columns of an empty result); iter_query_batches streams a server-side
+cursor and rolls back when the caller stops early. MCDM falls back to
+execute_query for clients without the frame method.
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+
+import pytest
+
+Column = namedtuple("Column", ["name"])
+
+
+class FakeCursor:
+    def __init__(self, conn, name=None):
+        self.conn = self.connection = conn
+        self.name = name
+        self.description = [Column("intersection"), Column("vehicle_count")]
+        self.itersize = None
+        self.closed = False
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.rows = list(self.conn.rows)
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.cursors = []
+        self.events = []
+
+    def cursor(self, name=None, cursor_factory=None):
+        self.cursors.append(FakeCursor(self, name))
+        return self.cursors[-1]
+
+    def commit(self):
+        self.events.append("commit")
+
+    def rollback(self):
+        self.events.append("rollback")
+
+
+def make_client(rows):
+    from app.services.db_client import VTTIPostgresClient
+    from app.services.prepared_statements import StatementPreparer
+
+    db = object.__new__(VTTIPostgresClient)
+    db.statements = StatementPreparer()
+    conn = FakeConnection(rows)
+
+    @contextmanager
+    def get_connection():
+        yield conn
+
+    db.get_connection = get_connection
+    return db, conn
+
+
+ROWS = [("glebe-potomac", 10), ("birch-broad", 20), ("glebe-potomac", 30)]
+
+
+class TestLeanResults:
+    def test_frame_matches_dict_rows(self):
+        import pandas as pd
+
+        db, _ = make_client(ROWS)
+        frame = db.execute_query_frame("SELECT 1")
+
+        expected = pd.DataFrame(
+            [{"intersection": name, "vehicle_count": count} for name, count in ROWS]
+        )
+        pd.testing.assert_frame_equal(frame, expected)
+
+    def test_empty_frame_keeps_columns(self):
+        db, _ = make_client([])
+        frame = db.execute_query_frame("SELECT 1")
+
+        assert frame.empty
+        assert list(frame.columns) == ["intersection", "vehicle_count"]
+
+    def test_batches_stream_from_a_named_cursor(self):
+        db, conn = make_client(ROWS)
+        batches = list(db.iter_query_batches("SELECT 1", batch_size=2))
+
+        assert [len(rows) for _, rows in batches] == [2, 1]
+        assert batches[0][0] == ["intersection", "vehicle_count"]
+        assert conn.cursors[0].name.startswith("vtti_stream_")
+        assert conn.cursors[0].closed
+        assert conn.events == ["commit"]
+
+    def test_stopping_early_rolls_back(self):
+        db, conn = make_client(ROWS)
+        stream = db.iter_query_batches("SELECT 1", batch_size=1)
+        next(stream)
+        stream.close()
+
+        assert conn.cursors[0].closed
+        assert conn.events == ["rollback"]
+
+
+class TestMCDMQueryFrame:
+    def test_dict_only_clients_still_work(self):
+        from app.services.mcdm_service import MCDMSafetyIndexService
+
+        class DictClient:
+            def execute_query(self, query, params=None):
+                return [{"intersection": "glebe-potomac", "vehicle_count": 10}]
+
+        service = MCDMSafetyIndexService(DictClient())
+        frame = service._query_frame("SELECT 1", {})
+
+        assert frame.to_dict("records") == [{"intersection": "glebe-potomac", "vehicle_count": 10}]
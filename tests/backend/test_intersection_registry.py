@@ -0,0 +1,122 @@
+"""
+Backend tests - IntersectionRegistry
+====================================
+Once loaded, find_crash_intersection_for_bsm must answer from memory with
+exactly the records the per-request database lookup would have built.
+"""
+import pytest
+
+VIEW_ROWS = [
+    {"intersection_name": "glebe-potomac", "short_name": "glebe-potomac",
+     "lat": 38.86, "lon": -77.05, "source": "psm"},
+    {"intersection_name": "birch_st-w_broad_st", "short_name": "birch-broad",
+     "lat": 38.88, "lon": -77.17, "source": "hiresdata"},
+    {"intersection_name": "n_maple_ave-w_broad_st", "short_name": "broad-maple",
+     "lat": None, "lon": -77.18, "source": "hiresdata"},
+]
+CRASH_IDS = {"glebe-potomac": 7, "birch-broad": 11}
+PRESENT = {
+    "vehicle-count": {"glebe-potomac", "birch_st-w_broad_st"},
+    "vru-count": {"glebe-potomac"},
+    "speed-distribution": {"birch_st-w_broad_st"},
+    "safety-event": {"birch-broad"},
+}
+
+
+class FakeCatalogClient:
+    """Answers both the per-request lookups and the registry's bulk loads."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        q = str(query)
+        table = next((t for t in PRESENT if f"'{t}'" in q or f'"{t}"' in q), None)
+        if "intersection_details_view" in q:
+            if params is None:
+                return list(VIEW_ROWS)
+            name = params["int_id"].lower()
+            return [
+                r for r in VIEW_ROWS
+                if r["intersection_name"].lower() == name or r["short_name"].lower() == name
+            ]
+        if "crash_intersection_id_with_coord" in q:
+            if params is None:
+                return [{"short_name": k, "crash_intersection_id": v} for k, v in CRASH_IDS.items()]
+            crash_id = CRASH_IDS.get(params["short_name"].lower())
+            return [{"crash_intersection_id": crash_id}] if crash_id else []
+        if table and "unnest" in q:
+            return [{"name": n} for n in params["names"] if n in PRESENT[table]]
+        if table:
+            return [{"?column?": 1}] if params["name"] in PRESENT[table] else []
+        return []
+
+
+@pytest.fixture
+def registry():
+    from app.core.intersection_registry import intersection_registry
+
+    intersection_registry.clear()
+    yield intersection_registry
+    intersection_registry.clear()
+
+
+class TestIntersectionRegistry:
+    @pytest.mark.parametrize("name", ["glebe-potomac", "BIRCH-BROAD", " birch_st-w_broad_st ", "nowhere"])
+    def test_matches_per_request_lookup(self, registry, name):
+        from app.api.intersection import find_crash_intersection_for_bsm
+
+        client = FakeCatalogClient()
+        expected = find_crash_intersection_for_bsm(name, client)
+
+        registry.refresh(client)
+        client.calls.clear()
+
+        assert find_crash_intersection_for_bsm(name, client) == expected
+        assert client.calls == []
+
+    def test_load_is_a_fixed_number_of_queries(self, registry):
+        client = FakeCatalogClient()
+        status = registry.refresh(client)
+
+        assert len(client.calls) == 6  # view, crash ids, four presence checks
+        assert status["loaded"] is True
+        assert status["entries"] == 2  # rows without coordinates are skipped
+
+    def test_failed_refresh_keeps_last_snapshot(self, registry):
+        client = FakeCatalogClient()
+        registry.refresh(client)
+        client.fail = True
+
+        with pytest.raises(RuntimeError):
+            registry.refresh(client)
+
+        assert registry.lookup("glebe-potomac")[0]["crash_intersection_id"] == 7
+        assert registry.status()["last_error"] == "database unavailable"
+
+    def test_failed_presence_check_keeps_last_snapshot(self, registry):
+        client = FakeCatalogClient()
+        registry.refresh(client)
+
+        class PresenceFails(FakeCatalogClient):
+            def execute_query(self, query, params=None):
+                if "unnest" in str(query):
+                    raise RuntimeError("statement timeout")
+                return super().execute_query(query, params)
+
+        with pytest.raises(RuntimeError):
+            registry.refresh(PresenceFails())
+
+        assert registry.lookup("glebe-potomac")[0]["valid_in_tables"]["vehicle-count"] is True
+        assert registry.status()["last_error"] == "statement timeout"
+
+    def test_lookups_are_isolated_copies(self, registry):
+        registry.refresh(FakeCatalogClient())
+
+        registry.lookup("birch-broad")[0]["valid_in_tables"]["vru-count"] = True
+
+        assert registry.lookup("birch-broad")[0]["valid_in_tables"]["vru-count"] is False
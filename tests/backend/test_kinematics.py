@@ -0,0 +1,218 @@
+"""
+Backend tests - kinematics
+==========================
+The grouped heading change rate must equal calculate_heading_change_rate
+applied group by group; the per-vehicle features must equal a per-vehicle
+loop with np.diff and np.percentile.
+"""
+import pytest
+
+
+def _frame(n, seed, groups=6, vehicles=9):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    heading = rng.uniform(0, 360, n)
+    heading[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({
+        "group": rng.integers(0, groups, n),
+        "vehicle_id": [f"veh-{v}" for v in rng.integers(0, vehicles, n)],
+        # Coarse times so some messages of a vehicle share a timestamp
+        "timestamp": pd.to_datetime(1_700_000_000_000 + rng.integers(0, 600, n) * 100, unit="ms"),
+        "speed": np.where(rng.random(n) < 0.05, np.nan, rng.uniform(0, 25, n)),
+        "heading": heading,
+        "hard_braking": (rng.random(n) < 0.3).astype(int),
+    })
+
+
+def _per_vehicle(df, group, n_groups):
+    """Reference: loop over (group, vehicle) segments."""
+    import numpy as np
+
+    yaw, accel, jerk = ([[] for _ in range(n_groups)] for _ in range(3))
+    streak = np.zeros(n_groups, dtype=int)
+    episodes = np.zeros(n_groups, dtype=int)
+    df = df.assign(_group=group).sort_values(["_group", "vehicle_id", "timestamp"], kind="stable")
+    for (g, _), seg in df.groupby(["_group", "vehicle_id"], sort=False):
+        t = seg["timestamp"].to_numpy(dtype="datetime64[ns]").astype(np.int64) / 1e9
+        dt = np.diff(t)
+        ok = dt > 0
+        delta = np.diff(seg["heading"].to_numpy())
+        delta = (delta + 180) % 360 - 180
+        a = np.where(ok, np.diff(seg["speed"].to_numpy()) / np.where(ok, dt, 1), np.nan)
+        yaw[g].extend((np.abs(delta) / np.where(ok, dt, 1))[ok])
+        accel[g].extend(a)
+        for k in range(1, len(a)):
+            if ok[k] and ok[k - 1]:
+                jerk[g].append(abs((a[k] - a[k - 1]) / ((dt[k] + dt[k - 1]) / 2)))
+        run = 0
+        for braking in seg["hard_braking"]:
+            if braking:
+                run += 1
+                episodes[g] += run == 1
+                streak[g] = max(streak[g], run)
+            else:
+                run = 0
+
+    def percentile(values, q):
+        values = [v for v in values if not np.isnan(v)]
+        return np.percentile(values, q) if values else 0.0
+
+    return {
+        "yaw_rate_p95": [percentile(v, 95) for v in yaw],
+        "accel_p5": [percentile(v, 5) for v in accel],
+        "accel_p50": [percentile(v, 50) for v in accel],
+        "accel_p95": [percentile(v, 95) for v in accel],
+        "jerk_abs_p95": [percentile(v, 95) for v in jerk],
+        "hard_braking_max_streak": list(streak),
+        "hard_braking_episodes": list(episodes),
+    }
+
+
+class TestHeadingChangeRate:
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_matches_per_group_function(self, seed):
+        import numpy as np
+        from app.services.kinematics import heading_change_rate
+        from app.services.vcc_feature_engineering import calculate_heading_change_rate
+
+        df = _frame(2000, seed, groups=40)
+        # Groups with fewer than two headings
+        df.loc[df["group"] == 3, "heading"] = np.nan
+        df = df[(df["group"] != 4) | (df.index == df.index[df["group"] == 4][0])]
+
+        rates = heading_change_rate(df["heading"], df["group"].to_numpy(), 41)
+
+        expected = np.zeros(41)
+        for g, headings in df.groupby("group")["heading"]:
+            expected[g] = calculate_heading_change_rate(headings)
+        np.testing.assert_allclose(rates, expected, rtol=1e-12, atol=1e-12)
+        assert rates[3] == rates[4] == rates[40] == 0.0
+
+    def test_wrap_around(self):
+        import pandas as pd
+        from app.services.vcc_feature_engineering import calculate_heading_change_rate
+
+        # Changes of 2, 2 and 4 degrees
+        assert calculate_heading_change_rate(pd.Series([359.0, 1.0, 359.0, 3.0])) == pytest.approx(0.9428, abs=1e-4)
+        assert calculate_heading_change_rate(pd.Series([10.0, None])) == 0.0
+
+
+class TestKinematicFeatures:
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_per_vehicle_loop(self, seed):
+        import numpy as np
+        from app.services.kinematics import KINEMATIC_COLUMNS, kinematic_features
+
+        df = _frame(1500, seed)
+        group = df["group"].to_numpy()
+
+        features = kinematic_features(df, group, 7)
+
+        assert list(features.columns) == KINEMATIC_COLUMNS
+        expected = _per_vehicle(df, group, 7)
+        for column in KINEMATIC_COLUMNS:
+            np.testing.assert_allclose(features[column], expected[column], rtol=1e-9, atol=1e-9, err_msg=column)
+        # Group 6 has no rows
+        assert (features.iloc[6] == 0).all()
+
+    def test_hard_braking_streaks(self):
+        import pandas as pd
+        from app.services.kinematics import kinematic_features
+
+        df = pd.DataFrame({
+            "vehicle_id": ["a"] * 6 + ["b"] * 3,
+            "timestamp": pd.to_datetime([5, 1, 2, 3, 4, 6, 1, 2, 3], unit="s"),
+            "speed": [10.0] * 9,
+            "heading": [90.0] * 9,
+            # In time order: a = 1 1 0 1 1 1, b = 1 0 1
+            "hard_braking": [1, 1, 1, 0, 1, 1, 1, 0, 1],
+        })
+
+        features = kinematic_features(df, [0] * 9, 1)
+
+        assert features.loc[0, "hard_braking_max_streak"] == 3
+        assert features.loc[0, "hard_braking_episodes"] == 4
+
+    def test_wrapped_yaw_rate(self):
+        import pandas as pd
+        from app.services.kinematics import kinematic_features, wrap_heading_delta
+
+        df = pd.DataFrame({
+            "vehicle_id": ["a", "a"],
+            "timestamp": pd.to_datetime([0, 500], unit="ms"),
+            "speed": [10.0, 9.0],
+            "heading": [358.0, 2.0],
+            "hard_braking": [0, 0],
+        })
+
+        features = kinematic_features(df, [0, 0], 1)
+
+        assert list(wrap_heading_delta([4.0, -356.0, 356.0, 180.0])) == [4.0, 4.0, -4.0, -180.0]
+        assert features.loc[0, "yaw_rate_p95"] == pytest.approx(8.0)
+        assert features.loc[0, "accel_p50"] == pytest.approx(-2.0)
+
+
+class TestExtractors:
+    def test_bsm_features_include_kinematics(self):
+        from app.services.kinematics import KINEMATIC_COLUMNS
+        from app.services.vcc_feature_engineering import extract_bsm_features
+
+        t0 = 1_700_000_040_000
+        messages = [
+            {"timestamp": t0 + k * 100, "locationName": "Main St", "bsmJson": {"coreData": {
+                "id": "veh-1", "speed": 20.0 - k, "heading": 90.0, "brakeAppliedStatus": 4}}}
+            for k in range(5)
+        ]
+
+        features = extract_bsm_features(messages, interval_minutes=1)
+
+        assert list(features.columns[:9]) == [
+            "intersection", "time_1min", "vehicle_count", "avg_speed", "speed_variance",
+            "hard_braking_count", "heading_change_rate", "accel_lon_variance", "accel_lat_variance",
+        ]
+        assert set(KINEMATIC_COLUMNS) <= set(features.columns)
+        row = features.iloc[0]
+        assert row["accel_p50"] == pytest.approx(-10.0)
+        assert row["hard_braking_max_streak"] == 5
+        assert row["hard_braking_episodes"] == 1
+
+    def test_trino_features_unchanged(self, monkeypatch):
+        import numpy as np
+        import pandas as pd
+        from app.services import feature_engineering
+
+        rng = np.random.default_rng(3)
+        n = 400
+        publish_us = 1_700_000_000_000_000 + np.sort(rng.integers(0, 3_600_000_000, n))
+        df = pd.DataFrame({
+            "intersection": rng.choice(["a", "b", None], n),
+            "time": pd.to_datetime(publish_us // 1_000_000, unit="s"),
+            "publish_timestamp": publish_us,
+            "vehicle_id": rng.integers(0, 10, n),
+            "lat": 37.2, "lon": -80.4,
+            "speed": rng.uniform(0, 20, n),
+            "heading": rng.uniform(0, 360, n),
+            "brake_applied_status": rng.choice([0.0, 4.0, 6.0, np.nan], n),
+            "accel_lon": rng.uniform(-3, 2, n),
+            "accel_lat": rng.uniform(-1, 1, n),
+        })
+        monkeypatch.setattr(feature_engineering.trino_client, "execute_query", lambda query: df.copy())
+
+        features = feature_engineering.collect_bsm_features()
+
+        # Reference: the per-group aggregation with the per-row brake flag
+        ref = df.assign(
+            time_15min=pd.to_datetime(df["time"], utc=True).dt.floor("15min"),
+            hard_braking=df["brake_applied_status"].apply(lambda x: 1 if pd.notna(x) and (int(x) & 0x04) else 0),
+        )
+        expected = ref.groupby(["intersection", "time_15min"]).agg(
+            hard_braking_count=("hard_braking", "sum"),
+            heading_change_rate=("heading", feature_engineering.calculate_heading_change_rate),
+        ).reset_index()
+
+        assert len(features) == len(expected)
+        assert list(features["hard_braking_count"]) == list(expected["hard_braking_count"])
+        np.testing.assert_allclose(features["heading_change_rate"], expected["heading_change_rate"], rtol=1e-12)
+        assert (features["hard_braking_max_streak"] >= 1).any()
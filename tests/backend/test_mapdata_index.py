@@ -0,0 +1,199 @@
+"""
+Backend tests - MapDataIndex
+============================
+The grid index must map positions to exactly the intersection the old
+first-match scan over MapData returned, and the prepared BSM/PSM frames
+must give the feature extractors and conflict detectors the same results
+as the raw message lists.
+"""
+import random
+
+import pytest
+
+T0_MS = 1_700_000_000_000
+
+
+def _mapdata(n=40, seed=1):
+    rng = random.Random(seed)
+    mapdata = []
+    for m in range(4):
+        intersections = [
+            {
+                "id": {"id": 1000 + m * 100 + i},
+                "refPoint": {"lat": 37.2 + rng.uniform(0, 0.05), "lon": -80.45 + rng.uniform(0, 0.05)},
+            }
+            for i in range(n // 4)
+        ]
+        intersections.append({"id": {"id": 9}, "refPoint": {}})
+        mapdata.append({"intersections": intersections})
+    mapdata.append({"messageType": "other"})
+    return mapdata
+
+
+def _first_match(lat, lon, mapdata_list, threshold=0.001):
+    """The original linear scan map_to_intersection performed."""
+    for mapdata in mapdata_list:
+        for intersection in mapdata.get("intersections", []):
+            ref = intersection.get("refPoint", {})
+            if ref.get("lat") is None or ref.get("lon") is None:
+                continue
+            if abs(lat - ref["lat"]) < threshold and abs(lon - ref["lon"]) < threshold:
+                return str(intersection["id"]["id"])
+    return None
+
+
+def _bsm(mapdata, n, seed):
+    rng = random.Random(seed)
+    refs = [i["refPoint"] for m in mapdata for i in m.get("intersections", []) if i["refPoint"]][:3]
+    messages = []
+    for k in range(n):
+        ref = rng.choice(refs)
+        messages.append({
+            "timestamp": T0_MS + rng.randint(0, 20 * 60 * 1000),
+            "bsmJson": {"coreData": {
+                "id": f"v{k % 20}",
+                "lat": ref["lat"] + rng.uniform(-0.0004, 0.0004),
+                "lon": ref["lon"] + rng.uniform(-0.0004, 0.0004),
+                "speed": rng.uniform(0, 25),
+                "heading": rng.uniform(0, 360),
+                "brakeAppliedStatus": rng.choice([0, 4]),
+            }},
+        })
+    return messages
+
+
+def _psm(mapdata, n, seed):
+    rng = random.Random(seed)
+    refs = [i["refPoint"] for m in mapdata for i in m.get("intersections", []) if i["refPoint"]][:3]
+    messages = []
+    for k in range(n):
+        ref = rng.choice(refs)
+        messages.append({
+            "timestamp": T0_MS + rng.randint(0, 20 * 60 * 1000),
+            "locationName": "Main St" if k % 4 == 0 else None,
+            "psmJson": {
+                "id": f"p{k % 10}",
+                "position": {
+                    "lat": ref["lat"] + rng.uniform(-0.0004, 0.0004),
+                    "lon": ref["lon"] + rng.uniform(-0.0004, 0.0004),
+                },
+                "speed": 1.2,
+                "heading": rng.uniform(0, 360),
+                "basicType": 1,
+            },
+        })
+    return messages
+
+
+class TestMapDataIndex:
+    def test_matches_first_match_scan(self):
+        from app.services.mapdata_index import get_mapdata_index
+
+        mapdata = _mapdata()
+        rng = random.Random(5)
+        points = [(37.2 + rng.uniform(-0.01, 0.06), -80.45 + rng.uniform(-0.01, 0.06)) for _ in range(5000)]
+
+        result = get_mapdata_index(mapdata).lookup([p[0] for p in points], [p[1] for p in points])
+
+        expected = [_first_match(lat, lon, mapdata) for lat, lon in points]
+        assert list(result) == expected
+        assert sum(r is not None for r in expected) > 50
+
+    def test_overlapping_ref_points_keep_mapdata_order(self):
+        from app.services.mapdata_index import MapDataIndex
+
+        index = MapDataIndex((("b", 37.0005, -80.0), ("a", 37.0, -80.0)))
+
+        assert list(index.lookup([37.0003], [-80.0])) == ["b"]
+        assert list(index.lookup([36.9995], [-80.0])) == ["a"]
+
+    def test_missing_coordinates_map_to_none(self):
+        from app.services.mapdata_index import MapDataIndex
+
+        index = MapDataIndex((("a", 37.0, -80.0),))
+
+        assert list(index.lookup([None, float("nan"), "x", 37.0], [-80.0, -80.0, -80.0, None])) == [None] * 4
+
+    def test_index_is_reused_until_mapdata_changes(self):
+        from app.services.mapdata_index import get_mapdata_index
+
+        mapdata = _mapdata()
+        index = get_mapdata_index(mapdata)
+
+        assert get_mapdata_index(_mapdata()) is index
+        assert get_mapdata_index(_mapdata(seed=2)) is not index
+
+    def test_map_to_intersection_single_point(self):
+        from app.services.vcc_feature_engineering import map_to_intersection
+
+        mapdata = [{"intersections": [{"id": {"id": 42}, "refPoint": {"lat": 37.0, "lon": -80.0}}]}]
+
+        assert map_to_intersection(37.0002, -80.0002, mapdata) == "42"
+        assert map_to_intersection(37.01, -80.0, mapdata) is None
+        assert map_to_intersection(37.0, -80.0, []) is None
+        assert map_to_intersection(None, -80.0, mapdata) is None
+
+
+class TestPreparedFrames:
+    def test_prepared_frames_give_same_results(self):
+        import pandas as pd
+        from app.services.vcc_feature_engineering import (
+            detect_vehicle_vehicle_conflicts,
+            detect_vru_vehicle_conflicts,
+            extract_bsm_features,
+            extract_psm_features,
+            prepare_bsm_frame,
+            prepare_psm_frame,
+        )
+
+        mapdata = _mapdata()
+        bsm, psm = _bsm(mapdata, 400, 7), _psm(mapdata, 150, 8)
+        bsm_frame = prepare_bsm_frame(bsm, mapdata)
+        psm_frame = prepare_psm_frame(psm, mapdata)
+
+        assert "mapped_intersection" in bsm_frame.columns
+        pd.testing.assert_frame_equal(
+            extract_bsm_features(bsm, mapdata_list=mapdata), extract_bsm_features(bsm_frame, mapdata_list=mapdata)
+        )
+        pd.testing.assert_frame_equal(
+            extract_psm_features(psm, mapdata_list=mapdata), extract_psm_features(psm_frame, mapdata_list=mapdata)
+        )
+        vru = detect_vru_vehicle_conflicts(bsm, psm, mapdata_list=mapdata)
+        assert len(vru) > 0
+        pd.testing.assert_frame_equal(vru, detect_vru_vehicle_conflicts(bsm_frame, psm_frame, mapdata_list=mapdata))
+        pd.testing.assert_frame_equal(
+            detect_vehicle_vehicle_conflicts(bsm, mapdata_list=mapdata),
+            detect_vehicle_vehicle_conflicts(bsm_frame, mapdata_list=mapdata),
+        )
+        # The shared frames are not modified by the callers
+        assert "intersection" not in bsm_frame.columns
+
+    def test_location_name_takes_precedence_over_mapdata(self):
+        from app.services.vcc_feature_engineering import extract_psm_features
+
+        mapdata = _mapdata()
+        features = extract_psm_features(_psm(mapdata, 40, 3), mapdata_list=mapdata)
+
+        assert "Main St" in set(features["intersection"])
+        assert set(features["intersection"]) - {"Main St"}
+
+    def test_without_mapdata(self):
+        from app.services.vcc_feature_engineering import (
+            detect_vru_vehicle_conflicts,
+            extract_psm_features,
+        )
+
+        mapdata = _mapdata()
+        psm = _psm(mapdata, 40, 3)
+
+        # Only messages with a location name are kept
+        assert set(extract_psm_features(psm)["intersection"]) == {"Main St"}
+        # Conflicts need MapData; without it none are attributed (no KeyError)
+        assert len(detect_vru_vehicle_conflicts(_bsm(mapdata, 50, 1), psm)) == 0
+
+    @pytest.mark.parametrize("messages", [[], None])
+    def test_empty_input(self, messages):
+        from app.services.vcc_feature_engineering import extract_bsm_features, prepare_bsm_frame
+
+        assert len(prepare_bsm_frame(messages, _mapdata())) == 0
+        assert len(extract_bsm_features(messages, mapdata_list=_mapdata())) == 0
@@ -0,0 +1,262 @@
+"""
+Backend tests - BinnedFrameStore (shared MCDM data-matrix store)
+================================================================
+Overlapping windows must only aggregate the bins the store is missing,
+unsettled bins must never be stored, recent bins must be re-fetched after
+their TTL, bins must not depend on the host time zone, and the byte budget
+must evict the least recently used bins first.
+"""
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+BIN_MINUTES = 15
+T0 = datetime(2024, 11, 1, 8, 0)
+
+
+class FakeFetcher:
+    """Returns one row per intersection for every bin in the requested range."""
+
+    def __init__(self, intersections=("glebe-potomac", "other-site")):
+        self.intersections = intersections
+        self.calls = []
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        rows = []
+        t = start
+        while t < end:
+            for i, name in enumerate(self.intersections):
+                rows.append(
+                    {
+                        "intersection": name,
+                        "time_bin": pd.Timestamp(t),
+                        "vehicle_count": float(10 * (i + 1)),
+                    }
+                )
+            t += timedelta(minutes=BIN_MINUTES)
+        return pd.DataFrame(rows)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now.timestamp()
+
+    def __call__(self):
+        return self.now
+
+
+def _store(max_bytes=10_000_000, now=None, **kwargs):
+    from app.core.matrix_store import BinnedFrameStore
+
+    clock = FakeClock(now or T0 + timedelta(days=30))
+    return BinnedFrameStore(max_bytes, settle_seconds=900, clock=clock, **kwargs)
+
+
+@pytest.fixture
+def new_york_tz(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+class TestBinnedFrameStore:
+    def test_fetches_only_missing_bins(self):
+        store = _store()
+        fetch = FakeFetcher()
+
+        first = store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+        second = store.slice(
+            BIN_MINUTES, T0 + timedelta(minutes=30), T0 + timedelta(hours=2), fetch
+        )
+
+        assert len(first) == 8
+        assert len(second) == 12
+        assert fetch.calls == [
+            (T0, T0 + timedelta(hours=1)),
+            (T0 + timedelta(hours=1), T0 + timedelta(hours=2)),
+        ]
+        assert second["time_bin"].is_monotonic_increasing
+        assert list(second.columns) == ["intersection", "time_bin", "vehicle_count"]
+
+    def test_unaligned_window_covers_overlapping_bins(self):
+        store = _store()
+        fetch = FakeFetcher(intersections=("glebe-potomac",))
+
+        frame = store.slice(
+            BIN_MINUTES, T0 + timedelta(minutes=5), T0 + timedelta(minutes=20), fetch
+        )
+
+        assert fetch.calls == [(T0, T0 + timedelta(minutes=30))]
+        assert len(frame) == 2
+
+    def test_empty_bins_are_remembered(self):
+        store = _store()
+        calls = []
+
+        def empty_fetch(start, end):
+            calls.append((start, end))
+            return pd.DataFrame()
+
+        assert store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), empty_fetch).empty
+        assert store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), empty_fetch).empty
+        assert len(calls) == 1
+
+    def test_unsettled_bins_are_refetched(self):
+        store = _store(now=T0 + timedelta(minutes=50))
+        fetch = FakeFetcher()
+
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+
+        # Only the first two bins ended more than 15 minutes before "now".
+        assert fetch.calls[1] == (T0 + timedelta(minutes=30), T0 + timedelta(hours=1))
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        probe = _store()
+        probe.slice(BIN_MINUTES, T0, T0 + timedelta(minutes=15), FakeFetcher())
+        one_bin = probe.status()["bytes"]
+
+        store = _store(max_bytes=one_bin * 3)
+        fetch = FakeFetcher()
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+
+        status = store.status()
+        assert status["bins"] == 3
+        assert status["evictions"] == 1
+        assert status["bytes"] <= one_bin * 3
+
+        # The oldest bin was evicted, so only it is fetched again.
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(minutes=15), fetch)
+        assert fetch.calls[-1] == (T0, T0 + timedelta(minutes=15))
+
+    def test_bins_in_the_late_window_expire(self):
+        store = _store(now=T0 + timedelta(hours=2), late_seconds=86400, late_ttl_seconds=600)
+        fetch = FakeFetcher()
+
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+        assert len(fetch.calls) == 1
+
+        store._clock.now += 600
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+        assert fetch.calls[-1] == (T0, T0 + timedelta(hours=1))
+        assert store.status()["bins"] == 4
+
+        # Once past the late window the bins are kept without expiry
+        store._clock.now += 86400
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+        store._clock.now += 86400
+        store.slice(BIN_MINUTES, T0, T0 + timedelta(hours=1), fetch)
+        assert len(fetch.calls) == 3
+
+    @pytest.mark.parametrize("aware", [False, True])
+    def test_bins_do_not_depend_on_host_time_zone(self, new_york_tz, aware):
+        from datetime import timezone
+
+        store = _store()
+        fetch = FakeFetcher(intersections=("glebe-potomac",))
+        start = T0.replace(tzinfo=timezone.utc) if aware else T0
+
+        frame = store.slice(BIN_MINUTES, start, start + timedelta(hours=1), fetch)
+
+        assert fetch.calls == [(start, start + timedelta(hours=1))]
+        assert len(frame) == 4
+        assert frame["time_bin"].iloc[0] == pd.Timestamp(T0)
+
+    def test_slice_async_fetches_missing_runs_concurrently(self):
+        import asyncio
+
+        store = _store()
+        fetch = FakeFetcher()
+        store.slice(BIN_MINUTES, T0 + timedelta(hours=1), T0 + timedelta(hours=2), fetch)
+        in_flight, peak = [0], [0]
+
+        async def fetch_async(start, end):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return fetch(start, end)
+
+        frame = asyncio.run(
+            store.slice_async(BIN_MINUTES, T0, T0 + timedelta(hours=3), fetch_async)
+        )
+
+        assert fetch.calls[1:] == [
+            (T0, T0 + timedelta(hours=1)),
+            (T0 + timedelta(hours=2), T0 + timedelta(hours=3)),
+        ]
+        assert peak[0] == 2
+        assert len(frame) == 24 and frame["time_bin"].is_monotonic_increasing
+        assert store.status()["bins"] == 12
+
+
+class TestMCDMUsesSharedStore:
+    def test_trend_and_point_queries_slice_the_store(self):
+        from app.services.mcdm_service import MCDMSafetyIndexService
+
+        class CountingClient:
+            def __init__(self):
+                self.calls = []
+
+            def execute_query(self, query, params=None):
+                self.calls.append((query, params))
+                return []
+
+        store = _store()
+        client = CountingClient()
+        service = MCDMSafetyIndexService(client, matrix_store=store)
+        windows = []
+        service._collect_data_matrix = lambda start, end, bin_minutes: (
+            windows.append((start, end)) or FakeFetcher()(start, end)
+        )
+
+        trend = service.calculate_safety_score_trend(
+            "glebe-potomac", T0, T0 + timedelta(hours=2), BIN_MINUTES
+        )
+        point = MCDMSafetyIndexService(client, matrix_store=store)
+        point._collect_data_matrix = service._collect_data_matrix
+        score = point.calculate_safety_score_for_time(
+            "glebe-potomac", T0 + timedelta(minutes=40), BIN_MINUTES
+        )
+
+        assert len(trend) == 8
+        assert score is not None
+        # The point-in-time window (a day of lookback) was already stored.
+        assert windows == [(T0 - timedelta(days=1), T0 + timedelta(hours=2))]
+        assert client.calls == []
+
+    def test_point_query_scores_a_prefetched_matrix(self):
+        import asyncio
+
+        from app.services.mcdm_service import MCDMSafetyIndexService
+
+        target = T0 + timedelta(minutes=40)
+        expected = MCDMSafetyIndexService(None, matrix_store=_store())
+        expected._collect_data_matrix = lambda start, end, bin_minutes: FakeFetcher()(start, end)
+
+        service = MCDMSafetyIndexService(None, matrix_store=_store())
+        windows = []
+
+        async def collect_async(start, end, bin_minutes):
+            windows.append((start, end))
+            return FakeFetcher()(start, end)
+
+        service._collect_data_matrix_async = collect_async
+        matrix = asyncio.run(service.get_data_matrix_for_time_async(target, BIN_MINUTES))
+
+        def no_query(*args):
+            raise AssertionError("matrix queried again")
+
+        service._collect_data_matrix = no_query
+        score = service.calculate_safety_score_for_time("glebe-potomac", target, BIN_MINUTES, matrix=matrix)
+
+        assert windows == [(T0 + timedelta(minutes=30) - timedelta(days=1), T0 + timedelta(minutes=45))]
+        assert score is not None
+        assert score == expected.calculate_safety_score_for_time("glebe-potomac", target, BIN_MINUTES)
+        assert "intersection_norm" not in matrix.columns
@@ -0,0 +1,146 @@
+"""
+Backend tests - MCDMSafetyIndexService data collection and scoring
+==================================================================
+The criteria matrix must come back from a single query, and a failure of
+that query must surface to the caller. The chunked scoring statistics must
+match their dense NumPy equivalents.
+"""
+from datetime import datetime, timezone
+
+START = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+END = datetime(2024, 1, 1, 1, 0, 0, tzinfo=timezone.utc)
+BIN_US = 900_000_000
+T0 = 1704067200000000
+
+
+class FakeMatrixClient:
+    """Returns finished criteria rows for the single-pass query."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        return [
+            {
+                "intersection": name,
+                "time_bin": float(T0 + b * BIN_US),
+                "vehicle_count": 100 + 10 * b + i,
+                "vru_count": b + i,
+                "avg_speed": 25.0 + b,
+                "speed_variance": 4.0 + i,
+                "incident_count": i,
+                "near_miss_count": 0,
+            }
+            for b in range(4)
+            for i, name in enumerate(("glebe-potomac", "birch-broad"))
+        ]
+
+
+class FailingMatrixClient:
+    """Rejects every query."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        raise RuntimeError("syntax error at or near FILTER")
+
+
+class TestCollectDataMatrix:
+    def test_single_query_returns_finished_matrix(self):
+        from app.services.mcdm_service import MCDMSafetyIndexService
+
+        client = FakeMatrixClient()
+        matrix = MCDMSafetyIndexService(client)._collect_data_matrix(START, END, 15)
+
+        assert len(client.calls) == 1
+        query, _ = client.calls[0]
+        assert '"safety-event"' in query and query.count('FROM "safety-event"') == 1
+        assert "FILTER (WHERE event_type IN ('NM-VRU', 'NM-VV'))" in query
+        assert len(matrix) == 8
+        assert str(matrix["time_bin"].iloc[0]) == "2024-01-01 00:00:00"
+        for column in MCDMSafetyIndexService(client).criteria_list:
+            assert column in matrix.columns
+
+    def test_query_errors_propagate(self):
+        import pytest
+        from app.services.mcdm_service import MCDMSafetyIndexService
+
+        client = FailingMatrixClient()
+        with pytest.raises(RuntimeError):
+            MCDMSafetyIndexService(client)._collect_data_matrix(START, END, 15)
+
+        assert len(client.calls) == 1
+
+
+def _dense_codas(service, matrix):
+    """The original n x n CODAS relative-assessment formulation."""
+    import numpy as np
+
+    weights = np.array([service.criterion_weights[c] for c in service.criteria_list])
+    weighted = matrix * weights
+    nis = np.min(weighted, axis=0)
+    euclidean = np.sqrt(np.sum((weighted - nis) ** 2, axis=1))
+    taxicab = np.sum(np.abs(weighted - nis), axis=1)
+    psi = euclidean[:, np.newaxis] - euclidean
+    psi[psi == 0] = (taxicab[:, np.newaxis] - taxicab)[psi == 0]
+    return service._scale_to_100(np.sum(psi, axis=1))
+
+
+class TestScalableScoring:
+    def _matrix(self, rows=300):
+        import numpy as np
+
+        rng = np.random.default_rng(9)
+        matrix = np.column_stack(
+            [
+                rng.integers(0, 400, rows),
+                rng.integers(0, 6, rows),  # many ties
+                rng.normal(28, 6, rows),
+                rng.gamma(2.0, 3.0, rows),
+                np.zeros(rows),  # zero-variance criterion
+            ]
+        ).astype(float)
+        matrix[:40] = matrix[0]  # identical rows: tied distances
+        return matrix
+
+    def test_codas_matches_dense_formulation(self):
+        import numpy as np
+        from app.services.mcdm_service import MCDMSafetyIndexService
+
+        service = MCDMSafetyIndexService(FakeMatrixClient())
+        normalized = service._normalize_matrix(self._matrix())
+        service.criterion_weights = service._calculate_critic_weights(normalized)
+
+        np.testing.assert_allclose(
+            service._calculate_codas(normalized),
+            _dense_codas(service, normalized),
+            rtol=1e-9,
+            atol=1e-9,
+        )
+
+    def test_chunked_statistics_match_numpy(self):
+        import numpy as np
+        from app.services.mcdm_service import MCDMSafetyIndexService
+
+        service = MCDMSafetyIndexService(FakeMatrixClient())
+        service.STATS_CHUNK_ROWS = 7
+        matrix = self._matrix()
+
+        normalized = service._normalize_matrix(matrix)
+        span = matrix.max(axis=0) - matrix.min(axis=0)
+        expected = np.where(
+            span > 0, (matrix - matrix.min(axis=0)) / np.where(span > 0, span, 1), 0.0
+        )
+        np.testing.assert_array_equal(normalized, expected)
+
+        weights = service._calculate_critic_weights(normalized)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.nan_to_num(np.corrcoef(normalized, rowvar=False), nan=0.0)
+        np.fill_diagonal(corr, 1.0)
+        info = np.std(normalized, axis=0) * np.sum(1 - corr, axis=1)
+        np.testing.assert_allclose(
+            [weights[c] for c in service.criteria_list], info / info.sum(), rtol=1e-9
+        )
@@ -0,0 +1,132 @@
+"""
+Backend tests - prepared statements
+===================================
+Recurring read statements are PREPAREd once per connection with ``$n``
+placeholders and declared parameter types, then run with EXECUTE; statements
+the server refuses run unprepared from then on.
+"""
+from collections import OrderedDict
+from datetime import datetime
+
+import psycopg2
+import pytest
+
+
+class FakeConnection:
+    def __init__(self):
+        self.prepared_statements = OrderedDict()
+        self.executed = []
+        self.rollbacks = 0
+        self.refuse = False
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+
+    def execute(self, query, params=None):
+        if query.startswith("PREPARE") and self.connection.refuse:
+            raise psycopg2.ProgrammingError("could not determine data type of parameter $1")
+        self.connection.executed.append((query, params))
+
+
+class TestToPositional:
+    def test_named_parameters_are_numbered_once(self):
+        from app.services.prepared_statements import to_positional
+
+        body, values = to_positional(
+            "SELECT * FROM t WHERE a = %(a)s AND b > %(b)s AND c = %(a)s AND d LIKE 'x%%'",
+            {"a": 1, "b": 2, "unused": 3},
+        )
+        assert body == "SELECT * FROM t WHERE a = $1 AND b > $2 AND c = $1 AND d LIKE 'x%'"
+        assert values == [1, 2]
+
+    def test_positional_parameters(self):
+        from app.services.prepared_statements import to_positional
+
+        assert to_positional("SELECT %s, %s", ("a", 2)) == ("SELECT $1, $2", ["a", 2])
+        assert to_positional("SELECT '%'", None) == ("SELECT '%'", [])
+
+    def test_mismatches_are_left_to_psycopg2(self):
+        from app.services.prepared_statements import to_positional
+
+        assert to_positional("SELECT %s", {"a": 1}) is None
+        assert to_positional("SELECT %(a)s", (1,)) is None
+        assert to_positional("SELECT %s, %s", (1,)) is None
+        assert to_positional("SELECT %d", (1,)) is None
+
+    def test_parameter_types_follow_psycopg2_literals(self):
+        from app.services.prepared_statements import param_type
+
+        assert param_type(True) == "boolean"
+        assert param_type(15) == "integer"
+        assert param_type(1_762_000_000_000_000) == "bigint"
+        assert param_type(0.5) == "numeric"
+        assert param_type(datetime(2025, 11, 9)) == "timestamp"
+        assert param_type("glebe-potomac") == "unknown"
+        assert param_type(["a", "b"]) == "unknown"
+
+
+class TestStatementPreparer:
+    QUERY = "SELECT * FROM t WHERE intersection = %(name)s AND time_bin >= %(start)s"
+    PARAMS = {"name": "glebe-potomac", "start": datetime(2025, 11, 9)}
+
+    def test_prepares_after_threshold_then_executes(self):
+        from app.services.prepared_statements import StatementPreparer
+
+        preparer = StatementPreparer(threshold=2)
+        conn = FakeConnection()
+        cursor = FakeCursor(conn)
+
+        ran = [preparer.execute(cursor, self.QUERY, self.PARAMS) for _ in range(3)]
+
+        assert ran == [False, True, True]
+        queries = [query for query, _ in conn.executed]
+        assert queries[0] == self.QUERY
+        assert queries[1].startswith("PREPARE vtti_stmt_")
+        assert "(unknown, timestamp) AS SELECT * FROM t WHERE intersection = $1" in queries[1]
+        name = queries[1].split()[1]
+        assert conn.executed[2] == (f"EXECUTE {name} (%s, %s)", ["glebe-potomac", datetime(2025, 11, 9)])
+        assert conn.executed[3][0] == conn.executed[2][0]
+
+    def test_refused_statements_run_unprepared(self):
+        from app.services.prepared_statements import StatementPreparer
+
+        preparer = StatementPreparer(threshold=1)
+        conn = FakeConnection()
+        conn.refuse = True
+        cursor = FakeCursor(conn)
+
+        assert preparer.execute(cursor, self.QUERY, self.PARAMS) is False
+        conn.refuse = False
+        assert preparer.execute(cursor, self.QUERY, self.PARAMS) is False
+        assert conn.rollbacks == 1
+        assert [query for query, _ in conn.executed] == [self.QUERY, self.QUERY]
+        assert preparer.status()["refused"] == 1
+
+    def test_least_recently_used_statements_are_deallocated(self):
+        from app.services.prepared_statements import StatementPreparer
+
+        preparer = StatementPreparer(threshold=1, cache_size=2)
+        conn = FakeConnection()
+        cursor = FakeCursor(conn)
+
+        for table in ("a", "b", "a", "c"):
+            preparer.execute(cursor, f"SELECT * FROM {table}", None)
+
+        deallocated = [query for query, _ in conn.executed if query.startswith("DEALLOCATE")]
+        assert len(deallocated) == 1
+        assert [body for body, _ in conn.prepared_statements] == ["SELECT * FROM a", "SELECT * FROM c"]
+
+    @pytest.mark.parametrize("query", ["UPDATE t SET a = 1", "SHOW server_version"])
+    def test_only_reads_are_prepared(self, query):
+        from app.services.prepared_statements import StatementPreparer
+
+        preparer = StatementPreparer(threshold=1)
+        conn = FakeConnection()
+
+        assert preparer.execute(FakeCursor(conn), query, None) is False
+        assert conn.executed == [(query, None)]
@@ -0,0 +1,212 @@
+"""
+Backend tests - proximity join
+==============================
+proximity_pairs must return exactly the pairs a brute-force comparison
+finds (same group, |dt| <= window, |dlat| and |dlon| strictly below the
+threshold), however the candidates are chunked; proximity_self_pairs the
+same pairs within one set, each unordered pair once.
+"""
+import pytest
+
+THRESHOLD = 10 / 111000.0
+WINDOW_NS = 5_000_000_000
+
+
+def _positions(rng, n, groups=3):
+    import numpy as np
+    from app.services.proximity_join import Positions
+
+    return Positions(
+        group=rng.integers(-1, groups, n).astype(np.int64),
+        time_ns=1_700_000_000_000_000_000 + rng.integers(0, 60_000, n).astype(np.int64) * 1_000_000,
+        lat=37.2 + rng.uniform(0, 5e-4, n),
+        lon=-80.4 + rng.uniform(0, 5e-4, n),
+    )
+
+
+def _brute_force(left, right):
+    import numpy as np
+
+    match = (
+        (left.group[:, None] == right.group[None, :])
+        & (left.group[:, None] >= 0)
+        & (np.abs(left.time_ns[:, None] - right.time_ns[None, :]) <= WINDOW_NS)
+        & (np.abs(right.lat[None, :] - left.lat[:, None]) < THRESHOLD)
+        & (np.abs(right.lon[None, :] - left.lon[:, None]) < THRESHOLD)
+    )
+    return set(zip(*np.nonzero(match)))
+
+
+def _pairs(left, right, **kwargs):
+    from app.services.proximity_join import proximity_pairs
+
+    found = []
+    for li, ri in proximity_pairs(left, right, THRESHOLD, WINDOW_NS, **kwargs):
+        found.extend(zip(li.tolist(), ri.tolist()))
+    assert len(found) == len(set(found))
+    return set(found)
+
+
+class TestProximityPairs:
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_brute_force(self, seed):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        left, right = _positions(rng, 400), _positions(rng, 1500)
+
+        expected = _brute_force(left, right)
+
+        assert expected
+        assert _pairs(left, right) == expected
+        assert _pairs(left, right, max_candidates=50) == expected
+
+    def test_boundaries(self):
+        import numpy as np
+        from app.services.proximity_join import Positions
+
+        t0 = 1_700_000_000_000_000_000
+        right = Positions(
+            group=np.array([0], dtype=np.int64),
+            time_ns=np.array([t0], dtype=np.int64),
+            lat=np.array([37.0]),
+            lon=np.array([-80.0]),
+        )
+        left = Positions(
+            group=np.array([0, 0, 0, 1, 0], dtype=np.int64),
+            time_ns=np.array([t0 + WINDOW_NS, t0 - WINDOW_NS - 1, t0, t0, t0], dtype=np.int64),
+            lat=np.array([37.0, 37.0, 37.0 + THRESHOLD * 0.99, 37.0, np.nan]),
+            lon=np.array([-80.0, -80.0, -80.0 - THRESHOLD * 0.99, -80.0, -80.0]),
+        )
+
+        assert _pairs(left, right) == {(0, 0), (2, 0)}
+
+    def test_group_codes_share_values(self):
+        import pandas as pd
+        from app.services.proximity_join import group_codes
+
+        a, b = group_codes(pd.Series(["x", None, "y"]), pd.Series(["y", "z"]))
+
+        assert a[1] == -1
+        assert a[2] == b[0]
+        assert b[1] not in (a[0], a[2])
+
+
+class TestProximitySelfPairs:
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_each_unordered_pair_once(self, seed):
+        import numpy as np
+        from app.services.proximity_join import Positions, proximity_self_pairs
+
+        rng = np.random.default_rng(seed)
+        points = _positions(rng, 1500)
+        # Coarse timestamps so many points share a time
+        points = Positions(points.group, points.time_ns // 10**9 * 10**9, points.lat, points.lon)
+
+        expected = {(i, j) for i, j in _brute_force(points, points) if i < j}
+
+        for max_candidates in (50, 2_000_000):
+            found = []
+            for i, j in proximity_self_pairs(points, THRESHOLD, WINDOW_NS, max_candidates):
+                found.extend((min(a, b), max(a, b)) for a, b in zip(i.tolist(), j.tolist()))
+            assert len(found) == len(set(found))
+            assert set(found) == expected
+
+
+def _traffic(n_bsm, n_psm, seed):
+    import random
+
+    rng = random.Random(seed)
+    refs = [(37.20, -80.40), (37.25, -80.45)]
+    mapdata = [{"intersections": [
+        {"id": {"id": i}, "refPoint": {"lat": lat, "lon": lon}} for i, (lat, lon) in enumerate(refs)
+    ]}]
+    t0 = 1_700_000_040_000
+
+    def near(ref):
+        return ref[0] + rng.uniform(-3e-4, 3e-4), ref[1] + rng.uniform(-3e-4, 3e-4)
+
+    bsm, psm = [], []
+    for k in range(n_bsm):
+        lat, lon = near(rng.choice(refs))
+        bsm.append({"timestamp": t0 + rng.randint(0, 120_000), "bsmJson": {"coreData": {
+            "id": f"v{k % 30}", "lat": lat, "lon": lon, "speed": rng.uniform(0, 20)}}})
+    for k in range(n_psm):
+        lat, lon = near(rng.choice(refs))
+        psm.append({"timestamp": t0 + rng.randint(0, 120_000),
+                    "psmJson": {"id": f"p{k % 9}", "position": {"lat": lat, "lon": lon}, "basicType": 1}})
+    return mapdata, bsm, psm
+
+
+class TestVehicleConflicts:
+    def test_counts_match_pairwise_scan(self):
+        import pandas as pd
+        from app.services.vcc_feature_engineering import detect_vehicle_vehicle_conflicts, prepare_bsm_frame
+
+        mapdata, bsm, _ = _traffic(700, 0, seed=4)
+
+        result = detect_vehicle_vehicle_conflicts(bsm, mapdata_list=mapdata, interval_minutes=1)
+
+        # Reference: the previous nested scan, one conflict per
+        # (vehicle, other vehicle, BSM time) seen from either side
+        df = prepare_bsm_frame(bsm, mapdata)
+        conflicts = set()
+        for i, row1 in df.iterrows():
+            same = df[df["mapped_intersection"] == row1["mapped_intersection"]]
+            nearby = same[
+                (abs(same["timestamp"] - row1["timestamp"]) <= pd.Timedelta(seconds=5))
+                & (abs(same["lat"] - row1["lat"]) < THRESHOLD)
+                & (abs(same["lon"] - row1["lon"]) < THRESHOLD)
+                & (same.index != i)
+            ]
+            for _, row2 in nearby.iterrows():
+                if abs(row1["speed"] - row2["speed"]) > 5.0:
+                    conflicts.add((row1["mapped_intersection"], row1["timestamp"],
+                                   row1["vehicle_id"], row2["vehicle_id"]))
+        counts = {}
+        for intersection, timestamp, _, _ in conflicts:
+            key = (intersection, timestamp.floor("1min"))
+            counts[key] = counts.get(key, 0) + 1
+
+        assert counts
+        assert dict(zip(zip(result["intersection"], result["time_1min"]), result["I_vehicle"])) == counts
+
+    def test_without_mapdata_no_conflicts(self):
+        from app.services.vcc_feature_engineering import detect_vehicle_vehicle_conflicts
+
+        _, bsm, _ = _traffic(50, 0, seed=1)
+
+        assert len(detect_vehicle_vehicle_conflicts(bsm)) == 0
+
+
+class TestVruConflicts:
+    def test_counts_match_row_scan(self):
+        import pandas as pd
+        from app.services.vcc_feature_engineering import (
+            detect_vru_vehicle_conflicts,
+            prepare_bsm_frame,
+            prepare_psm_frame,
+        )
+
+        mapdata, bsm, psm = _traffic(600, 200, seed=3)
+
+        result = detect_vru_vehicle_conflicts(bsm, psm, mapdata_list=mapdata, interval_minutes=1)
+
+        # Reference: the previous per-PSM scan
+        df_bsm = prepare_bsm_frame(bsm, mapdata)
+        df_psm = prepare_psm_frame(psm, mapdata)
+        counts = {}
+        for _, row in df_psm.iterrows():
+            same = df_bsm[df_bsm["mapped_intersection"] == row["mapped_intersection"]]
+            nearby = same[
+                (abs(same["timestamp"] - row["timestamp"]) <= pd.Timedelta(seconds=5))
+                & (abs(same["lat"] - row["lat"]) < THRESHOLD)
+                & (abs(same["lon"] - row["lon"]) < THRESHOLD)
+            ]
+            if len(nearby):
+                key = (row["mapped_intersection"], row["timestamp"].floor("1min"))
+                counts[key] = counts.get(key, 0) + 1
+
+        assert counts
+        assert dict(zip(zip(result["intersection"], result["time_1min"]), result["I_VRU"])) == counts
+        assert (result["vru_event_count"] == result["I_VRU"]).all()
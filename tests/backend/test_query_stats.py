@@ -0,0 +1,91 @@
+"""
+Backend tests - per-query statistics
+====================================
+Executions are grouped by fingerprint (literals and placeholders ignored)
+into call/row/error counters and a latency histogram.
+"""
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def stats():
+    from app.services.query_stats import QueryStats
+
+    return QueryStats(max_fingerprints=3, clock=FakeClock())
+
+
+class TestFingerprint:
+    def test_literals_and_placeholders_share_a_fingerprint(self):
+        from app.services.query_stats import fingerprint, normalize_query
+
+        a = "SELECT *  FROM t WHERE x = %(x)s AND bin = 15 AND name = 'glebe'"
+        b = "select * from t where x = %s and bin = 60 and name = 'birch'".upper()
+        assert fingerprint(a) != fingerprint(b)  # keywords keep their case
+        assert fingerprint(a) == fingerprint(
+            "SELECT * FROM t\n  WHERE x = %s AND bin = 60 AND name = 'it''s'"
+        )
+        assert normalize_query("SELECT a FROM t WHERE id IN (1, 2, 3) AND b = $1") == (
+            "SELECT a FROM t WHERE id IN (?...) AND b = ?"
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        from app.services.query_stats import fingerprint
+
+        assert fingerprint("SELECT col1 FROM t2") != fingerprint("SELECT col2 FROM t2")
+
+
+class TestQueryStats:
+    def test_timed_records_latency_rows_and_errors(self, stats):
+        clock = stats._clock
+        for elapsed, rows in ((0.004, 10), (0.004, 10), (0.3, 5)):
+            with stats.timed("SELECT * FROM t WHERE id = %s") as timer:
+                clock.now += elapsed
+                timer.rows = rows
+                timer.prepared = True
+        with pytest.raises(ValueError):
+            with stats.timed("SELECT * FROM t WHERE id = 7"):
+                raise ValueError("boom")
+
+        (row,) = stats.snapshot()
+        assert row["calls"] == 4
+        assert row["rows"] == 25
+        assert row["prepared_calls"] == 3
+        assert row["errors"] == 1
+        assert row["last_error"] == "ValueError: boom"
+        assert row["histogram"]["le_5"] == 2
+        assert row["histogram"]["le_500"] == 1
+        assert row["p50_ms"] == 5.0
+        assert row["p99_ms"] == 300.0
+
+    def test_stopping_a_stream_is_not_an_error(self, stats):
+        def stream():
+            with stats.timed("SELECT 1"):
+                yield 1
+                yield 2
+
+        batches = stream()
+        next(batches)
+        batches.close()
+
+        assert stats.snapshot()[0]["errors"] == 0
+
+    def test_new_shapes_overflow_once_full(self, stats):
+        for table in ("a", "b", "c", "d", "e"):
+            stats.record(f"SELECT * FROM {table}", 1.0)
+        stats.record("SELECT * FROM a", 1.0)
+
+        rows = {row["fingerprint"]: row for row in stats.snapshot(order_by="calls")}
+        assert len(rows) == 4
+        assert rows["overflow"]["calls"] == 2
+        assert stats.status()["calls"] == 6
+
+        stats.reset()
+        assert stats.snapshot() == []
@@ -0,0 +1,229 @@
+"""
+Backend tests - RTSIService batched / vectorized paths
+======================================================
+The array kernel must reproduce the scalar uplift, sub-index and combined
+index methods exactly, and the multi-intersection batch must issue a fixed
+number of grouped queries regardless of how many intersections it scores.
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+
+class FakeRTSIClient:
+    """Answers the grouped RT-SI queries from canned per-intersection rows."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        q = str(query)
+        if "vdot_crashes_with_intersections" in q:
+            return [
+                {"matched_intersection_id": i, "weighted_crashes": 10.0 * i, "exposure": 1}
+                for i in params.get("intersection_ids", [params.get("intersection_id")])
+            ]
+        if "PERCENTILE_CONT(0.95)" in q:
+            return [{"intersection": "glebe-potomac", "capacity": 400.0}]
+        if "MAX(publish_timestamp)" in q:
+            return [
+                {"intersection": name, "latest_ts": 1_730_000_000_000_000}
+                for name in params["intersections"]
+            ]
+        if '"speed-distribution"' in q:
+            return [
+                {
+                    "intersection": name,
+                    "total_count": 50,
+                    "avg_speed": 22.0,
+                    "free_flow_speed": 35.0,
+                }
+                for name in params["intersections"]
+            ]
+        if '"vru-count"' in q:
+            return [{"intersection": name, "vru_count": 4} for name in params["intersections"]]
+        if '"vehicle-count"' in q:
+            return [
+                {"intersection": name, "vehicle_count": 120, "turning_count": 30}
+                for name in params["intersections"]
+            ]
+        return []
+
+
+def _scalar_reference(service, r_hat, row, capacity):
+    uplift = service.compute_uplift_factors(
+        row["avg_speed"],
+        row["free_flow_speed"],
+        row["speed_variance"],
+        row["vehicle_count"],
+        row["vru_count"],
+        row["turning_count"],
+    )
+    sub = service.compute_sub_indices(
+        r_hat, uplift["U"], row["vehicle_count"], row["vru_count"], capacity
+    )
+    comb = service.compute_combined_index(sub["VRU_index"], sub["VEH_index"])
+    return uplift, sub, comb
+
+
+class TestRTSIArrayKernel:
+    def test_matches_scalar_methods_exactly(self):
+        from app.services.rt_si_service import RTSIService
+
+        service = RTSIService(FakeRTSIClient())
+        rows = [
+            {"avg_speed": 0.0, "free_flow_speed": 30.0, "speed_variance": 0.0,
+             "vehicle_count": 0, "vru_count": 0, "turning_count": 0},
+            {"avg_speed": 18.5, "free_flow_speed": 35.0, "speed_variance": 3.4,
+             "vehicle_count": 240, "vru_count": 12, "turning_count": 60},
+            {"avg_speed": 41.0, "free_flow_speed": 35.0, "speed_variance": 16.81,
+             "vehicle_count": 900, "vru_count": 300, "turning_count": 400},
+        ]
+        r_hat = 3.2
+        capacity = 500.0
+
+        arrays = service.compute_rt_si_arrays(
+            r_hat,
+            [r["avg_speed"] for r in rows],
+            [r["free_flow_speed"] for r in rows],
+            [r["speed_variance"] for r in rows],
+            [r["vehicle_count"] for r in rows],
+            [r["vru_count"] for r in rows],
+            [r["turning_count"] for r in rows],
+            capacity,
+        )
+
+        for i, row in enumerate(rows):
+            uplift, sub, comb = _scalar_reference(service, r_hat, row, capacity)
+            assert arrays["F_speed"][i] == uplift["F_speed"]
+            assert arrays["F_variance"][i] == uplift["F_variance"]
+            assert arrays["F_conflict"][i] == uplift["F_conflict"]
+            assert arrays["U"][i] == uplift["U"]
+            assert arrays["VRU_index"][i] == sub["VRU_index"]
+            assert arrays["VEH_index"][i] == sub["VEH_index"]
+            assert arrays["COMB"][i] == comb
+            assert arrays["RT_SI"][i] == min(100.0, comb)
+
+
+class TestRTSIBatch:
+    def test_query_count_is_independent_of_intersection_count(self):
+        from app.services.rt_si_service import RTSIService
+
+        targets = {f"site-{i}": i for i in range(1, 19)}
+        client = FakeRTSIClient()
+        results = RTSIService(client).calculate_rt_si_batch(
+            targets, datetime(2024, 11, 1, 12, 0), bin_minutes=15, lookback_hours=168
+        )
+
+        assert set(results) == set(targets)
+        assert len(client.calls) == 6
+
+    def test_batch_matches_single_intersection_formula(self):
+        from app.services.rt_si_service import RTSIService
+
+        client = FakeRTSIClient()
+        service = RTSIService(client)
+        results = service.calculate_rt_si_batch(
+            {"glebe-potomac": 7, "other-site": 2}, datetime(2024, 11, 1, 12, 0)
+        )
+
+        row = {
+            "avg_speed": 22.0,
+            "free_flow_speed": 35.0,
+            "speed_variance": (22.0 * 0.1) ** 2,
+            "vehicle_count": 120,
+            "vru_count": 4,
+            "turning_count": 30,
+        }
+        r_hat = service.compute_eb_rate(70.0, 1.0)
+        uplift, sub, comb = _scalar_reference(service, r_hat, row, 400.0)
+
+        glebe = results["glebe-potomac"]
+        assert glebe["intersection_id"] == 7
+        assert glebe["eb_crash_rate"] == r_hat
+        assert glebe["uplift_factor"] == uplift["U"]
+        assert glebe["VEH_index"] == sub["VEH_index"]
+        assert glebe["RT_SI"] == min(100.0, comb)
+        # No capacity row for the second site: falls back to the default.
+        assert results["other-site"]["vehicle_congestion_ratio"] == min(
+            1.0, 120 / RTSIService.DEFAULT_CAPACITY
+        )
+
+    def test_query_errors_propagate(self):
+        from app.services.rt_si_service import RTSIService
+
+        class FailingClient(FakeRTSIClient):
+            def execute_query(self, query, params=None):
+                if "MAX(publish_timestamp)" in str(query):
+                    raise RuntimeError("query deadline exceeded")
+                return super().execute_query(query, params)
+
+        with pytest.raises(RuntimeError):
+            RTSIService(FailingClient()).calculate_rt_si_batch(
+                {"glebe-potomac": 7}, datetime(2024, 11, 1, 12, 0)
+            )
+
+    def test_empty_targets_make_no_queries(self):
+        from app.services.rt_si_service import RTSIService
+
+        client = FakeRTSIClient()
+        assert RTSIService(client).calculate_rt_si_batch({}, datetime.now()) == {}
+        assert client.calls == []
+
+
+class TestRTSIColumnarTrend:
+    def _traffic_map(self):
+        from datetime import timedelta
+
+        start = datetime(2024, 11, 1, 8, 0)
+        speeds = [0.0, 12.5, 27.0, 33.0, 48.0]
+        return {
+            start + timedelta(minutes=15 * i): {
+                "vehicle_count": 40 * i,
+                "turning_count": 7 * i,
+                "vru_count": 3 * i,
+                "avg_speed": speed,
+                "speed_variance": (speed * 0.1) ** 2,
+                "free_flow_speed": 35.0,
+            }
+            for i, speed in enumerate(speeds)
+        }
+
+    def test_from_data_matches_per_bin_scalar_path(self):
+        from app.services.rt_si_service import RTSIService
+
+        service = RTSIService(FakeRTSIClient())
+        traffic = self._traffic_map()
+        results = service.calculate_rt_si_from_data(5, traffic, 300.0, bin_minutes=15)
+
+        hist = service.get_historical_crash_rate(5)
+        r_hat = service.compute_eb_rate(hist["raw_rate"], hist["exposure"])
+        assert [r["timestamp"] for r in results] == [t.isoformat() for t in sorted(traffic)]
+        for result, t in zip(results, sorted(traffic)):
+            uplift, sub, comb = _scalar_reference(service, r_hat, traffic[t], 300.0)
+            assert result["vehicle_count"] == traffic[t]["vehicle_count"]
+            assert isinstance(result["vehicle_count"], int)
+            assert result["F_variance"] == uplift["F_variance"]
+            assert result["uplift_factor"] == uplift["U"]
+            assert result["VRU_index"] == sub["VRU_index"]
+            assert result["vehicle_congestion_ratio"] == sub["H"]
+            assert result["combined_index"] == comb
+            assert result["safety_score"] == result["RT_SI"] == min(100.0, comb)
+
+    def test_columns_are_aligned_arrays(self):
+        from app.services.rt_si_service import RTSIService
+
+        service = RTSIService(FakeRTSIClient())
+        timestamps, traffic = service.traffic_columns(self._traffic_map())
+        columns = service.compute_rt_si_columns(
+            timestamps, traffic, 300.0, {"weighted_crashes": 4.0, "exposure": 1.0, "raw_rate": 4.0}
+        )
+
+        assert columns["timestamp"] == timestamps
+        assert isinstance(columns["RT_SI"], np.ndarray)
+        assert columns["RT_SI"].shape == (len(timestamps),)
+        assert service.rt_si_records(
+            {**columns, "timestamp": []}, 5, 15
+        ) == []
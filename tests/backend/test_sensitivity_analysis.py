@@ -0,0 +1,164 @@
+"""
+Backend tests - SensitivityAnalysisService parameter sweep
+==========================================================
+The (samples x bins) sweep must reproduce the per-parameter-set scoring
+path exactly and fetch the historical crash rate only once per analysis.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+class FakeCrashRateClient:
+    """Counts historical crash-rate lookups."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        if "vdot_crashes_with_intersections" in str(query):
+            return [{"weighted_crashes": 42.0, "exposure": 3}]
+        return []
+
+
+def _traffic_map():
+    start = datetime(2024, 11, 1, 8, 0)
+    speeds = [0.0, 9.5, 21.0, 33.0, 47.0, 28.0, 15.0]
+    return {
+        start + timedelta(minutes=15 * i): {
+            "vehicle_count": 35 * i + 5,
+            "turning_count": 6 * i,
+            "vru_count": (7 * i) % 11,
+            "avg_speed": speed,
+            "speed_variance": (speed * 0.1) ** 2,
+            "free_flow_speed": 35.0,
+        }
+        for i, speed in enumerate(speeds)
+    }
+
+
+class TestParameterSweep:
+    def test_sweep_matches_per_parameter_set_scoring(self):
+        from app.services.rt_si_service import RTSIService
+        from app.services.sensitivity_analysis_service import (
+            SensitivityAnalysisService,
+        )
+
+        client = FakeCrashRateClient()
+        service = SensitivityAnalysisService(client)
+        traffic_map = _traffic_map()
+        matrix = service.generate_parameter_matrix(0.3, 20, seed=7)
+
+        _, traffic = service.base_rt_si_service.traffic_columns(traffic_map)
+        hist = service.base_rt_si_service.get_historical_crash_rate(5)
+        scores = service.evaluate_parameter_sweep(matrix, traffic, 300.0, hist)
+
+        assert scores.shape == (20, len(traffic_map))
+        for row, params in zip(scores, matrix):
+            reference = RTSIService(client)
+            for name, value in zip(RTSIService.PARAMETER_NAMES, params):
+                setattr(reference, name, value)
+            expected = reference.calculate_rt_si_from_data(5, traffic_map, 300.0)
+            assert row.tolist() == [r["RT_SI"] for r in expected]
+
+    def test_chunking_does_not_change_results(self):
+        from app.services.sensitivity_analysis_service import (
+            SensitivityAnalysisService,
+        )
+
+        service = SensitivityAnalysisService(FakeCrashRateClient())
+        matrix = service.generate_parameter_matrix(0.25, 50, design="sobol", seed=1)
+        _, traffic = service.base_rt_si_service.traffic_columns(_traffic_map())
+        hist = {"weighted_crashes": 42.0, "exposure": 3.0, "raw_rate": 14.0}
+
+        full = service.evaluate_parameter_sweep(matrix, traffic, 300.0, hist)
+        service.SWEEP_CHUNK_SIZE = 7
+        chunked = service.evaluate_parameter_sweep(matrix, traffic, 300.0, hist)
+
+        assert np.array_equal(full, chunked)
+
+    def test_designs_keep_weight_groups_normalized(self):
+        from app.services.rt_si_service import RTSIService
+        from app.services.sensitivity_analysis_service import (
+            SensitivityAnalysisService,
+        )
+
+        service = SensitivityAnalysisService(FakeCrashRateClient())
+        col = {name: i for i, name in enumerate(RTSIService.PARAMETER_NAMES)}
+        for design in ("random", "sobol"):
+            matrix = service.generate_parameter_matrix(0.5, 64, design=design, seed=3)
+            assert matrix.shape == (64, len(RTSIService.PARAMETER_NAMES))
+            np.testing.assert_allclose(
+                matrix[:, col["OMEGA_VRU"]] + matrix[:, col["OMEGA_VEH"]], 1.0
+            )
+            np.testing.assert_allclose(
+                matrix[:, [col["BETA1"], col["BETA2"], col["BETA3"]]].sum(axis=1), 1.0
+            )
+            lam = matrix[:, col["LAMBDA"]] / RTSIService.LAMBDA
+            assert lam.min() >= 0.5 and lam.max() <= 1.5
+
+    def test_rowwise_spearman_matches_scipy(self):
+        from scipy.stats import spearmanr
+        from app.services.sensitivity_analysis_service import (
+            SensitivityAnalysisService,
+        )
+
+        rng = np.random.default_rng(0)
+        reference = rng.integers(0, 5, size=12).astype(float)  # with ties
+        matrix = rng.integers(0, 5, size=(6, 12)).astype(float)
+        matrix[0] = 2.0  # constant row: spearmanr gives NaN, reported as 0.0
+
+        corr = SensitivityAnalysisService._rowwise_spearman(matrix, reference)
+
+        assert corr[0] == 0.0
+        for row, value in zip(matrix[1:], corr[1:]):
+            np.testing.assert_allclose(value, spearmanr(reference, row)[0])
+
+
+class TestAnalyzeSensitivity:
+    def test_fetches_crash_rate_once_for_all_samples(self, monkeypatch):
+        import app.api.intersection as intersection_api
+        from app.services.sensitivity_analysis_service import (
+            SensitivityAnalysisService,
+        )
+
+        monkeypatch.setattr(
+            intersection_api,
+            "find_crash_intersection_for_bsm",
+            lambda name, db: [
+                {"crash_intersection_id": 5, "intersection_name": name}
+            ],
+        )
+        client = FakeCrashRateClient()
+        service = SensitivityAnalysisService(client)
+        monkeypatch.setattr(
+            service.base_rt_si_service,
+            "get_intersection_capacity",
+            lambda *args, **kwargs: 300.0,
+        )
+        monkeypatch.setattr(
+            service.base_rt_si_service,
+            "get_bulk_traffic_data",
+            lambda *args, **kwargs: _traffic_map(),
+        )
+
+        result = service.analyze_sensitivity(
+            "glebe-potomac",
+            datetime(2024, 11, 1, 8, 0),
+            datetime(2024, 11, 1, 10, 0),
+            n_samples=1000,
+            design="sobol",
+            seed=11,
+        )
+
+        assert len(client.calls) == 1
+        stability = result["stability_metrics"]
+        assert stability["total_perturbations"] == 1000
+        assert len(stability["spearman_correlations"]["values"]) == 1000
+        assert len(stability["tier_changes"]["values"]) == 1000
+        assert len(result["perturbed_samples"]) == 10
+        assert len(result["baseline"]["rt_si_scores"]) == len(_traffic_map())
+        assert set(result["parameter_importance"]) == set(
+            result["perturbed_samples"][0]["params"]
+        )
@@ -0,0 +1,176 @@
+"""
+Backend tests - SnapshotRefresher and the safety-index list snapshot
+====================================================================
+Requests must be answered from the last good snapshot, whose age is
+reported, while recomputation happens only in refresh().
+"""
+import pytest
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class CountingCompute:
+    def __init__(self, result=None):
+        self.calls = []
+        self.fail = False
+        self.result = result
+
+    def __call__(self, key):
+        self.calls.append(key)
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        if self.result is not None:
+            return self.result
+        return {"key": key, "version": len(self.calls)}
+
+
+COMPONENTS = [
+    {"intersection_id": 1, "intersection_name": "glebe-potomac", "traffic_volume": 120,
+     "longitude": -77.05, "latitude": 38.86, "rt_si_index": 80.0, "mcdm_index": 40.0},
+    {"intersection_id": 2, "intersection_name": "birch-broad", "traffic_volume": 0,
+     "longitude": -77.17, "latitude": 38.88, "rt_si_index": None, "mcdm_index": 0.0},
+]
+
+
+class TestSnapshotRefresher:
+    def test_refresh_due_respects_interval(self):
+        from app.core.snapshot import SnapshotRefresher
+
+        clock, compute = FakeClock(), CountingCompute()
+        refresher = SnapshotRefresher("test", compute, clock=clock)
+        refresher._interval = 900
+        refresher.track(15)
+
+        assert refresher.get(15) is None
+        assert refresher.refresh_due() == 900
+        clock.now += 600
+        assert refresher.refresh_due() == pytest.approx(300)
+        assert refresher.age(15) == 600
+        clock.now += 300
+        refresher.refresh_due()
+
+        assert compute.calls == [15, 15]
+        assert refresher.get(15)[0]["version"] == 2
+        assert refresher.age(15) == 0
+
+    def test_failed_refresh_keeps_last_good_snapshot(self):
+        from app.core.snapshot import RETRY_SECONDS, SnapshotRefresher
+
+        clock, compute = FakeClock(), CountingCompute()
+        refresher = SnapshotRefresher("test", compute, clock=clock)
+        refresher._interval = 900
+        refresher.track(15)
+        refresher.refresh_due()
+
+        compute.fail = True
+        clock.now += 900
+        assert refresher.refresh_due() == RETRY_SECONDS
+        assert refresher.refresh_due() == RETRY_SECONDS  # no retry before the delay
+        assert len(compute.calls) == 2
+
+        assert refresher.get(15)[0]["version"] == 1
+        assert refresher.status()["last_error"] == "database unavailable"
+
+    def test_background_thread_serves_waiting_request(self):
+        from app.core.snapshot import SnapshotRefresher
+
+        compute = CountingCompute()
+        refresher = SnapshotRefresher("test", compute)
+        refresher.start_background_refresh(900)
+        try:
+            refresher.track(5)
+            snapshot = refresher.wait_for(5, timeout=5)
+        finally:
+            refresher.stop_background_refresh()
+
+        assert snapshot[0] == {"key": 5, "version": 1}
+
+
+class TestSafetyIndexListSnapshot:
+    @pytest.fixture
+    def snapshots(self, monkeypatch):
+        from app.api import intersection
+
+        compute = CountingCompute(result=COMPONENTS)
+        monkeypatch.setattr(intersection.safety_index_snapshots, "_compute", compute)
+        intersection.safety_index_snapshots.clear()
+        yield intersection.safety_index_snapshots, compute
+        intersection.safety_index_snapshots.clear()
+
+    def test_blend_matches_alpha_formula(self):
+        from app.api.intersection import _blend_safety_index
+
+        full = _blend_safety_index(COMPONENTS, 0.7, True)
+        rt_only = _blend_safety_index(COMPONENTS, 1.0, False)
+
+        assert full[0].safety_index == pytest.approx(0.7 * 80 + 0.3 * 40)
+        assert full[0].index_type == "Blended"
+        assert full[0].mcdm_index == 40.0
+        assert full[1].safety_index == 0.0 and full[1].index_type == "No Data"
+        assert rt_only[0].safety_index == 80.0 and rt_only[0].mcdm_index is None
+
+    def test_requests_are_served_from_snapshot(self, snapshots):
+        from fastapi import Response
+        from app.api.intersection import list_intersections
+
+        refresher, compute = snapshots
+        refresher.refresh(15)
+
+        responses = [Response(), Response()]
+        first = list_intersections(responses[0], alpha=0.7, include_mcdm=True, bin_minutes=15)
+        second = list_intersections(responses[1], alpha=0.2, include_mcdm=True, bin_minutes=15)
+
+        assert compute.calls == [15]
+        assert first[0].safety_index != second[0].safety_index
+        assert "X-Snapshot-Age-Seconds" in responses[0].headers
+        assert "X-Snapshot-Computed-At" in responses[0].headers
+
+    def test_missing_snapshot_returns_503_while_refresher_warms(self, snapshots, monkeypatch):
+        from fastapi import HTTPException, Response
+        from app.api.intersection import list_intersections
+        from app.core.config import settings
+
+        refresher, compute = snapshots
+        monkeypatch.setattr(settings, "SAFETY_INDEX_SNAPSHOT_COLD_WAIT_SECONDS", 0)
+        monkeypatch.setattr(type(refresher), "running", property(lambda self: True))
+
+        with pytest.raises(HTTPException) as exc:
+            list_intersections(Response(), alpha=0.7, include_mcdm=True, bin_minutes=15)
+
+        assert exc.value.status_code == 503
+        assert compute.calls == []
+        assert 15 in refresher._tracked
+
+    def test_disabled_refresher_returns_503_without_computing(self, snapshots):
+        from fastapi import HTTPException, Response
+        from app.api.intersection import list_intersections
+
+        refresher, compute = snapshots
+
+        with pytest.raises(HTTPException) as exc:
+            list_intersections(Response(), alpha=0.7, include_mcdm=True, bin_minutes=15)
+
+        assert exc.value.status_code == 503
+        assert exc.value.headers["Retry-After"] == "30"
+        assert compute.calls == []
+
+    def test_other_bin_sizes_are_rejected(self, snapshots, monkeypatch):
+        from fastapi import HTTPException, Response
+        from app.api import intersection
+
+        refresher, compute = snapshots
+        on_demand = CountingCompute(result=COMPONENTS)
+        monkeypatch.setattr(intersection, "_compute_safety_index_components", on_demand)
+
+        with pytest.raises(HTTPException) as exc:
+            intersection.list_intersections(Response(), alpha=0.7, include_mcdm=True, bin_minutes=30)
+
+        assert exc.value.status_code == 422
+        assert on_demand.calls == compute.calls == []
+        assert refresher._tracked == {}
@@ -0,0 +1,112 @@
+"""
+Backend tests - chunk-aligned safety score trend caching
+=========================================================
+Range requests are assembled from per-day chunks of (intersection,
+bin_minutes); only chunks not yet cached may be computed.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+
+class FakeTrendSeries:
+    """Stands in for _compute_trend_series: one point per bin, records ranges."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, intersection, start_time, end_time, bin_minutes):
+        self.calls.append((start_time, end_time, bin_minutes))
+        points, t = [], start_time
+        while t < end_time:
+            points.append(
+                {"intersection": intersection, "time_bin": t, "mcdm_index": 40.0, "rt_si_score": 80.0}
+            )
+            t += timedelta(minutes=bin_minutes)
+        return points
+
+
+@pytest.fixture
+def trend(monkeypatch):
+    from app.api import intersection
+    from app.core.config import settings
+    from app.core.redis_cache import ResponseCache
+
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    cache = ResponseCache()
+    monkeypatch.setattr(cache, "_client", lambda: None)
+    monkeypatch.setattr(intersection, "response_cache", cache)
+    fake = FakeTrendSeries()
+    monkeypatch.setattr(intersection, "_compute_trend_series", fake)
+    return intersection, fake
+
+
+class TestTrendChunks:
+    def test_sliding_window_reuses_cached_chunks(self, trend):
+        intersection, fake = trend
+
+        first = intersection._compute_safety_score_trend(
+            "glebe-potomac", datetime(2025, 11, 9, 8), datetime(2025, 11, 10, 8), 60, 0.7, False
+        )
+        assert [call[0] for call in fake.calls] == [datetime(2025, 11, 9), datetime(2025, 11, 10)]
+
+        slid = intersection._compute_safety_score_trend(
+            "glebe-potomac", datetime(2025, 11, 9, 9), datetime(2025, 11, 10, 9), 60, 0.7, False
+        )
+        assert len(fake.calls) == 2
+
+        intersection._compute_safety_score_trend(
+            "glebe-potomac", datetime(2025, 11, 10, 9), datetime(2025, 11, 11, 9), 60, 0.7, False
+        )
+        assert [call[0] for call in fake.calls][2:] == [datetime(2025, 11, 11)]
+
+        assert first["metadata"]["data_points"] == slid["metadata"]["data_points"] == 24
+        assert first["time_series"][0]["time_bin"] == "2025-11-09T08:00:00"
+        assert slid["time_series"][-1]["time_bin"] == "2025-11-10T08:00:00"
+
+    def test_blending_does_not_alter_cached_chunks(self, trend):
+        intersection, fake = trend
+        args = ("glebe-potomac", datetime(2025, 11, 9), datetime(2025, 11, 9, 6), 60)
+
+        rt_si_heavy = intersection._compute_safety_score_trend(*args, 1.0, False)
+        mcdm_heavy = intersection._compute_safety_score_trend(*args, 0.0, False)
+
+        assert len(fake.calls) == 1
+        assert rt_si_heavy["time_series"][0]["safety_index"] == pytest.approx(80.0)
+        assert mcdm_heavy["time_series"][0]["safety_index"] == pytest.approx(40.0)
+        assert mcdm_heavy["time_series"][0]["index_type"] == "Hybrid"
+
+    def test_bins_that_do_not_divide_a_day_skip_chunking(self, trend):
+        intersection, fake = trend
+        start, end = datetime(2025, 11, 9, 8), datetime(2025, 11, 10, 8)
+
+        intersection._compute_safety_score_trend("glebe-potomac", start, end, 7, 0.7, False)
+
+        assert fake.calls == [(start, end, 7)]
+
+    def test_empty_range_is_404(self, trend, monkeypatch):
+        from fastapi import HTTPException
+
+        intersection, _ = trend
+        monkeypatch.setattr(intersection, "_compute_trend_series", lambda *args: [])
+
+        with pytest.raises(HTTPException) as exc:
+            intersection._compute_safety_score_trend(
+                "glebe-potomac", datetime(2025, 11, 9), datetime(2025, 11, 10), 15, 0.7, False
+            )
+        assert exc.value.status_code == 404
+
+    def test_empty_chunks_are_cached(self, trend, monkeypatch):
+        from fastapi import HTTPException
+
+        intersection, _ = trend
+        calls = []
+        monkeypatch.setattr(intersection, "_compute_trend_series", lambda *args: calls.append(args) or [])
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                intersection._compute_safety_score_trend(
+                    "glebe-potomac", datetime(2025, 11, 9), datetime(2025, 11, 10), 15, 0.7, False
+                )
+
+        assert len(calls) == 1
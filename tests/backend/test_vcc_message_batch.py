@@ -0,0 +1,155 @@
+"""
+Backend tests - VCC message batches
+===================================
+The columnar decoders must produce the frame the per-message parsers
+produce (same columns, rows and values), skip the messages the parsers
+reject, and feed the feature extractors unchanged.
+"""
+import random
+
+import pytest
+
+T0_MS = 1_700_000_000_000
+
+
+def _bsm(n, seed=0):
+    rng = random.Random(seed)
+    messages = []
+    for k in range(n):
+        core = {
+            "id": f"veh-{k % 17}",
+            "lat": 37.2 + rng.uniform(0, 0.01),
+            "lon": -80.4 + rng.uniform(0, 0.01),
+            "speed": rng.choice([None, rng.uniform(0, 25)]),
+            "heading": rng.uniform(0, 360),
+            "elev": rng.uniform(600, 650),
+            "brakeAppliedStatus": rng.choice([0, 4, 6, 8]),
+        }
+        if k % 3:
+            core["accelSet"] = {"long": rng.uniform(-4, 2), "lat": rng.uniform(-1, 1)}
+        messages.append({
+            "timestamp": T0_MS + rng.randint(0, 900_000),
+            "rsuName": "rsu-1",
+            "locationName": rng.choice([None, "Main St"]),
+            "bsmJson": {"coreData": core},
+        })
+    return messages
+
+
+def _psm(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "publishTimestamp": T0_MS + rng.randint(0, 900_000),
+            "psmJson": {
+                "id": f"vru-{k % 5}",
+                "position": {
+                    "lat": 37.2 + rng.uniform(0, 0.01),
+                    "lon": -80.4 + rng.uniform(0, 0.01),
+                    "elev": rng.uniform(600, 650),
+                },
+                "speed": rng.uniform(0, 3),
+                "heading": rng.uniform(0, 360),
+                "basicType": rng.choice([0, 1, 2, 3, "aPEDESTRIAN"]),
+            },
+        }
+        for k in range(n)
+    ]
+
+
+def _parsed_frame(messages, parse):
+    import pandas as pd
+
+    return pd.DataFrame([parsed for parsed in map(parse, messages) if parsed])
+
+
+class TestDecodeBsm:
+    def test_matches_per_message_parser(self):
+        import pandas as pd
+        from app.services.vcc_feature_engineering import parse_vcc_bsm_message
+        from app.services.vcc_message_batch import decode_bsm_messages
+
+        messages = _bsm(300)
+
+        pd.testing.assert_frame_equal(
+            decode_bsm_messages(messages), _parsed_frame(messages, parse_vcc_bsm_message), check_dtype=False
+        )
+
+    def test_skips_messages_the_parser_rejects(self):
+        from app.services.vcc_feature_engineering import parse_vcc_bsm_message
+        from app.services.vcc_message_batch import decode_bsm_messages
+
+        messages = [
+            {"timestamp": 0, "bsmJson": {"coreData": {"id": 1}}},  # no timestamp
+            {"timestamp": T0_MS, "bsmJson": {"coreData": {"brakeAppliedStatus": None}}},
+            {"timestamp": T0_MS, "bsmJson": None},
+            "not a message",
+            {"timestamp": 0, "publishTimestamp": T0_MS + 5, "bsmJson": {"coreData": {"id": 2, "accelSet": "n/a"}}},
+        ]
+
+        df = decode_bsm_messages(messages)
+
+        assert [parse_vcc_bsm_message(m) is not None for m in messages] == [False, False, False, False, True]
+        assert list(df["vehicle_id"]) == [2]
+        assert list(df["timestamp_ms"]) == [T0_MS + 5]
+        assert df["accel_lon"].isna().all()
+
+    def test_typed_columns(self):
+        from app.services.vcc_message_batch import decode_bsm_messages
+
+        df = decode_bsm_messages(_bsm(50))
+
+        assert str(df["timestamp"].dtype) == "datetime64[ns]"
+        for column in ("lat", "lon", "speed", "heading", "accel_lon"):
+            assert df[column].dtype == float
+        assert list(df["hard_braking"]) == [int(b & 0x04 != 0) for b in df["brake_applied_status"]]
+
+    @pytest.mark.parametrize("messages", [[], None])
+    def test_empty(self, messages):
+        from app.services.vcc_message_batch import BSM_COLUMNS, decode_bsm_messages
+
+        df = decode_bsm_messages(messages)
+
+        assert len(df) == 0
+        assert list(df.columns) == BSM_COLUMNS
+
+
+class TestDecodePsm:
+    def test_matches_per_message_parser(self):
+        import pandas as pd
+        from app.services.vcc_feature_engineering import parse_vcc_psm_message
+        from app.services.vcc_message_batch import decode_psm_messages
+
+        messages = _psm(200)
+
+        pd.testing.assert_frame_equal(
+            decode_psm_messages(messages), _parsed_frame(messages, parse_vcc_psm_message), check_dtype=False
+        )
+
+
+class TestFeatureExtraction:
+    def test_features_unchanged(self):
+        import pandas as pd
+        from app.services.vcc_feature_engineering import (
+            extract_bsm_features,
+            parse_vcc_bsm_message,
+        )
+
+        messages = _bsm(400, seed=2)
+        features = extract_bsm_features(messages, interval_minutes=1)
+
+        # Reference: the same aggregation over the per-message parser frame
+        df = _parsed_frame(messages, parse_vcc_bsm_message)
+        df = df[df["location_name"].notna()]
+        expected = df.groupby(["location_name", df["timestamp"].dt.floor("1min")]).agg(
+            vehicle_count=("vehicle_id", "nunique"),
+            avg_speed=("speed", "mean"),
+            hard_braking_count=("hard_braking", "sum"),
+        ).reset_index()
+
+        assert list(features["intersection"]) == list(expected["location_name"])
+        pd.testing.assert_series_equal(features["vehicle_count"], expected["vehicle_count"], check_names=False)
+        pd.testing.assert_series_equal(features["avg_speed"], expected["avg_speed"], check_names=False)
+        pd.testing.assert_series_equal(
+            features["hard_braking_count"], expected["hard_braking_count"], check_names=False
+        )